@@ -22,6 +22,7 @@ from .agent.base import (
 
 from .agent.batch import (
     run_batch_tasks,
+    iter_batch_tasks,
     llm_response_batch,
     agent_response_batch,
 )
@@ -78,6 +79,7 @@ __all__ = [
     "Entity",
     "ToolMessage",
     "run_batch_tasks",
+    "iter_batch_tasks",
     "llm_response_batch",
     "agent_response_batch",
     "InfiniteLoopException",
@@ -14,6 +14,8 @@ from typing import (
     Callable,
     Coroutine,
     Dict,
+    FrozenSet,
+    Iterable,
     List,
     Optional,
     Set,
@@ -51,7 +53,11 @@ from langroid.language_models.base import (
 from langroid.language_models.openai_gpt import OpenAIGPT, OpenAIGPTConfig
 from langroid.mytypes import Entity
 from langroid.parsing.file_attachment import FileAttachment
-from langroid.parsing.parse_json import extract_top_level_json
+from langroid.parsing.parse_json import (
+    extract_top_level_json,
+    get_json_candidates,
+    maybe_tool_candidate,
+)
 from langroid.parsing.parser import Parser, ParsingConfig
 from langroid.prompts.prompts_config import PromptsConfig
 from langroid.utils.configuration import settings
@@ -81,6 +87,37 @@ class SearchForTools(Enum):
     TOOLS = 3  # from OpenAI tool calls
 
 
+class _ToolInferenceIndex:
+    """
+    Index of the tools that may be inferred when the LLM omits the `request`
+    field of a tool-call: a tool matches a tool-call dict if all of the dict's
+    keys are fields of the tool, including a field specific to the tool
+    (i.e. not inherited from `ToolMessage`).
+    """
+
+    def __init__(self, tools: Iterable[Type[ToolMessage]]):
+        default_keys = set(ToolMessage.model_fields.keys())
+        # tools having each field
+        self.tools_with_key: Dict[str, Set[Type[ToolMessage]]] = {}
+        # fields specific to each tool
+        self.specific_keys: Dict[Type[ToolMessage], FrozenSet[str]] = {}
+        for tool in tools:
+            keys = set(tool.model_fields.keys())
+            self.specific_keys[tool] = frozenset(keys - default_keys)
+            for key in keys:
+                self.tools_with_key.setdefault(key, set()).add(tool)
+
+    def candidates(self, keys: Iterable[str]) -> List[Type[ToolMessage]]:
+        """Tools matching a tool-call dict with these keys."""
+        keys = list(keys)
+        tool_sets = [self.tools_with_key.get(key, set()) for key in keys]
+        if len(tool_sets) == 0:
+            return []
+        tool_sets.sort(key=len)
+        tools = tool_sets[0].intersection(*tool_sets[1:])
+        return [t for t in tools if not self.specific_keys[t].isdisjoint(keys)]
+
+
 class AgentConfig(BaseSettings):
     """
     General config settings for an LLM agent. This is nested, combining configs of
@@ -153,6 +190,10 @@ class Agent(ABC):
         self.enabled_requests_for_inference: Optional[Set[str]] = (
             None  # If None, we allow all
         )
+        # (handled tools it was built for, index) for request inference
+        self._tool_inference_index: Optional[
+            Tuple[FrozenSet[Tuple[str, Type[ToolMessage]]], _ToolInferenceIndex]
+        ] = None
         self.interactive: bool = True  # may be modified by Task wrapper
         self.token_stats_str = ""
         self.default_human_response: Optional[str] = None
@@ -681,7 +722,7 @@ class Agent(ABC):
             results_str = json.dumps(results, indent=2)
         if not settings.quiet:
             self.render_agent_response(results)
-        maybe_json = len(extract_top_level_json(results_str)) > 0
+        maybe_json = len(get_json_candidates(results_str)) > 0
         self.callbacks.show_agent_response(
             content=results_str,
             language="json" if maybe_json else "text",
@@ -1430,6 +1471,8 @@ class Agent(ABC):
             List[ToolMessage]: list of ToolMessage objects
         """
         self.tool_error = False
+        if not maybe_tool_candidate(input_str):
+            return []
         substrings = XMLToolMessage.find_candidates(input_str)
         is_json = False
         if len(substrings) == 0:
@@ -1768,6 +1811,23 @@ class Agent(ABC):
         """
         return None
 
+    def _get_tool_inference_index(self) -> _ToolInferenceIndex:
+        """
+        Index of the handled tools that may be inferred when the LLM omits the
+        `request` field, rebuilt only when these tools change.
+        """
+        if self.enabled_requests_for_inference is None:
+            allowable: Iterable[str] = self.llm_tools_handled
+        else:
+            allowable = self.enabled_requests_for_inference.intersection(
+                self.llm_tools_handled
+            )
+        tools = frozenset((r, self.llm_tools_map[r]) for r in allowable)
+        if self._tool_inference_index is None or self._tool_inference_index[0] != tools:
+            index = _ToolInferenceIndex(t for _, t in tools)
+            self._tool_inference_index = (tools, index)
+        return self._tool_inference_index[1]
+
     def _get_one_tool_message(
         self, tool_candidate_str: str, is_json: bool = True, from_llm: bool = True
     ) -> Optional[ToolMessage]:
@@ -1814,40 +1874,14 @@ class Agent(ABC):
             maybe_tool_dict = properties
         request = maybe_tool_dict.get("request")
         if request is None:
-            if self.enabled_requests_for_inference is None:
-                possible = [self.llm_tools_map[r] for r in self.llm_tools_handled]
-            else:
-                allowable = self.enabled_requests_for_inference.intersection(
-                    self.llm_tools_handled
-                )
-                possible = [self.llm_tools_map[r] for r in allowable]
-
-            default_keys = set(ToolMessage.model_fields.keys())
-            request_keys = set(maybe_tool_dict.keys())
-
-            def maybe_parse(tool: type[ToolMessage]) -> Optional[ToolMessage]:
-                all_keys = set(tool.model_fields.keys())
-                non_inherited_keys = all_keys.difference(default_keys)
-                # If the request has any keys not valid for the tool and
-                # does not specify some key specific to the type
-                # (e.g. not just `purpose`), the LLM must explicitly specify `request`
-                if not (
-                    request_keys.issubset(all_keys)
-                    and len(request_keys.intersection(non_inherited_keys)) > 0
-                ):
-                    return None
-
+            candidate_tools: List[ToolMessage] = []
+            for tool in self._get_tool_inference_index().candidates(maybe_tool_dict):
                 try:
-                    return tool.model_validate(maybe_tool_dict)
+                    candidate_tools.append(tool.model_validate(maybe_tool_dict))
                 except ValidationError:
-                    return None
-
-            candidate_tools = list(
-                filter(
-                    lambda t: t is not None,
-                    map(maybe_parse, possible),
-                )
-            )
+                    continue
+                if len(candidate_tools) > 1:
+                    break
 
             # If only one valid candidate exists, we infer
             # "request" to be the only possible value
@@ -2,17 +2,23 @@ import asyncio
 import copy
 import inspect
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from enum import Enum
 from typing import (
     Any,
+    AsyncIterator,
     Callable,
     Coroutine,
+    Dict,
+    Generic,
     Iterable,
     List,
     Optional,
+    Sequence,
+    Tuple,
     TypeVar,
     Union,
-    cast,
 )
 
 from dotenv import load_dotenv
@@ -21,7 +27,12 @@ from langroid.agent.base import Agent
 from langroid.agent.chat_document import ChatDocument
 from langroid.agent.task import Task
 from langroid.parsing.utils import batched
-from langroid.utils.configuration import quiet_mode
+from langroid.utils.configuration import (
+    Settings,
+    quiet_mode,
+    settings,
+    temporary_settings,
+)
 from langroid.utils.logging import setup_colored_logging
 from langroid.utils.output import SuppressLoggerWarnings, status
 
@@ -31,6 +42,7 @@ load_dotenv()
 
 T = TypeVar("T")
 U = TypeVar("U")
+W = TypeVar("W")
 
 
 class ExceptionHandling(str, Enum):
@@ -68,23 +80,159 @@ def _convert_exception_handling(
     )
 
 
+class _WorkerPool(Generic[W]):
+    """
+    Bounded pool of reusable workers (e.g. copies of a task or agent), so a batch
+    run builds (and keeps alive) as many workers as it runs concurrently, rather
+    than one per item: at most `size` workers are made (`make(k)` makes the k'th),
+    and a worker is `reset` before it is handed out again. A worker whose use
+    raised an error (or was cancelled) is dropped, and replaced when needed.
+    """
+
+    def __init__(self, make: Callable[[int], W], reset: Callable[[W], Any], size: int):
+        self._make = make
+        self._reset = reset
+        self._free: List[W] = []
+        self._made = 0
+        self._slots = asyncio.Semaphore(max(1, size))
+
+    @asynccontextmanager
+    async def worker(self) -> AsyncIterator[W]:
+        async with self._slots:
+            if self._free:
+                worker = self._free.pop()
+                self._reset(worker)
+            else:
+                worker = self._make(self._made)
+                self._made += 1
+            yield worker
+            # not reached if the caller raised
+            self._free.append(worker)
+
+
+def _concurrency(
+    n_items: int,
+    batch_size: Optional[int],
+    sequential: bool,
+    stop_on_first_result: bool,
+) -> int:
+    """Max number of items processed at a time by `run_batched_tasks`."""
+    if sequential and not stop_on_first_result:
+        return 1
+    return max(1, min(n_items, batch_size or n_items))
+
+
+def _run_coroutine(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run the coroutine to completion with `asyncio.run`, or, if this thread already
+    has a running event loop (e.g. in a notebook, or when called from async code),
+    in a new thread (with this thread's settings), since loops can't be nested.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        in_loop = False
+    else:
+        in_loop = True
+    if not in_loop:
+        # outside the except block, so errors aren't chained to the RuntimeError
+        return asyncio.run(coro)
+    current = Settings(**settings.model_dump())
+
+    def run() -> T:
+        with temporary_settings(current):
+            return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run).result()
+
+
+async def _iter_batch_async(
+    inputs: Sequence[str | ChatDocument],
+    do_task: Callable[[str | ChatDocument, int], Coroutine[Any, Any, Any]],
+    max_concurrency: Optional[int] = None,
+    start_idx: int = 0,
+    stop_on_first_result: bool = False,
+    handle_exceptions: Union[bool, ExceptionHandling] = ExceptionHandling.RAISE,
+    output_map: Callable[[Any], Any] = lambda x: x,
+) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Run `do_task` on the inputs concurrently, keeping up to `max_concurrency`
+    of them in flight: as soon as one finishes, the next input is started
+    (rather than waiting for a whole batch to finish).
+
+    Args:
+        inputs: Inputs to process
+        do_task: Task execution function that takes (input, index) and returns result
+        max_concurrency: Max number of tasks in flight; None for all at once
+        start_idx: Index of the first input
+        stop_on_first_result: Whether to stop (cancelling the tasks in flight,
+            and not starting the rest) after the first non-None result
+        handle_exceptions: How to handle exceptions, see `_process_batch_async`
+        output_map: Function to map results (and handled exceptions) to final output
+
+    Yields:
+        (index, result) pairs, in order of completion
+    """
+    exception_handling = _convert_exception_handling(handle_exceptions)
+    window = len(inputs) if max_concurrency is None else max(1, max_concurrency)
+    running: Dict["asyncio.Task[Any]", int] = {}
+    # done callbacks run in the order the tasks finished, so the queue
+    # gives us the tasks in order of completion
+    finished: "asyncio.Queue[asyncio.Task[Any]]" = asyncio.Queue()
+    next_idx = 0
+    try:
+        while True:
+            while next_idx < len(inputs) and len(running) < window:
+                task = asyncio.create_task(
+                    do_task(inputs[next_idx], next_idx + start_idx)
+                )
+                task.add_done_callback(finished.put_nowait)
+                running[task] = next_idx + start_idx
+                next_idx += 1
+            if len(running) == 0:
+                return
+            task = await finished.get()
+            index = running.pop(task)
+            # a task may end by raising CancelledError itself
+            error = asyncio.CancelledError() if task.cancelled() else task.exception()
+            if error is None:
+                result = task.result()
+            elif exception_handling == ExceptionHandling.RAISE:
+                raise error
+            elif exception_handling == ExceptionHandling.RETURN_NONE:
+                result = None
+            else:
+                result = error
+            result = output_map(result)
+            yield index, result
+            if stop_on_first_result and result is not None:
+                return
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+
 async def _process_batch_async(
-    inputs: Iterable[str | ChatDocument],
+    inputs: Sequence[str | ChatDocument],
     do_task: Callable[[str | ChatDocument, int], Coroutine[Any, Any, Any]],
     start_idx: int = 0,
     stop_on_first_result: bool = False,
     sequential: bool = False,
     handle_exceptions: Union[bool, ExceptionHandling] = ExceptionHandling.RAISE,
     output_map: Callable[[Any], Any] = lambda x: x,
+    max_concurrency: Optional[int] = None,
 ) -> List[Optional[ChatDocument] | BaseException]:
     """
     Unified batch processing logic for both agent methods and tasks.
 
     Args:
-        inputs: Iterable of inputs to process
+        inputs: Inputs to process
         do_task: Task execution function that takes (input, index) and returns result
         start_idx: Starting index for the batch
         stop_on_first_result: Whether to stop after first valid result
+            (the tasks are then run concurrently even if `sequential`)
         sequential: Whether to process sequentially
         handle_exceptions: How to handle exceptions:
             - RAISE or False: Let exceptions propagate
@@ -92,93 +240,39 @@ async def _process_batch_async(
             - RETURN_EXCEPTION: Include exception objects in results
             Boolean values are deprecated and will be removed in a future version.
         output_map: Function to map results to final output format
+        max_concurrency: Max number of tasks run concurrently; None for no limit
     """
     exception_handling = _convert_exception_handling(handle_exceptions)
 
-    def handle_error(e: BaseException) -> Any:
-        """Handle exceptions based on exception_handling."""
-        match exception_handling:
-            case ExceptionHandling.RAISE:
-                raise e
-            case ExceptionHandling.RETURN_NONE:
-                return None
-            case ExceptionHandling.RETURN_EXCEPTION:
-                return e
-
-    if stop_on_first_result:
+    if sequential and not stop_on_first_result:
         results: List[Optional[ChatDocument] | BaseException] = []
-        pending: set[asyncio.Task[Any]] = set()
-        # Create task-to-index mapping
-        task_indices: dict[asyncio.Task[Any], int] = {}
-        try:
-            tasks = [
-                asyncio.create_task(do_task(input, i + start_idx))
-                for i, input in enumerate(inputs)
-            ]
-            task_indices = {task: i for i, task in enumerate(tasks)}
-            results = [None] * len(tasks)
-
-            done, pending = await asyncio.wait(
-                tasks, return_when=asyncio.FIRST_COMPLETED
-            )
-
-            # Process completed tasks
-            for task in done:
-                index = task_indices[task]
-                try:
-                    result = await task
-                    results[index] = output_map(result)
-                except BaseException as e:
-                    results[index] = handle_error(e)
-
-            if any(r is not None for r in results):
-                return results
-        finally:
-            for task in pending:
-                task.cancel()
-            try:
-                await asyncio.gather(*pending, return_exceptions=True)
-            except BaseException as e:
-                handle_error(e)
-        return results
-
-    elif sequential:
-        results = []
         for i, input in enumerate(inputs):
             try:
                 result = await do_task(input, i + start_idx)
                 results.append(output_map(result))
             except BaseException as e:
-                results.append(handle_error(e))
+                match exception_handling:
+                    case ExceptionHandling.RAISE:
+                        raise e
+                    case ExceptionHandling.RETURN_NONE:
+                        results.append(None)
+                    case ExceptionHandling.RETURN_EXCEPTION:
+                        results.append(e)
         return results
 
-    # Parallel execution
-    else:
-        try:
-            return_exceptions = exception_handling != ExceptionHandling.RAISE
-            with quiet_mode(), SuppressLoggerWarnings():
-                results_with_exceptions = cast(
-                    list[Optional[ChatDocument | BaseException]],
-                    await asyncio.gather(
-                        *(
-                            do_task(input, i + start_idx)
-                            for i, input in enumerate(inputs)
-                        ),
-                        return_exceptions=return_exceptions,
-                    ),
-                )
-
-                if exception_handling == ExceptionHandling.RETURN_NONE:
-                    results = [
-                        None if isinstance(r, BaseException) else r
-                        for r in results_with_exceptions
-                    ]
-                else:  # ExceptionHandling.RETURN_EXCEPTION
-                    results = results_with_exceptions
-        except BaseException as e:
-            results = [handle_error(e) for _ in inputs]
-
-        return [output_map(r) for r in results]
+    results = [None] * len(inputs)
+    with quiet_mode(), SuppressLoggerWarnings():
+        async for index, result in _iter_batch_async(
+            inputs,
+            do_task,
+            max_concurrency=max_concurrency,
+            start_idx=start_idx,
+            stop_on_first_result=stop_on_first_result,
+            handle_exceptions=exception_handling,
+            output_map=output_map,
+        ):
+            results[index - start_idx] = result
+    return results
 
 
 def run_batched_tasks(
@@ -198,7 +292,8 @@ def run_batched_tasks(
     Args:
         inputs: List of inputs to process
         do_task: Task execution function
-        batch_size: Size of batches, if None process all at once
+        batch_size: Max number of tasks run concurrently (a new task starts as
+            soon as one finishes), if None run all at once
         stop_on_first_result: Whether to stop after first valid result
         sequential: Whether to process sequentially
         handle_exceptions: How to handle exceptions:
@@ -211,58 +306,83 @@ def run_batched_tasks(
         message: Optional override for status message
     """
 
-    async def run_all_batched_tasks(
-        inputs: List[str | ChatDocument],
-        batch_size: int | None,
-    ) -> List[Any]:
-        """Extra wrap to run asyncio.run one single time and not once per loop
-
-        Args:
-            inputs (List[str  |  ChatDocument]): inputs to process
-            batch_size (int | None): batch size
-
-        Returns:
-            List[Any]: results
-        """
-        results: List[Any] = []
-        if batch_size is None:
-            msg = message or message_template.format(total=len(inputs))
-            with status(msg), SuppressLoggerWarnings():
-                results = await _process_batch_async(
-                    inputs,
-                    do_task,
-                    stop_on_first_result=stop_on_first_result,
-                    sequential=sequential,
-                    handle_exceptions=handle_exceptions,
-                    output_map=output_map,
-                )
-        else:
-            batches = batched(inputs, batch_size)
-            for batch in batches:
-                start_idx = len(results)
-                complete_str = f", {start_idx} complete" if start_idx > 0 else ""
-                msg = (
-                    message or message_template.format(total=len(inputs)) + complete_str
-                )
+    msg = message or message_template.format(total=len(inputs))
+    with status(msg), SuppressLoggerWarnings():
+        return _run_coroutine(
+            _process_batch_async(
+                inputs,
+                do_task,
+                stop_on_first_result=stop_on_first_result,
+                sequential=sequential,
+                handle_exceptions=handle_exceptions,
+                output_map=output_map,
+                max_concurrency=batch_size,
+            )
+        )
 
-                if stop_on_first_result and any(r is not None for r in results):
-                    results.extend([None] * len(batch))
-                else:
-                    with status(msg), SuppressLoggerWarnings():
-                        results.extend(
-                            await _process_batch_async(
-                                batch,
-                                do_task,
-                                start_idx=start_idx,
-                                stop_on_first_result=stop_on_first_result,
-                                sequential=sequential,
-                                handle_exceptions=handle_exceptions,
-                                output_map=output_map,
-                            )
-                        )
-        return results
 
-    return asyncio.run(run_all_batched_tasks(inputs, batch_size))
+def _task_runner(
+    gen_task: Callable[[int], Task],
+    turns: int,
+    max_cost: float,
+    max_tokens: int,
+    pool_size: Optional[int] = None,
+) -> Callable[[str | ChatDocument, int], Coroutine[Any, Any, Optional[ChatDocument]]]:
+    """
+    Make a function that runs the i'th generated task on an input, raising
+    any exception the task swallowed (or a KILL result) as an error.
+    If `pool_size` is given, tasks are instead taken from a pool of (at most)
+    that many generated tasks, reset (with their sub-tasks) between inputs.
+    """
+    pool = (
+        None
+        if pool_size is None
+        else _WorkerPool(gen_task, Task.reset_all_sub_tasks, pool_size)
+    )
+
+    async def _do_task(
+        input: str | ChatDocument,
+        i: int,
+    ) -> Optional[ChatDocument]:
+        if pool is None:
+            return await _run_task(gen_task(i), input)
+        async with pool.worker() as task_i:
+            return await _run_task(task_i, input)
+
+    async def _run_task(
+        task_i: Task,
+        input: str | ChatDocument,
+    ) -> Optional[ChatDocument]:
+        if task_i.agent.llm is not None:
+            task_i.agent.llm.set_stream(False)
+        task_i.agent.config.show_stats = False
+
+        try:
+            result = await task_i.run_async(
+                input, turns=turns, max_cost=max_cost, max_tokens=max_tokens
+            )
+        except asyncio.CancelledError as e:
+            task_i.kill()
+            # exception will be handled by the caller
+            raise e
+        # ----------------------------------------
+        # Propagate any exception stored on the task that may have been
+        # swallowed inside `Task.run_async`, so that the upper-level
+        # exception-handling logic works as expected.
+        for attr in ("_exception", "last_exception", "exception"):
+            exc = getattr(task_i, attr, None)
+            if isinstance(exc, BaseException):
+                raise exc
+        # Fallback: treat a KILL-status result as an error
+        if (
+            isinstance(result, ChatDocument)
+            and getattr(result, "status", None) is not None
+            and str(getattr(result, "status")) == "StatusCode.KILL"
+        ):
+            raise RuntimeError(str(result.content))
+        return result
+
+    return _do_task
 
 
 def run_batch_task_gen(
@@ -278,6 +398,7 @@ def run_batch_task_gen(
     handle_exceptions: Union[bool, ExceptionHandling] = ExceptionHandling.RAISE,
     max_cost: float = 0.0,
     max_tokens: int = 0,
+    reuse_tasks: bool = False,
 ) -> list[Optional[U]]:
     """
     Generate and run copies of a task async/concurrently one per item in `items` list.
@@ -298,8 +419,8 @@ def run_batch_task_gen(
             returned list.
         sequential (bool): whether to run sequentially
             (e.g. some APIs such as ooba don't support concurrent requests)
-        batch_size (Optional[int]): The number of tasks to run at a time,
-            if None, unbatched
+        batch_size (Optional[int]): The max number of tasks to run at a time
+            (a new one starts as soon as one finishes), if None, unbatched
         turns (int): number of turns to run, -1 for infinite
         message (Optional[str]): optionally overrides the console status messages
         handle_exceptions: How to handle exceptions:
@@ -309,6 +430,14 @@ def run_batch_task_gen(
             Boolean values are deprecated and will be removed in a future version.
         max_cost: float: maximum cost to run the task (default 0.0 for unlimited)
         max_tokens: int: maximum token usage (in and out) (default 0 for unlimited)
+        reuse_tasks (bool): whether to reuse the generated tasks across items:
+            only as many tasks are generated as are run at a time, and each is
+            reset (`Task.reset_all_sub_tasks`) before it runs the next item.
+            Only use this if `gen_task(i)` gives equivalent tasks for all `i`.
+            Reset only restores what `init_state` does (message history and
+            token usage of the agents); any other state a run changes (e.g.
+            enabled tools, system message, ingested docs, other attributes)
+            carries over to later items.
 
 
     Returns:
@@ -316,40 +445,12 @@ def run_batch_task_gen(
         `stop_on_first_result` is disabled
     """
     inputs = [input_map(item) for item in items]
-
-    async def _do_task(
-        input: str | ChatDocument,
-        i: int,
-    ) -> BaseException | Optional[ChatDocument] | tuple[int, Optional[ChatDocument]]:
-        task_i = gen_task(i)
-        if task_i.agent.llm is not None:
-            task_i.agent.llm.set_stream(False)
-        task_i.agent.config.show_stats = False
-
-        try:
-            result = await task_i.run_async(
-                input, turns=turns, max_cost=max_cost, max_tokens=max_tokens
-            )
-        except asyncio.CancelledError as e:
-            task_i.kill()
-            # exception will be handled by the caller
-            raise e
-        # ----------------------------------------
-        # Propagate any exception stored on the task that may have been
-        # swallowed inside `Task.run_async`, so that the upper-level
-        # exception-handling logic works as expected.
-        for attr in ("_exception", "last_exception", "exception"):
-            exc = getattr(task_i, attr, None)
-            if isinstance(exc, BaseException):
-                raise exc
-        # Fallback: treat a KILL-status result as an error
-        if (
-            isinstance(result, ChatDocument)
-            and getattr(result, "status", None) is not None
-            and str(getattr(result, "status")) == "StatusCode.KILL"
-        ):
-            raise RuntimeError(str(result.content))
-        return result
+    pool_size = (
+        _concurrency(len(inputs), batch_size, sequential, stop_on_first_result)
+        if reuse_tasks
+        else None
+    )
+    _do_task = _task_runner(gen_task, turns, max_cost, max_tokens, pool_size)
 
     return run_batched_tasks(
         inputs=inputs,
@@ -375,6 +476,7 @@ def run_batch_tasks(
     turns: int = -1,
     max_cost: float = 0.0,
     max_tokens: int = 0,
+    reuse_tasks: bool = False,
 ) -> List[Optional[U]]:
     """
     Run copies of `task` async/concurrently one per item in `items` list.
@@ -389,11 +491,18 @@ def run_batch_tasks(
             to final result
         sequential (bool): whether to run sequentially
             (e.g. some APIs such as ooba don't support concurrent requests)
-        batch_size (Optional[int]): The number of tasks to run at a time,
-            if None, unbatched
+        batch_size (Optional[int]): The max number of tasks to run at a time
+            (a new one starts as soon as one finishes), if None, unbatched
         turns (int): number of turns to run, -1 for infinite
         max_cost: float: maximum cost to run the task (default 0.0 for unlimited)
         max_tokens: int: maximum token usage (in and out) (default 0 for unlimited)
+        reuse_tasks (bool): whether to reuse copies of `task` across items
+            (one per concurrently running item, reset before each item),
+            rather than cloning `task` for every item (default).
+            Reset only restores what `init_state` does (message history and
+            token usage of the agents); any other state a run changes (e.g.
+            enabled tools, system message, ingested docs, other attributes)
+            carries over to later items.
 
     Returns:
         list[Optional[U]]: list of final results. Always list[U] if
@@ -412,6 +521,84 @@ def run_batch_tasks(
         message,
         max_cost=max_cost,
         max_tokens=max_tokens,
+        reuse_tasks=reuse_tasks,
+    )
+
+
+def iter_batch_task_gen(
+    gen_task: Callable[[int], Task],
+    items: Sequence[T],
+    input_map: Callable[[T], str | ChatDocument] = lambda x: str(x),
+    output_map: Callable[[ChatDocument | None], U] = lambda x: x,  # type: ignore
+    stop_on_first_result: bool = False,
+    max_concurrency: Optional[int] = None,
+    turns: int = -1,
+    handle_exceptions: Union[bool, ExceptionHandling] = ExceptionHandling.RAISE,
+    max_cost: float = 0.0,
+    max_tokens: int = 0,
+    reuse_tasks: bool = False,
+) -> AsyncIterator[Tuple[int, Optional[U]]]:
+    """
+    Async version of `run_batch_task_gen` that streams the results: runs the
+    generated tasks concurrently (at most `max_concurrency` at a time, starting
+    a new one as soon as one finishes), and yields `(index, result)` pairs as
+    tasks complete, where `index` is the position of the item in `items`.
+    Use it from async code, e.g.:
+
+        async for i, result in iter_batch_task_gen(gen_task, items):
+            ...
+
+    Breaking out of the loop cancels the tasks still running.
+
+    Args: see `run_batch_task_gen`; with `stop_on_first_result`, iteration
+        ends after the first non-None result.
+    """
+    inputs = [input_map(item) for item in items]
+    pool_size = (
+        _concurrency(len(inputs), max_concurrency, False, stop_on_first_result)
+        if reuse_tasks
+        else None
+    )
+    return _iter_batch_async(
+        inputs,
+        _task_runner(gen_task, turns, max_cost, max_tokens, pool_size),
+        max_concurrency=max_concurrency,
+        stop_on_first_result=stop_on_first_result,
+        handle_exceptions=handle_exceptions,
+        output_map=output_map,
+    )
+
+
+def iter_batch_tasks(
+    task: Task,
+    items: Sequence[T],
+    input_map: Callable[[T], str | ChatDocument] = lambda x: str(x),
+    output_map: Callable[[ChatDocument | None], U] = lambda x: x,  # type: ignore
+    stop_on_first_result: bool = False,
+    max_concurrency: Optional[int] = None,
+    turns: int = -1,
+    handle_exceptions: Union[bool, ExceptionHandling] = ExceptionHandling.RAISE,
+    max_cost: float = 0.0,
+    max_tokens: int = 0,
+    reuse_tasks: bool = False,
+) -> AsyncIterator[Tuple[int, Optional[U]]]:
+    """
+    Async version of `run_batch_tasks` that streams the results, yielding
+    `(index, result)` pairs as the copies of `task` complete;
+    see `iter_batch_task_gen`.
+    """
+    return iter_batch_task_gen(
+        lambda i: task.clone(i),
+        items,
+        input_map=input_map,
+        output_map=output_map,
+        stop_on_first_result=stop_on_first_result,
+        max_concurrency=max_concurrency,
+        turns=turns,
+        handle_exceptions=handle_exceptions,
+        max_cost=max_cost,
+        max_tokens=max_tokens,
+        reuse_tasks=reuse_tasks,
     )
 
 
@@ -427,6 +614,7 @@ def run_batch_agent_method(
     stop_on_first_result: bool = False,
     handle_exceptions: Union[bool, ExceptionHandling] = ExceptionHandling.RAISE,
     batch_size: Optional[int] = None,
+    reuse_agents: bool = False,
 ) -> List[Any]:
     """
     Run the `method` on copies of `agent`, async/concurrently one per
@@ -456,8 +644,14 @@ def run_batch_agent_method(
             - RETURN_NONE or True: Convert exceptions to None in results
             - RETURN_EXCEPTION: Include exception objects in results
             Boolean values are deprecated and will be removed in a future version.
-        batch_size (Optional[int]): The number of items to process in each batch.
+        batch_size (Optional[int]): The max number of items to process at a
+            time (a new one starts as soon as one finishes).
             If None, process all items at once.
+        reuse_agents (bool): whether to reuse copies of `agent` across items
+            (one per concurrently processed item, reset with `init_state`
+            before each item), rather than making one per item (default).
+            Any state a call changes that `init_state` doesn't reset
+            carries over to later items.
     Returns:
         List[Any]: list of final results
     """
@@ -474,14 +668,30 @@ def run_batch_agent_method(
     agent_cls = type(agent)
     agent_name = agent_cfg.name
 
-    async def _do_task(input: str | ChatDocument, i: int) -> Any:
-        agent_cfg.name = f"{agent_cfg.name}-{i}"
-        agent_i = agent_cls(agent_cfg)
+    def _make_agent(k: int) -> Agent:
+        return agent_cls(agent_cfg.model_copy(update=dict(name=f"{agent_name}-{k}")))
+
+    pool = (
+        _WorkerPool(
+            _make_agent,
+            agent_cls.init_state,
+            _concurrency(len(inputs), batch_size, sequential, stop_on_first_result),
+        )
+        if reuse_agents
+        else None
+    )
+
+    async def _run_method(agent_i: Agent, input: str | ChatDocument) -> Any:
         method_i = getattr(agent_i, method_name, None)
         if method_i is None:
             raise ValueError(f"Agent {agent_name} has no method {method_name}")
-        result = await method_i(input)
-        return result
+        return await method_i(input)
+
+    async def _do_task(input: str | ChatDocument, i: int) -> Any:
+        if pool is None:
+            return await _run_method(_make_agent(i), input)
+        async with pool.worker() as agent_i:
+            return await _run_method(agent_i, input)
 
     return run_batched_tasks(
         inputs=inputs,
@@ -560,11 +770,11 @@ def run_batch_function(
 
     if batch_size is None:
         with status(f"[bold green]Running {len(items)} tasks:"):
-            results = asyncio.run(_do_all(items))
+            results = _run_coroutine(_do_all(items))
     else:
         batches = batched(items, batch_size)
         for batch in batches:
             with status(f"[bold green]Running batch of {len(batch)} tasks:"):
-                results.extend(asyncio.run(_do_all(batch)))
+                results.extend(_run_coroutine(_do_all(batch)))
 
     return results
@@ -34,6 +34,7 @@ from langroid.agent.base import (
     noop_fn,
 )
 from langroid.agent.chat_document import ChatDocument
+from langroid.agent.message_history import MessageHistory
 from langroid.agent.tool_message import (
     ToolMessage,
     format_schema_for_strict,
@@ -194,7 +195,7 @@ class ChatAgent(Agent):
         super().__init__(config)
         self.config: ChatAgentConfig = config
         self.config._set_fn_or_tools()
-        self.message_history: List[LLMMessage] = []
+        self.message_history = []
         self.init_state()
         # An agent's "task" is defined by a system msg and an optional user msg;
         # These are "priming" messages that kick off the agent's conversation.
@@ -224,6 +225,11 @@ class ChatAgent(Agent):
         self.llm_functions_handled: Set[str] = set()
         self.llm_functions_usable: Set[str] = set()
         self.llm_function_force: Optional[Dict[str, str]] = None
+        # memoized tool/function-call specs and system message, so they are not
+        # rebuilt on every LLM call, and are identical across calls (which keeps
+        # provider-side prompt caches warm); see `_invalidate_compiled_tools`
+        self._compiled_tools: Optional[Tuple[Any, Any, bool]] = None
+        self._compiled_system_message: Optional[Tuple[Any, LLMMessage]] = None
 
         self.output_format: Optional[type[ToolMessage | BaseModel]] = None
 
@@ -285,6 +291,23 @@ class ChatAgent(Agent):
             self.enable_message(AgentSendTool, use=False, handle=True)
             self.enable_message(ResultTool, use=False, handle=True)
 
+    @property
+    def message_history(self) -> MessageHistory:
+        """
+        The LLM message history. It maintains a running total of its token
+        count (see `chat_num_tokens`); any list assigned here is wrapped in a
+        `MessageHistory`.
+        """
+        return self._message_history
+
+    @message_history.setter
+    def message_history(self, messages: List[LLMMessage]) -> None:
+        if isinstance(messages, MessageHistory):
+            messages.set_counter(self._message_num_tokens)
+        else:
+            messages = MessageHistory(messages, counter=self._message_num_tokens)
+        self._message_history = messages
+
     def init_state(self) -> None:
         """
         Initialize the state of the agent. Just conversation state here,
@@ -378,7 +401,17 @@ class ChatAgent(Agent):
             and self.llm.supports_json_schema
         )
 
+    def _invalidate_compiled_tools(self) -> None:
+        """
+        Drop the memoized tool specs (see `_function_args`) and system message
+        (see `_create_system_and_tools_message`), when tools or output format
+        are enabled/disabled, or the system message is changed.
+        """
+        self._compiled_tools = None
+        self._compiled_system_message = None
+
     def set_system_message(self, msg: str) -> None:
+        self._invalidate_compiled_tools()
         self.system_message = msg
         if len(self.message_history) > 0:
             # if there is message history, update the system message in it
@@ -556,6 +589,7 @@ class ChatAgent(Agent):
         Args:
             message (str): system message
         """
+        self._invalidate_compiled_tools()
         self.system_message += "\n\n" + message
 
     def last_message_with_role(self, role: Role) -> LLMMessage | None:
@@ -636,16 +670,27 @@ class ChatAgent(Agent):
         Returns:
             LLMMessage object
         """
-        content = self.system_message
-        if self.system_tool_instructions != "":
-            content += "\n\n" + self.system_tool_instructions
-        if self.system_tool_format_instructions != "":
-            content += "\n\n" + self.system_tool_format_instructions
-        if self.output_format_instructions != "":
-            content += "\n\n" + self.output_format_instructions
-
-        # remove leading and trailing newlines and other whitespace
-        return LLMMessage(role=Role.SYSTEM, content=content.strip())
+        parts = (
+            self.system_message,
+            self.system_tool_instructions,
+            self.system_tool_format_instructions,
+            self.output_format_instructions,
+        )
+        compiled = self._compiled_system_message
+        if compiled is None or compiled[0] != parts:
+            content = self.system_message
+            if self.system_tool_instructions != "":
+                content += "\n\n" + self.system_tool_instructions
+            if self.system_tool_format_instructions != "":
+                content += "\n\n" + self.system_tool_format_instructions
+            if self.output_format_instructions != "":
+                content += "\n\n" + self.output_format_instructions
+
+            # remove leading and trailing newlines and other whitespace
+            compiled = (parts, LLMMessage(role=Role.SYSTEM, content=content.strip()))
+            self._compiled_system_message = compiled
+        # a copy, since callers may modify the message (e.g. the message history)
+        return compiled[1].model_copy()
 
     def handle_message_fallback(self, msg: str | ChatDocument) -> Any:
         """
@@ -850,6 +895,7 @@ class ChatAgent(Agent):
     def _update_tool_instructions(self) -> None:
         # Set tool instructions and JSON format instructions,
         # in case Tools have been enabled/disabled.
+        self._invalidate_compiled_tools()
         if self.config.use_tools:
             self.system_tool_format_instructions = self.tool_format_rules()
         self.system_tool_instructions = self.tool_instructions()
@@ -911,6 +957,7 @@ class ChatAgent(Agent):
         copy certain fields to ensure that we do not overwrite the main agent's
         setings.
         """
+        self._invalidate_compiled_tools()
         # Disable usage of an output format which was not specifically enabled
         # by `enable_message`
         if self.enabled_use_output_format is not None:
@@ -1629,7 +1676,12 @@ class ChatAgent(Agent):
         else:
             assert self.message_history[0].role == Role.SYSTEM
             # update the system message with the latest tool instructions
-            self.message_history[0] = self._create_system_and_tools_message()
+            # (unless unchanged, to avoid re-counting its tokens)
+            system_message = self._create_system_and_tools_message()
+            if self.message_history[0].model_dump(
+                exclude={"timestamp"}
+            ) != system_message.model_dump(exclude={"timestamp"}):
+                self.message_history[0] = system_message
 
         if message is not None:
             if (
@@ -1866,6 +1918,53 @@ class ChatAgent(Agent):
         Get function/tool spec/output format arguments for
         OpenAI-compatible LLM API call
         """
+        # the specs only depend on these, so we memoize them (and return the
+        # same specs, in the same order, while these are unchanged)
+        usable = tuple(self.llm_functions_usable)
+        key = (
+            usable,
+            tuple(id(self.llm_functions_map.get(f)) for f in usable),
+            self.config.use_functions_api,
+            self.config.use_tools_api,
+            (
+                None
+                if self.llm_function_force is None
+                else tuple(self.llm_function_force.items())
+            ),
+            self.disable_strict,
+            frozenset(self.disable_strict_tools_set),
+            self._strict_tools_available(),
+            self.output_format,
+            self.config.output_format_include_defaults,
+            self._json_schema_available(),
+        )
+        if self._compiled_tools is None or self._compiled_tools[0] != key:
+            self._compiled_tools = (key, *self._compile_function_args())
+        _, args, self.any_strict = self._compiled_tools
+        functions, fun_call, tools, force_tool, output_format = args
+        return (
+            None if functions is None else list(functions),
+            fun_call,
+            None if tools is None else list(tools),
+            force_tool,
+            output_format,
+        )
+
+    def _compile_function_args(
+        self,
+    ) -> Tuple[
+        Tuple[
+            Optional[List[LLMFunctionSpec]],
+            str | Dict[str, str],
+            Optional[List[OpenAIToolSpec]],
+            Optional[Dict[str, Dict[str, str] | str]],
+            Optional[OpenAIJsonSchemaSpec],
+        ],
+        bool,
+    ]:
+        """
+        Build the (uncached) `_function_args`, and whether any spec is strict.
+        """
         functions: Optional[List[LLMFunctionSpec]] = None
         fun_call: str | Dict[str, str] = "none"
         tools: Optional[List[OpenAIToolSpec]] = None
@@ -1939,7 +2038,7 @@ class ChatAgent(Agent):
                     ),
                 )
 
-        return functions, fun_call, tools, force_tool, output_format
+        return (functions, fun_call, tools, force_tool, output_format), self.any_strict
 
     def llm_response_messages(
         self,
@@ -2306,6 +2405,9 @@ class ChatAgent(Agent):
     def chat_num_tokens(self, messages: Optional[List[LLMMessage]] = None) -> int:
         """
         Total number of tokens in the message history so far.
+        Token counts are cached per message, and the total for the agent's
+        own message history is maintained incrementally, so this is cheap
+        to call repeatedly.
 
         Args:
             messages: if provided, compute the number of tokens in this list of
@@ -2319,8 +2421,25 @@ class ChatAgent(Agent):
                 "You must set ChatAgent.parser "
                 "before calling chat_num_tokens()."
             )
-        hist = messages if messages is not None else self.message_history
-        return sum([self._message_num_tokens(m) for m in hist])
+        if messages is None or messages is self.message_history:
+            history = self.message_history
+            if history.counter != self._message_num_tokens:
+                # e.g. a history copied from (or along with) another agent
+                history.set_counter(self._message_num_tokens)
+            return history.num_tokens(self._token_count_key())
+        return sum([self._message_num_tokens(m) for m in messages])
+
+    def _token_count_key(self) -> str:
+        """
+        Identity of the tokenizer (and attachment serialization) used to
+        count tokens, under which per-message token counts are cached.
+        """
+        parser_config = getattr(self.parser, "config", None)
+        if parser_config is None:
+            tokenizer = f"{type(self.parser).__name__}@{id(self.parser)}"
+        else:
+            tokenizer = f"{parser_config.token_encoding_model}:{parser_config.splitter}"
+        return f"{tokenizer}:{self._chat_model_name_for_attachments()}"
 
     def _message_num_tokens(self, message: LLMMessage) -> int:
         """Count tokens for a message, including serialized user attachments."""
@@ -2330,10 +2449,14 @@ class ChatAgent(Agent):
                 "You must set ChatAgent.parser "
                 "before calling _message_num_tokens()."
             )
-
-        return self.parser.num_tokens(message.content) + self._attachment_num_tokens(
-            message
-        )
+        key = self._token_count_key()
+        n = message.cached_num_tokens(key)
+        if n is None:
+            n = self.parser.num_tokens(message.content) + self._attachment_num_tokens(
+                message
+            )
+            message.set_cached_num_tokens(key, n)
+        return n
 
     def _attachment_num_tokens(self, message: LLMMessage) -> int:
         """
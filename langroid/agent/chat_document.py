@@ -6,7 +6,7 @@ from collections import OrderedDict
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union, cast
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
 from langroid.agent.tool_message import ToolMessage
 from langroid.agent.xml_tool_message import XMLToolMessage
@@ -22,7 +22,11 @@ from langroid.language_models.base import (
 from langroid.mytypes import DocMetaData, Document, Entity
 from langroid.parsing.agent_chats import parse_message
 from langroid.parsing.file_attachment import FileAttachment
-from langroid.parsing.parse_json import extract_top_level_json, top_level_json_field
+from langroid.parsing.parse_json import (
+    extract_top_level_json,
+    maybe_tool_candidate,
+    top_level_json_field,
+)
 from langroid.utils.object_registry import ObjectRegistry
 from langroid.utils.output.printing import shorten_text
 from langroid.utils.types import to_string
@@ -68,6 +72,31 @@ class ChatDocMetaData(DocMetaData):
     displayed: bool = False
     has_citation: bool = False
     status: Optional[StatusCode] = None
+    # When the ObjectRegistry holds only weak references, keep the parent
+    # ChatDocument alive from here, so the conversation chain leading up to
+    # a live message stays resolvable via `from_id`.
+    _parent_ref: Optional["ChatDocument"] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._pin_parent()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "parent_id":
+            self._pin_parent()
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "ChatDocMetaData":
+        # share (rather than copy) the pinned parent, and hence the whole chain
+        memo = {} if memo is None else memo
+        if self._parent_ref is not None:
+            memo[id(self._parent_ref)] = self._parent_ref
+        return super().__deepcopy__(memo)
+
+    def _pin_parent(self) -> None:
+        if ObjectRegistry.is_weak():
+            self._parent_ref = ChatDocument.from_id(self.parent_id)
+        else:
+            self._parent_ref = None
 
     @property
     def parent(self) -> Optional["ChatDocument"]:
@@ -206,6 +235,8 @@ class ChatDocument(Document):
             corresponding tool message class)
 
         """
+        if not maybe_tool_candidate(self.content):
+            return []
         tool_candidates = XMLToolMessage.find_candidates(self.content)
         if len(tool_candidates) == 0:
             tool_candidates = extract_top_level_json(self.content)
@@ -266,8 +297,13 @@ class ChatDocument(Document):
             content=content,
         )
 
-    def tsv_str(self) -> str:
-        fields = self.log_fields()
+    def tsv_str(self, fields: Optional[ChatDocLoggerFields] = None) -> str:
+        """
+        Tab-separated log fields, for the tsv logger.
+        Args:
+            fields: the `log_fields()` of this message, if already computed
+        """
+        fields = (fields or self.log_fields()).model_copy()
         fields.content = shorten_text(fields.content, 80)
         field_values = fields.model_dump().values()
         return "\t".join(str(v) for v in field_values)
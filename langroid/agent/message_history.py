@@ -0,0 +1,150 @@
+"""
+A list of `LLMMessage`s that maintains a running total of its token count,
+so the size of an agent's message history is O(1) to query.
+
+Each message caches its own token count (see `LLMMessage.cached_num_tokens`),
+so a message is tokenized once, when it first enters the history (or when its
+content is re-assigned). The running total is updated on every list mutation
+(append, extend, insert, pop, slice assignment/deletion, ...), and recomputed
+from the per-message counts (without re-tokenizing) only if the tokenizer
+changes or some counted message is mutated.
+"""
+
+import copy
+import types
+from typing import Any, Callable, Dict, Iterable, List, Optional, SupportsIndex
+
+from langroid.language_models.base import LLMMessage
+
+
+class MessageHistory(List[LLMMessage]):
+    def __init__(
+        self,
+        messages: Iterable[LLMMessage] = (),
+        counter: Optional[Callable[[LLMMessage], int]] = None,
+    ):
+        """
+        Args:
+            messages: initial messages
+            counter: fn returning the (cached) token count of a message
+        """
+        super().__init__(messages)
+        self._counter = counter
+        self._total: Optional[int] = None
+        self._key = ""
+        self._epoch = -1
+
+    @property
+    def counter(self) -> Optional[Callable[[LLMMessage], int]]:
+        return self._counter
+
+    def set_counter(self, counter: Optional[Callable[[LLMMessage], int]]) -> None:
+        self._counter = counter
+        self._total = None
+
+    def num_tokens(self, key: str = "") -> int:
+        """
+        Total number of tokens in the messages.
+
+        Args:
+            key: identity of the tokenizer used by the counter; the total is
+                recomputed when this changes.
+        Returns:
+            int: total token count
+        """
+        if self._counter is None:
+            raise ValueError("MessageHistory has no token counter")
+        if self._total is None or key != self._key or not self._fresh():
+            self._key = key
+            self._epoch = LLMMessage.token_epoch
+            self._total = sum(self._counter(m) for m in self)
+        return self._total
+
+    def _fresh(self) -> bool:
+        return self._epoch == LLMMessage.token_epoch
+
+    def _added(self, messages: Iterable[LLMMessage]) -> None:
+        if self._total is None or self._counter is None:
+            return
+        if not self._fresh():
+            self._total = None
+            return
+        self._total += sum(self._counter(m) for m in messages)
+        # counting may have tokenized messages mutated elsewhere
+        if not self._fresh():
+            self._total = None
+
+    def _removed(self, messages: Iterable[LLMMessage]) -> None:
+        if self._total is None or self._counter is None:
+            return
+        if not self._fresh():
+            self._total = None
+            return
+        self._total -= sum(self._counter(m) for m in messages)
+
+    def append(self, message: LLMMessage) -> None:
+        super().append(message)
+        self._added([message])
+
+    def extend(self, messages: Iterable[LLMMessage]) -> None:
+        messages = list(messages)
+        super().extend(messages)
+        self._added(messages)
+
+    def insert(self, index: SupportsIndex, message: LLMMessage) -> None:
+        super().insert(index, message)
+        self._added([message])
+
+    def pop(self, index: SupportsIndex = -1) -> LLMMessage:
+        message = super().pop(index)
+        self._removed([message])
+        return message
+
+    def remove(self, message: LLMMessage) -> None:
+        super().remove(message)
+        self._removed([message])
+
+    def clear(self) -> None:
+        super().clear()
+        if self._total is not None:
+            self._total = 0
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        old = self[index]
+        if isinstance(index, slice):
+            value = list(value)
+            super().__setitem__(index, value)
+            self._removed(old)
+            self._added(value)
+        else:
+            super().__setitem__(index, value)
+            self._removed([old])
+            self._added([value])
+
+    def __delitem__(self, index: Any) -> None:
+        old = self[index]
+        super().__delitem__(index)
+        self._removed(old if isinstance(index, slice) else [old])
+
+    def __iadd__(self, messages: Iterable[LLMMessage]) -> "MessageHistory":  # type: ignore[override,misc]
+        self.extend(messages)
+        return self
+
+    def __imul__(self, n: SupportsIndex) -> "MessageHistory":
+        super().__imul__(n)
+        self._total = None
+        return self
+
+    def __copy__(self) -> "MessageHistory":
+        return MessageHistory(self, counter=self._counter)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "MessageHistory":
+        counter = self._counter
+        owner = getattr(counter, "__self__", None)
+        if owner is not None and id(owner) in memo:
+            # copied along with the agent owning the counter: count with the copy
+            counter = types.MethodType(counter.__func__, memo[id(owner)])  # type: ignore
+        return MessageHistory(copy.deepcopy(list(self), memo), counter=counter)
+
+    def __reduce__(self) -> Any:
+        return (MessageHistory, (list(self),))
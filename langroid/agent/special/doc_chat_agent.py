@@ -18,19 +18,30 @@ import asyncio
 import copy
 import importlib
 import logging
+import os
 import threading
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from dataclasses import dataclass
-from functools import cache
+from functools import cache, partial
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    Deque,
     Dict,
+    Iterable,
+    Iterator,
     List,
     Optional,
     Set,
     Tuple,
+    TypeVar,
     no_type_check,
 )
 
@@ -55,7 +66,8 @@ from langroid.embedding_models.models import (
 from langroid.language_models.base import LLMConfig, StreamingIfAllowed
 from langroid.language_models.openai_gpt import OpenAIChatModel, OpenAIGPTConfig
 from langroid.mytypes import DocMetaData, Document, Entity
-from langroid.parsing.document_parser import DocumentType
+from langroid.parsing.bm25_index import BM25Index
+from langroid.parsing.document_parser import DocumentParser, DocumentType
 from langroid.parsing.parser import Parser, ParsingConfig, PdfParsingConfig, Splitter
 from langroid.parsing.repo_loader import RepoLoader
 from langroid.parsing.search import (
@@ -68,6 +80,8 @@ from langroid.parsing.url_loader import BaseCrawlerConfig, TrafilaturaConfig, UR
 from langroid.parsing.urls import get_list_from_user, get_urls_paths_bytes_indices
 from langroid.prompts.prompts_config import PromptsConfig
 from langroid.prompts.templates import SUMMARY_ANSWER_PROMPT_GPT4
+from langroid.utils.algorithms.mmr import mmr_order
+from langroid.utils.configuration import Settings, settings, temporary_settings
 from langroid.utils.constants import NO_ANSWER
 from langroid.utils.object_registry import ObjectRegistry
 from langroid.utils.output import show_if_debug, status
@@ -90,6 +104,8 @@ def apply_nest_asyncio() -> None:
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 @dataclass
 class _CrossEncoderCacheEntry:
@@ -220,12 +236,25 @@ class DocChatAgentConfig(ChatAgentConfig):
     n_fuzzy_neighbor_words: int = 100  # num neighbor words to retrieve for fuzzy match
     use_fuzzy_match: bool = True
     use_bm25_search: bool = True
+    # Use an inverted index for bm25 search, built once and updated incrementally
+    # as docs are ingested, instead of re-tokenizing all chunks on every query.
+    use_bm25_index: bool = True
+    # If set, the bm25 index is saved in (and loaded from) this directory,
+    # in a file named after the vecdb collection.
+    bm25_index_dir: Optional[str] = None
+    # In get_relevant_chunks, embed and search for the query and all its proxies
+    # (rephrasings, hypothetical answer) in one batch, and run the lexical
+    # (bm25, fuzzy) retrievers concurrently with the semantic search.
+    concurrent_retrieval: bool = True
     use_reciprocal_rank_fusion: bool = False
     cross_encoder_reranking_model: str = (  # ignored if use_reciprocal_rank_fusion=True
         "cross-encoder/ms-marco-MiniLM-L-6-v2" if has_sentence_transformers else ""
     )
     cross_encoder_device: Optional[str] = None  # default to CPU when None
     rerank_diversity: bool = True  # rerank to maximize diversity?
+    # relevance vs diversity trade-off in diversity reranking (MMR):
+    # 0 = pure diversity, 1 = pure relevance (similarity to query)
+    rerank_diversity_lambda: float = 0.0
     rerank_periphery: bool = True  # rerank to avoid Lost In the Middle effect?
     rerank_after_adding_context: bool = True  # rerank after adding context window?
     # RRF (Reciprocal Rank Fusion) score = 1/(rank + reciprocal_rank_fusion_constant)
@@ -235,6 +264,20 @@ class DocChatAgentConfig(ChatAgentConfig):
     debug: bool = False
     stream: bool = True  # allow streaming where needed
     split: bool = True  # use chunking
+    # If > 0, ingest docs as a stream of windows of this many chunks:
+    # each window goes through split -> enrich -> embed -> upsert before the next
+    # is processed, so peak memory is O(window) rather than O(corpus).
+    # In this mode the original (unsplit) docs are not retained.
+    ingest_window_size: int = 0
+    # max number of windows embedded ahead of the one being upserted
+    ingest_max_in_flight: int = 2
+    # In ingest_doc_paths, number of worker processes parsing local files/bytes
+    # (directories are expanded into their files, which are parsed in parallel),
+    # and number of threads fetching URLs. 1 = parse/fetch serially.
+    # In parallel mode results keep the input order, and a file or URL that
+    # fails is logged and skipped instead of aborting the whole ingestion.
+    parse_workers: int = 1
+    url_fetch_workers: int = 1
     relevance_extractor_config: None | RelevanceExtractorAgentConfig = (
         RelevanceExtractorAgentConfig(
             llm=None  # use the parent's llm unless explicitly set here
@@ -297,6 +340,70 @@ def _append_metadata_source(orig_source: str, source: str) -> str:
     return orig_source.strip() + source.strip()
 
 
+def _load_url(
+    url: str | bytes,
+    parsing_config: ParsingConfig,
+    crawler_config: Optional[BaseCrawlerConfig],
+) -> List[Document]:
+    loader = URLLoader(
+        urls=[url],  # type: ignore
+        parsing_config=parsing_config,
+        crawler_config=crawler_config,
+    )
+    return loader.load()
+
+
+# Parser per worker process, so tokenizers etc. are loaded once per process
+_worker_parsers: Dict[str, Parser] = {}
+
+
+def _parse_path_or_bytes(
+    source: str | bytes,
+    parsing_config: ParsingConfig,
+    doc_type: str | DocumentType | None,
+) -> List[Document]:
+    """Parse a single file (or bytes content); runs in a worker process."""
+    key = parsing_config.model_dump_json()
+    parser = _worker_parsers.get(key)
+    if parser is None:
+        parser = _worker_parsers[key] = Parser(parsing_config)
+    return DocumentParser.chunks_from_path_or_bytes(source, parser, doc_type=doc_type)
+
+
+def _parallel_parse(
+    units: List[Tuple[int, str | bytes]],
+    parse: Callable[[str | bytes], List[Document]],
+    executor: Executor,
+    max_in_flight: int,
+) -> Iterator[Tuple[int, List[Document]]]:
+    """
+    Parse sources on the executor, with at most `max_in_flight` submitted
+    ahead of the one being consumed, yielding (index, docs) in input order.
+    A source that fails to parse is logged and yields no docs.
+    """
+    pending: Deque[Tuple[int, str | bytes, Future[List[Document]]]] = deque()
+
+    def result(src: str | bytes, fut: Future[List[Document]]) -> List[Document]:
+        try:
+            return fut.result()
+        except Exception as e:
+            name = src if isinstance(src, str) else f"<{len(src)} bytes>"
+            logger.warning(f"Failed to parse {name}, skipping it: {e}")
+            return []
+
+    try:
+        for idx, src in units:
+            pending.append((idx, src, executor.submit(parse, src)))
+            if len(pending) >= max_in_flight:
+                idx, src, fut = pending.popleft()
+                yield idx, result(src, fut)
+        while len(pending) > 0:
+            idx, src, fut = pending.popleft()
+            yield idx, result(src, fut)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 class DocChatAgent(ChatAgent):
     """
     Agent for chatting with a collection of documents.
@@ -314,6 +421,9 @@ class DocChatAgent(ChatAgent):
         self.df_description = ""
         self.chunked_docs: List[Document] = []
         self.chunked_docs_clean: List[Document] = []
+        self.bm25_index: Optional[BM25Index] = None
+        # whether the bm25 index has changes not yet saved (see `flush_bm25_index`)
+        self._bm25_index_dirty = False
         self.response: None | Document = None
         if (
             self.config.cross_encoder_reranking_model != ""
@@ -375,6 +485,7 @@ class DocChatAgent(ChatAgent):
         for attr in [
             "chunked_docs",
             "chunked_docs_clean",
+            "bm25_index",
             "original_docs",
             "original_docs_length",
             "from_dataframe",
@@ -389,6 +500,8 @@ class DocChatAgent(ChatAgent):
         self.original_docs_length = 0
         self.chunked_docs = []
         self.chunked_docs_clean = []
+        self.bm25_index = None
+        self._bm25_index_dirty = False
         if self.vecdb is None:
             logger.warning("Attempting to clear VecDB, but VecDB not set.")
             return
@@ -451,7 +564,9 @@ class DocChatAgent(ChatAgent):
                 This is especially useful when the `paths` are of bytes type,
                 to help with document type detection.
         Returns:
-            List of Document objects
+            List of Document objects. In streaming mode (`ingest_window_size > 0`)
+            the parsed docs are not retained, so these only carry the metadata
+            of each parsed doc, with empty content.
         """
         if isinstance(paths, str) or isinstance(paths, bytes):
             paths = [paths]
@@ -483,46 +598,29 @@ class DocChatAgent(ChatAgent):
                 idx2meta = {p: metadata.model_dump() for p in idxs}
             urls_meta = {u: idx2meta[u] for u in url_idxs}
             paths_meta = {p: idx2meta[p] for p in path_idxs}
+        doc_iter = self._iter_docs_from_paths(
+            all_paths, url_idxs, path_idxs, urls_meta, paths_meta, doc_type
+        )
         docs: List[Document] = []
-        parser: Parser = Parser(self.config.parsing)
-        if len(urls) > 0:
-            for ui in url_idxs:
-                meta = urls_meta.get(ui, {})
-                loader = URLLoader(
-                    urls=[all_paths[ui]],
-                    parsing_config=self.config.parsing,
-                    crawler_config=self.config.crawler_config,
-                )  # type: ignore
-                url_docs = loader.load()
-                # update metadata of each doc with meta
-                for d in url_docs:
-                    orig_source = d.metadata.source
-                    d.metadata = d.metadata.model_copy(update=meta)
-                    d.metadata.source = _append_metadata_source(
-                        orig_source, meta.get("source", "")
-                    )
-                docs.extend(url_docs)
-        if len(paths) > 0:  # paths OR bytes are handled similarly
-            for pi in path_idxs:
-                meta = paths_meta.get(pi, {})
-                p = all_paths[pi]
-                path_docs = RepoLoader.get_documents(
-                    p,
-                    parser=parser,
-                    doc_type=doc_type,
-                )
-                # update metadata of each doc with meta
-                for d in path_docs:
-                    orig_source = d.metadata.source
-                    d.metadata = d.metadata.model_copy(update=meta)
-                    d.metadata.source = _append_metadata_source(
-                        orig_source, meta.get("source", "")
+        if self.config.ingest_window_size > 0:
+
+            def recorded(doc_iter: Iterator[Document]) -> Iterator[Document]:
+                for doc in doc_iter:
+                    docs.append(
+                        Document(content="", metadata=doc.metadata.model_copy())
                     )
-                docs.extend(path_docs)
-        n_docs = len(docs)
-        n_splits = self.ingest_docs(docs, split=self.config.split)
-        if n_docs == 0:
-            return []
+                    yield doc
+
+            n_splits = self.ingest_docs_stream(
+                recorded(doc_iter), split=self.config.split
+            )
+            if len(docs) == 0:
+                return []
+        else:
+            docs = list(doc_iter)
+            n_splits = self.ingest_docs(docs, split=self.config.split)
+            if len(docs) == 0:
+                return []
         n_urls = len(urls)
         n_paths = len(paths)
         print(
@@ -536,6 +634,91 @@ class DocChatAgent(ChatAgent):
         print("\n".join(path_reps))
         return docs
 
+    def _iter_docs_from_paths(
+        self,
+        all_paths: List[str | bytes],
+        url_idxs: List[int],
+        path_idxs: List[int],
+        urls_meta: Dict[int, Any],
+        paths_meta: Dict[int, Any],
+        doc_type: str | DocumentType | None = None,
+    ) -> Iterator[Document]:
+        """Lazily parse docs from urls and paths (or bytes), in order,
+        updating the metadata of each doc with the corresponding metadata.
+        Sources are parsed one at a time, or in parallel (with a bounded number
+        in flight) if `config.url_fetch_workers` / `config.parse_workers` > 1."""
+        url_units = [(ui, all_paths[ui]) for ui in url_idxs]
+        if self.config.url_fetch_workers > 1:
+            url_docs_iter = _parallel_parse(
+                url_units,
+                partial(
+                    _load_url,
+                    parsing_config=self.config.parsing,
+                    crawler_config=self.config.crawler_config,
+                ),
+                ThreadPoolExecutor(self.config.url_fetch_workers),
+                max_in_flight=2 * self.config.url_fetch_workers,
+            )
+        else:
+            url_docs_iter = (
+                (
+                    ui,
+                    _load_url(
+                        url,
+                        parsing_config=self.config.parsing,
+                        crawler_config=self.config.crawler_config,
+                    ),
+                )
+                for ui, url in url_units
+            )
+        for ui, url_docs in url_docs_iter:
+            yield from self._docs_with_source_meta(url_docs, urls_meta.get(ui, {}))
+
+        # paths OR bytes are handled similarly
+        if self.config.parse_workers > 1:
+            # parse each file (rather than each given path) in a worker process
+            path_units = [
+                (pi, f)
+                for pi in path_idxs
+                for f in RepoLoader.get_file_paths(all_paths[pi])
+            ]
+            path_docs_iter = _parallel_parse(
+                path_units,
+                partial(
+                    _parse_path_or_bytes,
+                    parsing_config=self.config.parsing,
+                    doc_type=doc_type,
+                ),
+                ProcessPoolExecutor(self.config.parse_workers),
+                max_in_flight=2 * self.config.parse_workers,
+            )
+        else:
+            parser: Parser = Parser(self.config.parsing)
+            path_docs_iter = (
+                (
+                    pi,
+                    RepoLoader.get_documents(
+                        all_paths[pi], parser=parser, doc_type=doc_type
+                    ),
+                )
+                for pi in path_idxs
+            )
+        for pi, path_docs in path_docs_iter:
+            yield from self._docs_with_source_meta(path_docs, paths_meta.get(pi, {}))
+
+    @staticmethod
+    def _docs_with_source_meta(
+        docs: List[Document], meta: Dict[str, Any]
+    ) -> List[Document]:
+        """Update metadata of each doc with `meta`, appending to its source."""
+        for d in docs:
+            orig_source = d.metadata.source
+            d.metadata = d.metadata.model_copy(update=meta)
+            d.metadata.source = _append_metadata_source(
+                orig_source, meta.get("source", "")
+            )
+        return docs
+
     def ingest_docs(
         self,
         docs: List[Document],
@@ -556,45 +739,122 @@ class DocChatAgent(ChatAgent):
                 [ASSUME no conflicting keys between the two metadata dicts.]
                 If a single dict is passed in, it is used for all docs.
         """
-        if isinstance(metadata, list) and len(metadata) > 0:
-            for d, m in zip(docs, metadata):
+        if self.config.ingest_window_size > 0:
+            return self.ingest_docs_stream(docs, split=split, metadata=metadata)
+        docs = list(self._docs_with_metadata(docs, metadata))
+        self.original_docs.extend(docs)
+        if self.parser is None:
+            raise ValueError("Parser not set")
+        docs = self._split_docs(docs, split)
+        if self.vecdb is None:
+            raise ValueError("VecDB not set")
+        docs = self._enrich_chunks_and_fields(docs)
+        docs = docs[: self.config.parsing.max_chunks]
+        # vecdb should take care of adding docs in batches;
+        # batching can be controlled via vecdb.config.batch_size
+        if not docs:
+            logging.warning(
+                "No documents to ingest after processing. Skipping VecDB addition."
+            )
+            return 0  # Return 0 since no documents were added
+        self.vecdb.add_documents(docs)
+        self.original_docs_length = self.doc_length(docs)
+        self.setup_documents(docs, filter=self.config.filter)
+        self.flush_bm25_index()
+        return len(docs)
+
+    def ingest_docs_stream(
+        self,
+        docs: Iterable[Document],
+        split: bool = True,
+        metadata: (
+            List[Dict[str, Any]] | Dict[str, Any] | DocMetaData | List[DocMetaData]
+        ) = [],
+    ) -> int:
+        """
+        Streaming version of `ingest_docs`: docs are consumed lazily and go through
+        the pipeline split -> enrich -> embed -> upsert in windows of
+        `config.ingest_window_size` chunks, with the embedding of upcoming windows
+        overlapping the upsert of the current one
+        (see `VectorStore.add_documents_stream`).
+        Peak memory is thus O(window) rather than O(corpus), except for the
+        chunks retained for lexical search (see `setup_documents`); the original
+        (unsplit) docs are not retained.
+
+        Args:
+            docs: Iterable (e.g. generator) of Document objects
+            split: Whether to split docs into chunks. Default is True.
+            metadata: same as in `ingest_docs`
+
+        Returns:
+            int: number of chunks ingested
+        """
+        if self.parser is None:
+            raise ValueError("Parser not set")
+        if self.vecdb is None:
+            raise ValueError("VecDB not set")
+        windows = self._chunk_windows(self._docs_with_metadata(docs, metadata), split)
+        n_chunks = 0
+        self.original_docs_length = 0
+        for window in self.vecdb.add_documents_stream(
+            windows, max_in_flight=self.config.ingest_max_in_flight
+        ):
+            n_chunks += len(window)
+            self.original_docs_length += self.doc_length(list(window))
+            if self.config.filter is None:
+                # cheap incremental update of chunks used for lexical search
+                self.setup_documents(list(window))
+        if n_chunks == 0:
+            logging.warning(
+                "No documents to ingest after processing. Skipping VecDB addition."
+            )
+            return 0
+        if self.config.filter is not None:
+            self.setup_documents(filter=self.config.filter)
+        # save the index once all windows are in, not after each one
+        self.flush_bm25_index()
+        return n_chunks
+
+    @staticmethod
+    def _docs_with_metadata(
+        docs: Iterable[Document],
+        metadata: (
+            List[Dict[str, Any]] | Dict[str, Any] | DocMetaData | List[DocMetaData]
+        ) = [],
+    ) -> Iterator[Document]:
+        """Lazily augment the metadata of each doc with the given metadata
+        (see `ingest_docs`), and assign ids to docs that lack one."""
+        # with a list of metadata, docs beyond its length are left as is
+        meta_iter = iter(metadata) if isinstance(metadata, list) else None
+        for d in docs:
+            m: Any = metadata if meta_iter is None else next(meta_iter, None)
+            if m is not None:
                 orig_source = d.metadata.source
-                m_dict = m if isinstance(m, dict) else m.model_dump()  # type: ignore
-                d.metadata = d.metadata.model_copy(update=m_dict)  # type: ignore
+                m_dict = m if isinstance(m, dict) else m.model_dump()
+                d.metadata = d.metadata.model_copy(update=m_dict)
                 d.metadata.source = _append_metadata_source(
                     orig_source, m_dict.get("source", "")
                 )
-        elif isinstance(metadata, dict):
-            for d in docs:
-                orig_source = d.metadata.source
-                d.metadata = d.metadata.model_copy(update=metadata)
-                d.metadata.source = _append_metadata_source(
-                    orig_source, metadata.get("source", "")
-                )
-        elif isinstance(metadata, DocMetaData):
-            for d in docs:
-                orig_source = d.metadata.source
-                d.metadata = d.metadata.model_copy(update=metadata.model_dump())
-                d.metadata.source = _append_metadata_source(
-                    orig_source, metadata.source
-                )
+            if d.metadata.id in [None, ""]:
+                d.metadata.id = ObjectRegistry.new_id()
+            yield d
 
-        self.original_docs.extend(docs)
+    def _split_docs(self, docs: List[Document], split: bool) -> List[Document]:
+        """Split docs into chunks, or if `split` is False, mark them as chunks."""
         if self.parser is None:
             raise ValueError("Parser not set")
-        for d in docs:
-            if d.metadata.id in [None, ""]:
-                d.metadata.id = ObjectRegistry.new_id()
         if split:
-            docs = self.parser.split(docs)
-        else:
-            if self.config.n_neighbor_chunks > 0:
-                self.parser.add_window_ids(docs)
-            # we're not splitting, so we mark each doc as a chunk
-            for d in docs:
-                d.metadata.is_chunk = True
-        if self.vecdb is None:
-            raise ValueError("VecDB not set")
+            return self.parser.split(docs)
+        if self.config.n_neighbor_chunks > 0:
+            self.parser.add_window_ids(docs)
+        # we're not splitting, so we mark each doc as a chunk
+        for d in docs:
+            d.metadata.is_chunk = True
+        return docs
+
+    def _enrich_chunks_and_fields(self, docs: List[Document]) -> List[Document]:
+        """Enrich chunks (if configured), and add `config.add_fields_to_content`
+        to their content."""
         if self.config.chunk_enrichment_config is not None:
             docs = self.enrich_chunks(docs)
 
@@ -603,7 +863,7 @@ class DocChatAgent(ChatAgent):
         # This helps retrieval for table-like data.
         # Note we need to do this at stage so that the embeddings
         # are computed on the full content with these additional fields.
-        if len(self.config.add_fields_to_content) > 0:
+        if len(self.config.add_fields_to_content) > 0 and len(docs) > 0:
             fields = [
                 f for f in extract_fields(docs[0], self.config.add_fields_to_content)
             ]
@@ -615,18 +875,31 @@ class DocChatAgent(ChatAgent):
                         + ",content="
                         + d.content
                     )
-        docs = docs[: self.config.parsing.max_chunks]
-        # vecdb should take care of adding docs in batches;
-        # batching can be controlled via vecdb.config.batch_size
-        if not docs:
-            logging.warning(
-                "No documents to ingest after processing. Skipping VecDB addition."
-            )
-            return 0  # Return 0 since no documents were added
-        self.vecdb.add_documents(docs)
-        self.original_docs_length = self.doc_length(docs)
-        self.setup_documents(docs, filter=self.config.filter)
-        return len(docs)
+        return docs
+
+    def _chunk_windows(
+        self, docs: Iterable[Document], split: bool
+    ) -> Iterator[List[Document]]:
+        """
+        Lazily split docs into chunks, and yield enriched windows of
+        `config.ingest_window_size` chunks, up to `config.parsing.max_chunks`
+        chunks in total.
+        """
+        window_size = max(1, self.config.ingest_window_size)
+        remaining = self.config.parsing.max_chunks
+        window: List[Document] = []
+        for d in docs:
+            window.extend(self._split_docs([d], split))
+            while len(window) >= window_size and remaining > 0:
+                batch, window = window[:window_size], window[window_size:]
+                batch = batch[:remaining]
+                remaining -= len(batch)
+                yield self._enrich_chunks_and_fields(batch)
+            if remaining <= 0:
+                return
+        window = window[:remaining]
+        if len(window) > 0:
+            yield self._enrich_chunks_and_fields(window)
 
     def retrieval_tool(self, msg: RetrievalTool) -> str:
         """Handle the RetrievalTool message"""
@@ -717,23 +990,128 @@ class DocChatAgent(ChatAgent):
         These will be used in various non-vector-based search functions,
         e.g. self.get_similar_chunks_bm25(), self.get_fuzzy_matches(), etc.
 
+        When `use_bm25_index` is enabled, the bm25 index is updated
+        incrementally with the new docs, or (re)built (or loaded from
+        `bm25_index_dir`) when all docs are fetched from the vecdb.
+        An incrementally updated index is not saved to `bm25_index_dir` here,
+        but by `flush_bm25_index` (called once ingestion is done).
+
         Args:
             docs: List of Document objects. This is empty when we are calling this
                 method after initial doc ingestion.
             filter: Filter condition for various lexical/semantic search fns.
         """
         if filter is None and len(docs) > 0:
-            # no filter, so just use the docs passed in
+            # no filter, so just use the docs passed in,
+            # and only pre-process (and index) the new docs
             self.chunked_docs.extend(docs)
-        else:
-            if self.vecdb is None:
-                raise ValueError("VecDB not set")
-            self.chunked_docs = self.vecdb.get_all_documents(where=filter or "")
+            new_docs_clean = [
+                Document(content=preprocess_text(d.content), metadata=d.metadata)
+                for d in docs
+            ]
+            self.chunked_docs_clean.extend(new_docs_clean)
+            if self.config.use_bm25_index:
+                if self.bm25_index is None or len(self.bm25_index) != len(
+                    self.chunked_docs_clean
+                ) - len(new_docs_clean):
+                    # index is missing or out of sync with chunked_docs: rebuild
+                    self.bm25_index = self._build_bm25_index(self.chunked_docs_clean)
+                else:
+                    self.bm25_index.add(
+                        [d.content.split() for d in new_docs_clean],
+                        ids=[d.id() for d in new_docs_clean],
+                    )
+                self._bm25_index_dirty = True
+            return
 
-        self.chunked_docs_clean = [
-            Document(content=preprocess_text(d.content), metadata=d.metadata)
-            for d in self.chunked_docs
-        ]
+        if self.vecdb is None:
+            raise ValueError("VecDB not set")
+        self.chunked_docs = []
+        self.chunked_docs_clean = []
+        for docs in self.vecdb.iter_documents(where=filter or ""):
+            self.chunked_docs.extend(docs)
+            self.chunked_docs_clean.extend(
+                Document(content=preprocess_text(d.content), metadata=d.metadata)
+                for d in docs
+            )
+        self._bm25_index_dirty = False
+        if not self.config.use_bm25_index:
+            self.bm25_index = None
+            return
+        # only the index of the full (unfiltered) collection is persisted
+        persist = filter in [None, ""]
+        self.bm25_index = self._load_bm25_index() if persist else None
+        if self.bm25_index is None:
+            self.bm25_index = self._build_bm25_index(self.chunked_docs_clean)
+            if persist:
+                self._save_bm25_index()
+
+    @staticmethod
+    def _build_bm25_index(docs_clean: List[Document]) -> BM25Index:
+        index = BM25Index()
+        index.add(
+            [d.content.split() for d in docs_clean],
+            ids=[d.id() for d in docs_clean],
+        )
+        return index
+
+    def _bm25_index_path(self) -> str | None:
+        if (
+            self.config.bm25_index_dir is None
+            or self.vecdb is None
+            or self.vecdb.config.collection_name is None
+        ):
+            return None
+        return os.path.join(
+            self.config.bm25_index_dir,
+            f"{self.vecdb.config.collection_name}.bm25.npz",
+        )
+
+    def flush_bm25_index(self) -> None:
+        """
+        Save the bm25 index to `bm25_index_dir` (if set), if it has changed
+        since it was last saved or loaded.
+        """
+        if self._bm25_index_dirty:
+            self._save_bm25_index()
+            self._bm25_index_dirty = False
+
+    def _save_bm25_index(self) -> None:
+        path = self._bm25_index_path()
+        if path is None or self.bm25_index is None:
+            return
+        try:
+            self.bm25_index.save(path)
+        except Exception as e:
+            logger.warning(f"Could not save bm25 index to {path}: {e}")
+
+    def _load_bm25_index(self) -> BM25Index | None:
+        """
+        Load the saved bm25 index of the current collection, if it exists and
+        indexes exactly `self.chunked_docs`. The saved index may list the docs in
+        a different order than the vecdb returns them, in which case
+        `self.chunked_docs` (and `self.chunked_docs_clean`) are re-ordered
+        to match the index.
+        """
+        path = self._bm25_index_path()
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            index = BM25Index.load(path)
+        except Exception as e:
+            logger.warning(f"Could not load bm25 index from {path}: {e}")
+            return None
+        doc_ids = [d.id() for d in self.chunked_docs]
+        if index.ids == doc_ids:
+            return index
+        id2pos = {id: i for i, id in enumerate(doc_ids)}
+        if len(id2pos) != len(doc_ids) or set(index.ids) != set(doc_ids):
+            logger.info(f"bm25 index at {path} is stale; rebuilding it")
+            return None
+        order = [id2pos[id] for id in index.ids]
+        self.chunked_docs = [self.chunked_docs[i] for i in order]
+        self.chunked_docs_clean = [self.chunked_docs_clean[i] for i in order]
+        return index
 
     def get_field_values(self, fields: list[str]) -> Dict[str, str]:
         """Get string-listing of possible values of each field,
@@ -1150,11 +1528,20 @@ class DocChatAgent(ChatAgent):
             if self.chunked_docs_clean is None or len(self.chunked_docs_clean) == 0:
                 logger.warning("No cleaned chunked docs; cannot use bm25-similarity")
                 return []
+            k = self.config.n_similar_chunks * multiple
+            if self.bm25_index is not None and len(self.bm25_index) == len(
+                self.chunked_docs
+            ):
+                query_words = preprocess_text(query).split()
+                return [
+                    (self.chunked_docs[i], score)
+                    for i, score in self.bm25_index.top_k(query_words, k)
+                ]
             docs_scores = find_closest_matches_with_bm25(
                 self.chunked_docs,
                 self.chunked_docs_clean,  # already pre-processed!
                 query,
-                k=self.config.n_similar_chunks * multiple,
+                k=k,
             )
         return docs_scores
 
@@ -1202,14 +1589,19 @@ class DocChatAgent(ChatAgent):
             passages = [d for _, d in sorted_pairs]
         return passages
 
-    def rerank_with_diversity(self, passages: List[Document]) -> List[Document]:
+    def rerank_with_diversity(
+        self, passages: List[Document], query: Optional[str] = None
+    ) -> List[Document]:
         """
-        Rerank a list of items in such a way that each successive item is least similar
-        (on average) to the earlier items.
+        Rerank a list of items using Maximal Marginal Relevance (MMR): with
+        `config.rerank_diversity_lambda = 0` (default), each successive item is the
+        one least similar (on average) to the earlier items; larger values trade
+        this off against relevance (similarity to the `query`, if given).
+        Embeddings returned by the vecdb with the search results are reused.
 
         Args:
-        query (str): The query for which the passages are relevant.
         passages (List[Document]): A list of Documents to be reranked.
+        query (str|None): The query for which the passages are relevant.
 
         Returns:
         List[Documents]: A reranked list of Documents.
@@ -1218,35 +1610,17 @@ class DocChatAgent(ChatAgent):
         if self.vecdb is None:
             logger.warning("No vecdb; cannot use rerank_with_diversity")
             return passages
-        emb_model = self.vecdb.embedding_model
-        emb_fn = emb_model.embedding_fn()
-        embs = emb_fn([p.content for p in passages])
-        embs_arr = [np.array(e) for e in embs]
-        indices = list(range(len(passages)))
-
-        # Helper function to compute average similarity to
-        # items in the current result list.
-        def avg_similarity_to_result(i: int, result: List[int]) -> float:
-            return sum(  # type: ignore
-                (embs_arr[i] @ embs_arr[j])
-                / (np.linalg.norm(embs_arr[i]) * np.linalg.norm(embs_arr[j]))
-                for j in result
-            ) / len(result)
-
-        # copy passages to items
-        result = [indices.pop(0)]  # Start with the first item.
-
-        while indices:
-            # Find the item that has the least average similarity
-            # to items in the result list.
-            least_similar_item = min(
-                indices, key=lambda i: avg_similarity_to_result(i, result)
-            )
-            result.append(least_similar_item)
-            indices.remove(least_similar_item)
-
-        # return passages in order of result list
-        return [passages[i] for i in result]
+        if len(passages) <= 1:
+            return passages
+        lambda_ = self.config.rerank_diversity_lambda
+        embs = np.array(self.vecdb.get_text_embeddings([p.content for p in passages]))
+        relevance = None
+        if query is not None and lambda_ > 0:
+            query_emb = np.array(self.vecdb.embedding_fn([query])[0])
+            norms = np.linalg.norm(embs, axis=1) * np.linalg.norm(query_emb)
+            relevance = embs @ query_emb / np.where(norms == 0, 1.0, norms)
+        order = mmr_order(embs, relevance=relevance, lambda_=lambda_)
+        return [passages[i] for i in order]
 
     def rerank_to_periphery(self, passages: List[Document]) -> List[Document]:
         """
@@ -1332,6 +1706,30 @@ class DocChatAgent(ChatAgent):
             where=self.config.filter,
         )
 
+    def get_semantic_search_results_batch(
+        self,
+        queries: List[str],
+        k: int = 10,
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Get semantic search results from vecdb for several queries at once,
+        using the vecdb's batch search (a single embedding call, and a single
+        search request where supported).
+        Args:
+            queries (List[str]): queries to search for
+            k (int): number of results to return per query
+        Returns:
+            List[List[Tuple[Document, float]]]: (Document, score) tuples for
+                each query.
+        """
+        if self.vecdb is None:
+            raise ValueError("VecDB not set")
+        return self.vecdb.similar_texts_with_scores_batch(
+            queries,
+            k=k,
+            where=self.config.filter,
+        )
+
     def get_relevant_chunks(
         self, query: str, query_proxies: List[str] = []
     ) -> List[Document]:
@@ -1363,8 +1761,10 @@ class DocChatAgent(ChatAgent):
 
         if (
             self.vecdb is None
-            or self.vecdb.config.collection_name
-            not in self.vecdb.list_collections(empty=False)
+            or self.vecdb.config.collection_name is None
+            or not self.vecdb.has_collection(
+                self.vecdb.config.collection_name, empty=False
+            )
         ):
             return []
 
@@ -1383,16 +1783,31 @@ class DocChatAgent(ChatAgent):
         if self.vecdb is None:
             raise ValueError("VecDB not set")
 
-        with status("[cyan]Searching VecDB for relevant doc passages..."):
-            docs_and_scores: List[Tuple[Document, float]] = []
-            for q in [query] + query_proxies:
-                docs_and_scores += self.get_semantic_search_results(
-                    q,
-                    k=self.config.n_similar_chunks * retrieval_multiple,
+        docs_and_scores: List[Tuple[Document, float]] = []
+        bm25_docs_scores: List[Tuple[Document, float]] = []
+        fuzzy_match_doc_scores: List[Tuple[Document, float]] = []
+        if self.config.concurrent_retrieval:
+            docs_and_scores, bm25_docs_scores, fuzzy_match_doc_scores = (
+                self._retrieve_concurrently(query, query_proxies, retrieval_multiple)
+            )
+        else:
+            with status("[cyan]Searching VecDB for relevant doc passages..."):
+                for q in [query] + query_proxies:
+                    docs_and_scores += self.get_semantic_search_results(
+                        q,
+                        k=self.config.n_similar_chunks * retrieval_multiple,
+                    )
+                    # sort by score descending
+                    docs_and_scores = sorted(
+                        docs_and_scores, key=lambda x: x[1], reverse=True
+                    )
+            if self.config.use_bm25_search:
+                bm25_docs_scores = self.get_similar_chunks_bm25(
+                    query, retrieval_multiple
                 )
-                # sort by score descending
-                docs_and_scores = sorted(
-                    docs_and_scores, key=lambda x: x[1], reverse=True
+            if self.config.use_fuzzy_match:
+                fuzzy_match_doc_scores = self.get_fuzzy_matches(
+                    query, retrieval_multiple
                 )
 
         # keep only docs with unique d.id()
@@ -1404,7 +1819,7 @@ class DocChatAgent(ChatAgent):
         id2_rank_bm25 = {}
         if self.config.use_bm25_search:
             # TODO: Add score threshold in config
-            docs_scores = self.get_similar_chunks_bm25(query, retrieval_multiple)
+            docs_scores = bm25_docs_scores
             id2doc.update({d.id(): d for d, _ in docs_scores})
             if self.config.use_reciprocal_rank_fusion:
                 # if we're not re-ranking with a cross-encoder, and have RRF enabled,
@@ -1420,7 +1835,6 @@ class DocChatAgent(ChatAgent):
         id2_rank_fuzzy = {}
         if self.config.use_fuzzy_match:
             # TODO: Add score threshold in config
-            fuzzy_match_doc_scores = self.get_fuzzy_matches(query, retrieval_multiple)
             if self.config.use_reciprocal_rank_fusion:
                 # if we're not re-ranking with a cross-encoder,
                 # instead of accumulating the fuzzy match results into passages,
@@ -1512,7 +1926,7 @@ class DocChatAgent(ChatAgent):
 
         if self.config.rerank_diversity:
             # reorder to increase diversity among top docs
-            passages = self.rerank_with_diversity(passages)
+            passages = self.rerank_with_diversity(passages, query)
 
         if self.config.rerank_periphery:
             # reorder so most important docs are at periphery
@@ -1526,6 +1940,57 @@ class DocChatAgent(ChatAgent):
 
         return passages[: self.config.n_relevant_chunks]
 
+    def _retrieve_concurrently(
+        self, query: str, query_proxies: List[str], retrieval_multiple: int
+    ) -> Tuple[
+        List[Tuple[Document, float]],
+        List[Tuple[Document, float]],
+        List[Tuple[Document, float]],
+    ]:
+        """
+        Run the semantic search (for the query and all its proxies, batched),
+        bm25 search and fuzzy matching concurrently.
+
+        Returns:
+            Tuple of (semantic, bm25, fuzzy) (Document, score) lists; the
+            semantic results of all queries are merged and sorted by score.
+        """
+        # worker threads don't see this thread's settings overrides otherwise
+        current_settings = Settings(**settings.model_dump())
+
+        def run(fn: Callable[..., T], *args: Any) -> T:
+            with temporary_settings(current_settings):
+                return fn(*args)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            bm25_future = (
+                executor.submit(
+                    run, self.get_similar_chunks_bm25, query, retrieval_multiple
+                )
+                if self.config.use_bm25_search
+                else None
+            )
+            fuzzy_future = (
+                executor.submit(run, self.get_fuzzy_matches, query, retrieval_multiple)
+                if self.config.use_fuzzy_match
+                else None
+            )
+            with status("[cyan]Searching VecDB for relevant doc passages..."):
+                results = self.get_semantic_search_results_batch(
+                    [query] + query_proxies,
+                    k=self.config.n_similar_chunks * retrieval_multiple,
+                )
+            bm25_docs_scores = bm25_future.result() if bm25_future else []
+            fuzzy_docs_scores = fuzzy_future.result() if fuzzy_future else []
+        # merge once; the stable sort keeps the same order as sorting
+        # after each query's results are added
+        docs_and_scores = sorted(
+            [ds for result in results for ds in result],
+            key=lambda x: x[1],
+            reverse=True,
+        )
+        return docs_and_scores, bm25_docs_scores, fuzzy_docs_scores
+
     @no_type_check
     def get_relevant_extracts(self, query: str) -> Tuple[str, List[Document]]:
         """
@@ -1551,7 +2016,7 @@ class DocChatAgent(ChatAgent):
         )
         has_vecdb_collection = (
             collection_name is not None
-            and collection_name in self.vecdb.list_collections(empty=False)
+            and self.vecdb.has_collection(collection_name, empty=False)
             if self.vecdb is not None
             else False
         )
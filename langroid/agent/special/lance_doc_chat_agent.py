@@ -225,6 +225,7 @@ class LanceDocChatAgent(DocChatAgent):
         # can work, as they require Document objects
         docs = dataframe_to_documents(df, content="content", metadata=metadata)
         self.setup_documents(docs)
+        self.flush_bm25_index()
         # mark each doc as already-chunked so we don't try to split them further
         # TODO later we may want to split large text-columns
         for d in docs:
@@ -257,6 +258,8 @@ class LanceDocChatAgent(DocChatAgent):
             .where(self.config.filter or None)
             .limit(self.config.n_similar_chunks * multiple)
         )
-        docs = self.vecdb._lance_result_to_docs(result)
-        scores = [r["score"] for r in result.to_list()]
+        # run the search once, and take the scores from the same results
+        table = result.to_arrow()
+        docs = self.vecdb._arrow_to_docs(table)
+        scores = table.column("score").to_pylist()
         return list(zip(docs, scores))
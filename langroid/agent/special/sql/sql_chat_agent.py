@@ -7,8 +7,12 @@ Functionality includes:
 - asking a question about a SQL schema
 """
 
+import csv
+import io
 import logging
-from typing import Any, Dict, List, Optional, Sequence, Union
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple, Union
 
 from rich.console import Console
 
@@ -18,8 +22,8 @@ from langroid.utils.constants import SEND_TO
 
 try:
     from sqlalchemy import MetaData, Row, create_engine, inspect, text
-    from sqlalchemy.engine import Engine
-    from sqlalchemy.exc import ResourceClosedError, SQLAlchemyError
+    from sqlalchemy.engine import Engine, Result
+    from sqlalchemy.exc import SQLAlchemyError
     from sqlalchemy.orm import Session, sessionmaker
 except ImportError as e:
     raise LangroidImportError(extra="sql", error=str(e))
@@ -33,6 +37,11 @@ from langroid.agent.special.sql.utils.populate_metadata import (
     populate_metadata,
     populate_metadata_with_schema_tools,
 )
+from langroid.agent.special.sql.utils.schema_cache import (
+    SchemaCache,
+    SchemaSnapshot,
+    schema_fingerprint,
+)
 from langroid.agent.special.sql.utils.system_message import (
     DEFAULT_SYS_MSG,
     SCHEMA_TOOLS_SYS_MSG,
@@ -95,6 +104,40 @@ and finally use the `{DoneTool.name()}` tool to send the correct answer to the u
 
 SQL_ERROR_MSG = "There was an error in your SQL Query"
 
+# string literals and quoted identifiers, or whitespace, or anything else
+_SQL_TOKEN = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\s+|[^\s'\"]+|['\"]")
+_SQL_READ = re.compile(
+    r"^\(?\s*(select|with|show|describe|desc|explain|values)\b", re.I
+)
+_SQL_WRITE = re.compile(
+    r"\b(insert|update|delete|merge|upsert|replace|create|drop|alter|truncate|"
+    r"grant|revoke|into|lock|call|exec|execute|set|copy|vacuum|attach)\b",
+    re.I,
+)
+
+
+def _normalize_sql(query: str) -> str:
+    """Collapse whitespace outside of quotes, and drop a trailing semicolon."""
+    tokens = [" " if t.isspace() else t for t in _SQL_TOKEN.findall(query)]
+    return "".join(tokens).strip().rstrip(";").rstrip()
+
+
+def _is_read_only_sql(query: str) -> bool:
+    """
+    Heuristic check that a (normalized) query only reads data: it starts with
+    e.g. SELECT or WITH, and has no data-modifying keyword outside of quotes.
+    """
+    unquoted = " ".join(
+        t for t in _SQL_TOKEN.findall(query) if not t.startswith(("'", '"'))
+    )
+    return bool(_SQL_READ.match(unquoted)) and not _SQL_WRITE.search(unquoted)
+
+
+def _csv_line(values: Iterable[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="").writerow(values)
+    return buffer.getvalue()
+
 
 class SQLChatAgentConfig(ChatAgentConfig):
     system_message: str = DEFAULT_SQL_CHAT_SYSTEM_MESSAGE
@@ -116,6 +159,25 @@ class SQLChatAgentConfig(ChatAgentConfig):
     addressing_prefix: str = ""
     max_result_rows: int | None = None  # limit query results to this
     max_retained_tokens: int | None = None  # limit history of query results to this
+    max_row_chars: int | None = None  # truncate each formatted result row to this
+    max_result_chars: int | None = None  # limit formatted query results to this
+    # "rows": one tuple per row; "csv": a header line with the column names,
+    # followed by one CSV line per row (more compact for wide results)
+    result_format: Literal["rows", "csv"] = "rows"
+    # query results are streamed, fetching this many rows at a time,
+    # so no more rows than needed (see max_result_*) are fetched
+    fetch_batch_size: int = 1000
+    # cache the results of up to this many distinct read-only queries (keyed
+    # by normalized SQL), cleared whenever any other query is run; 0 = no cache
+    query_cache_size: int = 0
+    # save snapshots of the database schema (table names, descriptions and
+    # metadata) on disk, and start from them while the schema is unchanged,
+    # instead of reflecting the whole database each time an agent is created
+    schema_cache: bool = False
+    schema_cache_path: str = ".sql_schema_cache"
+    # schema version to key snapshots by; if None, a fingerprint of the
+    # schema is queried from the database (see `schema_fingerprint`)
+    schema_version: str | None = None
 
     """
     Optional, but strongly recommended, context descriptions for tables, columns, 
@@ -169,9 +231,10 @@ class SQLChatAgent(ChatAgent):
         """
         self._validate_config(config)
         self.config: SQLChatAgentConfig = config
+        # normalized read-only query -> formatted result, in LRU order
+        self._query_cache: OrderedDict[str, str] = OrderedDict()
         self._init_database()
-        self._init_metadata()
-        self._init_table_metadata()
+        self._init_schema()
         self.final_instructions = ""
 
         # Caution - this updates the self.config.system_message!
@@ -204,11 +267,110 @@ class SQLChatAgent(ChatAgent):
             self.engine = create_engine(self.config.database_uri)
             self.Session = sessionmaker(bind=self.engine)()
 
+    def _init_schema(self) -> None:
+        """
+        Initialize the database metadata and table metadata: from a schema
+        snapshot if cached, else lazily (table by table, as the LLM asks for
+        their schema) when using schema tools, else by reflecting the database.
+        """
+        # descriptions are extracted from the database, unless given
+        self._extract_descriptions = not self.config.context_descriptions
+        self.metadata: MetaData | List[MetaData] = []
+        self.table_names: List[str] = []
+        self.table_metadata: Dict[str, Dict[str, Any]] = {}
+        self._schema_cache: Optional[SchemaCache] = None
+        self._schema_cache_key = ""
+        if self.config.schema_cache and isinstance(self.engine, Engine):
+            version = self.config.schema_version or schema_fingerprint(
+                self.engine, self.config.multi_schema
+            )
+            if version is not None:
+                self._schema_cache = SchemaCache(self.config.schema_cache_path)
+                self._schema_cache_key = SchemaCache.key(
+                    self.engine,
+                    version,
+                    multi_schema=self.config.multi_schema,
+                    use_schema_tools=self.config.use_schema_tools,
+                    context_descriptions=self.config.context_descriptions,
+                )
+                snapshot = self._schema_cache.load(self._schema_cache_key)
+                if snapshot is not None:
+                    logger.info("Using cached snapshot of the database schema")
+                    self.table_names = snapshot.table_names
+                    self.config.context_descriptions = snapshot.context_descriptions
+                    self.table_metadata = snapshot.table_metadata
+                    self.metadata = [] if self.config.multi_schema else MetaData()
+                    return
+
+        if self.config.use_schema_tools:
+            inspector = inspect(self.engine)
+            if self.config.multi_schema:
+                self.table_names = [
+                    f"{schema}.{table}"
+                    for schema in inspector.get_schema_names()
+                    for table in inspector.get_table_names(schema=schema)
+                ]
+                self.metadata = []
+            else:
+                self.table_names = inspector.get_table_names()
+                self.metadata = MetaData()
+        else:
+            self._init_metadata()
+            self._init_table_metadata()
+            self.table_names = list(self.table_metadata.keys())
+        self._save_schema_snapshot()
+
+    def _save_schema_snapshot(self) -> None:
+        if self._schema_cache is None:
+            return
+        self._schema_cache.save(
+            self._schema_cache_key,
+            SchemaSnapshot(
+                table_names=self.table_names,
+                context_descriptions=self.config.context_descriptions,
+                table_metadata=self.table_metadata,
+            ),
+        )
+
+    def _table_info(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Metadata of a table (description, and columns with their types and
+        descriptions), reflecting the table from the database if not yet done.
+        """
+        if table_name not in self.table_metadata and table_name in self.table_names:
+            if isinstance(self.metadata, list):
+                schema, table = table_name.split(".", 1)
+                metadata = next(
+                    (md for md in self.metadata if md.schema == schema), None
+                )
+                if metadata is None:
+                    metadata = MetaData(schema=schema)
+                    self.metadata.append(metadata)
+            else:
+                metadata, table = self.metadata, table_name
+            metadata.reflect(self.engine, only=[table])
+            if self._extract_descriptions and isinstance(self.engine, Engine):
+                self.config.context_descriptions.update(
+                    extract_schema_descriptions(
+                        self.engine, self.config.multi_schema, tables=[table_name]
+                    )
+                )
+            populate = (
+                populate_metadata_with_schema_tools
+                if self.config.use_schema_tools
+                else populate_metadata
+            )
+            self.table_metadata.update(
+                populate(self.metadata, self.config.context_descriptions, [table_name])
+            )
+            self._save_schema_snapshot()
+        return self.table_metadata.get(table_name)
+
     def _init_metadata(self) -> None:
         """Initialize the database metadata."""
         if self.engine is None:
             raise ValueError("Database engine is None")
-        self.metadata: MetaData | List[MetaData] = []
+        self.metadata = []
 
         if self.config.multi_schema:
             logger.info(
@@ -466,70 +628,151 @@ class SQLChatAgent(ChatAgent):
             str: The result of executing the SQL query.
         """
         query = msg.query
-        session = self.Session
         self.used_run_query = True
+        key = _normalize_sql(query)
+        cacheable = self.config.query_cache_size > 0 and _is_read_only_sql(key)
+        if cacheable and key in self._query_cache:
+            logger.info(f"Using cached result of SQL query: {query}")
+            self._query_cache.move_to_end(key)
+            response_message = self._query_cache[key]
+        else:
+            response_message, success = self._execute_query(query)
+            if not cacheable:
+                # the query may have modified the data
+                self._query_cache.clear()
+            elif success:
+                self._query_cache[key] = response_message
+                while len(self._query_cache) > self.config.query_cache_size:
+                    self._query_cache.popitem(last=False)
+
+        final_message = f"""
+        Below is the result from your use of the TOOL `{RunQueryTool.name()}`:
+        ==== result ====
+        {response_message}
+        ================
+        
+        If you are READY to ANSWER the ORIGINAL QUERY:
+        {self._tool_result_llm_answer_prompt()}
+        OTHERWISE:
+             continue using one of your available TOOLs:
+             {",".join(self.llm_tools_usable)}
+        """
+        return final_message
+
+    def _execute_query(self, query: str) -> Tuple[str, bool]:
+        """
+        Execute a SQL query, streaming (and formatting) only as many result rows
+        as fit within the configured limits.
+
+        Args:
+            query (str): The SQL query to execute.
+
+        Returns:
+            Tuple[str, bool]: The formatted result (or error message), and
+                whether the query succeeded.
+        """
+        session = self.Session
         try:
             logger.info(f"Executing SQL query: {query}")
 
-            query_result = session.execute(text(query))
-            session.commit()
-            try:
-                # attempt to fetch results: should work for normal SELECT queries
-                rows = query_result.fetchall()
-                n_rows = len(rows)
-                if self.config.max_result_rows and n_rows > self.config.max_result_rows:
-                    rows = rows[: self.config.max_result_rows]
-                    logger.warning(
-                        f"SQL query produced {n_rows} rows, "
-                        f"limiting to {self.config.max_result_rows}"
+            query_result = session.execute(
+                text(query), execution_options={"stream_results": True}
+            )
+            if query_result.returns_rows:
+                # normal SELECT queries
+                try:
+                    response_message = self._format_rows(
+                        self._stream_rows(query_result)
                     )
-
-                response_message = self._format_rows(rows)
-            except ResourceClosedError:
-                # If we get here, it's a non-SELECT query (UPDATE, INSERT, DELETE)
+                finally:
+                    # discard any rows not fetched
+                    query_result.close()
+            else:
+                # non-SELECT query (UPDATE, INSERT, DELETE)
                 affected_rows = query_result.rowcount  # type: ignore
                 response_message = f"""
                     Non-SELECT query executed successfully. 
                     Rows affected: {affected_rows}
                     """
-
+            session.commit()
+            return response_message, True
         except SQLAlchemyError as e:
             session.rollback()
             logger.error(f"Failed to execute query: {query}\n{e}")
-            response_message = self.retry_query(e, query)
+            return self.retry_query(e, query), False
         finally:
             session.close()
 
-        final_message = f"""
-        Below is the result from your use of the TOOL `{RunQueryTool.name()}`:
-        ==== result ====
-        {response_message}
-        ================
-        
-        If you are READY to ANSWER the ORIGINAL QUERY:
-        {self._tool_result_llm_answer_prompt()}
-        OTHERWISE:
-             continue using one of your available TOOLs:
-             {",".join(self.llm_tools_usable)}
+    def _stream_rows(self, query_result: Result[Any]) -> Iterator[Row[Any]]:
         """
-        return final_message
-
-    def _format_rows(self, rows: Sequence[Row[Any]]) -> str:
+        Lazily fetch the rows of a query result, in batches.
         """
-        Format the rows fetched from the query result into a string.
+        batch_size = max(1, self.config.fetch_batch_size)
+        if self.config.max_result_rows:
+            # one more row than the limit is enough to tell the result is truncated
+            batch_size = min(batch_size, self.config.max_result_rows + 1)
+        while batch := query_result.fetchmany(batch_size):
+            yield from batch
+
+    def _format_rows(self, rows: Iterable[Row[Any]]) -> str:
+        """
+        Format the rows fetched from the query result into a string,
+        consuming only as many rows as fit within `max_result_rows` and
+        `max_result_chars`.
 
         Args:
-            rows (list): List of rows fetched from the query result.
+            rows (Iterable[Row]): rows fetched from the query result (may be
+                a lazy stream of rows).
 
         Returns:
             str: Formatted string representation of rows.
         """
-        # TODO: UPDATE FORMATTING
-        return (
-            ",\n".join(str(row) for row in rows)
-            if rows
-            else "Query executed successfully."
-        )
+        max_rows = self.config.max_result_rows
+        max_row_chars = self.config.max_row_chars
+        max_chars = self.config.max_result_chars
+        as_csv = self.config.result_format == "csv"
+        separator = "\n" if as_csv else ",\n"
+        lines: List[str] = []
+        n_rows = 0
+        n_chars = 0
+        truncated = False
+        for row in rows:
+            if max_rows and n_rows >= max_rows:
+                logger.warning(
+                    f"SQL query produced more than {max_rows} rows, "
+                    f"limiting to {max_rows}"
+                )
+                truncated = True
+                break
+            if as_csv and n_rows == 0:
+                header = _csv_line(row._fields)
+                lines.append(header)
+                n_chars += len(header)
+            line = _csv_line(row) if as_csv else str(row)
+            if max_row_chars and len(line) > max_row_chars:
+                line = line[:max_row_chars] + "..."
+            size = len(line) + (len(separator) if lines else 0)
+            if max_chars and n_chars + size > max_chars:
+                truncated = True
+                if n_rows > 0:
+                    break
+                # show at least part of the first row
+                line = line[: max(0, max_chars - n_chars)] + "..."
+            lines.append(line)
+            n_rows += 1
+            n_chars += size
+            if truncated:
+                break
+
+        if n_rows == 0:
+            return "Query executed successfully."
+        result = separator.join(lines)
+        if truncated:
+            result += (
+                f"\n... [result truncated: showing only the first {n_rows} rows; "
+                "refine the query, e.g. with filters or aggregates, if you need more]"
+            )
+        return result
 
     def get_table_names(self, msg: GetTableNamesTool) -> str:
         """
@@ -539,11 +782,7 @@ class SQLChatAgent(ChatAgent):
         Returns:
             str: The names of all tables in the database.
         """
-        if isinstance(self.metadata, list):
-            table_names = [", ".join(md.tables.keys()) for md in self.metadata]
-            return ", ".join(table_names)
-
-        return ", ".join(self.metadata.tables.keys())
+        return ", ".join(self.table_names)
 
     def get_table_schema(self, msg: GetTableSchemaTool) -> str:
         """
@@ -556,7 +795,7 @@ class SQLChatAgent(ChatAgent):
         tables = msg.tables
         result = ""
         for table_name in tables:
-            table = self.table_metadata.get(table_name)
+            table = self._table_info(table_name)
             if table is not None:
                 result += f"{table_name}: {table}\n"
             else:
@@ -574,6 +813,7 @@ class SQLChatAgent(ChatAgent):
         table = msg.table
         columns = msg.columns.split(", ")
         result = f"\nTABLE: {table}"
+        self._table_info(table)
         descriptions = self.config.context_descriptions.get(table)
 
         for col in columns:
@@ -1,6 +1,7 @@
 from . import tools
 from . import description_extractors
 from . import populate_metadata
+from . import schema_cache
 from . import system_message
 from .tools import (
     RunQueryTool,
@@ -16,6 +17,7 @@ __all__ = [
     "GetColumnDescriptionsTool",
     "description_extractors",
     "populate_metadata",
+    "schema_cache",
     "system_message",
     "tools",
 ]
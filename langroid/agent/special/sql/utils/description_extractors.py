@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Collection, Dict, List, Optional
 
 from langroid.exceptions import LangroidImportError
 
@@ -12,6 +12,7 @@ except ImportError as e:
 def extract_postgresql_descriptions(
     engine: Engine,
     multi_schema: bool = False,
+    tables: Optional[Collection[str]] = None,
 ) -> Dict[str, Dict[str, Any]]:
     """
     Extracts descriptions for tables and columns from a PostgreSQL database.
@@ -22,6 +23,8 @@ def extract_postgresql_descriptions(
     Args:
         engine (Engine): SQLAlchemy engine connected to a PostgreSQL database.
         multi_schema (bool): Generate descriptions for all schemas in the database.
+        tables (Optional[Collection[str]]): Only describe these tables (named
+            "schema.table" if `multi_schema`); None means all tables.
 
     Returns:
         Dict[str, Dict[str, Any]]: A dictionary mapping table names to a
@@ -39,6 +42,8 @@ def extract_postgresql_descriptions(
                     table_name = table
                 else:
                     table_name = f"{schema}.{table}"
+                if tables is not None and table_name not in tables:
+                    continue
 
                 table_comment = (
                     conn.execute(
@@ -75,6 +80,7 @@ def extract_postgresql_descriptions(
 def extract_mysql_descriptions(
     engine: Engine,
     multi_schema: bool = False,
+    tables: Optional[Collection[str]] = None,
 ) -> Dict[str, Dict[str, Any]]:
     """Extracts descriptions for tables and columns from a MySQL database.
 
@@ -84,6 +90,8 @@ def extract_mysql_descriptions(
     Args:
         engine (Engine): SQLAlchemy engine connected to a MySQL database.
         multi_schema (bool): Generate descriptions for all schemas in the database.
+        tables (Optional[Collection[str]]): Only describe these tables (named
+            "schema.table" if `multi_schema`); None means all tables.
 
     Returns:
         Dict[str, Dict[str, Any]]: A dictionary mapping table names to a
@@ -102,6 +110,8 @@ def extract_mysql_descriptions(
                     table_name = table
                 else:
                     table_name = f"{schema}.{table}"
+                if tables is not None and table_name not in tables:
+                    continue
 
                 query = text(
                     "SELECT table_comment FROM information_schema.tables WHERE"
@@ -128,7 +138,9 @@ def extract_mysql_descriptions(
 
 
 def extract_default_descriptions(
-    engine: Engine, multi_schema: bool = False
+    engine: Engine,
+    multi_schema: bool = False,
+    tables: Optional[Collection[str]] = None,
 ) -> Dict[str, Dict[str, Any]]:
     """Extracts default descriptions for tables and columns from a database.
 
@@ -138,6 +150,8 @@ def extract_default_descriptions(
     Args:
         engine (Engine): SQLAlchemy engine connected to a database.
         multi_schema (bool): Generate descriptions for all schemas in the database.
+        tables (Optional[Collection[str]]): Only describe these tables (named
+            "schema.table" if `multi_schema`); None means all tables.
 
     Returns:
         Dict[str, Dict[str, Any]]: A dictionary mapping table names to a
@@ -151,11 +165,14 @@ def extract_default_descriptions(
         table_names: List[str] = inspector.get_table_names(schema=schema)
 
         for table in table_names:
+            table_name = table if schema is None else f"{schema}.{table}"
+            if tables is not None and table_name not in tables:
+                continue
             columns = {}
-            for col in inspector.get_columns(table):
+            for col in inspector.get_columns(table, schema=schema):
                 columns[col["name"]] = ""
 
-            result[table] = {"description": "", "columns": columns}
+            result[table_name] = {"description": "", "columns": columns}
 
     if multi_schema:
         for schema in inspector.get_schema_names():
@@ -167,7 +184,9 @@ def extract_default_descriptions(
 
 
 def extract_schema_descriptions(
-    engine: Engine, multi_schema: bool = False
+    engine: Engine,
+    multi_schema: bool = False,
+    tables: Optional[Collection[str]] = None,
 ) -> Dict[str, Dict[str, Any]]:
     """
     Extracts the schema descriptions from the database connected to by the engine.
@@ -175,6 +194,8 @@ def extract_schema_descriptions(
     Args:
         engine (Engine): SQLAlchemy engine instance.
         multi_schema (bool): Generate descriptions for all schemas in the database.
+        tables (Optional[Collection[str]]): Only describe these tables (named
+            "schema.table" if `multi_schema`); None means all tables.
 
     Returns:
         Dict[str, Dict[str, Any]]: A dictionary representation of table and column
@@ -186,5 +207,5 @@ def extract_schema_descriptions(
         "mysql": extract_mysql_descriptions,
     }
     return extractors.get(engine.dialect.name, extract_default_descriptions)(
-        engine, multi_schema=multi_schema
+        engine, multi_schema=multi_schema, tables=tables
     )
@@ -1,4 +1,4 @@
-from typing import Dict, List, Union
+from typing import Collection, Dict, List, Optional, Union
 
 from langroid.exceptions import LangroidImportError
 
@@ -11,6 +11,7 @@ except ImportError as e:
 def populate_metadata_with_schema_tools(
     metadata: MetaData | List[MetaData],
     info: Dict[str, Dict[str, Union[str, Dict[str, str]]]],
+    tables: Optional[Collection[str]] = None,
 ) -> Dict[str, Dict[str, Union[str, Dict[str, str]]]]:
     """
     Extracts information from an SQLAlchemy database's metadata and combines it
@@ -20,6 +21,8 @@ def populate_metadata_with_schema_tools(
         metadata (MetaData): SQLAlchemy metadata object of the database.
         info (Dict[str, Dict[str, Any]]): A dictionary with table and column
                                              descriptions.
+        tables (Optional[Collection[str]]): Only include these tables;
+            None means all tables in `metadata`.
 
     Returns:
         Dict[str, Dict[str, Any]]: A dictionary with table and context information.
@@ -29,9 +32,11 @@ def populate_metadata_with_schema_tools(
     def populate_metadata(md: MetaData) -> None:
         # Create empty metadata dictionary with column datatypes
         for table_name, table in md.tables.items():
+            if tables is not None and table_name not in tables:
+                continue
             # Populate tables with empty descriptions
             db_info[table_name] = {
-                "description": info[table_name]["description"] or "",
+                "description": info.get(table_name, {}).get("description") or "",
                 "columns": {},
             }
 
@@ -53,6 +58,7 @@ def populate_metadata_with_schema_tools(
 def populate_metadata(
     metadata: MetaData | List[MetaData],
     info: Dict[str, Dict[str, Union[str, Dict[str, str]]]],
+    tables: Optional[Collection[str]] = None,
 ) -> Dict[str, Dict[str, Union[str, Dict[str, str]]]]:
     """
     Populate metadata based on the provided database metadata and additional info.
@@ -60,13 +66,15 @@ def populate_metadata(
     Args:
         metadata (MetaData): Metadata object from SQLAlchemy.
         info (Dict): Additional information for database tables and columns.
+        tables (Optional[Collection[str]]): Only include these tables;
+            None means all tables in `metadata`.
 
     Returns:
         Dict: A dictionary containing populated metadata information.
     """
     # Fetch basic metadata info using available tools
     db_info: Dict[str, Dict[str, Union[str, Dict[str, str]]]] = (
-        populate_metadata_with_schema_tools(metadata=metadata, info=info)
+        populate_metadata_with_schema_tools(metadata=metadata, info=info, tables=tables)
     )
 
     # Iterate over tables to update column metadata
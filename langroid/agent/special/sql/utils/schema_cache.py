@@ -0,0 +1,142 @@
+"""
+On-disk cache of database schema snapshots (table names, table/column
+descriptions and table metadata), so that agents for a database whose schema
+has not changed can start without reflecting the whole schema.
+
+A snapshot is keyed by the connection URL (without password), the agent
+settings that affect it, and a schema version: either given explicitly, or a
+fingerprint of the schema obtained with a single cheap catalog query (see
+`schema_fingerprint`), so snapshots are not reused after the schema changes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from langroid.exceptions import LangroidImportError
+
+try:
+    from sqlalchemy import inspect, text
+    from sqlalchemy.engine import Engine
+except ImportError as e:
+    raise LangroidImportError(extra="sql", error=str(e))
+
+logger = logging.getLogger(__name__)
+
+# single queries summarizing the columns (and comments) of all tables
+_FINGERPRINT_QUERIES = {
+    "postgresql": """
+        SELECT count(*), md5(string_agg(
+            concat_ws('.', c.table_schema, c.table_name, c.column_name,
+                c.data_type, col_description(
+                    format('%I.%I', c.table_schema, c.table_name)::regclass,
+                    c.ordinal_position
+                ),
+                obj_description(
+                    format('%I.%I', c.table_schema, c.table_name)::regclass
+                )
+            ),
+            ',' ORDER BY c.table_schema, c.table_name, c.ordinal_position
+        ))
+        FROM information_schema.columns c
+        WHERE c.table_schema NOT IN ('pg_catalog', 'information_schema')
+        """,
+    "mysql": """
+        SELECT count(*), sum(crc32(concat_ws('.', c.table_schema, c.table_name,
+            c.column_name, c.column_type, c.column_comment, t.table_comment)))
+        FROM information_schema.columns c
+        JOIN information_schema.tables t
+            ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+        WHERE c.table_schema
+            NOT IN ('mysql', 'information_schema', 'performance_schema', 'sys')
+        """,
+    "sqlite": "SELECT group_concat(name || ':' || sql, ';') FROM sqlite_master",
+}
+
+
+class SchemaSnapshot(BaseModel):
+    table_names: List[str] = []
+    context_descriptions: Dict[str, Dict[str, Any]] = {}
+    table_metadata: Dict[str, Dict[str, Any]] = {}
+
+
+def schema_fingerprint(engine: Engine, multi_schema: bool = False) -> Optional[str]:
+    """
+    Fingerprint of the database schema, from a single catalog query where
+    the dialect supports it, otherwise from the table names.
+
+    Args:
+        engine (Engine): SQLAlchemy engine instance.
+        multi_schema (bool): Whether all schemas in the database are used.
+
+    Returns:
+        Optional[str]: The fingerprint, or None if it could not be obtained.
+    """
+    try:
+        query = _FINGERPRINT_QUERIES.get(engine.dialect.name)
+        if query is not None:
+            with engine.connect() as conn:
+                row = conn.execute(text(query)).one()
+            summary: Any = list(row)
+        else:
+            inspector = inspect(engine)
+            schemas = inspector.get_schema_names() if multi_schema else [None]
+            summary = [
+                [schema, sorted(inspector.get_table_names(schema=schema))]
+                for schema in schemas
+            ]
+    except Exception as e:
+        logger.warning(f"Could not get a fingerprint of the database schema: {e}")
+        return None
+    return hashlib.sha256(json.dumps(summary, default=str).encode()).hexdigest()
+
+
+class SchemaCache:
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): directory where snapshots are stored
+        """
+        self.path = Path(path)
+
+    @staticmethod
+    def key(engine: Engine, version: str, **settings: Any) -> str:
+        """
+        Key of the snapshot of the database connected to by `engine`,
+        at schema `version`, built with the given agent `settings`.
+        """
+        url = engine.url.render_as_string(hide_password=True)
+        return hashlib.sha256(
+            json.dumps(
+                dict(url=url, version=version, **settings),
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()
+
+    def load(self, key: str) -> Optional[SchemaSnapshot]:
+        file = self.path / f"{key}.json"
+        if not file.exists():
+            return None
+        try:
+            return SchemaSnapshot.model_validate_json(file.read_text())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable schema snapshot {file}: {e}")
+            return None
+
+    def save(self, key: str, snapshot: SchemaSnapshot) -> None:
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            # write atomically, since agents may share the cache
+            fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(snapshot.model_dump_json())
+            os.replace(tmp, self.path / f"{key}.json")
+        except OSError as e:
+            logger.warning(f"Could not save schema snapshot in {self.path}: {e}")
@@ -14,12 +14,16 @@ commands.
 The `full_eval` flag is false by default, which means that the input is sanitized
 against most common code injection attack vectors. `full_eval` may be set to True to 
 disable sanitization at all. Both cases should be used with caution.
+
+With `engine="duckdb"`, a data file (Parquet or CSV/TSV) is not loaded into
+memory: expressions are evaluated on the data it selects, queried lazily via
+DuckDB (see `langroid.utils.lazy_table`), and the summary is computed on a sample.
 """
 
 import io
 import logging
 import sys
-from typing import List, Optional, Tuple, no_type_check
+from typing import List, Literal, Optional, Tuple, no_type_check
 
 import numpy as np
 import pandas as pd
@@ -33,6 +37,7 @@ from langroid.language_models.openai_gpt import OpenAIChatModel, OpenAIGPTConfig
 from langroid.parsing.table_loader import read_tabular_data
 from langroid.prompts.prompts_config import PromptsConfig
 from langroid.utils.constants import DONE, PASS
+from langroid.utils.lazy_table import LazyTable
 from langroid.utils.pandas_utils import sanitize_command
 from langroid.vector_store.base import VectorStoreConfig
 
@@ -133,6 +138,11 @@ class TableChatAgentConfig(ChatAgentConfig):
     )
     data: str | pd.DataFrame  # data file, URL, or DataFrame
     separator: None | str = None  # separator for data file
+    # "pandas": load the data into a dataframe; "duckdb": query a data file
+    # lazily, loading only the rows/columns each expression needs (for data
+    # too large to fit in memory; requires `duckdb`)
+    engine: Literal["pandas", "duckdb"] = "pandas"
+    summary_sample_rows: int = 10_000  # rows sampled for the summary (duckdb)
     vecdb: None | VectorStoreConfig = None
     llm: OpenAIGPTConfig = OpenAIGPTConfig(
         type="openai",
@@ -178,22 +188,41 @@ class TableChatAgent(ChatAgent):
     sent_expression: bool = False
 
     def __init__(self, config: TableChatAgentConfig):
-        if isinstance(config.data, pd.DataFrame):
-            df = config.data
+        self.table: Optional[LazyTable] = None
+        if config.engine == "duckdb" and isinstance(config.data, str):
+            self.table = LazyTable(config.data, config.separator)
+            # only the columns (and dtypes), the data stays in the file
+            df = self.table.load(limit=0)
+            sample = self.table.sample(config.summary_sample_rows)
+            summary = dataframe_summary(sample)
+            if len(sample) < self.table.num_rows:
+                summary = (
+                    f"(computed on a random sample of {len(sample)} "
+                    f"of the {self.table.num_rows} rows)\n{summary}"
+                )
+            shape = (self.table.num_rows, len(self.table.columns))
         else:
-            df = read_tabular_data(config.data, config.separator)
+            if config.engine == "duckdb":
+                logger.warning(
+                    "The duckdb engine needs a data file; using the given DataFrame"
+                )
+            if isinstance(config.data, pd.DataFrame):
+                df = config.data
+            else:
+                df = read_tabular_data(config.data, config.separator)
 
-        df.columns = df.columns.str.strip().str.replace(" +", "_", regex=True)
+            df.columns = df.columns.str.strip().str.replace(" +", "_", regex=True)
+            summary = dataframe_summary(df)
+            shape = df.shape
 
         self.df = df
-        summary = dataframe_summary(df)
         config.system_message = config.system_message.format(summary=summary)
 
         super().__init__(config)
         self.config: TableChatAgentConfig = config
 
         logger.info(
-            f"""TableChatAgent initialized with dataframe of shape {self.df.shape}
+            f"""TableChatAgent initialized with dataframe of shape {shape}
             and columns: 
             {self.df.columns}
             """
@@ -235,7 +264,10 @@ class TableChatAgent(ChatAgent):
         try:
             if not self.config.full_eval:
                 exprn = sanitize_command(exprn)
-            code = compile(exprn, "<calc>", "eval")
+            if self.table is not None:
+                code, vars = self.table.bind(exprn)
+            else:
+                code = compile(exprn, "<calc>", "eval")
             eval_result = eval(code, vars, {})
         except Exception as e:
             eval_result = f"ERROR: {type(e)}: {e}"
@@ -247,7 +279,8 @@ class TableChatAgent(ChatAgent):
         sys.stdout = sys.__stdout__
 
         # If df has been modified in-place, save the changes back to self.df
-        self.df = vars["df"]
+        if self.table is None:
+            self.df = vars["df"]
 
         # Get the resulting string from the I/O stream
         print_result = code_out.getvalue() or ""
@@ -44,7 +44,7 @@ from langroid.agent.tools.orchestration import AgentDoneTool, DoneTool, FinalRes
 from langroid.cachedb.redis_cachedb import RedisCache, RedisCacheConfig
 from langroid.exceptions import InfiniteLoopException
 from langroid.mytypes import Entity
-from langroid.parsing.parse_json import extract_top_level_json
+from langroid.parsing.parse_json import get_json_candidates
 from langroid.parsing.routing import parse_addressed_message
 from langroid.utils.configuration import settings
 from langroid.utils.constants import (
@@ -56,7 +56,7 @@ from langroid.utils.constants import (
     USER_QUIT_STRINGS,
 )
 from langroid.utils.html_logger import HTMLLogger
-from langroid.utils.logging import RichFileLogger, setup_file_logger
+from langroid.utils.logging import RichFileLogger, log_writer, setup_file_logger
 from langroid.utils.object_registry import scheduled_cleanup
 from langroid.utils.system import hash
 from langroid.utils.types import to_string
@@ -172,6 +172,12 @@ class TaskConfig(BaseModel):
     done_sequences: Optional[List[Union[str, DoneSequence]]] = None
 
 
+class _HTMLLogFields(BaseModel):
+    """Log fields of a message, as passed to the HTML logger."""
+
+    model_config = ConfigDict(extra="allow")  # Allow extra fields
+
+
 class Task:
     """
     A `Task` wraps an `Agent` object, and sets up the `Agent`'s goals and instructions.
@@ -697,6 +703,7 @@ class Task:
             self.tsv_logger = setup_file_logger(
                 f"tsv_logger.{self.name}.{id(self)}",
                 str(Path(self.config.logs_dir) / f"{self.name}.tsv"),
+                background=True,
             )
             header = ChatDocLoggerFields().tsv_header()
             self.tsv_logger.info(f" \tTask\tResponder\t{header}")
@@ -1573,7 +1580,7 @@ class Task:
                 if result is None
                 else "\n\n".join(str(m) for m in ChatDocument.to_LLMMessage(result))
             )
-            maybe_tool = len(extract_top_level_json(result_str)) > 0
+            maybe_tool = len(get_json_candidates(result_str)) > 0
             self.callbacks.show_subtask_response(
                 task=e,
                 content=result_str,
@@ -1713,7 +1720,7 @@ class Task:
                 if result is None
                 else "\n\n".join(str(m) for m in ChatDocument.to_LLMMessage(result))
             )
-            maybe_tool = len(extract_top_level_json(result_str)) > 0
+            maybe_tool = len(get_json_candidates(result_str)) > 0
             self.callbacks.show_subtask_response(
                 task=e,
                 content=result_str,
@@ -2109,10 +2116,16 @@ class Task:
         """
         from langroid.agent.chat_document import ChatDocLoggerFields
 
-        default_values = ChatDocLoggerFields().model_dump().values()
-        msg_str_tsv = "\t".join(str(v) for v in default_values)
-        if msg is not None:
-            msg_str_tsv = msg.tsv_str()
+        if self.logger is None and self.tsv_logger is None and self.html_logger is None:
+            return
+        # computed once for all loggers (finding tools in a message is not cheap)
+        f: ChatDocLoggerFields | None = None
+        if msg is None:
+            default_values = ChatDocLoggerFields().model_dump().values()
+            msg_str_tsv = "\t".join(str(v) for v in default_values)
+        else:
+            f = msg.log_fields()
+            msg_str_tsv = msg.tsv_str(f)
 
         mark_str = "*" if mark else " "
         task_name = self.name if self.name != "" else "root"
@@ -2128,7 +2141,7 @@ class Task:
                 Entity.AGENT: "red",
                 Entity.SYSTEM: "magenta",
             }[msg.metadata.sender]
-            f = msg.log_fields()
+            assert f is not None
             tool_type = f.tool_type.rjust(6)
             tool_name = f.tool.rjust(10)
             tool_str = f"{tool_type}({tool_name})" if tool_name != "" else ""
@@ -2169,8 +2182,8 @@ class Task:
                 }
             else:
                 # Get fields from the message
-                fields = msg.log_fields()
-                fields_dict = fields.model_dump()
+                assert f is not None
+                fields_dict = f.model_dump()
                 fields_dict.update(
                     {
                         "responder": str(resp),
@@ -2180,13 +2193,7 @@ class Task:
                 )
 
             # Create a ChatDocLoggerFields-like object for the HTML logger
-            # Create a simple BaseModel subclass dynamically
-            from pydantic import BaseModel
-
-            class LogFields(BaseModel):
-                model_config = ConfigDict(extra="allow")  # Allow extra fields
-
-            log_obj = LogFields(**fields_dict)
+            log_obj = _HTMLLogFields(**fields_dict)
             self.html_logger.log(log_obj)
 
     def _valid_recipient(self, recipient: str) -> bool:
@@ -2419,6 +2426,8 @@ class Task:
 
     def close_loggers(self) -> None:
         """Close all loggers to ensure clean shutdown."""
+        # write out entries still queued for the background log writer
+        log_writer().flush()
         if hasattr(self, "logger") and self.logger is not None:
             self.logger.close()
         if hasattr(self, "html_logger") and self.html_logger is not None:
@@ -8,6 +8,7 @@ from .fastmcp_client import (
     get_mcp_tool_async,
     get_mcp_tools_async,
 )
+from .session_pool import MCPSessionPool, mcp_session_pool
 
 
 __all__ = [
@@ -19,4 +20,6 @@ __all__ = [
     "get_tools_async",
     "get_mcp_tool_async",
     "get_mcp_tools_async",
+    "MCPSessionPool",
+    "mcp_session_pool",
 ]
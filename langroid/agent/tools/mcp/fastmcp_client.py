@@ -5,7 +5,19 @@ import logging
 import os
 from base64 import b64decode
 from io import BytesIO
-from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeAlias, cast
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeAlias,
+    TypeVar,
+    cast,
+)
 
 from dotenv import load_dotenv
 from fastmcp.client import Client
@@ -43,10 +55,13 @@ from pydantic import AnyUrl, BaseModel, Field, create_model
 from langroid.agent.base import Agent
 from langroid.agent.chat_document import ChatDocument
 from langroid.agent.tool_message import ToolMessage
+from langroid.agent.tools.mcp.session_pool import mcp_session_pool, pool_key
 from langroid.parsing.file_attachment import FileAttachment
 
 load_dotenv()  # load environment variables from .env
 
+T = TypeVar("T")
+
 # Concrete server/transport spec accepted by fastmcp.Client
 FastMCPServerConcrete: TypeAlias = str | FastMCP[Any] | ClientTransport | AnyUrl
 # Public spec we accept: concrete spec or a zero-arg factory returning a spec
@@ -321,6 +336,24 @@ class FastMCPClient:
         target = await self.get_mcp_tool_async(tool_name)
         if target is None:
             raise ValueError(f"No tool named {tool_name}")
+        return self._tool_from_mcp(target)
+
+    def _client_config(self) -> Dict[str, Any]:
+        """Configuration needed to recreate a client for the same server."""
+        return {
+            # Always store a SERVER FACTORY to ensure a fresh transport per call
+            "server": self._as_server_factory(self.server),
+            "sampling_handler": self.sampling_handler,
+            "roots": self.roots,
+            "log_handler": self.log_handler,
+            "message_handler": self.message_handler,
+            "read_timeout_seconds": self.read_timeout_seconds,
+        }
+
+    def _tool_from_mcp(self, target: Tool) -> Type[ToolMessage]:
+        """
+        Create a Langroid ToolMessage subclass from the MCP Tool `target`.
+        """
         props = target.inputSchema.get("properties", {})
         # Get the list of required fields from JSON Schema
         required_fields = set(target.inputSchema.get("required", []))
@@ -366,17 +399,13 @@ class FastMCPClient:
             ),
         )
         # Store ALL client configuration needed to recreate a client
-        client_config = {
-            # Always store a SERVER FACTORY to ensure a fresh transport per call
-            "server": self._as_server_factory(self.server),
-            "sampling_handler": self.sampling_handler,
-            "roots": self.roots,
-            "log_handler": self.log_handler,
-            "message_handler": self.message_handler,
-            "read_timeout_seconds": self.read_timeout_seconds,
-        }
+        client_config = self._client_config()
 
         tool_model._client_config = client_config  # type: ignore [attr-defined]
+        # key of the pooled sessions to the server used for calls
+        tool_model._pool_key = pool_key(  # type: ignore [attr-defined]
+            self.server, client_config
+        )
         tool_model._renamed_fields = renamed  # type: ignore[attr-defined]
 
         # 2) define an arg-free call_tool_async()
@@ -421,6 +450,17 @@ class FastMCPClient:
 
                 return await self.call_mcp_tool(itself.request, payload)
 
+            pool = mcp_session_pool()
+            if pool.enabled:
+                # call on a session kept open across calls (and tasks)
+                return await pool.call_tool(
+                    itself.__class__._pool_key,  # type: ignore[attr-defined]
+                    client_cfg,
+                    itself.request,
+                    payload,
+                    max_sessions=self._max_pooled_sessions(),
+                )
+
             # open a fresh client, call the tool, then close
             async with FastMCPClient(**client_cfg) as client:  # type: ignore
                 return await client.call_mcp_tool(itself.request, payload)
@@ -476,7 +516,42 @@ class FastMCPClient:
                     "Client not initialized. Use async with FastMCPClient."
                 )
         resp = await self.client.list_tools()
-        return [await self.get_tool_async(t.name) for t in resp]
+        return [self._tool_from_mcp(t) for t in resp]
+
+    async def _list_pooled_mcp_tools(self) -> List[Tool]:
+        """List the server's tools, via the (cached) session pool if enabled,
+        else on a temporary connection."""
+        pool = mcp_session_pool()
+        if not pool.enabled:
+            async with self:
+                assert self.client is not None
+                return await self.client.list_tools()
+        config = self._client_config()
+        return await pool.list_tools(
+            pool_key(self.server, config),
+            config,
+            max_sessions=self._max_pooled_sessions(),
+        )
+
+    def _max_pooled_sessions(self) -> Optional[int]:
+        """
+        Cap on pooled sessions to our server: a transport instance that is
+        reused across connections (see `_as_server_factory`) can only serve
+        one session at a time.
+        """
+        server = self.server
+        if not isinstance(server, ClientTransport):
+            return None
+        if isinstance(server, StdioTransport) and not isinstance(
+            server,
+            tuple(
+                t
+                for t in (NpxStdioTransport, UvxStdioTransport)
+                if not isinstance(t, tuple)
+            ),
+        ):
+            return None
+        return 1
 
     async def get_mcp_tool_async(self, name: str) -> Optional[Tool]:
         """Find the "original" MCP Tool (i.e. of type mcp.types.Tool) on the server
@@ -723,10 +798,19 @@ class FastMCPClient:
 # ==============================================================================
 # Convenience functions (wrappers around FastMCPClient methods)
 # These are useful for one-off calls without needing to manage the
-# FastMCPClient context explicitly.
+# FastMCPClient context explicitly. They list tools via the MCP session pool.
 # ==============================================================================
 
 
+async def _closing_pooled_sessions(coro: Awaitable[T]) -> T:
+    """Await `coro`, then close the sessions it opened in the (short-lived)
+    event loop of a sync wrapper."""
+    try:
+        return await coro
+    finally:
+        await mcp_session_pool().close()
+
+
 async def get_tool_async(
     server: FastMCPServerSpec,
     tool_name: str,
@@ -734,7 +818,8 @@ async def get_tool_async(
 ) -> Type[ToolMessage]:
     """Get a single Langroid ToolMessage subclass for a specific MCP tool name (async).
 
-    This is a convenience wrapper that creates a temporary FastMCPClient.
+    This is a convenience wrapper that lists the server's tools via the
+    MCP session pool.
 
     Args:
         server: Specification of the FastMCP server to connect to.
@@ -746,8 +831,14 @@ async def get_tool_async(
         A dynamically created Langroid ToolMessage subclass representing the
         requested tool.
     """
-    async with FastMCPClient(server, **client_kwargs) as client:
-        return await client.get_tool_async(tool_name)
+    client = FastMCPClient(server, **client_kwargs)
+    target = next(
+        (t for t in await client._list_pooled_mcp_tools() if t.name == tool_name),
+        None,
+    )
+    if target is None:
+        raise ValueError(f"No tool named {tool_name}")
+    return client._tool_from_mcp(target)
 
 
 def get_tool(
@@ -771,7 +862,9 @@ def get_tool(
         A dynamically created Langroid ToolMessage subclass representing the
         requested tool.
     """
-    return asyncio.run(get_tool_async(server, tool_name, **client_kwargs))
+    return asyncio.run(
+        _closing_pooled_sessions(get_tool_async(server, tool_name, **client_kwargs))
+    )
 
 
 async def get_tools_async(
@@ -780,7 +873,8 @@ async def get_tools_async(
 ) -> List[Type[ToolMessage]]:
     """Get all available tools as Langroid ToolMessage subclasses (async).
 
-    This is a convenience wrapper that creates a temporary FastMCPClient.
+    This is a convenience wrapper that lists the server's tools via the
+    MCP session pool.
 
     Args:
         server: Specification of the FastMCP server to connect to.
@@ -791,8 +885,8 @@ async def get_tools_async(
         A list of dynamically created Langroid ToolMessage subclasses
         representing all available tools on the server.
     """
-    async with FastMCPClient(server, **client_kwargs) as client:
-        return await client.get_tools_async()
+    client = FastMCPClient(server, **client_kwargs)
+    return [client._tool_from_mcp(t) for t in await client._list_pooled_mcp_tools()]
 
 
 def get_tools(
@@ -813,7 +907,9 @@ def get_tools(
         A list of dynamically created Langroid ToolMessage subclasses
         representing all available tools on the server.
     """
-    return asyncio.run(get_tools_async(server, **client_kwargs))
+    return asyncio.run(
+        _closing_pooled_sessions(get_tools_async(server, **client_kwargs))
+    )
 
 
 async def get_mcp_tool_async(
@@ -823,8 +919,8 @@ async def get_mcp_tool_async(
 ) -> Optional[Tool]:
     """Get the raw MCP Tool object for a specific tool name (async).
 
-    This is a convenience wrapper that creates a temporary FastMCPClient to
-    retrieve the tool definition from the server.
+    This is a convenience wrapper that retrieves the tool definition from the
+    server via the MCP session pool.
 
     Args:
         server: Specification of the FastMCP server to connect to.
@@ -836,8 +932,8 @@ async def get_mcp_tool_async(
         The raw `mcp.types.Tool` object from the server, or `None` if the tool
         is not found.
     """
-    async with FastMCPClient(server, **client_kwargs) as client:
-        return await client.get_mcp_tool_async(name)
+    tools = await FastMCPClient(server, **client_kwargs)._list_pooled_mcp_tools()
+    return next((t for t in tools if t.name == name), None)
 
 
 async def get_mcp_tools_async(
@@ -846,8 +942,8 @@ async def get_mcp_tools_async(
 ) -> List[Tool]:
     """Get all available raw MCP Tool objects from the server (async).
 
-    This is a convenience wrapper that creates a temporary FastMCPClient to
-    retrieve the list of tool definitions from the server.
+    This is a convenience wrapper that retrieves the list of tool definitions
+    from the server via the MCP session pool.
 
     Args:
         server: Specification of the FastMCP server to connect to.
@@ -857,7 +953,4 @@ async def get_mcp_tools_async(
     Returns:
         A list of raw `mcp.types.Tool` objects available on the server.
     """
-    async with FastMCPClient(server, **client_kwargs) as client:
-        if not client.client:
-            raise RuntimeError("Client not initialized. Use async with FastMCPClient.")
-        return await client.client.list_tools()
+    return await FastMCPClient(server, **client_kwargs)._list_pooled_mcp_tools()
@@ -0,0 +1,402 @@
+"""
+A pool of persistent MCP client sessions, so MCP tool calls (and tool listings)
+reuse a live connection to the server instead of opening a new one per call,
+which for stdio servers means a subprocess spawn plus an MCP handshake.
+
+Sessions are kept per server (and client handlers), per event loop, since a
+session is bound to the loop it was opened in. For each server:
+- at most `max_sessions` sessions are opened; concurrent calls beyond that
+  share the least busy session (MCP sessions multiplex requests);
+- a session whose connection fails is discarded, and the call is retried once
+  on a new session;
+- sessions idle for `idle_timeout` seconds are closed, and all of a loop's
+  sessions are closed when the loop shuts down its async generators (as
+  `asyncio.run` does before closing the loop);
+- the server's tool list is cached while a session is open, and invalidated
+  when the server sends a `notifications/tools/list_changed` notification.
+
+The process-wide pool is `mcp_session_pool()`, configured by the env vars
+`LANGROID_MCP_POOL_MAX_SESSIONS` (default 0, i.e. pooling is off unless this
+is set, e.g. to 4) and
+`LANGROID_MCP_POOL_IDLE_TIMEOUT` (seconds, default 300).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import anyio
+from mcp.shared.exceptions import McpError
+from mcp.types import Tool, ToolListChangedNotification
+from pydantic import AnyUrl
+
+from langroid.parsing.file_attachment import FileAttachment
+
+if TYPE_CHECKING:
+    from langroid.agent.tools.mcp.fastmcp_client import FastMCPClient
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[Hashable, ...]
+
+_CLIENT_HANDLERS = ("sampling_handler", "roots", "log_handler", "message_handler")
+
+
+class _Identity:
+    """Hashable wrapper comparing (and keeping alive) an object by identity."""
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any):
+        self.obj = obj
+
+    def __hash__(self) -> int:
+        return id(self.obj)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Identity) and other.obj is self.obj
+
+
+def pool_key(server: Any, client_config: Dict[str, Any]) -> PoolKey:
+    """
+    Key of the sessions that can serve a client with this (original) server
+    spec and `client_config` (as stored on generated MCP tools): servers given
+    as a string/URL match by value, others (and handlers) by identity.
+    """
+    spec = str(server) if isinstance(server, (str, AnyUrl)) else _Identity(server)
+    return (
+        spec,
+        *(_Identity(client_config.get(name)) for name in _CLIENT_HANDLERS),
+        client_config.get("read_timeout_seconds"),
+    )
+
+
+def _is_connection_error(e: BaseException) -> bool:
+    if isinstance(
+        e,
+        (
+            anyio.ClosedResourceError,
+            anyio.BrokenResourceError,
+            anyio.EndOfStream,
+            ConnectionError,
+        ),
+    ):
+        return True
+    msg = str(e).lower()
+    if isinstance(e, McpError):
+        return "connection closed" in msg
+    return isinstance(e, RuntimeError) and (
+        "closed" in msg or "not connected" in msg or "client not initialized" in msg
+    )
+
+
+@dataclass
+class _PooledSession:
+    client: "FastMCPClient"
+    key: PoolKey
+    in_use: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+    def alive(self) -> bool:
+        return self.client.client is not None and self.client.client.is_connected()
+
+
+@dataclass
+class _ServerSessions:
+    sessions: List[_PooledSession] = field(default_factory=list)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    reaper: Optional[asyncio.TimerHandle] = None
+
+
+class MCPSessionPool:
+    def __init__(self, max_sessions: int = 4, idle_timeout: float = 300.0):
+        """
+        Args:
+            max_sessions: max number of sessions per server; 0 disables pooling
+            idle_timeout: seconds after which an unused session is closed
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._loops: Dict[asyncio.AbstractEventLoop, Dict[PoolKey, _ServerSessions]] = (
+            {}
+        )
+        self._tools: Dict[PoolKey, List[Tool]] = {}
+        self._shutdown_hooks: Dict[asyncio.AbstractEventLoop, AsyncIterator[None]] = {}
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._stats: Dict[str, int] = dict(
+            opened=0, reused=0, reconnects=0, closed_idle=0, tool_list_hits=0
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_sessions > 0
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of sessions opened, reused, reconnected and closed when idle,
+        cached tool-list hits, and currently open sessions."""
+        return dict(
+            **self._stats,
+            open=sum(
+                len(server.sessions)
+                for servers in self._loops.values()
+                for server in servers.values()
+            ),
+        )
+
+    def _servers(self) -> Dict[PoolKey, _ServerSessions]:
+        """Sessions of the running loop; forget those of loops since closed."""
+        for loop in [lp for lp in self._loops if lp.is_closed()]:
+            self._drop_closed_loop(loop)
+        return self._loops.setdefault(asyncio.get_running_loop(), {})
+
+    def _drop_closed_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Forget the sessions of a closed loop. They are normally closed by the
+        loop's shutdown hook (see `_watch_loop`); any left were opened in a loop
+        closed without shutting down its async generators, and can no longer be
+        closed from another loop, so their clients are released for
+        finalization (which ends stdio server processes).
+        """
+        servers = self._loops.pop(loop)
+        self._shutdown_hooks.pop(loop, None)
+        stale = [s for server in servers.values() for s in server.sessions]
+        if stale:
+            logger.warning(
+                f"Dropping {len(stale)} MCP session(s) of an event loop that was "
+                "closed without `loop.shutdown_asyncgens()`; "
+                "use `asyncio.run` or close the pool before closing the loop"
+            )
+        for server in servers.values():
+            server.sessions.clear()
+        for key in servers:
+            self._forget_tools_if_unused(key)
+
+    async def _watch_loop(self) -> None:
+        """
+        Close the running loop's sessions when the loop shuts down: register
+        (and keep alive) an async generator suspended at its `yield`, whose
+        `finally` runs when the loop finalizes its async generators.
+        """
+        loop = asyncio.get_running_loop()
+        if loop in self._shutdown_hooks:
+            return
+
+        async def on_shutdown() -> AsyncIterator[None]:
+            try:
+                yield
+            finally:
+                self._shutdown_hooks.pop(loop, None)
+                await self.close()
+                self._loops.pop(loop, None)
+
+        hook = on_shutdown()
+        await hook.__anext__()
+        self._shutdown_hooks[loop] = hook
+
+    def _forget_tools_if_unused(self, key: PoolKey) -> None:
+        # without a live session we would miss list-change notifications
+        if not any(
+            key in servers and servers[key].sessions for servers in self._loops.values()
+        ):
+            self._tools.pop(key, None)
+
+    def _message_handler(self, key: PoolKey, handler: Any) -> Any:
+        async def on_message(message: Any) -> None:
+            if isinstance(
+                getattr(message, "root", message), ToolListChangedNotification
+            ):
+                self._tools.pop(key, None)
+            if handler is not None:
+                await handler(message)
+
+        return on_message
+
+    async def _acquire(
+        self,
+        key: PoolKey,
+        client_config: Dict[str, Any],
+        max_sessions: Optional[int],
+    ) -> _PooledSession:
+        await self._watch_loop()
+        server = self._servers().setdefault(key, _ServerSessions())
+        limit = min(max_sessions or self.max_sessions, self.max_sessions)
+        async with server.lock:
+            for dead in [s for s in server.sessions if not s.alive() and not s.in_use]:
+                await self._discard(dead)
+            session = min(server.sessions, key=lambda s: s.in_use, default=None)
+            if session is None or (session.in_use > 0 and len(server.sessions) < limit):
+                from langroid.agent.tools.mcp.fastmcp_client import FastMCPClient
+
+                config = dict(client_config)
+                config["message_handler"] = self._message_handler(
+                    key, client_config.get("message_handler")
+                )
+                client = FastMCPClient(**config)
+                await client.connect()
+                session = _PooledSession(client=client, key=key)
+                server.sessions.append(session)
+                self._stats["opened"] += 1
+            else:
+                self._stats["reused"] += 1
+            session.in_use += 1
+            return session
+
+    async def _release(self, session: _PooledSession, broken: bool = False) -> None:
+        session.in_use -= 1
+        session.last_used = time.monotonic()
+        if broken:
+            await self._discard(session)
+        elif session.in_use == 0:
+            self._schedule_reaper(session.key)
+
+    async def _discard(self, session: _PooledSession) -> None:
+        server = self._servers().get(session.key)
+        if server is not None and session in server.sessions:
+            server.sessions.remove(session)
+        self._forget_tools_if_unused(session.key)
+        try:
+            await session.client.close()
+        except (Exception, asyncio.CancelledError) as e:
+            # at loop shutdown, the session's own tasks may already be cancelled
+            logger.debug(f"Error closing MCP session: {e}")
+
+    def _schedule_reaper(self, key: PoolKey) -> None:
+        server = self._servers().get(key)
+        if server is None or server.reaper is not None:
+            return
+        loop = asyncio.get_running_loop()
+
+        def reap() -> None:
+            server.reaper = None
+            task = loop.create_task(self._close_idle(key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        server.reaper = loop.call_later(self.idle_timeout, reap)
+
+    async def _close_idle(self, key: PoolKey) -> None:
+        server = self._servers().get(key)
+        if server is None:
+            return
+        now = time.monotonic()
+        for session in list(server.sessions):
+            if session.in_use == 0 and now - session.last_used >= self.idle_timeout:
+                await self._discard(session)
+                self._stats["closed_idle"] += 1
+        if any(s.in_use == 0 for s in server.sessions):
+            self._schedule_reaper(key)
+
+    async def call_tool(
+        self,
+        key: PoolKey,
+        client_config: Dict[str, Any],
+        tool_name: str,
+        arguments: Dict[str, Any],
+        max_sessions: Optional[int] = None,
+    ) -> Optional[Tuple[str, List[FileAttachment]]]:
+        """
+        Call an MCP tool on a pooled session, reconnecting once if the
+        session's connection has failed.
+
+        Args:
+            key: pool key of the server, see `pool_key`
+            client_config: kwargs to create a `FastMCPClient` for the server
+            tool_name: name of the tool to call
+            arguments: arguments to pass to the tool
+            max_sessions: cap on the number of sessions for this server
+                (below the pool's `max_sessions`)
+
+        Returns:
+            The result of the tool call, as from `FastMCPClient.call_mcp_tool`.
+        """
+        for attempt in range(2):
+            session = await self._acquire(key, client_config, max_sessions)
+            # a call cancelled mid-request leaves the session in an unknown state
+            broken = True
+            try:
+                result = await session.client.call_mcp_tool(tool_name, arguments)
+                broken = False
+            except Exception as e:
+                broken = _is_connection_error(e) or not session.alive()
+                if broken and attempt == 0:
+                    logger.warning(
+                        f"MCP session failed calling {tool_name}: {e}. Reconnecting..."
+                    )
+                    self._stats["reconnects"] += 1
+                    continue
+                raise
+            finally:
+                await self._release(session, broken=broken)
+            return result
+        raise AssertionError("unreachable")
+
+    async def list_tools(
+        self,
+        key: PoolKey,
+        client_config: Dict[str, Any],
+        max_sessions: Optional[int] = None,
+    ) -> List[Tool]:
+        """
+        List the server's tools, cached until the server reports a change
+        (or no session to the server remains open).
+        """
+        tools = self._tools.get(key)
+        if tools is not None:
+            self._stats["tool_list_hits"] += 1
+            return tools
+        for attempt in range(2):
+            session = await self._acquire(key, client_config, max_sessions)
+            broken = True  # unless the listing completes (see `call_tool`)
+            try:
+                assert session.client.client is not None
+                tools = await session.client.client.list_tools()
+                broken = False
+            except Exception as e:
+                broken = _is_connection_error(e) or not session.alive()
+                if broken and attempt == 0:
+                    self._stats["reconnects"] += 1
+                    continue
+                raise
+            finally:
+                await self._release(session, broken=broken)
+            self._tools[key] = tools
+            return tools
+        raise AssertionError("unreachable")
+
+    async def close(self) -> None:
+        """Close all sessions opened in the running event loop."""
+        servers = self._servers()
+        for server in list(servers.values()):
+            if server.reaper is not None:
+                server.reaper.cancel()
+                server.reaper = None
+            for session in list(server.sessions):
+                await self._discard(session)
+        servers.clear()
+
+
+_pool: Optional[MCPSessionPool] = None
+
+
+def mcp_session_pool() -> MCPSessionPool:
+    """The process-wide MCP session pool (configured from env vars)."""
+    global _pool
+    if _pool is None:
+        _pool = MCPSessionPool(
+            max_sessions=int(os.getenv("LANGROID_MCP_POOL_MAX_SESSIONS", "0")),
+            idle_timeout=float(os.getenv("LANGROID_MCP_POOL_IDLE_TIMEOUT", "300")),
+        )
+    return _pool
@@ -1,8 +1,14 @@
 from . import base
 
 from . import redis_cachedb
+from . import sqlite_cachedb
+from . import memory_cachedb
+from . import tiered_cachedb
 
 __all__ = [
     "base",
     "redis_cachedb",
+    "sqlite_cachedb",
+    "memory_cachedb",
+    "tiered_cachedb",
 ]
@@ -1,9 +1,50 @@
+import asyncio
+import hashlib
+import json
 from abc import ABC, abstractmethod
+from enum import Enum
 from typing import Any, Dict, List
 
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 
 
+def _canonical(obj: Any) -> Any:
+    """JSON-serializable stand-in for objects `json` can't handle natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    if isinstance(obj, bytes):
+        return obj.hex()
+    return repr(obj)
+
+
+def canonical_key(prefix: str, **kwargs: Any) -> str:
+    """
+    Stable cache key for a call with the given keyword args: the sha256 of
+    their canonical JSON form (keys sorted at every level, compact separators),
+    so it does not depend on dict insertion order or on Python reprs.
+
+    Args:
+        prefix (str): name of the call, e.g. "Completion"
+        **kwargs: the call's arguments
+
+    Returns:
+        str: hex digest
+    """
+    payload = json.dumps(
+        kwargs,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_canonical,
+    )
+    return hashlib.sha256(f"{prefix}:{payload}".encode()).hexdigest()
+
+
 class CacheDBConfig(BaseSettings):
     """Configuration model for CacheDB."""
 
@@ -37,6 +78,57 @@ class CacheDB(ABC):
         """
         pass
 
+    def store_many(self, items: Dict[str, Any]) -> None:
+        """
+        Store several key/value pairs. Backends that support batched writes
+        should override this; the default stores them one at a time.
+
+        Args:
+            items (Dict[str, Any]): mapping of keys to the values to store.
+        """
+        for key, value in items.items():
+            self.store(key, value)
+
+    def retrieve_many(self, keys: List[str]) -> List[Dict[str, Any] | str | None]:
+        """
+        Retrieve the values of several keys, in the same order as `keys`
+        (None for missing keys). Backends that support batched reads
+        should override this; the default retrieves them one at a time.
+
+        Args:
+            keys (List[str]): The keys to retrieve the values for.
+
+        Returns:
+            List: The values associated with the keys.
+        """
+        return [self.retrieve(key) for key in keys]
+
+    async def astore(self, key: str, value: Any) -> None:
+        """
+        Store a value without blocking the event loop. Backends with a native
+        async client should override this; the default runs `store` in a
+        worker thread.
+
+        Args:
+            key (str): The key under which to store the value.
+            value (Any): The value to store.
+        """
+        await asyncio.to_thread(self.store, key, value)
+
+    async def aretrieve(self, key: str) -> Dict[str, Any] | str | None:
+        """
+        Retrieve a value without blocking the event loop. Backends with a
+        native async client should override this; the default runs `retrieve`
+        in a worker thread.
+
+        Args:
+            key (str): The key to retrieve the value for.
+
+        Returns:
+            dict|str|None: The value associated with the key.
+        """
+        return await asyncio.to_thread(self.retrieve, key)
+
     @abstractmethod
     def delete_keys(self, keys: List[str]) -> None:
         """
@@ -0,0 +1,110 @@
+import fnmatch
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from langroid.cachedb.base import CacheDB, CacheDBConfig
+
+
+class MemoryCacheConfig(CacheDBConfig):
+    """Configuration model for MemoryCache."""
+
+    max_entries: int = 1000  # least-recently-used entries are evicted beyond this
+    ttl: Optional[float] = 3600.0  # expiry (seconds) of stored keys; None = never
+
+
+class MemoryCache(CacheDB):
+    """
+    In-process, size- and TTL-bounded LRU implementation of the CacheDB.
+    Values are stored JSON-serialized (like the other backends), so callers
+    mutating a retrieved value do not affect the cached copy.
+    """
+
+    def __init__(self, config: MemoryCacheConfig = MemoryCacheConfig()):
+        """
+        Initialize a MemoryCache with the given config.
+
+        Args:
+            config (MemoryCacheConfig): The configuration to use.
+        """
+        self.config = config
+        # key -> (expiry time or None, json-serialized value)
+        self._data: OrderedDict[str, Tuple[Optional[float], str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        """Clear all keys."""
+        with self._lock:
+            self._data.clear()
+
+    def store(self, key: str, value: Any) -> None:
+        """
+        Store a value associated with a key.
+
+        Args:
+            key (str): The key under which to store the value.
+            value (Any): The value to store.
+        """
+        if self.config.max_entries <= 0:
+            return
+        expiry = None if self.config.ttl is None else time.time() + self.config.ttl
+        serialized = json.dumps(value)
+        with self._lock:
+            self._data[key] = (expiry, serialized)
+            self._data.move_to_end(key)
+            while len(self._data) > self.config.max_entries:
+                self._data.popitem(last=False)
+
+    def retrieve(self, key: str) -> Dict[str, Any] | str | None:
+        """
+        Retrieve the value associated with a key, marking it as recently used.
+
+        Args:
+            key (str): The key to retrieve the value for.
+
+        Returns:
+            dict|str|None: The value associated with the key.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expiry, serialized = entry
+            if expiry is not None and expiry < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        return json.loads(serialized)  # type: ignore
+
+    async def astore(self, key: str, value: Any) -> None:
+        self.store(key, value)
+
+    async def aretrieve(self, key: str) -> Dict[str, Any] | str | None:
+        return self.retrieve(key)
+
+    def delete_keys(self, keys: List[str]) -> None:
+        """
+        Delete the keys from the cache.
+
+        Args:
+            keys (List[str]): The keys to delete.
+        """
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def delete_keys_pattern(self, pattern: str) -> None:
+        """
+        Delete the keys matching the (glob-style) pattern from the cache.
+
+        Args:
+            pattern (str): The pattern to match.
+        """
+        with self._lock:
+            for key in [k for k in self._data if fnmatch.fnmatchcase(k, pattern)]:
+                del self._data[key]
@@ -1,11 +1,13 @@
+import asyncio
 import json
 import logging
 import os
 from contextlib import AbstractContextManager, contextmanager
-from typing import Any, Dict, List, TypeVar
+from typing import Any, AsyncIterator, Dict, List, Optional, TypeVar
 
 import fakeredis
 import redis
+import redis.asyncio
 from dotenv import load_dotenv
 
 from langroid.cachedb.base import CacheDB, CacheDBConfig
@@ -18,6 +20,7 @@ class RedisCacheConfig(CacheDBConfig):
     """Configuration model for RedisCache."""
 
     fake: bool = False
+    ttl: Optional[int] = None  # expiry (seconds) of stored keys; None = never
 
 
 class RedisCache(CacheDB):
@@ -34,9 +37,16 @@ class RedisCache(CacheDB):
         """
         self.config = config
         load_dotenv()
+        # async clients (and their closing hooks), per event loop they are bound to
+        self._async_clients: Dict[asyncio.AbstractEventLoop, Any] = {}
+        self._shutdown_hooks: Dict[asyncio.AbstractEventLoop, AsyncIterator[None]] = {}
+        # connection kwargs of the real redis server, if any
+        self._redis_kwargs: Dict[str, Any] = {}
+        # in-memory server backing both the sync and async fake clients
+        self._fake_server = fakeredis.FakeServer()
 
         if self.config.fake:
-            self.pool = fakeredis.FakeStrictRedis()  # type: ignore
+            self.pool = fakeredis.FakeStrictRedis(server=self._fake_server)  # type: ignore
         else:
             redis_password = os.getenv("REDIS_PASSWORD")
             redis_host = os.getenv("REDIS_HOST") or None
@@ -48,9 +58,11 @@ class RedisCache(CacheDB):
                         using fake redis client"""
                     )
                     RedisCache._warned_password = True
-                self.pool = fakeredis.FakeStrictRedis()  # type: ignore
+                self.pool = fakeredis.FakeStrictRedis(  # type: ignore
+                    server=self._fake_server
+                )
             else:
-                self.pool = redis.ConnectionPool(  # type: ignore
+                self._redis_kwargs = dict(
                     host=redis_host,
                     port=redis_port,
                     password=redis_password,
@@ -60,6 +72,7 @@ class RedisCache(CacheDB):
                     retry_on_timeout=True,
                     health_check_interval=30,
                 )
+                self.pool = redis.ConnectionPool(**self._redis_kwargs)  # type: ignore
 
     @contextmanager  # type: ignore
     def redis_client(self) -> AbstractContextManager[T]:  # type: ignore
@@ -73,6 +86,46 @@ class RedisCache(CacheDB):
             finally:
                 client.close()
 
+    async def _aclient(self) -> Any:
+        """
+        Async redis client for the running event loop (clients can't be
+        shared across loops, so one is made per loop). It is closed when its
+        loop shuts down its async generators, as `asyncio.run` does before
+        closing the loop.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is not None:
+            return client
+        for closed in [lp for lp in self._async_clients if lp.is_closed()]:
+            # closed without shutting down its async generators: the client
+            # can't be closed from another loop, so just drop it
+            self._async_clients.pop(closed)
+            self._shutdown_hooks.pop(closed, None)
+        if len(self._redis_kwargs) == 0:
+            client = fakeredis.FakeAsyncRedis(server=self._fake_server)
+        else:
+            client = redis.asyncio.Redis(
+                connection_pool=redis.asyncio.ConnectionPool(**self._redis_kwargs)
+            )
+        self._async_clients[loop] = client
+
+        async def close_on_shutdown() -> AsyncIterator[None]:
+            try:
+                yield
+            finally:
+                self._shutdown_hooks.pop(loop, None)
+                self._async_clients.pop(loop, None)
+                try:
+                    await client.aclose(close_connection_pool=True)
+                except Exception as e:
+                    logger.warning(f"Error closing async redis client: {e}")
+
+        hook = close_on_shutdown()
+        await hook.__anext__()
+        self._shutdown_hooks[loop] = hook
+        return client
+
     def close_all_connections(self) -> None:
         with self.redis_client() as client:  # type: ignore
             clients = client.client_list()
@@ -99,7 +152,7 @@ class RedisCache(CacheDB):
         """
         with self.redis_client() as client:  # type: ignore
             try:
-                client.set(key, json.dumps(value))
+                client.set(key, json.dumps(value), ex=self.config.ttl)
             except redis.exceptions.ConnectionError:
                 logger.warning("Redis connection error, not storing key/value")
                 return None
@@ -122,6 +175,77 @@ class RedisCache(CacheDB):
                 return None
             return json.loads(value) if value else None
 
+    async def astore(self, key: str, value: Any) -> None:
+        """
+        Store a value associated with a key, via the async redis client.
+
+        Args:
+            key (str): The key under which to store the value.
+            value (Any): The value to store.
+        """
+        try:
+            client = await self._aclient()
+            await client.set(key, json.dumps(value), ex=self.config.ttl)
+        except redis.exceptions.ConnectionError:
+            logger.warning("Redis connection error, not storing key/value")
+
+    async def aretrieve(self, key: str) -> Dict[str, Any] | str | None:
+        """
+        Retrieve the value associated with a key, via the async redis client.
+
+        Args:
+            key (str): The key to retrieve the value for.
+
+        Returns:
+            dict|str|None: The value associated with the key.
+        """
+        try:
+            client = await self._aclient()
+            value = await client.get(key)
+        except redis.exceptions.ConnectionError:
+            logger.warning("Redis connection error, returning None")
+            return None
+        return json.loads(value) if value else None
+
+    def store_many(self, items: Dict[str, Any]) -> None:
+        """
+        Store several key/value pairs in a single round-trip.
+
+        Args:
+            items (Dict[str, Any]): mapping of keys to the values to store.
+        """
+        if len(items) == 0:
+            return
+        with self.redis_client() as client:  # type: ignore
+            try:
+                pipe = client.pipeline()
+                for key, value in items.items():
+                    pipe.set(key, json.dumps(value), ex=self.config.ttl)
+                pipe.execute()
+            except redis.exceptions.ConnectionError:
+                logger.warning("Redis connection error, not storing key/values")
+                return None
+
+    def retrieve_many(self, keys: List[str]) -> List[Dict[str, Any] | str | None]:
+        """
+        Retrieve the values of several keys in a single round-trip.
+
+        Args:
+            keys (List[str]): The keys to retrieve the values for.
+
+        Returns:
+            List: The values associated with the keys (None if missing).
+        """
+        if len(keys) == 0:
+            return []
+        with self.redis_client() as client:  # type: ignore
+            try:
+                values = client.mget(keys)
+            except redis.exceptions.ConnectionError:
+                logger.warning("Redis connection error, returning None")
+                return [None] * len(keys)
+            return [json.loads(v) if v else None for v in values]
+
     def delete_keys(self, keys: List[str]) -> None:
         """
         Delete the keys from the cache.
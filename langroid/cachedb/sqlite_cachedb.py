@@ -0,0 +1,176 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from langroid.cachedb.base import CacheDB, CacheDBConfig
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCacheConfig(CacheDBConfig):
+    """Configuration model for SQLiteCache."""
+
+    storage_path: str = ".langroid/cache.db"
+    # max number of entries kept; least-recently-used entries are evicted
+    # beyond this. None = unbounded
+    max_entries: Optional[int] = None
+
+
+class SQLiteCache(CacheDB):
+    """
+    Local, on-disk SQLite implementation of the CacheDB, with optional
+    LRU eviction. Useful when no Redis server is available.
+    """
+
+    def __init__(self, config: SQLiteCacheConfig):
+        """
+        Initialize a SQLiteCache with the given config.
+
+        Args:
+            config (SQLiteCacheConfig): The configuration to use.
+        """
+        self.config = config
+        dir_name = os.path.dirname(config.storage_path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(config.storage_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_last_used ON cache (last_used)"
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0])
+
+    def clear(self) -> None:
+        """Clear all keys."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def store(self, key: str, value: Any) -> None:
+        """
+        Store a value associated with a key.
+
+        Args:
+            key (str): The key under which to store the value.
+            value (Any): The value to store.
+        """
+        self.store_many({key: value})
+
+    def store_many(self, items: Dict[str, Any]) -> None:
+        """
+        Store several key/value pairs in a single transaction.
+
+        Args:
+            items (Dict[str, Any]): mapping of keys to the values to store.
+        """
+        if len(items) == 0:
+            return
+        now = time.time()
+        rows = [(k, json.dumps(v), now) for k, v in items.items()]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, last_used) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries beyond `max_entries`."""
+        if self.config.max_entries is None:
+            return
+        n = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        excess = n - self.config.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY last_used ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def retrieve(self, key: str) -> Dict[str, Any] | str | None:
+        """
+        Retrieve the value associated with a key.
+
+        Args:
+            key (str): The key to retrieve the value for.
+
+        Returns:
+            dict|str|None: The value associated with the key.
+        """
+        return self.retrieve_many([key])[0]
+
+    def retrieve_many(self, keys: List[str]) -> List[Dict[str, Any] | str | None]:
+        """
+        Retrieve the values of several keys, marking them as recently used.
+
+        Args:
+            keys (List[str]): The keys to retrieve the values for.
+
+        Returns:
+            List: The values associated with the keys (None if missing).
+        """
+        if len(keys) == 0:
+            return []
+        found: Dict[str, str] = {}
+        # stay well under SQLite's limit on the number of query parameters
+        chunk = 500
+        with self._lock, self._conn:
+            for i in range(0, len(keys), chunk):
+                part = keys[i : i + chunk]
+                marks = ",".join("?" * len(part))
+                found.update(
+                    self._conn.execute(
+                        f"SELECT key, value FROM cache WHERE key IN ({marks})", part
+                    ).fetchall()
+                )
+            if self.config.max_entries is not None and len(found) > 0:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE cache SET last_used = ? WHERE key = ?",
+                    [(now, k) for k in found],
+                )
+        return [json.loads(found[k]) if k in found else None for k in keys]
+
+    def delete_keys(self, keys: List[str]) -> None:
+        """
+        Delete the keys from the cache.
+
+        Args:
+            keys (List[str]): The keys to delete.
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM cache WHERE key = ?", [(k,) for k in keys]
+            )
+
+    def delete_keys_pattern(self, pattern: str) -> None:
+        """
+        Delete the keys matching the (glob-style) pattern from the cache.
+
+        Args:
+            pattern (str): The pattern to match.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE key GLOB ?", (pattern,))
@@ -0,0 +1,127 @@
+from typing import Any, Dict, List, Optional
+
+from langroid.cachedb.base import CacheDB
+from langroid.cachedb.memory_cachedb import MemoryCache, MemoryCacheConfig
+
+
+class TieredCache(CacheDB):
+    """
+    Two-tier CacheDB: an in-process `MemoryCache` (LRU, TTL-bounded) in front
+    of a shared backend (e.g. `RedisCache` or `SQLiteCache`). Lookups check
+    the memory tier first and fall back to the backend, populating the
+    memory tier on a backend hit; stores write through to both tiers.
+    Hit/miss counts are kept per tier (see `stats()`).
+    """
+
+    def __init__(
+        self,
+        backend: CacheDB,
+        memory_config: MemoryCacheConfig = MemoryCacheConfig(),
+    ):
+        """
+        Args:
+            backend (CacheDB): the shared (second-tier) cache
+            memory_config (MemoryCacheConfig): config of the in-process tier
+        """
+        self.backend = backend
+        self.memory = MemoryCache(memory_config)
+        self._stats: Dict[str, Dict[str, int]] = {
+            "memory": dict(hits=0, misses=0),
+            "backend": dict(hits=0, misses=0),
+        }
+
+    def _record(self, tier: str, hit: bool) -> None:
+        self._stats[tier]["hits" if hit else "misses"] += 1
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-tier lookup statistics.
+
+        Returns:
+            Dict[str, Dict[str, float]]: for each tier ("memory", "backend"),
+                the number of hits, misses and the hit rate.
+        """
+        result: Dict[str, Dict[str, float]] = {}
+        for tier, counts in self._stats.items():
+            n = counts["hits"] + counts["misses"]
+            result[tier] = dict(
+                hits=counts["hits"],
+                misses=counts["misses"],
+                hit_rate=counts["hits"] / n if n > 0 else 0.0,
+            )
+        return result
+
+    def clear(self) -> None:
+        """Clear keys from both tiers."""
+        self.memory.clear()
+        clear = getattr(self.backend, "clear", None)
+        if clear is not None:
+            clear()
+
+    def store(self, key: str, value: Any) -> None:
+        """
+        Store a value associated with a key, in both tiers.
+
+        Args:
+            key (str): The key under which to store the value.
+            value (Any): The value to store.
+        """
+        self.memory.store(key, value)
+        self.backend.store(key, value)
+
+    def retrieve(self, key: str) -> Dict[str, Any] | str | None:
+        """
+        Retrieve the value associated with a key.
+
+        Args:
+            key (str): The key to retrieve the value for.
+
+        Returns:
+            dict|str|None: The value associated with the key.
+        """
+        value = self.memory.retrieve(key)
+        self._record("memory", value is not None)
+        if value is not None:
+            return value
+        value = self.backend.retrieve(key)
+        return self._backend_result(key, value)
+
+    async def astore(self, key: str, value: Any) -> None:
+        self.memory.store(key, value)
+        await self.backend.astore(key, value)
+
+    async def aretrieve(self, key: str) -> Dict[str, Any] | str | None:
+        value = self.memory.retrieve(key)
+        self._record("memory", value is not None)
+        if value is not None:
+            return value
+        value = await self.backend.aretrieve(key)
+        return self._backend_result(key, value)
+
+    def _backend_result(
+        self, key: str, value: Optional[Dict[str, Any] | str]
+    ) -> Dict[str, Any] | str | None:
+        self._record("backend", value is not None)
+        if value is not None:
+            self.memory.store(key, value)
+        return value
+
+    def delete_keys(self, keys: List[str]) -> None:
+        """
+        Delete the keys from both tiers.
+
+        Args:
+            keys (List[str]): The keys to delete.
+        """
+        self.memory.delete_keys(keys)
+        self.backend.delete_keys(keys)
+
+    def delete_keys_pattern(self, pattern: str) -> None:
+        """
+        Delete the keys matching the pattern from both tiers.
+
+        Args:
+            pattern (str): The pattern to match.
+        """
+        self.memory.delete_keys_pattern(pattern)
+        self.backend.delete_keys_pattern(pattern)
@@ -1,11 +1,13 @@
 from . import base
 from . import models
 from . import remote_embeds
+from . import embedding_cache
 
 from .base import (
     EmbeddingModel,
     EmbeddingModelsConfig,
 )
+from .embedding_cache import EmbeddingCache
 from .models import (
     OpenAIEmbeddings,
     OpenAIEmbeddingsConfig,
@@ -27,6 +29,8 @@ __all__ = [
     "base",
     "models",
     "remote_embeds",
+    "embedding_cache",
+    "EmbeddingCache",
     "EmbeddingModel",
     "EmbeddingModelsConfig",
     "OpenAIEmbeddings",
@@ -1,9 +1,12 @@
 import logging
 from abc import ABC, abstractmethod
+from typing import Optional
 
 import numpy as np
 from pydantic_settings import BaseSettings
 
+from langroid.cachedb.base import CacheDBConfig
+from langroid.embedding_models.embedding_cache import EmbeddingCache, get_cachedb
 from langroid.mytypes import EmbeddingFunction
 
 logging.getLogger("openai").setLevel(logging.ERROR)
@@ -14,6 +17,9 @@ class EmbeddingModelsConfig(BaseSettings):
     dims: int = 0
     context_length: int = 512
     batch_size: int = 512
+    # opt-in cache of embeddings, keyed by (model, dims, text), shared by all
+    # users of the same model; e.g. SQLiteCacheConfig() or RedisCacheConfig()
+    cache_config: Optional[CacheDBConfig] = None
 
 
 class EmbeddingModel(ABC):
@@ -36,6 +42,25 @@ class EmbeddingModel(ABC):
                 pass
         return self
 
+    @property
+    def embedding_cache(self) -> Optional[EmbeddingCache]:
+        """
+        Cache of this model's embeddings (None unless `config.cache_config`
+        is set); its `hits` and `misses` counters track cache effectiveness.
+        """
+        config = getattr(self, "config", None)
+        if config is None or config.cache_config is None:
+            return None
+        cache: Optional[EmbeddingCache] = getattr(self, "_embedding_cache", None)
+        if cache is None:
+            cache = EmbeddingCache(
+                get_cachedb(config.cache_config),
+                model_name=getattr(config, "model_name", config.model_type),
+                dims=config.dims,
+            )
+            self._embedding_cache = cache
+        return cache
+
     @classmethod
     def create(cls, config: EmbeddingModelsConfig) -> "EmbeddingModel":
         from langroid.embedding_models.models import (
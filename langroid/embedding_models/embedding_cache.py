@@ -0,0 +1,140 @@
+"""
+Content-addressed cache of embedding vectors.
+
+Vectors are keyed by (model name, dims, sha256 of text), so they are shared by
+every vector store (and agent) using the same embedding model, and survive
+re-ingestion of unchanged documents. Storage is delegated to a `CacheDB`:
+a local `SQLiteCache` (with LRU eviction) or a `RedisCache`.
+Enable it by setting `cache_config` in the `EmbeddingModelsConfig`, e.g.
+
+    OpenAIEmbeddingsConfig(cache_config=SQLiteCacheConfig(max_entries=100_000))
+
+See tests for examples: tests/main/test_embedding_cache.py
+"""
+
+import base64
+import hashlib
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from langroid.cachedb.base import CacheDB, CacheDBConfig
+from langroid.mytypes import Embeddings
+
+logger = logging.getLogger(__name__)
+
+# CacheDB instances shared across all embedding fns using the same cache config
+_cachedb_registry: Dict[str, CacheDB] = {}
+_registry_lock = threading.Lock()
+
+
+def _create_cachedb(config: CacheDBConfig) -> CacheDB:
+    from langroid.cachedb.redis_cachedb import RedisCache, RedisCacheConfig
+    from langroid.cachedb.sqlite_cachedb import SQLiteCache, SQLiteCacheConfig
+
+    if isinstance(config, SQLiteCacheConfig):
+        return SQLiteCache(config)
+    elif isinstance(config, RedisCacheConfig):
+        return RedisCache(config)
+    else:
+        raise ValueError(f"Unknown cache config: {config.__class__.__name__}")
+
+
+def get_cachedb(config: CacheDBConfig) -> CacheDB:
+    """
+    Get the (process-wide, shared) CacheDB for the given config.
+
+    Args:
+        config (CacheDBConfig): the cache config
+
+    Returns:
+        CacheDB: the shared cache instance
+    """
+    key = f"{config.__class__.__name__}:{config.model_dump_json()}"
+    with _registry_lock:
+        cachedb = _cachedb_registry.get(key)
+        if cachedb is None:
+            cachedb = _create_cachedb(config)
+            _cachedb_registry[key] = cachedb
+        return cachedb
+
+
+class EmbeddingCache:
+    """
+    Cache of embedding vectors for one embedding model, with hit/miss counters.
+    Vectors are stored as base64-encoded float32 arrays.
+    """
+
+    def __init__(self, cachedb: CacheDB, model_name: str, dims: int):
+        self.cachedb = cachedb
+        self.prefix = f"emb:{model_name}:{dims}:"
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text: str) -> str:
+        return self.prefix + hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_or_compute(
+        self,
+        texts: Sequence[str],
+        compute: Callable[[List[str]], Embeddings],
+    ) -> Embeddings:
+        """
+        Look up the embeddings of `texts`, calling `compute` (once, on the
+        distinct missing texts only) for those not in the cache, and storing them.
+
+        Args:
+            texts: texts to embed
+            compute: fn embedding a list of texts (e.g. in batches via the model)
+
+        Returns:
+            Embeddings: embeddings of `texts`, in order
+        """
+        keys = [self.key(t) for t in texts]
+        try:
+            cached = self.cachedb.retrieve_many(keys)
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed, ignoring cache: {e}")
+            cached = [None] * len(keys)
+        results: List[Optional[List[float]]] = [
+            self._decode(v) if isinstance(v, str) else None for v in cached
+        ]
+        # distinct missing texts -> positions needing them
+        missing: Dict[str, List[int]] = {}
+        for i, (k, r) in enumerate(zip(keys, results)):
+            if r is None:
+                missing.setdefault(k, []).append(i)
+        n_missing = sum(len(positions) for positions in missing.values())
+        self.hits += len(texts) - n_missing
+        self.misses += n_missing
+        if len(missing) > 0:
+            miss_texts = [texts[positions[0]] for positions in missing.values()]
+            embeds = compute(miss_texts)
+            if len(embeds) != len(miss_texts):
+                # e.g. a model returning several vectors for long texts:
+                # results can't be matched to texts, so bypass the cache
+                logger.warning("Embedding count does not match text count; not caching")
+                return compute(list(texts))
+            to_store = {}
+            for (k, positions), emb in zip(missing.items(), embeds):
+                for i in positions:
+                    results[i] = emb
+                to_store[k] = self._encode(emb)
+            try:
+                self.cachedb.store_many(to_store)
+            except Exception as e:
+                logger.warning(f"Embedding cache store failed: {e}")
+        return results  # type: ignore
+
+    @staticmethod
+    def _encode(embedding: List[float]) -> str:
+        return base64.b64encode(
+            np.asarray(embedding, dtype=np.float32).tobytes()
+        ).decode("ascii")
+
+    @staticmethod
+    def _decode(value: str) -> List[float]:
+        vec = np.frombuffer(base64.b64decode(value), dtype=np.float32)
+        return [float(x) for x in vec]
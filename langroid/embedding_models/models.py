@@ -132,6 +132,13 @@ class EmbeddingFunctionCallable:
         Returns:
             Embeddings: A list of embedding vectors corresponding to the input texts.
         """
+        cache = self.embed_model.embedding_cache
+        if cache is not None:
+            # only texts not already in the cache are sent to the model
+            return cache.get_or_compute(input, self._embed)
+        return self._embed(input)
+
+    def _embed(self, input: List[str]) -> Embeddings:
         embeds = []
         if isinstance(self.embed_model, (OpenAIEmbeddings, AzureOpenAIEmbeddings)):
             # Truncate texts to context length while preserving text format
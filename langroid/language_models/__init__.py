@@ -1,4 +1,5 @@
 from . import utils
+from . import rate_limiter
 from . import config
 from . import base
 from . import openai_gpt
@@ -15,6 +16,7 @@ from .base import (
     LLMTokenUsage,
     LLMResponse,
 )
+from .rate_limiter import RateLimitConfig
 from .model_info import (
     OpenAIChatModel,
     AnthropicModel,
@@ -29,6 +31,7 @@ from .azure_openai import AzureConfig, AzureGPT
 
 __all__ = [
     "utils",
+    "rate_limiter",
     "config",
     "base",
     "openai_gpt",
@@ -43,6 +46,7 @@ __all__ = [
     "Role",
     "LLMTokenUsage",
     "LLMResponse",
+    "RateLimitConfig",
     "OpenAIChatModel",
     "AnthropicModel",
     "GeminiModel",
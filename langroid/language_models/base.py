@@ -7,6 +7,7 @@ from typing import (
     Any,
     Awaitable,
     Callable,
+    ClassVar,
     Dict,
     List,
     Literal,
@@ -17,12 +18,14 @@ from typing import (
     cast,
 )
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from pydantic_settings import BaseSettings
 
 from langroid.cachedb.base import CacheDBConfig
+from langroid.cachedb.memory_cachedb import MemoryCacheConfig
 from langroid.cachedb.redis_cachedb import RedisCacheConfig
 from langroid.language_models.model_info import ModelInfo, get_model_info
+from langroid.language_models.rate_limiter import RateLimitConfig
 from langroid.parsing.agent_chats import parse_message
 from langroid.parsing.file_attachment import FileAttachment
 from langroid.parsing.parse_json import parse_imperfect_json, top_level_json_field
@@ -93,8 +96,12 @@ class LLMConfig(BaseSettings):
     # TODO: we could have a `stream_reasoning` flag here to control whether to show
     # reasoning output from reasoning models
     cache_config: None | CacheDBConfig = RedisCacheConfig()
+    # in-process LRU tier in front of the `cache_config` cache; None to disable
+    memory_cache_config: None | MemoryCacheConfig = MemoryCacheConfig()
     thought_delimiters: Tuple[str, str] = ("<think>", "</think>")
     retry_params: RetryParams = RetryParams()
+    # client-side limits, shared by all LLMs with the same model and api_base
+    rate_limit: RateLimitConfig = RateLimitConfig()
 
     @property
     def model_max_output_tokens(self) -> int:
@@ -291,6 +298,38 @@ class LLMMessage(BaseModel):
     # link to corresponding chat document, for provenance/rewind purposes
     chat_document_id: str = ""
 
+    # fields whose change alters the token count of the message
+    _TOKEN_FIELDS: ClassVar[frozenset[str]] = frozenset({"content", "files", "role"})
+    # bumped whenever a message whose token count was cached is mutated,
+    # so running totals over message lists can detect staleness in O(1)
+    token_epoch: ClassVar[int] = 0
+    # cached token count, and the tokenizer-identity key it was computed with
+    _num_tokens: Optional[int] = PrivateAttr(default=None)
+    _num_tokens_key: str = PrivateAttr(default="")
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if (
+            name in LLMMessage._TOKEN_FIELDS
+            and getattr(self, "_num_tokens", None) is not None
+        ):
+            self._num_tokens = None
+            LLMMessage.token_epoch += 1
+        super().__setattr__(name, value)
+
+    def cached_num_tokens(self, key: str) -> Optional[int]:
+        """
+        Token count of this message cached by `set_cached_num_tokens`, if it was
+        computed with the tokenizer identified by `key` and the content has not
+        been re-assigned since. (In-place mutation of `files` is not tracked.)
+        """
+        if self._num_tokens is None or self._num_tokens_key != key:
+            return None
+        return self._num_tokens
+
+    def set_cached_num_tokens(self, key: str, n: int) -> None:
+        self._num_tokens = n
+        self._num_tokens_key = key
+
     def api_dict(self, model: str, has_system_role: bool = True) -> Dict[str, Any]:
         """
         Convert to dictionary for API request, keeping ONLY
@@ -1,4 +1,3 @@
-import hashlib
 import json
 import logging
 import os
@@ -30,8 +29,10 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from rich import print
 from rich.markup import escape
 
-from langroid.cachedb.base import CacheDB
+from langroid.cachedb.base import CacheDB, canonical_key
 from langroid.cachedb.redis_cachedb import RedisCache, RedisCacheConfig
+from langroid.cachedb.sqlite_cachedb import SQLiteCache, SQLiteCacheConfig
+from langroid.cachedb.tiered_cachedb import TieredCache
 from langroid.exceptions import LangroidImportError
 from langroid.language_models.base import (
     LanguageModel,
@@ -77,6 +78,11 @@ from langroid.language_models.provider_params import (
     LangDBParams,
     PortkeyParams,
 )
+from langroid.language_models.rate_limiter import (
+    RateLimiter,
+    estimate_tokens,
+    get_rate_limiter,
+)
 from langroid.language_models.utils import (
     async_retry_with_exponential_backoff,
     retry_with_exponential_backoff,
@@ -793,25 +799,38 @@ class OpenAIGPT(LanguageModel):
                 self.async_client = AsyncOpenAI(**async_client_kwargs)
 
         self.cache: CacheDB | None = None
+        backend: CacheDB | None = None
         use_cache = self.config.cache_config is not None
-        if "redis" in settings.cache_type and use_cache:
-            if config.cache_config is None or not isinstance(
-                config.cache_config,
-                RedisCacheConfig,
-            ):
-                # switch to fresh redis config if needed
-                config.cache_config = RedisCacheConfig(
-                    fake="fake" in settings.cache_type
-                )
-            if "fake" in settings.cache_type:
-                # force use of fake redis if global cache_type is "fakeredis"
-                config.cache_config.fake = True
-            self.cache = RedisCache(config.cache_config)
+        if settings.cache_type == "sqlite" and use_cache:
+            if not isinstance(config.cache_config, SQLiteCacheConfig):
+                config.cache_config = SQLiteCacheConfig()
+            backend = SQLiteCache(config.cache_config)
+        elif "redis" in settings.cache_type and use_cache:
+            if isinstance(config.cache_config, SQLiteCacheConfig):
+                # local cache explicitly configured, e.g. when redis isn't available
+                backend = SQLiteCache(config.cache_config)
+            else:
+                if config.cache_config is None or not isinstance(
+                    config.cache_config,
+                    RedisCacheConfig,
+                ):
+                    # switch to fresh redis config if needed
+                    config.cache_config = RedisCacheConfig(
+                        fake="fake" in settings.cache_type
+                    )
+                if "fake" in settings.cache_type:
+                    # force use of fake redis if global cache_type is "fakeredis"
+                    config.cache_config.fake = True
+                backend = RedisCache(config.cache_config)
         elif settings.cache_type != "none" and use_cache:
             raise ValueError(
                 f"Invalid cache type {settings.cache_type}. "
-                "Valid types are redis, fakeredis, none"
+                "Valid types are redis, fakeredis, sqlite, none"
             )
+        if backend is not None and config.memory_cache_config is not None:
+            self.cache = TieredCache(backend, config.memory_cache_config)
+        else:
+            self.cache = backend
 
         self.config._validate_litellm()
 
@@ -1713,15 +1732,19 @@ class OpenAIGPT(LanguageModel):
             logging.error(f"Error in OpenAIGPT._cache_store: {e}")
             pass
 
+    async def _acache_store(self, k: str, v: Any) -> None:
+        if self.cache is None:
+            return
+        try:
+            await self.cache.astore(k, v)
+        except Exception as e:
+            logging.error(f"Error in OpenAIGPT._acache_store: {e}")
+
     def _cache_lookup(self, fn_name: str, **kwargs: Dict[str, Any]) -> Tuple[str, Any]:
         if self.cache is None:
             return "", None  # no cache, return empty key and None result
-        # Use the kwargs as the cache key
-        sorted_kwargs_str = str(sorted(kwargs.items()))
-        raw_key = f"{fn_name}:{sorted_kwargs_str}"
-
-        # Hash the key to a fixed length using SHA256
-        hashed_key = hashlib.sha256(raw_key.encode()).hexdigest()
+        # Use the (canonicalized) kwargs as the cache key
+        hashed_key = canonical_key(fn_name, **kwargs)
 
         if not settings.cache:
             # when caching disabled, return the hashed_key and none result
@@ -1734,6 +1757,82 @@ class OpenAIGPT(LanguageModel):
             return hashed_key, None
         return hashed_key, cached_val
 
+    async def _acache_lookup(
+        self, fn_name: str, **kwargs: Dict[str, Any]
+    ) -> Tuple[str, Any]:
+        """Like `_cache_lookup`, but does not block the event loop."""
+        if self.cache is None:
+            return "", None
+        hashed_key = canonical_key(fn_name, **kwargs)
+        if not settings.cache:
+            return hashed_key, None
+        try:
+            cached_val = await self.cache.aretrieve(hashed_key)
+        except Exception as e:
+            logging.error(f"Error in OpenAIGPT._acache_lookup: {e}")
+            return hashed_key, None
+        return hashed_key, cached_val
+
+    def _rate_limiter(self, model: str) -> RateLimiter:
+        """The process-wide rate limiter for calls to `model` at our api_base."""
+        return get_rate_limiter(
+            model or self.config.chat_model,
+            self.api_base,
+            self.config.rate_limit,
+        )
+
+    def _rate_limited_call(
+        self, call: Callable[..., Any], kwargs: Dict[str, Any]
+    ) -> Any:
+        """
+        Make the API call `call(**kwargs)` once admitted by the rate limiter.
+        A streamed response keeps its slot until the stream is consumed.
+        """
+        limiter = self._rate_limiter(kwargs.get("model", ""))
+        tokens = estimate_tokens(kwargs)
+        if kwargs.get("stream"):
+            limiter.acquire(tokens)
+            try:
+                stream = call(**kwargs)
+            except BaseException:
+                limiter.release(success=False)
+                raise
+            return limiter.limit_stream(stream)
+        with limiter.limit(tokens):
+            result = call(**kwargs)
+        self._settle_token_estimate(limiter, tokens, result)
+        return result
+
+    async def _arate_limited_call(
+        self, call: Callable[..., Any], kwargs: Dict[str, Any]
+    ) -> Any:
+        """Async version of `_rate_limited_call`."""
+        limiter = self._rate_limiter(kwargs.get("model", ""))
+        tokens = estimate_tokens(kwargs)
+        if kwargs.get("stream"):
+            await limiter.aacquire(tokens)
+            try:
+                stream = await call(**kwargs)
+            except BaseException:
+                limiter.release(success=False)
+                raise
+            return limiter.alimit_stream(stream)
+        async with limiter.alimit(tokens):
+            result = await call(**kwargs)
+        self._settle_token_estimate(limiter, tokens, result)
+        return result
+
+    @staticmethod
+    def _settle_token_estimate(
+        limiter: RateLimiter, estimated: int, result: Any
+    ) -> None:
+        # correct the tokens/minute budget when the actual usage is known
+        # (i.e. not when streaming)
+        usage = getattr(result, "usage", None)
+        total = getattr(usage, "total_tokens", None)
+        if isinstance(total, int):
+            limiter.adjust_tokens(total - estimated)
+
     def _cost_chat_model(self, prompt: int, cached: int, completion: int) -> float:
         price = self.chat_cost()
         return (
@@ -1807,8 +1906,7 @@ class OpenAIGPT(LanguageModel):
         if settings.debug:
             print(f"[grey37]PROMPT: {escape(prompt)}[/grey37]")
 
-        @retry_with_exponential_backoff
-        def completions_with_backoff(**kwargs):  # type: ignore
+        def completions(**kwargs):  # type: ignore
             cached = False
             hashed_key, result = self._cache_lookup("Completion", **kwargs)
             if result is not None:
@@ -1833,7 +1931,7 @@ class OpenAIGPT(LanguageModel):
                 if self.config.litellm and settings.debug:
                     kwargs["logger_fn"] = litellm_logging_fn
                 # If it's not in the cache, call the API
-                result = completion_call(**kwargs)
+                result = self._rate_limited_call(completion_call, kwargs)
                 if self.get_stream():
                     llm_response, openai_response = self._stream_response(
                         result,
@@ -1858,6 +1956,9 @@ class OpenAIGPT(LanguageModel):
             stream=self.get_stream(),
         )
         args = self._openai_api_call_params(args)
+        completions_with_backoff = retry_with_exponential_backoff(
+            completions, rate_limiter=self._rate_limiter(args["model"])
+        )
         cached, hashed_key, response = completions_with_backoff(**args)
         # assume response is an actual response rather than a streaming event
         if not isinstance(response, dict):
@@ -1899,10 +2000,9 @@ class OpenAIGPT(LanguageModel):
         # WARNING: .Completion.* endpoints are deprecated,
         # and as of Sep 2023 only legacy models will work here,
         # e.g. text-davinci-003, text-ada-001.
-        @async_retry_with_exponential_backoff
-        async def completions_with_backoff(**kwargs):  # type: ignore
+        async def completions(**kwargs):  # type: ignore
             cached = False
-            hashed_key, result = self._cache_lookup("AsyncCompletion", **kwargs)
+            hashed_key, result = await self._acache_lookup("AsyncCompletion", **kwargs)
             if result is not None:
                 cached = True
                 if settings.debug:
@@ -1925,8 +2025,8 @@ class OpenAIGPT(LanguageModel):
                 if self.config.litellm and settings.debug:
                     kwargs["logger_fn"] = litellm_logging_fn
                 # If it's not in the cache, call the API
-                result = await acompletion_call(**kwargs)
-                self._cache_store(hashed_key, result.model_dump())
+                result = await self._arate_limited_call(acompletion_call, kwargs)
+                await self._acache_store(hashed_key, result.model_dump())
             return cached, hashed_key, result
 
         kwargs: Dict[str, Any] = dict(model=self.config.completion_model)
@@ -1936,6 +2036,9 @@ class OpenAIGPT(LanguageModel):
             kwargs["messages"] = [dict(content=prompt, role=Role.SYSTEM)]
         else:  # any other OpenAI-compatible endpoint
             kwargs["prompt"] = prompt
+        completions_with_backoff = async_retry_with_exponential_backoff(
+            completions, rate_limiter=self._rate_limiter(kwargs["model"])
+        )
         cached, hashed_key, response = await completions_with_backoff(
             **kwargs,
             max_tokens=max_tokens,
@@ -2078,7 +2181,7 @@ class OpenAIGPT(LanguageModel):
                 completion_call = self.client.chat.completions.create
             if self.config.litellm and settings.debug:
                 kwargs["logger_fn"] = litellm_logging_fn
-            result = completion_call(**kwargs)
+            result = self._rate_limited_call(completion_call, kwargs)
 
             if self.get_stream():
                 # If streaming, cannot cache result
@@ -2115,12 +2218,13 @@ class OpenAIGPT(LanguageModel):
             max_retries=self.config.retry_params.max_retries,
             exponential_base=self.config.retry_params.exponential_base,
             jitter=self.config.retry_params.jitter,
+            rate_limiter=self._rate_limiter(kwargs.get("model", "")),
         )
         return retry_func(**kwargs)
 
     async def _achat_completions_with_backoff_body(self, **kwargs):  # type: ignore
         cached = False
-        hashed_key, result = self._cache_lookup("Completion", **kwargs)
+        hashed_key, result = await self._acache_lookup("Completion", **kwargs)
         if result is not None:
             cached = True
             if settings.debug:
@@ -2142,7 +2246,7 @@ class OpenAIGPT(LanguageModel):
             if self.config.litellm and settings.debug:
                 kwargs["logger_fn"] = litellm_logging_fn
             # If it's not in the cache, call the API
-            result = await acompletion_call(**kwargs)
+            result = await self._arate_limited_call(acompletion_call, kwargs)
             if self.get_stream():
                 try:
                     # Try to peek at the first chunk to immediately catch any errors
@@ -2172,7 +2276,7 @@ class OpenAIGPT(LanguageModel):
                     # Any exception here should be raised to trigger the retry mechanism
                     raise e
             else:
-                self._cache_store(hashed_key, result.model_dump())
+                await self._acache_store(hashed_key, result.model_dump())
         return cached, hashed_key, result
 
     async def _achat_completions_with_backoff(self, **kwargs):  # type: ignore
@@ -2182,6 +2286,7 @@ class OpenAIGPT(LanguageModel):
             max_retries=self.config.retry_params.max_retries,
             exponential_base=self.config.retry_params.exponential_base,
             jitter=self.config.retry_params.jitter,
+            rate_limiter=self._rate_limiter(kwargs.get("model", "")),
         )
         return await retry_func(**kwargs)
 
@@ -2484,7 +2589,7 @@ class OpenAIGPT(LanguageModel):
             llm_response, openai_response = await self._stream_response_async(
                 response, chat=True
             )
-            self._cache_store(hashed_key, openai_response)
+            await self._acache_store(hashed_key, openai_response)
             return llm_response  # type: ignore
         if isinstance(response, dict):
             response_dict = response
@@ -0,0 +1,394 @@
+"""
+Process-wide client-side rate limiting of LLM API calls.
+
+All `OpenAIGPT` instances in a process that talk to the same model at the same
+API base URL share one `RateLimiter` (see `get_rate_limiter`), which combines:
+- token buckets for requests/minute and tokens/minute (when configured),
+- an adaptive concurrency limit, adjusted AIMD-style: halved (by default) once
+  per congestion event, i.e. on a rate-limit (429) response to a call admitted
+  since the last cut (a burst of 429s to calls in flight together cuts it only
+  once), and raised additively as calls succeed,
+- a shared cool-down period, set from the `Retry-After` header of a 429
+  response, during which no new calls are admitted.
+
+This way, when many concurrent tasks (e.g. from `run_batch_tasks`) hit a rate
+limit, they back off together instead of retrying in lockstep.
+"""
+
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from pydantic import field_validator
+from pydantic_settings import BaseSettings
+
+logger = logging.getLogger(__name__)
+
+# how long to wait before re-checking for a free concurrency slot
+_POLL_INTERVAL = 0.05
+
+T = TypeVar("T")
+
+
+class RateLimitConfig(BaseSettings):
+    """
+    Client-side rate limits, shared by all LLM clients in the process that use
+    the same model and API base URL. None means no limit.
+    """
+
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    # initial (and max) number of concurrent calls
+    max_concurrency: Optional[int] = None
+    min_concurrency: int = 1
+    # factor by which the concurrency limit is cut on a rate-limit error
+    backoff_factor: float = 0.5
+    # increase of the concurrency limit after each "window" of successful calls
+    additive_increase: float = 1.0
+
+    @field_validator("min_concurrency")
+    @classmethod
+    def check_min_concurrency(cls, v: int) -> int:
+        # with a limit below 1, no call could ever be admitted
+        if v < 1:
+            raise ValueError("min_concurrency must be at least 1")
+        return v
+
+
+class RateLimiter:
+    def __init__(self, config: RateLimitConfig = RateLimitConfig()):
+        self._lock = threading.Lock()
+        self.config = config
+        now = time.monotonic()
+        self._requests = float(config.requests_per_minute or 0)
+        self._tokens = float(config.tokens_per_minute or 0)
+        self._refilled_at = now
+        self._cooldown_until = 0.0
+        self._in_flight = 0
+        # None = unbounded, until the first rate-limit error
+        self._limit: Optional[float] = (
+            float(config.max_concurrency) if config.max_concurrency else None
+        )
+        self._counts: Dict[str, int] = dict(calls=0, queued=0, throttled=0, retried=0)
+        # number of cuts of the concurrency limit so far, and its value when the
+        # call made in the current task/thread was admitted
+        self._epoch = 0
+        self._admitted_epoch: ContextVar[Optional[int]] = ContextVar(
+            f"rate_limiter_admitted_epoch_{id(self)}", default=None
+        )
+
+    def configure(self, config: RateLimitConfig) -> None:
+        """Change the limits, keeping the current state and counters."""
+        with self._lock:
+            self.config = config
+            if config.max_concurrency is not None:
+                self._limit = min(
+                    self._limit if self._limit is not None else float("inf"),
+                    float(config.max_concurrency),
+                )
+            self._refill(time.monotonic())
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        rpm, tpm = self.config.requests_per_minute, self.config.tokens_per_minute
+        if rpm:
+            self._requests = min(float(rpm), self._requests + elapsed * rpm / 60)
+        if tpm:
+            self._tokens = min(float(tpm), self._tokens + elapsed * tpm / 60)
+
+    def _try_acquire(self, tokens: int) -> float:
+        """
+        Admit a call if possible.
+
+        Returns:
+            float: 0 if admitted, else the number of seconds to wait before
+                trying again.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._cooldown_until:
+                return self._cooldown_until - now
+            if self._limit is not None and self._in_flight >= int(self._limit):
+                return _POLL_INTERVAL
+            wait = 0.0
+            rpm, tpm = self.config.requests_per_minute, self.config.tokens_per_minute
+            if rpm and self._requests < 1:
+                wait = (1 - self._requests) * 60 / rpm
+            # a request larger than the bucket only needs a full bucket
+            needed = min(tokens, tpm) if tpm else 0
+            if tpm and self._tokens < needed:
+                wait = max(wait, (needed - self._tokens) * 60 / tpm)
+            if wait > 0:
+                return wait
+            if rpm:
+                self._requests -= 1
+            if tpm:
+                self._tokens -= tokens
+            self._in_flight += 1
+            self._counts["calls"] += 1
+            self._admitted_epoch.set(self._epoch)
+            return 0.0
+
+    @staticmethod
+    def _jittered(wait: float) -> float:
+        # spread out waiters, so they don't all wake up at the same instant
+        return wait * (1 + 0.1 * random.random())
+
+    def acquire(self, tokens: int = 0) -> None:
+        """
+        Block until a call using (an estimated) `tokens` tokens is admitted.
+        Must be followed by `release()`.
+        """
+        queued = False
+        while (wait := self._try_acquire(tokens)) > 0:
+            if not queued:
+                queued = True
+                self._count("queued")
+            time.sleep(self._jittered(wait))
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        """Async version of `acquire`: waits without blocking the event loop."""
+        queued = False
+        while (wait := self._try_acquire(tokens)) > 0:
+            if not queued:
+                queued = True
+                self._count("queued")
+            await asyncio.sleep(self._jittered(wait))
+
+    def release(self, success: bool = True) -> None:
+        """
+        Release the slot taken by `acquire`.
+
+        Args:
+            success (bool): whether the call succeeded; each success raises
+                the concurrency limit by `additive_increase / limit`, i.e.
+                by `additive_increase` per "window" of successful calls.
+        """
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            if success and self._limit is not None:
+                self._limit += self.config.additive_increase / max(self._limit, 1)
+                if self.config.max_concurrency is not None:
+                    self._limit = min(self._limit, self.config.max_concurrency)
+
+    def adjust_tokens(self, delta: int) -> None:
+        """
+        Charge (or refund, if negative) tokens to the tokens/minute bucket,
+        e.g. to correct an estimate once the actual usage is known.
+        """
+        if not self.config.tokens_per_minute or delta == 0:
+            return
+        with self._lock:
+            self._tokens -= delta
+
+    @contextmanager
+    def limit(self, tokens: int = 0) -> Iterator[None]:
+        """Context manager holding an admitted call slot."""
+        self.acquire(tokens)
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            self.release(success)
+
+    @asynccontextmanager
+    async def alimit(self, tokens: int = 0) -> AsyncIterator[None]:
+        """Async context manager holding an admitted call slot."""
+        await self.aacquire(tokens)
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            self.release(success)
+
+    def limit_stream(self, stream: Iterable[T]) -> Iterator[T]:
+        """
+        Iterate over a streamed response whose call holds a slot taken by
+        `acquire`, releasing the slot once the stream is exhausted, fails,
+        or is closed, so the slot bounds the whole streamed response.
+        """
+        success = False
+        try:
+            yield from stream
+            success = True
+        finally:
+            self.release(success)
+
+    async def alimit_stream(self, stream: AsyncIterable[T]) -> AsyncIterator[T]:
+        """Async version of `limit_stream`."""
+        success = False
+        try:
+            async for item in stream:
+                yield item
+            success = True
+        finally:
+            self.release(success)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """
+        Record a rate-limit (429) response: cut the concurrency limit, unless
+        the call that got it was admitted before the limit was last cut (its 429 is
+        part of the congestion event that caused that cut), and, if the server
+        said when to retry, pause all new calls until then.
+        """
+        with self._lock:
+            self._counts["throttled"] += 1
+            if retry_after is not None and retry_after > 0:
+                self._cooldown_until = max(
+                    self._cooldown_until, time.monotonic() + retry_after
+                )
+            admitted = self._admitted_epoch.get()
+            if admitted is not None and admitted < self._epoch:
+                return
+            self._epoch += 1
+            current = self._limit if self._limit is not None else self._in_flight + 1
+            self._limit = max(
+                float(self.config.min_concurrency),
+                current * self.config.backoff_factor,
+            )
+
+    def on_retry(self) -> None:
+        self._count("retried")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: counts of calls admitted, queued (had to wait),
+                throttled (got a rate-limit error) and retried, plus the
+                current number of in-flight calls and concurrency limit
+                (None = unbounded).
+        """
+        with self._lock:
+            return dict(
+                **self._counts,
+                in_flight=self._in_flight,
+                concurrency_limit=(None if self._limit is None else int(self._limit)),
+            )
+
+
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    model: str, api_base: Optional[str], config: RateLimitConfig
+) -> RateLimiter:
+    """
+    Get the process-wide RateLimiter for calls to `model` at `api_base`,
+    creating it with `config` if needed. Since the limiter is shared, a
+    different `config` does not replace its limits but tightens them: each
+    limit becomes the strictest one set by any of the clients sharing it.
+    """
+    key = (model, api_base or "")
+    limiter = _limiters.get(key)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.setdefault(key, RateLimiter(config))
+    if limiter.config != config:
+        merged = _strictest(limiter.config, config)
+        if merged != limiter.config:
+            limiter.configure(merged)
+    return limiter
+
+
+def _strictest(a: RateLimitConfig, b: RateLimitConfig) -> RateLimitConfig:
+    """The strictest of the limits (and the slowest adaptation) of `a` and `b`."""
+
+    def lowest(x: Optional[int], y: Optional[int]) -> Optional[int]:
+        return y if x is None else x if y is None else min(x, y)
+
+    return a.model_copy(
+        update=dict(
+            requests_per_minute=lowest(a.requests_per_minute, b.requests_per_minute),
+            tokens_per_minute=lowest(a.tokens_per_minute, b.tokens_per_minute),
+            max_concurrency=lowest(a.max_concurrency, b.max_concurrency),
+            min_concurrency=min(a.min_concurrency, b.min_concurrency),
+            backoff_factor=min(a.backoff_factor, b.backoff_factor),
+            additive_increase=min(a.additive_increase, b.additive_increase),
+        )
+    )
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of all rate limiters, keyed by "model@api_base"."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {
+        f"{model}@{base}" if base else model: limiter.stats()
+        for (model, base), limiter in limiters.items()
+    }
+
+
+def reset_rate_limiters() -> None:
+    """Discard all rate limiters (and their state and counters)."""
+    with _limiters_lock:
+        _limiters.clear()
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Seconds to wait before retrying, as given by the `Retry-After`
+    (or `retry-after-ms`) header of the HTTP response in an API error, if any.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        ms = headers.get("retry-after-ms")
+        if ms is not None:
+            return float(ms) / 1000
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            # HTTP-date format
+            date = email.utils.parsedate_to_datetime(value)
+            return max(0.0, date.timestamp() - time.time())
+    except Exception:
+        return None
+
+
+def estimate_tokens(kwargs: Dict[str, Any]) -> int:
+    """
+    Rough (~4 chars/token) estimate of the tokens used by a completion request
+    with the given API call args: prompt/messages plus max output tokens.
+    """
+    chars = 0
+    prompt = kwargs.get("prompt")
+    if isinstance(prompt, str):
+        chars += len(prompt)
+    for msg in kwargs.get("messages") or []:
+        content = msg.get("content") if isinstance(msg, dict) else None
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            chars += sum(len(str(part)) for part in content)
+    max_output = kwargs.get("max_tokens") or kwargs.get("max_completion_tokens") or 0
+    return chars // 4 + int(max_output)
@@ -3,17 +3,36 @@ import asyncio
 import logging
 import random
 import time
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 import aiohttp
 import openai
 import requests
 
+from langroid.language_models.rate_limiter import RateLimiter, retry_after_seconds
+
 logger = logging.getLogger(__name__)
 # setlevel to warning
 logger.setLevel(logging.WARNING)
 
 
+def _wait_before_retry(
+    error: BaseException, delay: float, rate_limiter: Optional[RateLimiter]
+) -> float:
+    """
+    Seconds to wait before retrying after `error`: the backoff `delay`, or
+    longer if the server asked for it in a rate-limit error.
+    """
+    if rate_limiter is not None:
+        rate_limiter.on_retry()
+    if not isinstance(error, openai.RateLimitError):
+        return delay
+    retry_after = retry_after_seconds(error)
+    if rate_limiter is not None:
+        rate_limiter.on_rate_limited(retry_after)
+    return max(delay, retry_after or 0.0)
+
+
 # define a retry decorator
 def retry_with_exponential_backoff(
     func: Callable[..., Any],
@@ -30,8 +49,13 @@ def retry_with_exponential_backoff(
         aiohttp.ServerTimeoutError,
         asyncio.TimeoutError,
     ),
+    rate_limiter: Optional[RateLimiter] = None,
 ) -> Callable[..., Any]:
-    """Retry a function with exponential backoff."""
+    """
+    Retry a function with exponential backoff.
+    On a rate-limit error, wait at least as long as the `Retry-After` header
+    says, and report the error to the `rate_limiter`, if any.
+    """
 
     def wrapper(*args: List[Any], **kwargs: Dict[Any, Any]) -> Any:
         # Initialize variables
@@ -84,13 +108,14 @@ def retry_with_exponential_backoff(
 
                 # Increment the delay
                 delay *= exponential_base * (1 + jitter * random.random())
+                wait = _wait_before_retry(e, delay, rate_limiter)
                 logger.warning(
                     f"""OpenAI API request failed with error: 
                     {e}. 
-                    Retrying in {delay} seconds..."""
+                    Retrying in {wait} seconds..."""
                 )
                 # Sleep for the delay
-                time.sleep(delay)
+                time.sleep(wait)
 
             # Raise exceptions for any errors not specified
             except Exception as e:
@@ -113,8 +138,12 @@ def async_retry_with_exponential_backoff(
         aiohttp.ServerTimeoutError,
         asyncio.TimeoutError,
     ),
+    rate_limiter: Optional[RateLimiter] = None,
 ) -> Callable[..., Any]:
-    """Retry a function with exponential backoff."""
+    """
+    Retry an async function with exponential backoff, sleeping without
+    blocking the event loop (see `retry_with_exponential_backoff`).
+    """
 
     async def wrapper(*args: List[Any], **kwargs: Dict[Any, Any]) -> Any:
         # Initialize variables
@@ -163,12 +192,13 @@ def async_retry_with_exponential_backoff(
 
                 # Increment the delay
                 delay *= exponential_base * (1 + jitter * random.random())
+                wait = _wait_before_retry(e, delay, rate_limiter)
                 logger.warning(
                     f"""OpenAI API request failed with error{e}. 
-                    Retrying in {delay} seconds..."""
+                    Retrying in {wait} seconds..."""
                 )
-                # Sleep for the delay
-                time.sleep(delay)
+                # Sleep for the delay, without blocking the event loop
+                await asyncio.sleep(wait)
 
             # Raise exceptions for any errors not specified
             except Exception as e:
@@ -10,6 +10,7 @@ from . import table_loader
 from . import urls
 from . import utils
 from . import search
+from . import bm25_index
 from . import web_search
 
 from .parser import (
@@ -37,6 +38,7 @@ __all__ = [
     "urls",
     "utils",
     "search",
+    "bm25_index",
     "web_search",
     "Splitter",
     "PdfParsingConfig",
@@ -0,0 +1,248 @@
+"""
+Incremental, persistable inverted-index BM25 (Okapi) engine.
+
+`find_closest_matches_with_bm25` in `langroid/parsing/search.py` re-tokenizes the
+whole corpus and constructs a fresh `rank_bm25.BM25Okapi` for every query, so each
+query costs O(corpus). `BM25Index` instead is built once, updated as new chunks are
+added, and at query time only touches the postings of the query terms.
+Scores are identical to those of `rank_bm25.BM25Okapi` (same k1, b, epsilon
+and idf-flooring scheme), so it can be used as a drop-in replacement.
+
+See tests for examples: tests/main/test_bm25_index.py
+"""
+
+import json
+import os
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_FORMAT_VERSION = 1
+
+
+class BM25Index:
+    """
+    Inverted index over tokenized documents, scoring queries with BM25 (Okapi).
+
+    Documents are identified by their position (in order of addition); an
+    optional string id per document is kept so a saved index can be validated
+    against the documents it is later paired with.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25):
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+        self.ids: List[str] = []
+        self.vocab: Dict[str, int] = {}  # term -> term-id
+        self._df: List[int] = []  # term-id -> num docs containing term
+        self._post_docs: List[List[int]] = []  # term-id -> doc positions
+        self._post_tfs: List[List[int]] = []  # term-id -> term freqs in those docs
+        self._doc_lens: List[int] = []
+        self._total_len = 0
+        # derived, lazily (re)computed after additions
+        self._compiled: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._idf: Optional[np.ndarray] = None
+        self._len_norm: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._doc_lens)
+
+    def add(
+        self,
+        tokenized_docs: Sequence[Sequence[str]],
+        ids: Optional[Sequence[str]] = None,
+    ) -> None:
+        """
+        Add documents to the index; cost is proportional to the new docs only.
+
+        Args:
+            tokenized_docs: list of token lists, one per document
+            ids: optional ids of the documents (same length as `tokenized_docs`)
+        """
+        if ids is not None and len(ids) != len(tokenized_docs):
+            raise ValueError("ids and tokenized_docs must have the same length")
+        for i, tokens in enumerate(tokenized_docs):
+            pos = len(self._doc_lens)
+            for term, tf in Counter(tokens).items():
+                tid = self.vocab.get(term)
+                if tid is None:
+                    tid = len(self._df)
+                    self.vocab[term] = tid
+                    self._df.append(0)
+                    self._post_docs.append([])
+                    self._post_tfs.append([])
+                self._df[tid] += 1
+                self._post_docs[tid].append(pos)
+                self._post_tfs[tid].append(tf)
+                self._compiled.pop(tid, None)
+            self._doc_lens.append(len(tokens))
+            self._total_len += len(tokens)
+            self.ids.append(str(ids[i]) if ids is not None else str(pos))
+        if len(tokenized_docs) > 0:
+            # idf and length-normalization depend on corpus-wide stats
+            self._idf = None
+            self._len_norm = None
+
+    def _get_idf(self) -> np.ndarray:
+        if self._idf is None:
+            n_docs = len(self._doc_lens)
+            df = np.asarray(self._df, dtype=np.float64)
+            idf = np.log(n_docs - df + 0.5) - np.log(df + 0.5)
+            # same flooring of negative idfs as rank_bm25.BM25Okapi
+            average_idf = float(idf.sum()) / len(idf) if len(idf) > 0 else 0.0
+            idf[idf < 0] = self.epsilon * average_idf
+            self._idf = idf
+        return self._idf
+
+    def _get_len_norm(self) -> np.ndarray:
+        if self._len_norm is None:
+            doc_lens = np.asarray(self._doc_lens, dtype=np.float64)
+            avgdl = self._total_len / len(doc_lens)
+            self._len_norm = self.k1 * (1 - self.b + self.b * doc_lens / avgdl)
+        return self._len_norm
+
+    def _get_postings(self, tid: int) -> Tuple[np.ndarray, np.ndarray]:
+        postings = self._compiled.get(tid)
+        if postings is None:
+            postings = (
+                np.asarray(self._post_docs[tid], dtype=np.int64),
+                np.asarray(self._post_tfs[tid], dtype=np.float64),
+            )
+            self._compiled[tid] = postings
+        return postings
+
+    def scores(self, query_tokens: Sequence[str]) -> Dict[int, float]:
+        """
+        BM25 scores of all docs containing at least one query token.
+
+        Args:
+            query_tokens: tokenized query; repeated tokens count repeatedly,
+                as in rank_bm25.
+
+        Returns:
+            Dict[int, float]: doc position -> score (docs not listed score 0)
+        """
+        cand, cand_scores = self._score_candidates(query_tokens)
+        return dict(zip(cand.tolist(), cand_scores.tolist()))
+
+    def _score_candidates(
+        self, query_tokens: Sequence[str]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if len(self) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        tids = [self.vocab[t] for t in query_tokens if t in self.vocab]
+        if len(tids) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        idf = self._get_idf()
+        len_norm = self._get_len_norm()
+        postings = [self._get_postings(tid) for tid in tids]
+        cand = np.unique(np.concatenate([docs for docs, _ in postings]))
+        cand_scores = np.zeros(len(cand))
+        for tid, (docs, tfs) in zip(tids, postings):
+            # positions of this term's postings within the (sorted) candidates
+            where = np.searchsorted(cand, docs)
+            cand_scores[where] += idf[tid] * (
+                tfs * (self.k1 + 1) / (tfs + len_norm[docs])
+            )
+        return cand, cand_scores
+
+    def top_k(self, query_tokens: Sequence[str], k: int) -> List[Tuple[int, float]]:
+        """
+        Top-k docs by BM25 score, in the same order as sorting
+        `rank_bm25.BM25Okapi.get_scores` by descending score (ties broken by
+        position), including zero-score docs if fewer than k docs match.
+
+        Args:
+            query_tokens: tokenized query
+            k: number of results
+
+        Returns:
+            List[Tuple[int, float]]: (doc position, score) pairs
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return []
+        cand, cand_scores = self._score_candidates(query_tokens)
+        positive = cand_scores > 0
+        negative = cand_scores < 0  # possible when most idfs are negative
+        results = self._sorted_top(cand[positive], cand_scores[positive], k)
+        if len(results) < k:
+            # zero-score docs (mostly those without any query term), by position
+            nonzero = set(cand[positive | negative].tolist())
+            for pos in range(len(self)):
+                if len(results) >= k:
+                    break
+                if pos not in nonzero:
+                    results.append((pos, 0.0))
+        if len(results) < k:
+            results += self._sorted_top(
+                cand[negative], cand_scores[negative], k - len(results)
+            )
+        return results
+
+    @staticmethod
+    def _sorted_top(
+        cand: np.ndarray, cand_scores: np.ndarray, k: int
+    ) -> List[Tuple[int, float]]:
+        if len(cand) > k:
+            # keep everything tied with the k-th best score, then sort exactly
+            kth = np.partition(cand_scores, len(cand) - k)[len(cand) - k]
+            keep = cand_scores >= kth
+            cand, cand_scores = cand[keep], cand_scores[keep]
+        order = np.lexsort((cand, -cand_scores))[:k]
+        return list(zip(cand[order].tolist(), cand_scores[order].tolist()))
+
+    def save(self, path: str) -> None:
+        """Save the index to `path` (a `.npz` file)."""
+        n_terms = len(self._df)
+        offsets = np.zeros(n_terms + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(p) for p in self._post_docs])
+        meta = dict(
+            version=_FORMAT_VERSION,
+            k1=self.k1,
+            b=self.b,
+            epsilon=self.epsilon,
+            ids=self.ids,
+            terms=list(self.vocab.keys()),
+        )
+        dir_name = os.path.dirname(path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+            doc_lens=np.asarray(self._doc_lens, dtype=np.int64),
+            offsets=offsets,
+            post_docs=np.fromiter(
+                (d for p in self._post_docs for d in p), dtype=np.int64
+            ),
+            post_tfs=np.fromiter(
+                (tf for p in self._post_tfs for tf in p), dtype=np.int64
+            ),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """Load an index previously saved with `save`."""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            if meta.get("version") != _FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported BM25 index format version: {meta.get('version')}"
+                )
+            index = cls(k1=meta["k1"], b=meta["b"], epsilon=meta["epsilon"])
+            offsets = data["offsets"].tolist()
+            post_docs = data["post_docs"].tolist()
+            post_tfs = data["post_tfs"].tolist()
+            index._doc_lens = data["doc_lens"].tolist()
+        index.ids = meta["ids"]
+        index.vocab = {t: i for i, t in enumerate(meta["terms"])}
+        index._post_docs = [post_docs[s:e] for s, e in zip(offsets[:-1], offsets[1:])]
+        index._post_tfs = [post_tfs[s:e] for s, e in zip(offsets[:-1], offsets[1:])]
+        index._df = [len(p) for p in index._post_docs]
+        index._total_len = sum(index._doc_lens)
+        return index
@@ -386,7 +386,8 @@ class DocumentParser(Parser):
                 each containing a chunk of text
         """
 
-        split = []  # tokens in curr split
+        split: List[int] = []  # tokens of pages not yet fully chunked
+        start = 0  # index in `split` where the current chunk starts
         pages: List[str] = []
         docs: List[Document] = []
         # metadata.id to be shared by ALL chunks of this document
@@ -402,12 +403,14 @@ class DocumentParser(Parser):
             # split could be so long it needs to be split
             # into multiple chunks. Or it could be so short
             # that it needs to be combined with the next chunk.
-            while len(split) > self.config.chunk_size:
+            while len(split) - start > self.config.chunk_size:
                 # pretty formatting of pages (e.g. 1-3, 4, 5-7)
                 p_0 = int(pages[0]) - self.config.page_number_offset
                 p_n = int(pages[-1]) - self.config.page_number_offset
                 page_str = f"pages {p_0}-{p_n}" if p_0 != p_n else f"page {p_0}"
-                text = self.tokenizer.decode(split[: self.config.chunk_size])
+                text = self.tokenizer.decode(
+                    split[start : start + self.config.chunk_size]
+                )
                 docs.append(
                     Document(
                         content=text,
@@ -419,8 +422,11 @@ class DocumentParser(Parser):
                     )
                 )
                 n_chunks += 1
-                split = split[self.config.chunk_size - self.config.overlap :]
+                start += self.config.chunk_size - self.config.overlap
                 pages = [str(i + 1)]
+            # drop the consumed tokens once per page, not once per chunk
+            del split[:start]
+            start = 0
         # there may be a last split remaining:
         # if it's shorter than the overlap, we shouldn't make a chunk for it
         # since it's already included in the prior chunk;
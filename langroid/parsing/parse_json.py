@@ -1,11 +1,20 @@
 import ast
 import json
+import re
 from datetime import datetime
-from typing import Any, Dict, Iterator, List, Union
+from typing import Any, Dict, Iterator, List, Tuple, Union
 
 import yaml
 from json_repair import repair_json
-from pyparsing import nested_expr, original_text_for
+
+# Inside braces, braces within quoted strings are ignored. Quoted strings are
+# as in pyparsing's `quoted_string`: the body is matched greedily (without
+# backtracking), and must then be followed by the closing quote.
+_BRACE_OR_QUOTE = re.compile(r"[{}\"']")
+_STRING_BODY = {
+    '"': re.compile(r'"(?:[^"\n\r\\]|""|\\(?:[^x]|x[0-9a-fA-F]+))*'),
+    "'": re.compile(r"'(?:[^'\n\r\\]|''|\\(?:[^x]|x[0-9a-fA-F]+))*"),
+}
 
 
 def is_valid_json(json_str: str) -> bool:
@@ -34,18 +43,136 @@ def flatten(nested_list) -> Iterator[str]:  # type: ignore
             yield item
 
 
+def maybe_tool_candidate(s: str) -> bool:
+    """
+    Fast check whether `s` may contain a JSON (`{...}`) or XML (`<tag>...`)
+    tool candidate: if False, it definitely does not.
+    """
+    return "{" in s or "<" in s
+
+
+def _scan_braces(
+    s: str,
+    pos: int,
+    start: int,
+    depth: int,
+    limit: int,
+    spans: List[Tuple[int, int]],
+    final: bool = True,
+) -> Tuple[int, int, int]:
+    """
+    Scan `s[pos:limit]` for top-level `{...}` spans, appending complete ones
+    to `spans`. `start` and `depth` are the start and nesting depth of the
+    span being scanned (or -1 and 0 if none). Unless `final`, text may follow
+    `limit`, so the scan stops before a quoted string that may not end there.
+
+    Returns:
+        Tuple[int, int, int]: the scan state (pos, start, depth) at the end.
+    """
+    while True:
+        if depth == 0:
+            start = s.find("{", pos, limit)
+            if start < 0:
+                return limit, -1, 0
+            pos, depth = start + 1, 1
+        m = _BRACE_OR_QUOTE.search(s, pos, limit)
+        if m is None:
+            return limit, start, depth
+        i = m.start()
+        c = s[i]
+        pos = i + 1
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                spans.append((start, pos))
+        else:
+            end = _STRING_BODY[c].match(s, i, limit).end()  # type: ignore
+            if end < limit and s[end] == c:
+                pos = end + 1
+            elif end == limit and not final:
+                return i, start, depth
+
+
+def json_candidate_spans(s: str, pos: int = 0) -> List[Tuple[int, int]]:
+    """
+    Spans of top-level JSON candidates, i.e. balanced `{...}` substrings,
+    where braces within quoted strings are ignored, and an opening brace that
+    is never closed is skipped (the scan resumes right after it).
+
+    Args:
+        s (str): The input string to search.
+        pos (int): Where to start the search.
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) of each candidate.
+    """
+    spans: List[Tuple[int, int]] = []
+    last_close = s.rfind("}")
+    while pos <= last_close:
+        pos, start, depth = _scan_braces(s, pos, -1, 0, len(s), spans)
+        if depth == 0:
+            break
+        pos = start + 1
+    return spans
+
+
 def get_json_candidates(s: str) -> List[str]:
     """Get top-level JSON candidates, i.e. strings between curly braces."""
-    # Define the grammar for matching curly braces
-    curly_braces = original_text_for(nested_expr("{", "}"))
-
-    # Parse the string
-    try:
-        results = curly_braces.search_string(s)
-        # Properly convert nested lists to strings
-        return [r[0] for r in results]
-    except Exception:
+    if "{" not in s:
         return []
+    return [s[start:end] for start, end in json_candidate_spans(s)]
+
+
+class JsonCandidateScanner:
+    """
+    Incremental version of `get_json_candidates`, for text arriving in pieces
+    (e.g. streamed LLM response deltas): `feed` each piece, then `finish`.
+    Together these return the same candidates as `get_json_candidates` on the
+    whole text. Only the text of a candidate still being scanned is retained.
+
+    Since quoted strings may not span lines, text is scanned up to the last
+    complete line, so a candidate is returned once the line it ends on is
+    complete.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""  # retained text, not yet fully scanned
+        self._pieces: List[str] = []  # fed since the last scan
+        # scan state, relative to _text
+        self._pos = 0
+        self._start = -1
+        self._depth = 0
+
+    def feed(self, piece: str) -> List[str]:
+        """Add a piece of text; return candidates completed in it."""
+        self._pieces.append(piece)
+        if "\n" not in piece:
+            return []
+        return self._scan(final=False)
+
+    def finish(self) -> List[str]:
+        """Signal the end of the text; return the remaining candidates."""
+        return self._scan(final=True)
+
+    def _scan(self, final: bool) -> List[str]:
+        text = self._text + "".join(self._pieces)
+        self._pieces = []
+        limit = len(text) if final else text.rfind("\n") + 1
+        spans: List[Tuple[int, int]] = []
+        pos, start, depth = _scan_braces(
+            text, self._pos, self._start, self._depth, limit, spans, final
+        )
+        if final and depth > 0:
+            # unclosed brace: resume the scan right after it
+            spans += json_candidate_spans(text, start + 1)
+            pos, start, depth = len(text), -1, 0
+        candidates = [text[s:e] for s, e in spans]
+        keep = start if depth > 0 else pos
+        self._text = text[keep:]
+        self._pos, self._start, self._depth = pos - keep, start - keep, depth
+        return candidates
 
 
 def parse_imperfect_json(json_string: str) -> Union[Dict[str, Any], List[Any]]:
@@ -116,6 +243,8 @@ def extract_top_level_json(s: str) -> List[str]:
     Returns:
         List[str]: A list of top-level JSON-formatted substrings.
     """
+    if "{" not in s:
+        return []
     # Find JSON object and array candidates
     json_candidates = get_json_candidates(s)
     maybe_repaired_jsons = map(try_repair_json_yaml, json_candidates)
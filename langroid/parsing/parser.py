@@ -1,8 +1,11 @@
+import bisect
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, Iterable, List, Literal, Optional, Sequence, Tuple
 
+import numpy as np
 import tiktoken
 from pydantic import field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -19,6 +22,55 @@ from langroid.utils.object_registry import ObjectRegistry
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.WARNING)
 
+# sentence/line boundaries, at which token chunks are preferably cut
+_CHUNK_BOUNDARY = re.compile(r"(?:[.!?][\s\n]|\n)")
+
+# per encoding name: for each token id, the number of chars starting in the
+# token's bytes, and 1 if its first byte continues a char started in the
+# previous token (else 0); -1 where not yet computed
+_TOKEN_CHARS: Dict[str, np.ndarray] = {}
+
+
+def token_char_offsets(
+    tokenizer: tiktoken.Encoding, tokens: Sequence[int]
+) -> Tuple[str, np.ndarray]:
+    """
+    Decode the tokens of a text, along with the offset in the text at which
+    each token starts: same as `tokenizer.decode_with_offsets`, but computed
+    from (cached) per-token char counts with numpy, instead of a Python loop
+    over the bytes of every token.
+
+    Args:
+        tokenizer: the tiktoken encoding that produced `tokens`
+        tokens: tokens of a (valid unicode) text
+
+    Returns:
+        Tuple[str, np.ndarray]: the text, and the offset of each token.
+    """
+    text = tokenizer.decode(list(tokens))
+    ids = np.asarray(tokens, dtype=np.int64)
+    if len(ids) == 0:
+        return text, np.zeros(0, dtype=np.int64)
+    table = _TOKEN_CHARS.get(tokenizer.name)
+    size = max(tokenizer.n_vocab, int(ids.max()) + 1)
+    if table is None or len(table) < size:
+        grown = np.full((size, 2), -1, dtype=np.int64)
+        if table is not None:
+            grown[: len(table)] = table
+        table = _TOKEN_CHARS[tokenizer.name] = grown
+    seen = np.zeros(len(table), dtype=bool)
+    seen[ids] = True
+    for token in np.flatnonzero(seen & (table[:, 0] < 0)).tolist():
+        data = tokenizer.decode_single_token_bytes(token)
+        table[token] = (
+            sum(1 for b in data if not 0x80 <= b < 0xC0),
+            int(len(data) > 0 and 0x80 <= data[0] < 0xC0),
+        )
+    chars = table[ids]
+    ends = np.cumsum(chars[:, 0])
+    offsets = np.maximum(0, ends - chars[:, 0] - chars[:, 1])
+    return text, offsets
+
 
 class Splitter(str, Enum):
     TOKENS = "tokens"
@@ -115,6 +167,9 @@ class ParsingConfig(BaseSettings):
     chunk_size_variation: float = 0.30  # max variation from chunk_size
     overlap: int = 50  # overlap between chunks
     max_chunks: int = 10_000
+    # number of threads splitting docs into chunks in parallel
+    # (tokenization releases the GIL, so this helps the TOKENS splitter)
+    chunk_workers: int = 1
 
     @field_validator("chunk_size", mode="before")
     @classmethod
@@ -278,23 +333,31 @@ class Parser:
 
         return final_chunks
 
+    def _chunk_text(self, text: str) -> List[str]:
+        if self.config.splitter == Splitter.MARKDOWN:
+            return chunk_markdown(
+                text,
+                MarkdownChunkConfig(
+                    # apply rough adjustment factor to convert from tokens to words,
+                    # which is what the markdown chunker uses
+                    chunk_size=int(self.config.chunk_size * 0.75),
+                    overlap_tokens=int(self.config.overlap * 0.75),
+                    variation_percent=self.config.chunk_size_variation,
+                    rollup=True,
+                ),
+            )
+        return self.chunk_tokens(text)
+
     def split_chunk_tokens(self, docs: List[Document]) -> List[Document]:
         final_docs = []
-        for d in docs:
-            if self.config.splitter == Splitter.MARKDOWN:
-                chunks = chunk_markdown(
-                    d.content,
-                    MarkdownChunkConfig(
-                        # apply rough adjustment factor to convert from tokens to words,
-                        # which is what the markdown chunker uses
-                        chunk_size=int(self.config.chunk_size * 0.75),
-                        overlap_tokens=int(self.config.overlap * 0.75),
-                        variation_percent=self.config.chunk_size_variation,
-                        rollup=True,
-                    ),
-                )
-            else:
-                chunks = self.chunk_tokens(d.content)
+        texts = [d.content for d in docs]
+        doc_chunks: Iterable[List[str]]
+        if self.config.chunk_workers > 1 and len(docs) > 1:
+            with ThreadPoolExecutor(self.config.chunk_workers) as pool:
+                doc_chunks = list(pool.map(self._chunk_text, texts))
+        else:
+            doc_chunks = map(self._chunk_text, texts)
+        for d, chunks in zip(docs, doc_chunks):
             # note we are ensuring we COPY the document metadata into each chunk,
             # which ensures all chunks of a given doc have same metadata
             # (and in particular same metadata.id, which is important later for
@@ -332,65 +395,60 @@ class Parser:
         if not text or text.isspace():
             return []
 
-        # Tokenize the text
+        # Tokenize the text once; chunks are then delimited by token indices,
+        # and cut at boundaries found by a single scan of the whole text.
         tokens = self.tokenizer.encode(text, disallowed_special=())
+        text, offsets = token_char_offsets(self.tokenizer, tokens)
+        n_tokens = len(tokens)
+        # char offset at which each token starts, and the end of the text
+        token_starts = np.append(offsets, len(text))
+        boundary_starts: List[int] = []
+        boundary_ends: List[int] = []
+        for m in _CHUNK_BOUNDARY.finditer(text):
+            boundary_starts.append(m.start())
+            boundary_ends.append(m.end())
 
-        # Initialize an empty list of chunks
         chunks = []
-
-        # Initialize a counter for the number of chunks
         num_chunks = 0
-
-        # Loop until all tokens are consumed
-        while tokens and num_chunks < self.config.max_chunks:
-            # Take the first chunk_size tokens as a chunk
-            chunk = tokens[: self.config.chunk_size]
-
-            # Decode the chunk into text
-            chunk_text = self.tokenizer.decode(chunk)
+        start = 0  # first token of the next chunk
+        char_start = 0  # where the next chunk's text starts
+        while start < n_tokens and num_chunks < self.config.max_chunks:
+            # Take the next chunk_size tokens as a chunk
+            end = min(start + self.config.chunk_size, n_tokens)
+            char_end = int(token_starts[end])
+            chunk_text = text[char_start:char_end]
+            next_start, next_char_start = end, char_end
 
             # Skip the chunk if it is empty or whitespace
             if not chunk_text or chunk_text.isspace():
-                # Remove the tokens corresponding to the chunk text
-                # from remaining tokens
-                tokens = tokens[len(chunk) :]
-                # Continue to the next iteration of the loop
+                start, char_start = next_start, next_char_start
                 continue
 
-            # Find the last period or punctuation mark in the chunk
-            punctuation_matches = [
-                (m.start(), m.group())
-                for m in re.finditer(r"(?:[.!?][\s\n]|\n)", chunk_text)
-            ]
-
-            last_punctuation = max([pos for pos, _ in punctuation_matches] + [-1])
-
-            # If there is a punctuation mark, and the last punctuation index is
-            # after MIN_CHUNK_SIZE_CHARS
+            # Find the last period or punctuation mark in the chunk,
+            # and if it is after MIN_CHUNK_SIZE_CHARS, truncate the chunk there;
+            # the next chunk starts right after it, from the token containing it.
+            i = bisect.bisect_right(boundary_ends, char_end) - 1
             if (
-                last_punctuation != -1
-                and last_punctuation > self.config.min_chunk_chars
+                i >= 0
+                and boundary_starts[i] >= char_start
+                and boundary_starts[i] - char_start > self.config.min_chunk_chars
             ):
-                # Truncate the chunk text at the punctuation mark
-                chunk_text = chunk_text[: last_punctuation + 1]
+                next_char_start = boundary_starts[i] + 1
+                chunk_text = text[char_start:next_char_start]
+                token = int(np.searchsorted(offsets, next_char_start, "right")) - 1
+                next_start = max(start + 1, token)
 
-            # Replace redundant (3 or more) newlines with 2 newlines to preser
+            # Replace redundant (3 or more) newlines with 2 newlines to preserve
             # paragraph separation!
             # But do NOT strip leading/trailing whitespace, to preserve formatting
             # (e.g. code blocks, or in case we want to stitch chunks back together)
-            chunk_text_to_append = re.sub(r"\n{3,}", "\n\n", chunk_text)
-
-            if len(chunk_text_to_append) > self.config.discard_chunk_chars:
-                # Append the chunk text to the list of chunks
-                chunks.append(chunk_text_to_append)
+            if "\n\n\n" in chunk_text:
+                chunk_text = re.sub(r"\n{3,}", "\n\n", chunk_text)
 
-            # Remove the tokens corresponding to the chunk text
-            # from the remaining tokens
-            tokens = tokens[
-                len(self.tokenizer.encode(chunk_text, disallowed_special=())) :
-            ]
+            if len(chunk_text) > self.config.discard_chunk_chars:
+                chunks.append(chunk_text)
 
-            # Increment the number of chunks
+            start, char_start = next_start, next_char_start
             num_chunks += 1
 
         # There may be remaining tokens, but we discard them
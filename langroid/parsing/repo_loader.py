@@ -544,7 +544,37 @@ class RepoLoader:
 
         """
         docs = []
-        file_paths = []
+        file_paths = RepoLoader.get_file_paths(path, file_types, exclude_dirs, depth)
+        for file_path in file_paths:
+            docs.extend(
+                DocumentParser.chunks_from_path_or_bytes(
+                    file_path,
+                    parser,
+                    doc_type=doc_type,
+                    lines=lines,
+                )
+            )
+        return docs
+
+    @staticmethod
+    def get_file_paths(
+        path: str | bytes,
+        file_types: Optional[List[str]] = None,
+        exclude_dirs: Optional[List[str]] = None,
+        depth: int = -1,
+    ) -> List[str | bytes]:
+        """
+        List the files under a path that `get_documents` would parse,
+        so they can be parsed independently (e.g. in parallel).
+
+        Args:
+            path (str|bytes): The path to the directory or file, or bytes content
+                (returned as is).
+            file_types, exclude_dirs, depth: as in `get_documents`.
+        Returns:
+            List[str|bytes]: file paths (or the bytes content)
+        """
+        file_paths: List[str | bytes] = []
         if isinstance(path, bytes):
             file_paths.append(path)
         else:
@@ -570,17 +600,7 @@ class RepoLoader:
                                 or file_path in file_types
                             ):
                                 file_paths.append(file_path)
-
-        for file_path in file_paths:
-            docs.extend(
-                DocumentParser.chunks_from_path_or_bytes(
-                    file_path,
-                    parser,
-                    doc_type=doc_type,
-                    lines=lines,
-                )
-            )
-        return docs
+        return file_paths
 
     def load_docs_from_github(
         self,
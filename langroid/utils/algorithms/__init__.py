@@ -1,3 +1,4 @@
 from . import graph
+from . import mmr
 
-__all__ = ["graph"]
+__all__ = ["graph", "mmr"]
@@ -0,0 +1,63 @@
+"""
+Maximal Marginal Relevance (MMR) ordering of items by their embeddings.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+def mmr_order(
+    embeddings: Sequence[Sequence[float]] | np.ndarray,
+    relevance: Optional[Sequence[float] | np.ndarray] = None,
+    lambda_: float = 0.0,
+    k: Optional[int] = None,
+) -> List[int]:
+    """
+    Order items so that each successive item balances relevance against
+    (average cosine) similarity to the items already picked:
+    the next item maximizes
+        lambda_ * relevance[i] - (1 - lambda_) * mean_{j picked} sim(i, j)
+
+    With `lambda_=0` (or no `relevance`) this is pure diversity re-ranking:
+    starting from the first item, each next item is the one least similar,
+    on average, to the earlier ones. Ties are broken by position.
+
+    The embeddings are normalized once, the pairwise similarities computed in a
+    single matrix product, and a running sum of similarities to the picked items
+    is updated per pick, so the cost is O(n^2 d) in one BLAS call plus O(n^2).
+
+    Args:
+        embeddings: n x d array (or list) of item embeddings
+        relevance: optional relevance score of each item (e.g. similarity to
+            the query); if None, items are assumed to be in relevance order
+        lambda_: weight of relevance vs diversity, in [0, 1]
+        k: number of items to pick (default: all)
+
+    Returns:
+        List[int]: indices of the picked items, in order
+    """
+    emb = np.asarray(embeddings, dtype=np.float64)
+    n = len(emb)
+    k = n if k is None else min(k, n)
+    if k <= 0:
+        return []
+    norms = np.linalg.norm(emb, axis=1, keepdims=True)
+    emb = emb / np.where(norms == 0, 1.0, norms)
+    sims = emb @ emb.T
+
+    use_relevance = relevance is not None and lambda_ > 0
+    rel = np.asarray(relevance, dtype=np.float64) if use_relevance else np.zeros(n)
+    picked = np.zeros(n, dtype=bool)
+    first = int(np.argmax(rel)) if use_relevance else 0
+    order = [first]
+    picked[first] = True
+    sim_sum = sims[first].copy()
+    while len(order) < k:
+        scores = lambda_ * rel - (1 - lambda_) * sim_sum / len(order)
+        scores[picked] = -np.inf
+        i = int(np.argmax(scores))  # first max, i.e. ties broken by position
+        order.append(i)
+        picked[i] = True
+        sim_sum += sims[i]
+    return order
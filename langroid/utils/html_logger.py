@@ -8,11 +8,11 @@ import html
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
-from langroid.utils.logging import setup_logger
+from langroid.utils.logging import log_writer, setup_logger
 
 
 class HTMLLogger:
@@ -48,6 +48,14 @@ class HTMLLogger:
         if not append or not self.file_path.exists():
             self._write_header()
 
+        # kept open; entries are formatted and written by the background
+        # log writer (see `langroid.utils.logging.log_writer`)
+        self._file: Optional[IO[str]] = None
+        try:
+            self._file = open(self.file_path, "a", encoding="utf-8")
+        except Exception as e:
+            self.logger.error(f"Failed to open HTML log file: {e}")
+
     def _write_header(self) -> None:
         """Write the HTML header with CSS and JavaScript."""
         timestamp = datetime.now().strftime("%m/%d/%Y, %I:%M:%S %p")
@@ -506,12 +514,19 @@ class HTMLLogger:
         Args:
             fields: ChatDocLoggerFields containing all log information
         """
+        if self._file is None or self._file.closed:
+            return
+        log_writer().write(self._file, lambda: self._render_entry(fields))
+
+    def _render_entry(self, fields: BaseModel) -> str:
+        """Format a log entry, on the log writer thread."""
         try:
             entry_html = self._format_entry(fields)
-            self._append_to_file(entry_html)
             self.entry_counter += 1
+            return entry_html + "\n"
         except Exception as e:
             self.logger.error(f"Failed to log entry: {e}")
+            return ""
 
     def _format_entry(self, fields: BaseModel) -> str:
         """Format a log entry as HTML.
@@ -790,21 +805,14 @@ class HTMLLogger:
     </div>
 </div>"""
 
-    def _append_to_file(self, content: str) -> None:
-        """Append content to the HTML file.
-
-        Args:
-            content: HTML content to append
-        """
-        try:
-            with open(self.file_path, "a", encoding="utf-8") as f:
-                f.write(content + "\n")
-                f.flush()
-        except Exception as e:
-            self.logger.error(f"Failed to append to file: {e}")
+    def flush(self) -> None:
+        """Wait until all entries logged so far are written."""
+        log_writer().flush()
 
     def close(self) -> None:
         """Close the HTML file with footer."""
+        if self._file is None or self._file.closed:
+            return
         footer = """
     </div>
     <script>
@@ -819,8 +827,9 @@ class HTMLLogger:
     </script>
 </body>
 </html>"""
+        log_writer().write(self._file, footer)
+        self.flush()
         try:
-            with open(self.file_path, "a", encoding="utf-8") as f:
-                f.write(footer)
+            self._file.close()
         except Exception as e:
-            self.logger.error(f"Failed to write HTML footer: {e}")
+            self.logger.error(f"Failed to close HTML log file: {e}")
@@ -0,0 +1,525 @@
+"""
+Lazy access to a tabular data file (Parquet, CSV/TSV) via DuckDB, for evaluating
+pandas expressions on a dataframe `df` without loading the whole file in memory.
+
+The file is queried in place (DuckDB memory-maps/streams it). Before a pandas
+expression is evaluated, the parts of it that select data from `df` are
+"pushed down" into SQL queries, so only the needed data is loaded:
+- column selection, e.g. `df['a']`, `df.a`, `df[['a', 'b']]`,
+  `df.groupby('a')['b']` (only columns a and b are loaded);
+- row filters, e.g. `df[(df['a'] > 3) & df['b'].isin(['x', 'y'])]` or
+  `df.query("a > 3 and b == 'x'")` (simple comparisons, `isin`, `between`,
+  null checks and `str.contains/startswith/endswith` are translated to SQL);
+- `head(n)`, and row counts: `len(df)`, `df.shape`.
+Anything else is evaluated by pandas on the loaded data; a bare `df` that
+remains in the expression is loaded in full (as with an in-memory dataframe).
+
+Loaded rows keep their row number in the file as their index, so results of
+different parts of an expression align as they would on the full dataframe.
+"""
+
+import ast
+import re
+from dataclasses import dataclass, field
+from types import CodeType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from langroid.exceptions import LangroidImportError
+
+Condition = Tuple[str, List[Any]]  # SQL boolean expression, and its parameters
+
+_ROW = "__row"
+_PARQUET_SUFFIXES = (".parquet", ".pq")
+
+_SQL_COMPARE = {
+    ast.Eq: "=",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+}
+# the comparison `literal <op> column`, as `column <flipped op> literal`
+_FLIPPED = {ast.Eq: ast.Eq, ast.NotEq: ast.NotEq, ast.Lt: ast.Gt, ast.LtE: ast.GtE}
+_FLIPPED.update({ast.Gt: ast.Lt, ast.GtE: ast.LtE})
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_string(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _literal(node: ast.AST) -> Tuple[bool, Any]:
+    """(True, value) if `node` is a number/string/bool literal, or a list of them."""
+    try:
+        value = ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return False, None
+    values = value if isinstance(value, (list, tuple)) else [value]
+    ok = all(isinstance(v, (int, float, str)) for v in values)
+    return ok, value
+
+
+def normalize_column_name(name: str) -> str:
+    """Column name as seen by the LLM, e.g. " total  sales " -> "total_sales"."""
+    return re.sub(" +", "_", name.strip())
+
+
+@dataclass
+class _Query:
+    columns: Optional[List[str]] = None  # None = all columns
+    where: List[Condition] = field(default_factory=list)
+    limit: Optional[int] = None
+    series: Optional[str] = None  # a single column, selected as a Series
+
+
+class LazyTable:
+    """
+    A Parquet or CSV/TSV file (or glob of files), queried lazily via DuckDB.
+    """
+
+    def __init__(self, path: str, sep: Optional[str] = None):
+        """
+        Args:
+            path (str): path, URL or glob of the data file(s)
+            sep (Optional[str]): separator of CSV files; auto-detected if None
+        """
+        try:
+            import duckdb
+        except ImportError:
+            raise LangroidImportError("duckdb")
+
+        self.path = path
+        self.con = duckdb.connect()
+        lower = path.lower()
+        if lower.endswith(_PARQUET_SUFFIXES):
+            source = f"read_parquet({_sql_string(path)}"
+            if not any(c in path for c in "*?["):
+                # row numbers come from the scan, so filters are still pushed
+                # down to the file (e.g. skipping row groups)
+                source += ", file_row_number = true"
+            source += ")"
+        else:
+            delim = "" if sep is None else f", delim = {_sql_string(sep)}"
+            source = f"read_csv({_sql_string(path)}, header = true{delim})"
+        names = [
+            row[0]
+            for row in self.con.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+        ]
+        if "file_row_number" in names:
+            row_number = "file_row_number"
+            names.remove("file_row_number")
+        else:
+            row_number = "row_number() OVER () - 1"
+        names = [n for n in names if n.strip() != ""]
+        self.columns = [normalize_column_name(n) for n in names]
+        select = ", ".join(
+            f"{_quote(n)} AS {_quote(c)}" for n, c in zip(names, self.columns)
+        )
+        self.con.execute(
+            f"CREATE VIEW data AS SELECT {row_number} AS {_ROW}, {select} "
+            f"FROM {source}"
+        )
+        self._num_rows: Optional[int] = None
+
+    @property
+    def num_rows(self) -> int:
+        if self._num_rows is None:
+            self._num_rows = self.count()
+        return self._num_rows
+
+    def _sql(
+        self,
+        select: str,
+        where: Sequence[Condition],
+        limit: Optional[int] = None,
+    ) -> Tuple[str, List[Any]]:
+        sql = f"SELECT {select} FROM data"
+        params: List[Any] = []
+        if where:
+            sql += " WHERE " + " AND ".join(f"({cond})" for cond, _ in where)
+            for _, cond_params in where:
+                params.extend(cond_params)
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return sql, params
+
+    def load(
+        self,
+        columns: Optional[List[str]] = None,
+        where: Sequence[Condition] = (),
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Load rows of the table as a dataframe, indexed by their row number.
+
+        Args:
+            columns (Optional[List[str]]): columns to load; None means all
+            where (Sequence[Condition]): SQL conditions the rows must satisfy
+            limit (Optional[int]): max number of rows to load
+
+        Returns:
+            pd.DataFrame: the rows, in file order
+        """
+        names = self.columns if columns is None else columns
+        select = ", ".join([_ROW] + [_quote(c) for c in names])
+        sql, params = self._sql(select, where, limit)
+        df = self.con.execute(sql, params).df().set_index(_ROW)
+        df.index.name = None
+        return df
+
+    def count(
+        self, where: Sequence[Condition] = (), limit: Optional[int] = None
+    ) -> int:
+        """Number of rows satisfying the `where` conditions (at most `limit`)."""
+        sql, params = self._sql(_ROW, where, limit)
+        result = self.con.execute(f"SELECT count(*) FROM ({sql})", params).fetchone()
+        return int(result[0]) if result is not None else 0
+
+    def sample(self, n: int, seed: int = 42) -> pd.DataFrame:
+        """A random sample of (up to) `n` rows of the table."""
+        columns = ", ".join(_quote(c) for c in self.columns)
+        return self.con.execute(
+            f"SELECT {columns} FROM data "
+            f"USING SAMPLE reservoir({int(n)} ROWS) REPEATABLE ({int(seed)})"
+        ).df()
+
+    def bind(self, expression: str) -> Tuple[CodeType, Dict[str, Any]]:
+        """
+        Compile a pandas expression involving the dataframe `df` for evaluation,
+        with the data it selects from `df` pushed down into queries.
+
+        Args:
+            expression (str): the pandas expression
+
+        Returns:
+            Tuple[CodeType, Dict[str, Any]]: the compiled expression, and the
+                variables (loaded data) to evaluate it with.
+        """
+        tree = ast.parse(expression, mode="eval")
+        pushdown = _Pushdown(self)
+        tree = ast.fix_missing_locations(pushdown.visit(tree))
+        variables = pushdown.variables
+        if any(isinstance(n, ast.Name) and n.id == "df" for n in ast.walk(tree)):
+            variables["df"] = self.load()
+        return compile(tree, "<calc>", "eval"), variables
+
+
+class _Pushdown(ast.NodeTransformer):
+    """
+    Replace the parts of an expression that select data from `df` with
+    variables holding the data, loaded with the equivalent SQL query.
+    """
+
+    def __init__(self, table: LazyTable):
+        self.table = table
+        self.variables: Dict[str, Any] = {}
+
+    def _bind(self, value: Any) -> ast.Name:
+        name = f"__df_{len(self.variables)}"
+        self.variables[name] = value
+        return ast.Name(id=name, ctx=ast.Load())
+
+    def _column_name(self, name: Any) -> Optional[str]:
+        return name if isinstance(name, str) and name in self.table.columns else None
+
+    def _df_column(self, node: ast.AST) -> Optional[str]:
+        """The column `c`, if `node` is `df['c']` or `df.c`."""
+        if isinstance(node, ast.Subscript) and _is_df(node.value):
+            ok, name = _literal(node.slice)
+            return self._column_name(name) if ok else None
+        if isinstance(node, ast.Attribute) and _is_df(node.value):
+            if not hasattr(pd.DataFrame, node.attr):
+                return self._column_name(node.attr)
+        return None
+
+    def _query_column(self, node: ast.AST) -> Optional[str]:
+        """The column `c`, if `node` is the name `c` in a `df.query` string."""
+        return self._column_name(node.id) if isinstance(node, ast.Name) else None
+
+    def _condition(
+        self, node: ast.AST, column: Callable[[ast.AST], Optional[str]]
+    ) -> Optional[Condition]:
+        """
+        SQL equivalent of the boolean (row-filter) expression `node`, if any.
+        Conditions are two-valued (NULL compares as false, like NaN in pandas).
+        """
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+            return self._combine(
+                [node.left, node.right], isinstance(node.op, ast.BitAnd), column
+            )
+        if isinstance(node, ast.BoolOp):
+            return self._combine(node.values, isinstance(node.op, ast.And), column)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Invert, ast.Not)):
+            operand = self._condition(node.operand, column)
+            return None if operand is None else (f"NOT ({operand[0]})", operand[1])
+        if isinstance(node, ast.Compare):
+            parts = []
+            left = node.left
+            for op, right in zip(node.ops, node.comparators):
+                part = self._comparison(left, op, right, column)
+                if part is None:
+                    return None
+                parts.append(part)
+                left = right
+            return _and_or(parts, True)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            return self._method_condition(node, column)
+        return None
+
+    def _combine(
+        self,
+        nodes: List[ast.expr],
+        conjunction: bool,
+        column: Callable[[ast.AST], Optional[str]],
+    ) -> Optional[Condition]:
+        parts = [self._condition(n, column) for n in nodes]
+        if any(p is None for p in parts):
+            return None
+        return _and_or([p for p in parts if p is not None], conjunction)
+
+    def _comparison(
+        self,
+        left: ast.expr,
+        op: ast.cmpop,
+        right: ast.expr,
+        column: Callable[[ast.AST], Optional[str]],
+    ) -> Optional[Condition]:
+        name = column(left)
+        ok, value = _literal(right)
+        if name is None or not ok:
+            # literal <op> column
+            name = column(right)
+            ok, value = _literal(left)
+            if type(op) not in _FLIPPED:
+                return None
+            op = _FLIPPED[type(op)]()
+        if name is None or not ok:
+            return None
+        col = _quote(name)
+        if isinstance(op, (ast.In, ast.NotIn)) and isinstance(value, (list, tuple)):
+            if len(value) == 0:
+                cond = "false"
+            else:
+                cond = f"coalesce({col} IN ({', '.join('?' * len(value))}), false)"
+            return (cond if isinstance(op, ast.In) else f"NOT {cond}", list(value))
+        if isinstance(value, (list, tuple)):
+            return None
+        if isinstance(op, ast.NotEq):
+            return f"{col} IS DISTINCT FROM ?", [value]
+        if type(op) in _SQL_COMPARE:
+            return f"coalesce({col} {_SQL_COMPARE[type(op)]} ?, false)", [value]
+        return None
+
+    def _method_condition(
+        self, node: ast.Call, column: Callable[[ast.AST], Optional[str]]
+    ) -> Optional[Condition]:
+        assert isinstance(node.func, ast.Attribute)
+        method = node.func.attr
+        target = node.func.value
+        keywords = {kw.arg: kw.value for kw in node.keywords}
+        args = [_literal(a) for a in node.args]
+        if not all(ok for ok, _ in args) or any(k is None for k in keywords):
+            return None
+        values = [v for _, v in args]
+        is_str = method in ("contains", "startswith", "endswith")
+        if is_str:
+            # column.str.<method>(...)
+            if not (isinstance(target, ast.Attribute) and target.attr == "str"):
+                return None
+            target = target.value
+        name = column(target)
+        if name is None:
+            return None
+        col = _quote(name)
+        if method in ("isna", "isnull", "notna", "notnull") and not (
+            values or keywords
+        ):
+            null = "IS NULL" if method in ("isna", "isnull") else "IS NOT NULL"
+            return f"{col} {null}", []
+        if method == "isin" and len(values) == 1 and not keywords:
+            if not isinstance(values[0], (list, tuple)):
+                return None
+            if len(values[0]) == 0:
+                return "false", []
+            marks = ", ".join("?" * len(values[0]))
+            return f"coalesce({col} IN ({marks}), false)", list(values[0])
+        if method == "between" and len(values) == 2 and not keywords:
+            return f"coalesce({col} BETWEEN ? AND ?, false)", values
+        if is_str and len(values) == 1 and isinstance(values[0], str):
+            options = {}
+            for key, value in keywords.items():
+                ok, options[key] = _literal(value)
+                if not ok or key not in ("case", "regex"):
+                    return None
+            if method == "contains":
+                if options.get("regex", True):
+                    flags = "" if options.get("case", True) else ", 'i'"
+                    cond = f"regexp_matches({col}, ?{flags})"
+                elif options.get("case", True):
+                    cond = f"contains({col}, ?)"
+                else:
+                    cond = f"contains(lower({col}), lower(?))"
+            elif keywords:
+                return None
+            else:
+                func = "starts_with" if method == "startswith" else "suffix"
+                cond = f"{func}({col}, ?)"
+            return f"coalesce({cond}, false)", values
+        return None
+
+    def _query(self, node: ast.AST) -> Optional[_Query]:
+        """
+        The query loading the data selected by `node`, if it only selects
+        (columns, rows) from `df`.
+        """
+        if _is_df(node):
+            return _Query()
+        if isinstance(node, ast.Subscript):
+            base = self._query(node.value)
+            if base is None or base.limit is not None or base.series is not None:
+                return None
+            ok, key = _literal(node.slice)
+            if ok and self._column_name(key) is not None:
+                if base.columns is not None and key not in base.columns:
+                    return None
+                return _Query(columns=[key], where=base.where, series=key)
+            if ok and isinstance(key, list):
+                if not all(self._column_name(k) is not None for k in key):
+                    return None
+                if base.columns is not None and not set(key) <= set(base.columns):
+                    return None
+                return _Query(columns=key, where=base.where)
+            condition = self._condition(node.slice, self._df_column)
+            if condition is None:
+                return None
+            return _Query(columns=base.columns, where=base.where + [condition])
+        if isinstance(node, ast.Attribute):
+            base = self._query(node.value)
+            name = self._column_name(node.attr)
+            if (
+                base is None
+                or name is None
+                or hasattr(pd.DataFrame, name)
+                or base.limit is not None
+                or base.series is not None
+                or (base.columns is not None and name not in base.columns)
+            ):
+                return None
+            return _Query(columns=[name], where=base.where, series=name)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            base = self._query(node.func.value)
+            if base is None or base.limit is not None:
+                return None
+            method = node.func.attr
+            if method == "head" and not node.keywords and len(node.args) <= 1:
+                ok, n = _literal(node.args[0]) if node.args else (True, 5)
+                if not ok or not isinstance(n, int) or n < 0:
+                    return None
+                return _Query(base.columns, base.where, n, base.series)
+            if (
+                method == "query"
+                and base.series is None
+                and len(node.args) == 1
+                and not node.keywords
+            ):
+                ok, text = _literal(node.args[0])
+                if not ok or not isinstance(text, str):
+                    return None
+                try:
+                    tree = ast.parse(text.strip(), mode="eval")
+                except SyntaxError:
+                    return None
+                condition = self._condition(tree.body, self._query_column)
+                if condition is None:
+                    return None
+                return _Query(base.columns, base.where + [condition])
+        return None
+
+    def _load(self, query: _Query) -> Any:
+        df = self.table.load(query.columns, query.where, query.limit)
+        return df[query.series] if query.series is not None else df
+
+    def _count(self, query: _Query) -> int:
+        if not query.where and query.limit is None:
+            return self.table.num_rows
+        return self.table.count(query.where, query.limit)
+
+    def visit(self, node: ast.AST) -> Any:
+        # len(<selection>), <selection>.shape: counted without loading data
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id == "len"
+            and len(node.args) == 1
+            and not node.keywords
+        ):
+            query = self._query(node.args[0])
+            if query is not None:
+                return ast.Constant(value=self._count(query))
+        if isinstance(node, ast.Attribute) and node.attr == "shape":
+            query = self._query(node.value)
+            if query is not None:
+                n_rows = self._count(query)
+                shape = [n_rows]
+                if query.series is None:
+                    shape.append(len(query.columns or self.table.columns))
+                return ast.Tuple(
+                    elts=[ast.Constant(value=n) for n in shape], ctx=ast.Load()
+                )
+
+        if not _is_df(node):
+            query = self._query(node)
+            if query is not None:
+                return self._bind(self._load(query))
+
+        # <selection>.groupby(keys)[columns]: only load the keys and columns
+        if (
+            isinstance(node, ast.Subscript)
+            and isinstance(node.value, ast.Call)
+            and isinstance(node.value.func, ast.Attribute)
+            and node.value.func.attr == "groupby"
+        ):
+            grouped = self._grouped_columns(node)
+            query = self._query(node.value.func.value)
+            if grouped is not None and query is not None and query.series is None:
+                if query.columns is None or set(grouped) <= set(query.columns):
+                    query.columns = grouped
+                    node.value.func.value = self._bind(self._load(query))
+                    return node
+
+        return super().visit(node)
+
+    def _grouped_columns(self, node: ast.Subscript) -> Optional[List[str]]:
+        """Columns used by `X.groupby(keys)[columns]`, if all are literal."""
+        assert isinstance(node.value, ast.Call)
+        call = node.value
+        keys = [a for a in call.args[:1]] + [
+            kw.value for kw in call.keywords if kw.arg == "by"
+        ]
+        if len(keys) != 1 or len(call.args) > 1:
+            return None
+        names: List[str] = []
+        for key in (keys[0], node.slice):
+            ok, value = _literal(key)
+            values = value if isinstance(value, (list, tuple)) else [value]
+            if not ok or not all(self._column_name(v) for v in values):
+                return None
+            names.extend(v for v in values if v not in names)
+        return names
+
+
+def _is_df(node: ast.AST) -> bool:
+    return isinstance(node, ast.Name) and node.id == "df"
+
+
+def _and_or(parts: List[Condition], conjunction: bool) -> Condition:
+    joiner = " AND " if conjunction else " OR "
+    params: List[Any] = []
+    for _, part_params in parts:
+        params.extend(part_params)
+    return joiner.join(f"({cond})" for cond, _ in parts), params
@@ -1,14 +1,22 @@
+import atexit
+import io
 import logging
 import os
 import os.path
+import queue
 import sys
 import threading
-from typing import ClassVar, Dict, no_type_check
+from functools import partial
+from typing import IO, Any, Callable, ClassVar, Dict, List, Optional, Tuple, Union
 
 import colorlog
 from rich.console import Console
 from rich.markup import escape
 
+# A log entry: the text to write, or a function returning it, which is called
+# on the writer thread, so that formatting is also off the caller's path.
+LogText = Union[str, Callable[[], str]]
+
 
 # Define a function to set up the colored logger
 def setup_colored_logging() -> None:
@@ -78,11 +86,19 @@ def setup_file_logger(
     append: bool = False,
     log_format: bool = False,
     propagate: bool = False,
+    background: bool = False,
 ) -> logging.Logger:
+    """
+    Set up a logger of module `name` writing to `filename`.
+    Args:
+        background: write records via the shared background `LogWriter`
+            (see `log_writer`), instead of synchronously in the caller.
+    """
     os.makedirs(os.path.dirname(filename), exist_ok=True)
     file_mode = "a" if append else "w"
     logger = setup_logger(name, terminal=False)
-    handler = logging.FileHandler(filename, mode=file_mode, encoding="utf-8")
+    handler_class = BackgroundFileHandler if background else logging.FileHandler
+    handler = handler_class(filename, mode=file_mode, encoding="utf-8")
     handler.setLevel(logging.INFO)
     if log_format:
         formatter = logging.Formatter(
@@ -116,6 +132,174 @@ def setup_loggers_for_package(package_name: str, level: int) -> None:
         setup_logger(module.__name__, level)
 
 
+class LogWriter:
+    """
+    Background writer of log files, shared by the Task loggers
+    (`RichFileLogger`, the TSV logger and `HTMLLogger`).
+
+    Loggers enqueue entries for their (open) file streams on a bounded queue,
+    which a single daemon thread drains: it writes up to `batch_size` entries
+    at a time, and flushes each stream once per batch rather than per entry.
+    Entries for a stream are written in the order they were enqueued.
+
+    When the queue is full, `write` blocks until there is room
+    (`overflow="block"`), or drops the entry (`overflow="drop"`).
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        overflow: str = "block",
+    ):
+        if overflow not in ("block", "drop"):
+            raise ValueError(f"overflow must be 'block' or 'drop', not {overflow!r}")
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self._queue: "queue.Queue[Tuple[Optional[IO[str]], Any]]" = queue.Queue(
+            max_queue
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = dict(written=0, dropped=0, errors=0, batches=0)
+
+    def _ensure_started(self) -> None:
+        # (re)start the thread lazily, e.g. also in a forked child process
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="langroid-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def write(self, stream: IO[str], text: LogText) -> bool:
+        """
+        Enqueue `text` to be written to `stream`.
+
+        Returns:
+            bool: False if the entry was dropped because the queue was full.
+        """
+        self._ensure_started()
+        if self.overflow == "block":
+            self._queue.put((stream, text))
+            return True
+        try:
+            self._queue.put_nowait((stream, text))
+            return True
+        except queue.Full:
+            self._count("dropped")
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all entries enqueued so far are written and flushed.
+
+        Returns:
+            bool: False if this timed out.
+        """
+        if self._thread is None:
+            return True
+        self._ensure_started()
+        done = threading.Event()
+        self._queue.put((None, done))
+        return done.wait(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of entries written, dropped and failed, batches written,
+        and entries currently queued."""
+        with self._lock:
+            return dict(**self._stats, queued=self._queue.qsize())
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += n
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Tuple[Optional[IO[str]], Any]]) -> None:
+        dirty: Dict[int, IO[str]] = {}
+        flushed: List[threading.Event] = []
+        written = errors = 0
+        for stream, text in batch:
+            if stream is None:
+                flushed.append(text)
+                continue
+            try:
+                stream.write(text if isinstance(text, str) else text())
+                dirty[id(stream)] = stream
+                written += 1
+            except Exception as e:
+                # e.g. the stream was closed by its owner in the meantime
+                errors += 1
+                logging.getLogger(__name__).warning(f"Failed to write log entry: {e}")
+        for stream in dirty.values():
+            try:
+                stream.flush()
+            except Exception:
+                errors += 1
+        with self._lock:
+            self._stats["written"] += written
+            self._stats["errors"] += errors
+            self._stats["batches"] += 1
+        for event in flushed:
+            event.set()
+
+
+_log_writer: Optional[LogWriter] = None
+_log_writer_lock = threading.Lock()
+
+
+def log_writer() -> LogWriter:
+    """
+    The process-wide `LogWriter`, configured by the env vars
+    `LANGROID_LOG_QUEUE_SIZE` (default 10000) and
+    `LANGROID_LOG_OVERFLOW` ("block" (default) or "drop").
+    Pending entries are flushed at exit.
+    """
+    global _log_writer
+    if _log_writer is None:
+        with _log_writer_lock:
+            if _log_writer is None:
+                writer = LogWriter(
+                    max_queue=int(os.getenv("LANGROID_LOG_QUEUE_SIZE", "10000")),
+                    overflow=os.getenv("LANGROID_LOG_OVERFLOW", "block"),
+                )
+                atexit.register(writer.flush, 5.0)
+                _log_writer = writer
+    return _log_writer
+
+
+class BackgroundFileHandler(logging.FileHandler):
+    """`logging.FileHandler` whose records are formatted and written
+    by the shared `LogWriter` thread."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.stream is None:
+            self.stream = self._open()
+        log_writer().write(self.stream, partial(self._format_line, record))
+
+    def _format_line(self, record: logging.LogRecord) -> str:
+        return self.format(record) + self.terminator
+
+    def flush(self) -> None:
+        log_writer().flush()
+        super().flush()
+
+    def close(self) -> None:
+        log_writer().flush()
+        super().close()
+
+
 class RichFileLogger:
     """Singleton-per-path, ref-counted, thread-safe file logger.
 
@@ -124,7 +308,8 @@ class RichFileLogger:
       once, even when many threads construct the logger concurrently.
     • A reference counter tracks how many parts of the program are using the
       logger; the FD is closed only when the counter reaches zero.
-    • All writes are serialised with a dedicated write-lock.
+    • Messages are formatted and written by the shared background
+      `LogWriter` thread (see `log_writer`), so writes are serialised there.
     """
 
     _instances: ClassVar[Dict[str, "RichFileLogger"]] = {}
@@ -166,7 +351,7 @@ class RichFileLogger:
             mode = "a" if append else "w"
             self._owns_file: bool = True
             try:
-                self.file = open(log_file, mode, buffering=1, encoding="utf-8")
+                self.file = open(log_file, mode, encoding="utf-8")
             except OSError as exc:  # EMFILE: too many open files
                 if exc.errno == 24:
                     # Fallback: reuse an already-open stream to avoid creating a new FD
@@ -176,8 +361,9 @@ class RichFileLogger:
                     raise
             self.log_file: str = log_file
             self.color: bool = color
+            # renders to a string, on the writer thread
             self.console: Console | None = (
-                Console(file=self.file, force_terminal=True, width=200)
+                Console(file=io.StringIO(), force_terminal=True, width=200)
                 if color
                 else None
             )
@@ -187,15 +373,20 @@ class RichFileLogger:
     # ------------------------------------------------------------------ #
     # public API
     # ------------------------------------------------------------------ #
-    @no_type_check
     def log(self, message: str) -> None:
-        """Thread-safe write to the log file."""
-        with self._write_lock:
-            if self.color and self.console is not None:
+        """Thread-safe (background) write to the log file."""
+        log_writer().write(self.file, partial(self._render, message))
+
+    def _render(self, message: str) -> str:
+        if self.color and self.console is not None:
+            with self.console.capture() as capture:
                 self.console.print(escape(message))
-            else:
-                print(message, file=self.file)
-            self.file.flush()
+            return capture.get()
+        return message + "\n"
+
+    def flush(self) -> None:
+        """Wait until all messages logged so far are written."""
+        log_writer().flush()
 
     def close(self) -> None:
         """Decrease ref-count; close FD only when last user is done."""
@@ -204,6 +395,7 @@ class RichFileLogger:
             if count <= 0:
                 self._ref_counts.pop(self.log_file, None)
                 self._instances.pop(self.log_file, None)
+                log_writer().flush()
                 with self._write_lock:
                     if self._owns_file and not self.file.closed:
                         self.file.close()
@@ -1,5 +1,18 @@
+import logging
+import threading
 import time
-from typing import TYPE_CHECKING, Dict, Optional, TypeAlias, TypeVar
+import weakref
+from collections import Counter, OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    MutableMapping,
+    Optional,
+    TypeAlias,
+    TypeVar,
+    cast,
+)
 from uuid import uuid4
 
 from pydantic import BaseModel
@@ -17,23 +30,129 @@ else:
 # Define a type variable that can be any subclass of BaseModel
 T = TypeVar("T", bound=BaseModel)
 
+logger = logging.getLogger(__name__)
+
 
 class ObjectRegistry:
-    """A global registry to hold id -> object mappings."""
+    """
+    A global registry to hold id -> object mappings.
+
+    By default the registry holds strong references to every object ever
+    registered (every ChatDocument and Agent), which grows without bound in a
+    long-running process. Use `ObjectRegistry.configure()` to choose:
+    - `weak=True`: hold weak references, so objects are dropped from the
+      registry once nothing else references them; and/or
+    - `max_size=N`: retain strong references only to the N most recently
+      registered or looked-up objects. With `weak=True`, older objects remain
+      retrievable for as long as they are referenced elsewhere; with
+      `weak=False` they are dropped from the registry.
+
+    With `weak=True`, a ChatDocument holds a strong reference to its parent,
+    so parent/child lookups keep working along the chain leading up to any
+    live message. Call `configure()` at startup, before creating agents or
+    messages.
+    """
+
+    registry: MutableMapping[str, ObjWithId] = {}
+    # strong refs to recently used objects, in LRU order (when max_size is set)
+    _retained: "OrderedDict[str, ObjWithId]" = OrderedDict()
+    _weak: bool = False
+    _max_size: Optional[int] = None
+    _evicted: int = 0
+    _lock = threading.RLock()
 
-    registry: Dict[str, ObjWithId] = {}
+    @classmethod
+    def configure(cls, weak: bool = False, max_size: Optional[int] = None) -> None:
+        """
+        Set the retention policy of the registry. Objects currently registered
+        are carried over.
+
+        Args:
+            weak (bool): hold weak references to registered objects
+            max_size (Optional[int]): max number of objects held by strong
+                reference, evicting the least-recently-used; None = unbounded
+        """
+        if max_size is not None and max_size < 0:
+            raise ValueError("max_size must be non-negative")
+        with cls._lock:
+            objects = list(cls._retained.items()) + [
+                (k, v) for k, v in list(cls.registry.items()) if v is not None
+            ]
+            cls._weak = weak
+            cls._max_size = max_size
+            cls.registry = weakref.WeakValueDictionary() if weak else OrderedDict()
+            cls._retained = OrderedDict()
+            for obj_id, obj in objects:
+                cls._store(obj_id, obj)
+
+    @classmethod
+    def is_weak(cls) -> bool:
+        """Whether the registry holds weak references to objects."""
+        return cls._weak
+
+    @classmethod
+    def _store(cls, obj_id: str, obj: ObjWithId) -> None:
+        if not cls._weak:
+            cls.registry[obj_id] = obj
+            if cls._max_size is not None:
+                registry = cast("OrderedDict[str, ObjWithId]", cls.registry)
+                registry.move_to_end(obj_id)
+                while len(registry) > cls._max_size:
+                    registry.popitem(last=False)
+                    cls._evicted += 1
+            return
+        try:
+            cls.registry[obj_id] = obj
+        except TypeError:
+            # not weak-referenceable: can only be held strongly
+            logger.warning(
+                f"{type(obj).__name__} does not support weak references; "
+                "holding it by strong reference in the ObjectRegistry"
+            )
+            cls._retained[obj_id] = obj
+            return
+        if cls._max_size is not None:
+            cls._retain(obj_id, obj)
+
+    @classmethod
+    def _retain(cls, obj_id: str, obj: ObjWithId) -> None:
+        """Hold a strong ref to `obj`, as most recently used."""
+        assert cls._max_size is not None
+        cls._retained[obj_id] = obj
+        cls._retained.move_to_end(obj_id)
+        while len(cls._retained) > cls._max_size:
+            cls._retained.popitem(last=False)
+            cls._evicted += 1
 
     @classmethod
     def add(cls, obj: ObjWithId) -> str:
         """Adds an object to the registry, returning the object's ID."""
         object_id = obj.id() if callable(obj.id) else obj.id
-        cls.registry[object_id] = obj
+        if cls._max_size is None and not cls._weak:
+            cls.registry[object_id] = obj
+            return object_id
+        with cls._lock:
+            cls._store(object_id, obj)
         return object_id
 
     @classmethod
     def get(cls, obj_id: str) -> Optional[ObjWithId]:
         """Retrieves an object by ID if it still exists."""
-        return cls.registry.get(obj_id)
+        if cls._max_size is None:
+            obj = cls.registry.get(obj_id)
+            if obj is None and cls._weak:
+                return cls._retained.get(obj_id)
+            return obj
+        with cls._lock:
+            obj = cls.registry.get(obj_id)
+            if obj is None:
+                return cls._retained.get(obj_id)
+            # refresh recency
+            if cls._weak:
+                cls._retain(obj_id, obj)
+            else:
+                cast("OrderedDict[str, ObjWithId]", cls.registry).move_to_end(obj_id)
+            return obj
 
     @classmethod
     def register_object(cls, obj: ObjWithId) -> str:
@@ -43,15 +162,44 @@ class ObjectRegistry:
     @classmethod
     def remove(cls, obj_id: str) -> None:
         """Removes an object from the registry."""
-        if obj_id in cls.registry:
-            del cls.registry[obj_id]
+        with cls._lock:
+            cls.registry.pop(obj_id, None)
+            cls._retained.pop(obj_id, None)
 
     @classmethod
     def cleanup(cls) -> None:
         """Cleans up the registry by removing entries where the object is None."""
-        to_remove = [key for key, value in cls.registry.items() if value is None]
-        for key in to_remove:
-            del cls.registry[key]
+        with cls._lock:
+            to_remove = [key for key, value in cls.registry.items() if value is None]
+            for key in to_remove:
+                del cls.registry[key]
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """
+        Registry metrics.
+
+        Returns:
+            Dict[str, Any]: with keys
+                - "live": number of objects retrievable from the registry
+                - "retained": number held by strong reference
+                - "evicted": number of LRU evictions (due to `max_size`) so far
+                - "by_type": number of live objects of each type name
+        """
+        with cls._lock:
+            objects = {k: v for k, v in cls.registry.items() if v is not None}
+            objects.update(cls._retained)
+            retained = (
+                len(cls._retained)
+                if cls._weak
+                else len([v for v in cls.registry.values() if v is not None])
+            )
+            return dict(
+                live=len(objects),
+                retained=retained,
+                evicted=cls._evicted,
+                by_type=dict(Counter(type(v).__name__ for v in objects.values())),
+            )
 
     @staticmethod
     def new_id() -> str:
@@ -1,7 +1,20 @@
 import copy
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Sequence, Tuple, Type
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
 
 import numpy as np
 import pandas as pd
@@ -9,8 +22,7 @@ from pydantic_settings import BaseSettings
 
 from langroid.embedding_models.base import EmbeddingModel, EmbeddingModelsConfig
 from langroid.embedding_models.models import OpenAIEmbeddingsConfig
-from langroid.mytypes import DocMetaData, Document, EmbeddingFunction
-from langroid.utils.algorithms.graph import components, topological_sort
+from langroid.mytypes import DocMetaData, Document, EmbeddingFunction, Embeddings
 from langroid.utils.configuration import settings
 from langroid.utils.object_registry import ObjectRegistry
 from langroid.utils.output.printing import print_long_text
@@ -19,6 +31,11 @@ from langroid.utils.pydantic_utils import flatten_dict
 
 logger = logging.getLogger(__name__)
 
+# max number of vectors from search results kept for reuse by a VectorStore
+_MAX_SEARCH_EMBEDDINGS = 2048
+# max number of chunk contents kept for reuse when adding context windows
+_MAX_CHUNK_CONTENTS = 4096
+
 
 class VectorStoreConfig(BaseSettings):
     type: str = ""  # deprecated, keeping it for backward compatibility
@@ -39,6 +56,12 @@ class VectorStoreConfig(BaseSettings):
     metadata_class: Type[DocMetaData] = DocMetaData
     # compose_file: str = "langroid/vector_store/docker-compose-qdrant.yml"
     full_eval: bool = False  # runs eval without sanitization. Use only on trusted input
+    # Seconds for which collection metadata (names, emptiness, readiness) is
+    # cached, so hot paths (e.g. per-query collection checks, per-batch upserts)
+    # avoid round trips to the store. The cache is invalidated when this
+    # VectorStore creates, deletes or adds to collections; changes made by
+    # other clients are seen once the TTL expires. 0 disables the cache.
+    collection_cache_ttl: float = 30.0
 
 
 class VectorStore(ABC):
@@ -55,6 +78,17 @@ class VectorStore(ABC):
         if hasattr(self.config, "embedding_model"):
             self.config.embedding_model = None
         self.embedding_fn: EmbeddingFunction = self.embedding_model.embedding_fn()
+        self._embedding_dim: Optional[int] = None
+        # list_collections(empty) results: empty -> (time cached, names)
+        self._collections_cache: Dict[bool, Tuple[float, List[str]]] = {}
+        # collections known to be ready for upserts -> time checked
+        self._ready_collections: Dict[str, float] = {}
+        # vectors returned along with recent search results: content -> vector
+        self._search_embeddings: OrderedDict[str, List[float]] = OrderedDict()
+        # contents of recently fetched chunks: (collection, id) -> content
+        self._chunk_contents: OrderedDict[Tuple[Optional[str], str], str] = (
+            OrderedDict()
+        )
 
     @staticmethod
     def create(config: VectorStoreConfig) -> Optional["VectorStore"]:
@@ -95,7 +129,9 @@ class VectorStore(ABC):
 
     @property
     def embedding_dim(self) -> int:
-        return len(self.embedding_fn(["test"])[0])
+        if self._embedding_dim is None:
+            self._embedding_dim = len(self.embedding_fn(["test"])[0])
+        return self._embedding_dim
 
     def clone(self) -> "VectorStore":
         """Return a vector-store clone suitable for agent cloning.
@@ -175,6 +211,62 @@ class VectorStore(ABC):
         """
         pass
 
+    def list_collections_cached(self, empty: bool = False) -> List[str]:
+        """
+        Like `list_collections`, but served from the collection-metadata cache
+        when it is fresh (see `VectorStoreConfig.collection_cache_ttl`).
+        """
+        ttl = self.config.collection_cache_ttl
+        cached = self._collections_cache.get(empty)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return list(cached[1])
+        names = self.list_collections(empty=empty)
+        if ttl > 0:
+            self._collections_cache[empty] = (time.monotonic(), list(names))
+        return names
+
+    def has_collection(self, collection_name: str, empty: bool = False) -> bool:
+        """
+        Whether the collection exists (and is non-empty, unless `empty` is True),
+        using the collection-metadata cache.
+        """
+        return collection_name in self.list_collections_cached(empty=empty)
+
+    def invalidate_collection_cache(
+        self, collection_name: Optional[str] = None
+    ) -> None:
+        """
+        Drop cached collection metadata, for the given collection or for all.
+        Subclasses call this whenever they create or delete collections.
+        """
+        self._collections_cache.clear()
+        if collection_name is None:
+            self._ready_collections.clear()
+        else:
+            self._ready_collections.pop(collection_name, None)
+        self._forget_chunk_contents(collection_name)
+
+    def _mark_collection_nonempty(self, collection_name: Optional[str]) -> None:
+        """Record in the cache that documents were just added to the collection."""
+        if collection_name is None:
+            return
+        # added docs may replace existing ones with the same ids
+        self._forget_chunk_contents(collection_name)
+        for _, names in self._collections_cache.values():
+            if collection_name not in names:
+                names.append(collection_name)
+
+    def _is_collection_ready_cached(self, collection_name: str) -> bool:
+        checked = self._ready_collections.get(collection_name)
+        return (
+            checked is not None
+            and time.monotonic() - checked < self.config.collection_cache_ttl
+        )
+
+    def _mark_collection_ready(self, collection_name: str) -> None:
+        if self.config.collection_cache_ttl > 0:
+            self._ready_collections[collection_name] = time.monotonic()
+
     def set_collection(self, collection_name: str, replace: bool = False) -> None:
         """
         Set the current collection to the given collection name.
@@ -203,6 +295,74 @@ class VectorStore(ABC):
     def add_documents(self, documents: Sequence[Document]) -> None:
         pass
 
+    def add_embedded_documents(
+        self, documents: Sequence[Document], embeddings: Embeddings
+    ) -> None:
+        """
+        Add documents whose embeddings (of their `content`) were already computed.
+
+        The default implementation calls `add_documents` with `self.embedding_fn`
+        temporarily replaced by one that looks up the given embeddings of these
+        docs' contents (so it also works for stores that embed docs in slices);
+        any other text is embedded as usual.
+        Subclasses that can pass embeddings directly should override this.
+
+        Args:
+            documents: documents to add
+            embeddings: embeddings of the documents' content, in the same order
+        """
+        precomputed = {d.content: e for d, e in zip(documents, embeddings)}
+        embedding_fn = self.embedding_fn
+
+        def precomputed_embedding_fn(inputs: List[str]) -> Embeddings:
+            missing = list(dict.fromkeys(t for t in inputs if t not in precomputed))
+            computed = dict(zip(missing, embedding_fn(missing))) if missing else {}
+            return [precomputed[t] if t in precomputed else computed[t] for t in inputs]
+
+        self.embedding_fn = precomputed_embedding_fn
+        try:
+            self.add_documents(documents)
+        finally:
+            self.embedding_fn = embedding_fn
+
+    def add_documents_stream(
+        self,
+        batches: Iterable[Sequence[Document]],
+        max_in_flight: int = 2,
+    ) -> Iterator[Sequence[Document]]:
+        """
+        Add documents arriving as a stream of batches, e.g. from a generator
+        that parses and splits docs lazily.
+        Embeddings of upcoming batches are computed in a background thread while
+        the current batch is upserted, and at most `max_in_flight` batches are
+        embedded ahead of the upsert, so peak memory is O(max_in_flight * batch).
+
+        Args:
+            batches: iterable of batches of documents
+            max_in_flight: max number of batches embedded ahead of the upsert
+
+        Yields:
+            Sequence[Document]: each batch, once it has been added
+        """
+        embedding_fn = self.embedding_fn
+        batch_iter = iter(batches)
+        pending: Deque[Tuple[Sequence[Document], Future[Embeddings]]] = deque()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < max(1, max_in_flight):
+                    batch = next(batch_iter, None)
+                    if batch is None:
+                        exhausted = True
+                    elif len(batch) > 0:
+                        texts = [d.content for d in batch]
+                        pending.append((batch, pool.submit(embedding_fn, texts)))
+                if len(pending) == 0:
+                    break
+                batch, embeddings = pending.popleft()
+                self.add_embedded_documents(batch, embeddings.result())
+                yield batch
+
     def compute_from_docs(self, docs: List[Document], calc: str) -> str:
         """Compute a result on a set of documents,
         using a dataframe calc string like `df.groupby('state')['income'].mean()`.
@@ -267,6 +427,112 @@ class VectorStore(ABC):
         """
         pass
 
+    def similar_texts_with_scores_batch(
+        self,
+        texts: List[str],
+        k: int = 1,
+        where: Optional[str] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Batched version of `similar_texts_with_scores`: find the k most similar
+        texts to each of the given texts. Vector stores with a native
+        batch-search API override this to embed all texts in one call and search
+        in a single round trip; the default searches one text at a time.
+
+        Args:
+            texts (List[str]): The texts to find similar texts for.
+            k (int, optional): Number of similar texts to retrieve per text.
+            where (Optional[str], optional): Where clause to filter the search.
+
+        Returns:
+            List[List[Tuple[Document,float]]]: (Document, score) tuples for
+                each text, in the order of `texts`.
+        """
+        return [self.similar_texts_with_scores(t, k=k, where=where) for t in texts]
+
+    def _remember_search_embeddings(
+        self, docs: Sequence[Document], embeddings: Sequence[Optional[List[float]]]
+    ) -> None:
+        """
+        Keep (a bounded number of) the vectors returned with search results,
+        so `get_text_embeddings` can reuse them instead of re-embedding.
+        """
+        for d, e in zip(docs, embeddings):
+            if e is None:
+                continue
+            self._search_embeddings[d.content] = e
+            self._search_embeddings.move_to_end(d.content)
+        while len(self._search_embeddings) > _MAX_SEARCH_EMBEDDINGS:
+            self._search_embeddings.popitem(last=False)
+
+    def get_text_embeddings(self, texts: List[str]) -> Embeddings:
+        """
+        Embeddings of the given texts, reusing the vectors returned with recent
+        search results where available, and embedding the rest in one call.
+        Vectors from the store may have been normalized by it, so these are
+        meant for cosine-similarity computations (e.g. diversity re-ranking).
+
+        Args:
+            texts (List[str]): texts to embed
+
+        Returns:
+            Embeddings: embeddings of the texts, in order
+        """
+        embeddings: List[Optional[List[float]]] = [
+            self._search_embeddings.get(t) for t in texts
+        ]
+        missing = [i for i, e in enumerate(embeddings) if e is None]
+        if len(missing) > 0:
+            new_embeddings = self.embedding_fn([texts[i] for i in missing])
+            for i, e in zip(missing, new_embeddings):
+                embeddings[i] = e
+        return embeddings  # type: ignore
+
+    def _forget_chunk_contents(self, collection_name: Optional[str] = None) -> None:
+        """Drop cached chunk contents, for the given collection or for all."""
+        if collection_name is None:
+            self._chunk_contents.clear()
+            return
+        for key in [k for k in self._chunk_contents if k[0] == collection_name]:
+            del self._chunk_contents[key]
+
+    def get_chunk_contents(self, ids: Sequence[str]) -> Dict[str, str]:
+        """
+        Contents of the documents (typically chunks) with the given ids in the
+        current collection. Recently fetched contents are reused, and the rest
+        are fetched with a single `get_documents_by_ids` call.
+
+        Args:
+            ids (Sequence[str]): ids of the documents
+
+        Returns:
+            Dict[str, str]: id -> content, for the ids that were found
+        """
+        coll = self.config.collection_name
+        contents: Dict[str, str] = {}
+        missing: List[str] = []
+        for id in dict.fromkeys(ids):
+            content = self._chunk_contents.get((coll, id))
+            if content is None:
+                missing.append(id)
+            else:
+                self._chunk_contents.move_to_end((coll, id))
+                contents[id] = content
+        if len(missing) > 0:
+            docs = self.get_documents_by_ids(missing)
+            # stores return the docs in the order of the ids (skipping
+            # missing ones), but may not preserve the ids as given
+            if len(docs) == len(missing):
+                fetched = dict(zip(missing, [d.content for d in docs]))
+            else:
+                fetched = {d.id(): d.content for d in docs}
+            for id, content in fetched.items():
+                contents[id] = content
+                self._chunk_contents[(coll, id)] = content
+            while len(self._chunk_contents) > _MAX_CHUNK_CONTENTS:
+                self._chunk_contents.popitem(last=False)
+        return contents
+
     def add_context_window(
         self, docs_scores: List[Tuple[Document, float]], neighbors: int = 0
     ) -> List[Tuple[Document, float]]:
@@ -279,6 +545,8 @@ class VectorStore(ABC):
 
         We may have stored a longer set of window_ids than we need during chunking.
         Now, we just want `neighbors` on each side of the center of the window_ids list.
+        The contents of all chunks in the final windows are fetched together,
+        see `get_chunk_contents`.
 
         Args:
             docs_scores (List[Tuple[Document, float]]): List of pairs of documents
@@ -324,13 +592,14 @@ class VectorStore(ABC):
         # and they may overlap, so we coalesce overlapping groups into
         # separate windows.
         window_ids_list = self.remove_overlaps(window_ids_list)
+        contents = self.get_chunk_contents([id for w in window_ids_list for id in w])
         final_docs = []
         final_scores = []
         for w in window_ids_list:
             metadata = copy.deepcopy(id2metadata[w[0]])
             metadata.window_ids = w
             document = Document(
-                content="".join([d.content for d in self.get_documents_by_ids(w)]),
+                content="".join([contents[id] for id in w if id in contents]),
                 metadata=metadata,
             )
             # make a fresh id since content is in general different
@@ -343,9 +612,13 @@ class VectorStore(ABC):
     def remove_overlaps(windows: List[List[str]]) -> List[List[str]]:
         """
         Given a collection of windows, where each window is a sequence of ids,
-        identify groups of overlapping windows, and for each overlapping group,
-        order the chunk-ids using topological sort so they appear in the original
-        order in the text.
+        identify groups of overlapping windows, and merge each group into a single
+        window with the ids in their original order in the text.
+
+        Each window is a contiguous run of chunk-ids of a document, so two windows
+        sharing an id are aligned by that id: we track the offset of each window
+        relative to the first window of its group (with a union-find), which gives
+        every id a position in its group, and sort the ids by group and position.
 
         Args:
             windows (List[int|str]): List of windows, where each window is a
@@ -355,49 +628,55 @@ class VectorStore(ABC):
             List[int|str]: List of windows, where each window is a sequence of ids,
                 and no two windows overlap.
         """
-        ids = set(id for w in windows for id in w)
-        # id -> {win -> # pos}
-        id2win2pos: Dict[str, Dict[int, int]] = {id: {} for id in ids}
-
-        for i, w in enumerate(windows):
-            for j, id in enumerate(w):
-                id2win2pos[id][i] = j
-
         n = len(windows)
-        # relation between windows:
-        order = np.zeros((n, n), dtype=np.int8)
+        parent = list(range(n))
+        # offset of a window's start relative to its parent's start
+        offset = [0] * n
+
+        def find(i: int) -> Tuple[int, int]:
+            """Root of window i's group, and the offset of i relative to it."""
+            path = []
+            while parent[i] != i:
+                path.append(i)
+                i = parent[i]
+            total = 0
+            for j in reversed(path):
+                total += offset[j]
+                offset[j] = total
+                parent[j] = i
+            return i, total
+
+        # id -> (window, position) where it was first seen
+        first_seen: Dict[str, Tuple[int, int]] = {}
         for i, w in enumerate(windows):
-            for j, x in enumerate(windows):
-                if i == j:
-                    continue
-                if len(set(w).intersection(x)) == 0:
+            for p, id in enumerate(w):
+                seen = first_seen.setdefault(id, (i, p))
+                if seen[0] == i:
                     continue
-                id = list(set(w).intersection(x))[0]  # any common id
-                if id2win2pos[id][i] > id2win2pos[id][j]:
-                    order[i, j] = -1  # win i is before win j
-                else:
-                    order[i, j] = 1  # win i is after win j
-
-        # find groups of windows that overlap, like connected components in a graph
-        groups = components(np.abs(order))
-
-        # order the chunk-ids in each group using topological sort
-        new_windows = []
-        for g in groups:
-            # find total ordering among windows in group based on order matrix
-            # (this is a topological sort)
-            _g = np.array(g)
-            order_matrix = order[_g][:, _g]
-            ordered_window_indices = topological_sort(order_matrix)
-            ordered_window_ids = [windows[i] for i in _g[ordered_window_indices]]
-            flattened = [id for w in ordered_window_ids for id in w]
-            flattened_deduped = list(dict.fromkeys(flattened))
-            # Note we are not going to split these, and instead we'll return
-            # larger windows from concatenating the connected groups.
-            # This ensures context is retained for LLM q/a
-            new_windows += [flattened_deduped]
-
-        return new_windows
+                j, q = seen
+                root_i, offset_i = find(i)
+                root_j, offset_j = find(j)
+                if root_i != root_j:
+                    # align so that id is at the same position in both windows
+                    parent[root_i] = root_j
+                    offset[root_i] = offset_j + q - p - offset_i
+
+        roots, starts = zip(*[find(i) for i in range(n)]) if n > 0 else ((), ())
+        # groups in order of their first window, ids in order of position
+        group_rank = {r: k for k, r in enumerate(dict.fromkeys(roots))}
+        sizes = np.array([len(w) for w in windows], dtype=np.int64)
+        groups = np.repeat([group_rank[r] for r in roots], sizes)
+        positions = np.repeat(np.array(starts, dtype=np.int64), sizes) + (
+            np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        )
+        ids = [id for w in windows for id in w]
+        new_windows: List[List[str]] = [[] for _ in group_rank]
+        for k in np.lexsort((positions, groups)):
+            new_windows[groups[k]].append(ids[k])
+        # Note we are not going to split these, and instead we'll return
+        # larger windows from concatenating the connected groups.
+        # This ensures context is retained for LLM q/a
+        return [list(dict.fromkeys(w)) for w in new_windows]
 
     @abstractmethod
     def get_all_documents(self, where: str = "") -> List[Document]:
@@ -406,6 +685,18 @@ class VectorStore(ABC):
         """
         pass
 
+    def iter_documents(
+        self, where: str = "", batch_size: Optional[int] = None
+    ) -> Iterator[List[Document]]:
+        """
+        Get all documents in the current collection, possibly filtered by `where`,
+        in batches. Stores that can read documents incrementally override this;
+        the default yields `get_all_documents` as a single batch.
+        """
+        docs = self.get_all_documents(where=where)
+        if len(docs) > 0:
+            yield docs
+
     @abstractmethod
     def get_documents_by_ids(self, ids: List[str]) -> List[Document]:
         """
@@ -7,7 +7,7 @@ from langroid.embedding_models.base import (
 )
 from langroid.embedding_models.models import OpenAIEmbeddingsConfig
 from langroid.exceptions import LangroidImportError
-from langroid.mytypes import Document
+from langroid.mytypes import Document, Embeddings
 from langroid.utils.configuration import settings
 from langroid.utils.output.printing import print_long_text
 from langroid.vector_store.base import VectorStore, VectorStoreConfig
@@ -64,6 +64,7 @@ class ChromaDB(VectorStore):
             n_empty_deletes += c.count() == 0
             n_non_empty_deletes += c.count() > 0
             self.client.delete_collection(name=c.name)
+        self.invalidate_collection_cache()
         logger.warning(
             f"""
             Deleted {n_empty_deletes} empty collections and
@@ -79,6 +80,7 @@ class ChromaDB(VectorStore):
             if coll.count() == 0:
                 n_deletes += 1
                 self.client.delete_collection(name=coll.name)
+        self.invalidate_collection_cache()
         return n_deletes
 
     def list_collections(self, empty: bool = False) -> List[str]:
@@ -120,8 +122,21 @@ class ChromaDB(VectorStore):
                 # https://docs.trychroma.com/docs/collections/configure
             },
         )
+        self.invalidate_collection_cache(collection_name)
 
     def add_documents(self, documents: Sequence[Document]) -> None:
+        self._add_documents(documents)
+
+    def add_embedded_documents(
+        self, documents: Sequence[Document], embeddings: Embeddings
+    ) -> None:
+        self._add_documents(documents, embeddings)
+
+    def _add_documents(
+        self,
+        documents: Sequence[Document],
+        embeddings: Optional[Embeddings] = None,
+    ) -> None:
         super().maybe_add_ids(documents)
         if documents is None:
             return
@@ -136,18 +151,19 @@ class ChromaDB(VectorStore):
 
         ids = [str(d.id()) for d in documents]
 
-        colls = self.list_collections(empty=True)
         if self.config.collection_name is None:
             raise ValueError("No collection name set, cannot ingest docs")
-        if self.config.collection_name not in colls:
+        if not self.has_collection(self.config.collection_name, empty=True):
             self.create_collection(self.config.collection_name, replace=True)
 
+        # with embeddings given, chroma does not call its embedding function
         self.collection.add(
-            # embedding_models=embedding_models,
+            embeddings=embeddings,
             documents=contents,
             metadatas=metadata_dicts,
             ids=ids,
         )
+        self._mark_collection_nonempty(self.config.collection_name)
 
     def get_all_documents(self, where: str = "") -> List[Document]:
         filter = json.loads(where) if where else None
@@ -160,15 +176,21 @@ class ChromaDB(VectorStore):
         return self._docs_from_results(results)
 
     def get_documents_by_ids(self, ids: List[str]) -> List[Document]:
-        # get them one by one since chroma mangles the order of the results
-        # when fetched from a list of ids.
-        results = [
-            self.collection.get(ids=[id], include=["documents", "metadatas"])
-            for id in ids
-        ]
+        if len(ids) == 0:
+            return []
+        # fetch all docs in a single call; chroma does not return them
+        # in the order of the ids, so we restore that order here.
+        results = self.collection.get(
+            ids=list(dict.fromkeys(ids)), include=["documents", "metadatas"]
+        )
+        id2index = {id: i for i, id in enumerate(results["ids"])}
+        indices = [id2index[id] for id in ids if id in id2index]
         final_results = {}
-        final_results["documents"] = [[r["documents"][0] for r in results]]
-        final_results["metadatas"] = [[r["metadatas"][0] for r in results]]
+        final_results["documents"] = [[results["documents"][i] for i in indices]]
+        final_results["metadatas"] = [
+            # copied, since _docs_from_results modifies them in place
+            [dict(results["metadatas"][i]) for i in indices]
+        ]
         return self._docs_from_results(final_results)
 
     def delete_collection(self, collection_name: str) -> None:
@@ -176,39 +198,58 @@ class ChromaDB(VectorStore):
             self.client.delete_collection(name=collection_name)
         except Exception:
             pass
+        self.invalidate_collection_cache(collection_name)
 
     def similar_texts_with_scores(
         self, text: str, k: int = 1, where: Optional[str] = None
     ) -> List[Tuple[Document, float]]:
+        return self.similar_texts_with_scores_batch([text], k=k, where=where)[0]
+
+    def similar_texts_with_scores_batch(
+        self, texts: List[str], k: int = 1, where: Optional[str] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        if len(texts) == 0:
+            return []
         n = self.collection.count()
         filter = json.loads(where) if where else None
+        # a single query for all texts: chroma embeds them in one batch
         results = self.collection.query(
-            query_texts=[text],
+            query_texts=texts,
             n_results=min(n, k),
             where=filter,
-            include=["documents", "distances", "metadatas"],
+            include=["documents", "distances", "metadatas", "embeddings"],
         )
-        docs = self._docs_from_results(results)
-        # chroma distances are 1 - cosine.
-        scores = [1 - s for s in results["distances"][0]]
-        return list(zip(docs, scores))
+        docs_scores = []
+        for i in range(len(texts)):
+            docs = self._docs_from_results(results, i)
+            # chroma distances are 1 - cosine.
+            scores = [1 - s for s in results["distances"][i]]
+            docs_scores.append(list(zip(docs, scores)))
+            if results.get("embeddings") is not None:
+                self._remember_search_embeddings(
+                    docs, [list(map(float, e)) for e in results["embeddings"][i]]
+                )
+        return docs_scores
 
-    def _docs_from_results(self, results: Dict[str, Any]) -> List[Document]:
+    def _docs_from_results(
+        self, results: Dict[str, Any], index: int = 0
+    ) -> List[Document]:
         """
         Helper function to convert results from ChromaDB to a list of Documents
         Args:
             results (dict): results from ChromaDB
+            index (int): which query's results to convert (for batched queries)
 
         Returns:
             List[Document]: list of Documents
         """
-        if len(results["documents"][0]) == 0:
+        if len(results["documents"][index]) == 0:
             return []
-        contents = results["documents"][0]
+        contents = results["documents"][index]
         if settings.debug:
             for i, c in enumerate(contents):
                 print_long_text("red", "italic red", f"MATCH-{i}", c)
-        metadatas = results["metadatas"][0]
+        metadatas = results["metadatas"][index]
         for m in metadatas:
             # restore the stringified list of window_ids into the original List[str]
             if m["window_ids"].strip() == "":
@@ -6,6 +6,7 @@ from typing import (
     Any,
     Dict,
     Generator,
+    Iterator,
     List,
     Optional,
     Sequence,
@@ -13,12 +14,14 @@ from typing import (
     Type,
 )
 
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 from pydantic import BaseModel, ValidationError, create_model
 
 if TYPE_CHECKING:
-    from lancedb.query import LanceVectorQueryBuilder
+    import pyarrow as pa
+    from lancedb.query import LanceQueryBuilder
 
 from langroid.embedding_models.base import (
     EmbeddingModelsConfig,
@@ -96,6 +99,7 @@ class LanceDB(VectorStore):
             if nr == 0:
                 n_deletes += 1
                 self.client.drop_table(name)
+        self.invalidate_collection_cache()
         return n_deletes
 
     def clear_all_collections(self, really: bool = False, prefix: str = "") -> int:
@@ -116,6 +120,7 @@ class LanceDB(VectorStore):
             n_empty_deletes += nr == 0
             n_non_empty_deletes += nr > 0
             self.client.drop_table(name)
+        self.invalidate_collection_cache()
         logger.warning(
             f"""
             Deleted {n_empty_deletes} empty collections and
@@ -195,7 +200,6 @@ class LanceDB(VectorStore):
 
     def add_documents(self, documents: Sequence[Document]) -> None:
         super().maybe_add_ids(documents)
-        colls = self.list_collections(empty=True)
         if len(documents) == 0:
             return
         embedding_vecs = self.embedding_fn([doc.content for doc in documents])
@@ -205,7 +209,7 @@ class LanceDB(VectorStore):
         # self._maybe_set_doc_class_schema(documents[0])
         table_exists = False
         if (
-            coll_name in colls
+            self.has_collection(coll_name, empty=True)
             and self.client.open_table(coll_name).head(1).shape[0] > 0
         ):
             # collection exists and  is not empty:
@@ -213,6 +217,7 @@ class LanceDB(VectorStore):
             # else we'll append to it.
             if self.config.replace_collection:
                 self.client.drop_table(coll_name)
+                self.invalidate_collection_cache(coll_name)
             else:
                 table_exists = True
 
@@ -248,6 +253,7 @@ class LanceDB(VectorStore):
                 )
                 # ... and add the rest
                 tbl.add(batch_gen)
+            self._mark_collection_nonempty(coll_name)
         except Exception as e:
             logger.error(
                 f"""
@@ -317,24 +323,27 @@ class LanceDB(VectorStore):
             # collection exists and is not empty, so append to it
             tbl = self.client.open_table(self.config.collection_name)
             tbl.add(df)
+        self._mark_collection_nonempty(coll_name)
 
     def delete_collection(self, collection_name: str) -> None:
         self.client.drop_table(collection_name, ignore_missing=True)
+        self.invalidate_collection_cache(collection_name)
+
+    def _lance_result_to_docs(self, result: "LanceQueryBuilder") -> List[Document]:
+        return self._arrow_to_docs(result.to_arrow())
 
-    def _lance_result_to_docs(
-        self, result: "LanceVectorQueryBuilder"
-    ) -> List[Document]:
+    def _arrow_to_docs(self, table: "pa.Table | pa.RecordBatch") -> List[Document]:
+        """Documents from (a table or batch of) LanceDB query results."""
         if self.is_from_dataframe:
-            df = result.to_pandas()
             return dataframe_to_documents(
-                df,
+                table.to_pandas(),
                 content="content",
                 metadata=self.df_metadata_columns,
                 doc_cls=self.config.document_class,
             )
-        else:
-            records = result.to_arrow().to_pylist()
-            return self._records_to_docs(records)
+        # the vectors are not part of the documents, so don't convert them
+        columns = [c for c in table.schema.names if c != "vector"]
+        return self._records_to_docs(table.select(columns).to_pylist())
 
     def _records_to_docs(self, records: List[Dict[str, Any]]) -> List[Document]:
         try:
@@ -352,25 +361,51 @@ class LanceDB(VectorStore):
         return docs
 
     def get_all_documents(self, where: str = "") -> List[Document]:
+        return [d for docs in self.iter_documents(where) for d in docs]
+
+    def iter_documents(
+        self, where: str = "", batch_size: Optional[int] = None
+    ) -> Iterator[List[Document]]:
+        """
+        Documents in the current collection (possibly filtered by `where`),
+        read (without their vectors) and converted one Arrow batch at a time.
+        """
         if self.config.collection_name is None:
             raise ValueError("No collection name set, cannot retrieve docs")
         if self.config.collection_name not in self.list_collections(empty=True):
-            return []
+            return
+        batch_size = batch_size or self.config.batch_size
         tbl = self.client.open_table(self.config.collection_name)
-        pre_result = tbl.search(None).where(where or None).limit(None)
-        return self._lance_result_to_docs(pre_result)
+        try:
+            dataset = tbl.to_lance()
+        except (AttributeError, NotImplementedError):
+            # not a local table: read all results, then split them
+            pre_result = tbl.search(None).where(where or None).limit(None)
+            batches = pre_result.to_arrow().to_batches(max_chunksize=batch_size)
+        else:
+            columns = [c for c in tbl.schema.names if c != "vector"]
+            batches = dataset.to_batches(
+                columns=columns, filter=where or None, batch_size=batch_size
+            )
+        for batch in batches:
+            if batch.num_rows > 0:
+                yield self._arrow_to_docs(batch)
 
     def get_documents_by_ids(self, ids: List[str]) -> List[Document]:
         if self.config.collection_name is None:
             raise ValueError("No collection name set, cannot retrieve docs")
         _ids = [str(id) for id in ids]
+        if len(_ids) == 0:
+            return []
         tbl = self.client.open_table(self.config.collection_name)
-        docs = []
-        for _id in _ids:
-            results = self._lance_result_to_docs(tbl.search().where(f"id == '{_id}'"))
-            if len(results) > 0:
-                docs.append(results[0])
-        return docs
+        # fetch all docs in a single query, then restore the order of the ids
+        unique_ids = list(dict.fromkeys(_ids))
+        id_list = ", ".join("'" + _id.replace("'", "''") + "'" for _id in unique_ids)
+        results = self._lance_result_to_docs(
+            tbl.search().where(f"id IN ({id_list})").limit(len(unique_ids))
+        )
+        id2doc = {str(d.id()): d for d in results}
+        return [id2doc[_id] for _id in _ids if _id in id2doc]
 
     def similar_texts_with_scores(
         self,
@@ -379,24 +414,80 @@ class LanceDB(VectorStore):
         where: Optional[str] = None,
     ) -> List[Tuple[Document, float]]:
         embedding = self.embedding_fn([text])[0]
+        return self._similar_to_embedding(text, embedding, k, where)
+
+    def similar_texts_with_scores_batch(
+        self,
+        texts: List[str],
+        k: int = 1,
+        where: Optional[str] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        if len(texts) == 0:
+            return []
+        # embed all texts in one call, then search for each
+        embeddings = self.embedding_fn(texts)
+        return [
+            self._similar_to_embedding(text, embedding, k, where)
+            for text, embedding in zip(texts, embeddings)
+        ]
+
+    def similar_texts_table(
+        self,
+        text: str,
+        k: int = 1,
+        where: Optional[str] = None,
+    ) -> "pa.Table":
+        """
+        Like `similar_texts_with_scores`, but returns the matches as an Arrow
+        table (with a `score` column, and without the vectors), so callers that
+        only need some columns avoid converting each match to a `Document`.
+        """
+        embedding = self.embedding_fn([text])[0]
+        table = self._search_table(embedding, k, where)
+        table = table.append_column("score", self._scores(table))
+        return table.drop(
+            [c for c in ["vector", "_distance"] if c in table.schema.names]
+        )
+
+    def _search_table(
+        self, embedding: List[float], k: int, where: Optional[str]
+    ) -> "pa.Table":
+        """Run a vector search once, keeping the results as an Arrow table."""
         tbl = self.client.open_table(self.config.collection_name)
-        result = (
+        return (
             tbl.search(embedding)
             .metric(self.config.distance)
             .where(where, prefilter=True)
             .limit(k)
+            .to_arrow()
         )
-        docs = self._lance_result_to_docs(result)
+
+    @staticmethod
+    def _scores(table: "pa.Table") -> "pa.Array":
+        import pyarrow.compute as pc
+
         # note _distance is 1 - cosine
-        if self.is_from_dataframe:
-            scores = [
-                1 - rec["_distance"] for rec in result.to_pandas().to_dict("records")
-            ]
-        else:
-            scores = [1 - rec["_distance"] for rec in result.to_arrow().to_pylist()]
-        if len(docs) == 0:
+        return pc.subtract(1, table.column("_distance"))
+
+    def _similar_to_embedding(
+        self,
+        text: str,
+        embedding: List[float],
+        k: int,
+        where: Optional[str],
+    ) -> List[Tuple[Document, float]]:
+        table = self._search_table(embedding, k, where)
+        if table.num_rows == 0:
             logger.warning(f"No matches found for {text}")
             return []
+        docs = self._arrow_to_docs(table)
+        scores: List[float] = self._scores(table).to_pylist()
+        if not self.is_from_dataframe and "vector" in table.schema.names:
+            vectors = table.column("vector").combine_chunks()
+            self._remember_search_embeddings(
+                docs,
+                np.asarray(vectors.flatten()).reshape(table.num_rows, -1).tolist(),
+            )
         if settings.debug:
             logger.info(f"Found {len(docs)} matches, max score: {max(scores)}")
         doc_score_pairs = list(zip(docs, scores))
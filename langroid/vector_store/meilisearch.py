@@ -94,6 +94,7 @@ class MeiliSearch(VectorStore):
         coll_names = [c for c in self.list_collections() if c.startswith(prefix)]
         deletes = asyncio.run(self._async_delete_indices(coll_names))
         n_deletes = sum(deletes)
+        self.invalidate_collection_cache()
         logger.warning(f"Deleted {n_deletes} indices in MeiliSearch")
         return n_deletes
 
@@ -162,6 +163,7 @@ class MeiliSearch(VectorStore):
                 logger.warning("Recreating fresh collection")
                 asyncio.run(self._async_delete_index(collection_name))
         asyncio.run(self._async_create_index(collection_name))
+        self.invalidate_collection_cache(collection_name)
         collection_info = asyncio.run(self._async_get_index(collection_name))
         if settings.debug:
             level = logger.getEffectiveLevel()
@@ -184,10 +186,9 @@ class MeiliSearch(VectorStore):
         super().maybe_add_ids(documents)
         if len(documents) == 0:
             return
-        colls = self._list_all_collections()
         if self.config.collection_name is None:
             raise ValueError("No collection name set, cannot ingest docs")
-        if self.config.collection_name not in colls:
+        if not self.has_collection(self.config.collection_name, empty=True):
             self.create_collection(self.config.collection_name, replace=True)
         docs = [
             dict(
@@ -198,9 +199,11 @@ class MeiliSearch(VectorStore):
             for d in documents
         ]
         asyncio.run(self._async_add_documents(self.config.collection_name, docs))
+        self._mark_collection_nonempty(self.config.collection_name)
 
     def delete_collection(self, collection_name: str) -> None:
         asyncio.run(self._async_delete_index(collection_name))
+        self.invalidate_collection_cache(collection_name)
 
     def _to_int_or_uuid(self, id: str) -> int | str:
         try:
@@ -228,6 +228,7 @@ class PineconeDB(VectorStore):
             self.client.create_index(**payload)
         except PineconeApiException as e:
             logger.error(e)
+        self.invalidate_collection_cache(collection_name)
 
     def delete_collection(self, collection_name: str) -> None:
         logger.info(f"Attempting to delete {collection_name}")
@@ -236,6 +237,7 @@ class PineconeDB(VectorStore):
         except PineconeApiException as e:
             logger.error(f"Failed to delete {collection_name}")
             logger.error(e)
+        self.invalidate_collection_cache(collection_name)
 
     def add_documents(self, documents: Sequence[Document], namespace: str = "") -> None:
         if self.config.collection_name is None:
@@ -267,7 +269,7 @@ class PineconeDB(VectorStore):
             )
         ]
 
-        if self.config.collection_name not in self.list_collections(empty=True):
+        if not self.has_collection(self.config.collection_name, empty=True):
             self.create_collection(
                 collection_name=self.config.collection_name, replace=True
             )
@@ -288,6 +290,7 @@ class PineconeDB(VectorStore):
                     f"Unable to add of docs between indices {i} and {batch_size}"
                 )
                 logger.error(e)
+        self._mark_collection_nonempty(self.config.collection_name)
 
     def get_all_documents(
         self, prefix: str = "", namespace: str = ""
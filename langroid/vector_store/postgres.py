@@ -1,16 +1,20 @@
 import hashlib
+import io
 import json
 import logging
 import os
+import struct
 import uuid
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from langroid.embedding_models.base import (
     EmbeddingModelsConfig,
 )
 from langroid.embedding_models.models import OpenAIEmbeddingsConfig
 from langroid.exceptions import LangroidImportError
-from langroid.mytypes import DocMetaData, Document
+from langroid.mytypes import DocMetaData, Document, Embeddings
 from langroid.vector_store.base import VectorStore, VectorStoreConfig
 
 has_postgres: bool = True
@@ -26,8 +30,8 @@ try:
         text,
     )
     from sqlalchemy.dialects.postgresql import JSONB
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
     from sqlalchemy.engine import Connection, Engine
-    from sqlalchemy.sql.expression import insert
 except ImportError:
     Engine = Any  # type: ignore
     Connection = Any  # type: ignore
@@ -48,6 +52,45 @@ class PostgresDBConfig(VectorStoreConfig):
     max_overflow: int = 20
     hnsw_m: int = 16
     hnsw_ef_construction: int = 200
+    # Per-query HNSW search settings (None = server default), see
+    # https://github.com/pgvector/pgvector?tab=readme-ov-file#query-options
+    # size of the candidate list; must be >= k to get k results
+    hnsw_ef_search: Optional[int] = None
+    # "strict_order" or "relaxed_order" (pgvector >= 0.8): keep scanning the
+    # index until enough rows pass the `where` filter
+    hnsw_iterative_scan: Optional[str] = None
+    # create a GIN index on the metadata, to speed up `where` filters
+    metadata_index: bool = False
+    # ingest with a binary COPY into a staging table (when the driver supports
+    # it), instead of multi-row INSERTs
+    use_copy: bool = True
+
+
+# header and trailer of PostgreSQL's binary COPY format
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_COPY_TRAILER = struct.pack("!h", -1)
+
+
+def _copy_rows(rows: Iterable[Tuple[str, Sequence[float], str, str]]) -> bytes:
+    """
+    Encode (id, embedding, document, metadata JSON) rows in PostgreSQL's binary
+    COPY format, for the columns (text, vector, text, jsonb).
+    """
+    buffer = io.BytesIO()
+    for id, embedding, document, metadata in rows:
+        vector = np.asarray(embedding, dtype=">f4")
+        fields = [
+            id.encode(),
+            # pgvector's binary format: dims, unused, then the float4 values
+            struct.pack("!hh", len(vector), 0) + vector.tobytes(),
+            document.encode(),
+            b"\x01" + metadata.encode(),  # jsonb version 1
+        ]
+        buffer.write(struct.pack("!h", len(fields)))
+        for field in fields:
+            buffer.write(struct.pack("!i", len(field)))
+            buffer.write(field)
+    return buffer.getvalue()
 
 
 class PostgresDB(VectorStore):
@@ -157,6 +200,22 @@ class PostgresDB(VectorStore):
                 )
                 connection.execute(create_index_query)
 
+            # GIN index for `where` filters, i.e. jsonb containment (@>) queries
+            gin_index_name = f"gin_index_{self.config.collection_name}_cmetadata"
+            if self.config.metadata_index and not self.index_exists(
+                connection, gin_index_name
+            ):
+                connection.execute(text("COMMIT"))
+                connection.execute(
+                    text(
+                        f"""
+                        CREATE INDEX CONCURRENTLY IF NOT EXISTS {gin_index_name}
+                        ON {self.config.collection_name}
+                        USING gin (cmetadata jsonb_path_ops);
+                        """
+                    )
+                )
+
     def index_exists(self, connection: Connection, index_name: str) -> bool:
         """Check if an index exists."""
         query = text(
@@ -195,6 +254,7 @@ class PostgresDB(VectorStore):
             self.config.collection_name = collection_name
             self.config.replace_collection = replace
             self._setup_table()
+            self.invalidate_collection_cache(collection_name)
 
     def list_collections(self, empty: bool = True) -> List[str]:
         inspector = inspect(self.engine)
@@ -233,6 +293,7 @@ class PostgresDB(VectorStore):
             # 4. Refresh metadata again after dropping the table
             self.metadata.clear()
             self.metadata.reflect(bind=self.engine)
+        self.invalidate_collection_cache(collection_name)
 
     def clear_all_collections(self, really: bool = False, prefix: str = "") -> int:
         if not really:
@@ -324,32 +385,133 @@ class PostgresDB(VectorStore):
             return documents
 
     def add_documents(self, documents: Sequence[Document]) -> None:
+        """
+        Add (or, for ids already in the collection, replace) documents, embedding
+        and writing them one batch at a time. With `use_copy`, the batches are
+        loaded with a binary COPY into a temporary staging table, and then
+        upserted into the collection in a single statement.
+        """
+        self._add_documents(documents)
+
+    def add_embedded_documents(
+        self, documents: Sequence[Document], embeddings: Embeddings
+    ) -> None:
+        self._add_documents(documents, embeddings)
+
+    def _add_documents(
+        self,
+        documents: Sequence[Document],
+        embeddings: Optional[Embeddings] = None,
+    ) -> None:
         super().maybe_add_ids(documents)
         for doc in documents:
             doc.metadata.id = str(PostgresDB._id_to_uuid(doc.metadata.id, doc.metadata))
-
-        embeddings = self.embedding_fn([doc.content for doc in documents])
+        # an upsert can't affect the same row twice: keep the last doc for each id
+        positions = list(
+            {doc.metadata.id: i for i, doc in enumerate(documents)}.values()
+        )
+        documents = [documents[i] for i in positions]
+        if embeddings is not None:
+            embeddings = [embeddings[i] for i in positions]
+        if len(documents) == 0:
+            return
 
         batch_size = self.config.batch_size
-        with self.SessionLocal() as session:
-            for i in range(0, len(documents), batch_size):
-                batch_docs = documents[i : i + batch_size]
-                batch_embeddings = embeddings[i : i + batch_size]
-
-                new_records = [
-                    {
-                        "id": doc.metadata.id,
-                        "embedding": embedding,
-                        "document": doc.content,
-                        "cmetadata": doc.metadata.model_dump(),
-                    }
-                    for doc, embedding in zip(batch_docs, batch_embeddings)
-                ]
-
-                if new_records:
-                    stmt = insert(self.embeddings_table).values(new_records)
-                    session.execute(stmt)
-                session.commit()
+        batches = (
+            (
+                documents[i : i + batch_size],
+                None if embeddings is None else embeddings[i : i + batch_size],
+            )
+            for i in range(0, len(documents), batch_size)
+        )
+        with self.engine.begin() as connection:
+            cursor = connection.connection.cursor() if self.config.use_copy else None
+            try:
+                if hasattr(cursor, "copy_expert") or hasattr(cursor, "copy"):
+                    self._copy_upsert(connection, cursor, batches)
+                else:
+                    for batch, batch_embeddings in batches:
+                        self._insert_upsert(connection, batch, batch_embeddings)
+            finally:
+                if cursor is not None:
+                    cursor.close()
+        self._mark_collection_nonempty(self.config.collection_name)
+
+    def _insert_upsert(
+        self,
+        connection: Connection,
+        docs: Sequence[Document],
+        embeddings: Optional[Embeddings] = None,
+    ) -> None:
+        if embeddings is None:
+            embeddings = self.embedding_fn([doc.content for doc in docs])
+        stmt = pg_insert(self.embeddings_table).values(
+            [
+                {
+                    "id": doc.metadata.id,
+                    "embedding": embedding,
+                    "document": doc.content,
+                    "cmetadata": doc.metadata.model_dump(),
+                }
+                for doc, embedding in zip(docs, embeddings)
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["id"],
+            set_={c: stmt.excluded[c] for c in ["embedding", "document", "cmetadata"]},
+        )
+        connection.execute(stmt)
+
+    def _copy_upsert(
+        self,
+        connection: Connection,
+        cursor: Any,
+        batches: Iterable[Tuple[Sequence[Document], Optional[Embeddings]]],
+    ) -> None:
+        quote = self.engine.dialect.identifier_preparer.quote
+        table = quote(self.config.collection_name)
+        staging = quote(f"staging_{self.config.collection_name}")
+        columns = "id, embedding, document, cmetadata"
+        connection.execute(
+            text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {staging} "
+                f"(LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+        )
+        copy_sql = f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT binary)"
+        for batch, embeddings in batches:
+            if embeddings is None:
+                embeddings = self.embedding_fn([doc.content for doc in batch])
+            data = (
+                _COPY_HEADER
+                + _copy_rows(
+                    (
+                        str(doc.metadata.id),
+                        embedding,
+                        doc.content,
+                        json.dumps(doc.metadata.model_dump()),
+                    )
+                    for doc, embedding in zip(batch, embeddings)
+                )
+                + _COPY_TRAILER
+            )
+            if hasattr(cursor, "copy_expert"):  # psycopg2
+                cursor.copy_expert(copy_sql, io.BytesIO(data))
+            else:  # psycopg 3
+                with cursor.copy(copy_sql) as copy:
+                    copy.write(data)
+        connection.execute(
+            text(
+                f"""
+                INSERT INTO {table} ({columns})
+                SELECT {columns} FROM {staging}
+                ON CONFLICT (id) DO UPDATE SET
+                    embedding = EXCLUDED.embedding,
+                    document = EXCLUDED.document,
+                    cmetadata = EXCLUDED.cmetadata
+                """
+            )
+        )
 
     @staticmethod
     def _id_to_uuid(id: str, obj: object) -> str:
@@ -366,6 +528,19 @@ class PostgresDB(VectorStore):
 
         return doc_id
 
+    def _apply_search_settings(self, connection: Connection) -> None:
+        """Set the HNSW search options for the current transaction."""
+        settings = {
+            "hnsw.ef_search": self.config.hnsw_ef_search,
+            "hnsw.iterative_scan": self.config.hnsw_iterative_scan,
+        }
+        for name, value in settings.items():
+            if value is not None:
+                connection.execute(
+                    text("SELECT set_config(:name, :value, true)"),
+                    dict(name=name, value=str(value)),
+                )
+
     def similar_texts_with_scores(
         self,
         query: str,
@@ -373,54 +548,70 @@ class PostgresDB(VectorStore):
         where: Optional[str] = None,
         neighbors: int = 1,  # Parameter not used in this implementation
     ) -> List[Tuple[Document, float]]:
-        embedding = self.embedding_fn([query])[0]
-
-        with self.SessionLocal() as session:
-            # Calculate the score (1 - cosine_distance) and label it as "score"
-            score = (
-                1 - (self.embeddings_table.c.embedding.cosine_distance(embedding))
-            ).label("score")
-
-            if where is not None:
-                try:
-                    json_query = json.loads(where)
-                except json.JSONDecodeError:
-                    raise ValueError(f"Invalid JSON in 'where' clause: {where}")
-
-                results = (
-                    session.query(
-                        self.embeddings_table.c.id,
-                        self.embeddings_table.c.document,
-                        self.embeddings_table.c.cmetadata,
-                        score,  # Select the calculated score
-                    )
-                    .filter(self.embeddings_table.c.cmetadata.contains(json_query))
-                    .order_by(score.desc())  # Order by score in descending order
-                    .limit(k)
-                    .all()
-                )
-            else:
-                results = (
-                    session.query(
-                        self.embeddings_table.c.id,
-                        self.embeddings_table.c.document,
-                        self.embeddings_table.c.cmetadata,
-                        score,  # Select the calculated score
-                    )
-                    .order_by(score.desc())  # Order by score in descending order
-                    .limit(k)
-                    .all()
-                )
+        return self.similar_texts_with_scores_batch([query], k=k, where=where)[0]
 
-            documents_with_scores = [
+    def similar_texts_with_scores_batch(
+        self,
+        texts: List[str],
+        k: int = 1,
+        where: Optional[str] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Embed all texts in one call, and search for all of them with a single
+        query (a lateral join of the query vectors with the nearest rows), so
+        each search can use the HNSW index.
+        """
+        if len(texts) == 0:
+            return []
+        filter = None
+        if where is not None:
+            try:
+                filter = json.dumps(json.loads(where))
+            except json.JSONDecodeError:
+                raise ValueError(f"Invalid JSON in 'where' clause: {where}")
+        embeddings = self.embedding_fn(texts)
+        # a vector[] literal, e.g. {"[0.1,0.2]","[0.3,0.4]"}
+        queries = (
+            "{"
+            + ",".join(
+                '"[' + ",".join(str(float(x)) for x in e) + ']"' for e in embeddings
+            )
+            + "}"
+        )
+        table = self.engine.dialect.identifier_preparer.quote(
+            self.config.collection_name
+        )
+        filter_clause = "WHERE e.cmetadata @> CAST(:filter AS jsonb)" if filter else ""
+        query = text(
+            f"""
+            SELECT q.ord, t.document, t.cmetadata, 1 - t.distance AS score
+            FROM unnest(CAST(:queries AS vector[])) WITH ORDINALITY AS q(vec, ord)
+            CROSS JOIN LATERAL (
+                SELECT e.document, e.cmetadata, e.embedding <=> q.vec AS distance
+                FROM {table} e
+                {filter_clause}
+                ORDER BY e.embedding <=> q.vec
+                LIMIT :k
+            ) t
+            ORDER BY q.ord, t.distance
+            """
+        )
+        params: Dict[str, Any] = dict(queries=queries, k=k)
+        if filter:
+            params["filter"] = filter
+        with self.engine.begin() as connection:
+            self._apply_search_settings(connection)
+            rows = connection.execute(query, params).all()
+
+        results: List[List[Tuple[Document, float]]] = [[] for _ in texts]
+        for row in rows:
+            results[row.ord - 1].append(
                 (
                     Document(
-                        content=result.document,
-                        metadata=DocMetaData(**(result.cmetadata or {})),
+                        content=row.document,
+                        metadata=DocMetaData(**(row.cmetadata or {})),
                     ),
-                    result.score,  # Use the score from the query result
+                    row.score,
                 )
-                for result in results
-            ]
-
-            return documents_with_scores
+            )
+        return results
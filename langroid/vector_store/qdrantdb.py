@@ -177,6 +177,7 @@ class QdrantDB(VectorStore):
             if info.points_count == 0:
                 n_deletes += 1
                 self.client.delete_collection(collection_name=name)
+        self.invalidate_collection_cache()
         return n_deletes
 
     def clear_all_collections(self, really: bool = False, prefix: str = "") -> int:
@@ -200,6 +201,7 @@ class QdrantDB(VectorStore):
             n_empty_deletes += points_count == 0
             n_non_empty_deletes += points_count > 0
             self.client.delete_collection(collection_name=name)
+        self.invalidate_collection_cache()
         logger.warning(
             f"""
             Deleted {n_empty_deletes} empty collections and
@@ -267,6 +269,7 @@ class QdrantDB(VectorStore):
                 else:
                     logger.warning("Recreating fresh collection")
             self.client.delete_collection(collection_name=collection_name)
+            self.invalidate_collection_cache(collection_name)
 
         vectors_config = {
             "": VectorParams(
@@ -284,9 +287,11 @@ class QdrantDB(VectorStore):
             vectors_config=vectors_config,
             sparse_vectors_config=sparse_vectors_config,
         )
+        self.invalidate_collection_cache(collection_name)
         collection_info = self.client.get_collection(collection_name=collection_name)
         assert collection_info.status == CollectionStatus.GREEN
         assert collection_info.vectors_count in [0, None]
+        self._mark_collection_ready(collection_name)
         if settings.debug:
             level = logger.getEffectiveLevel()
             logger.setLevel(logging.INFO)
@@ -322,6 +327,18 @@ class QdrantDB(VectorStore):
         return sparse_embeddings
 
     def add_documents(self, documents: Sequence[Document]) -> None:
+        self._add_documents(documents)
+
+    def add_embedded_documents(
+        self, documents: Sequence[Document], embeddings: Embeddings
+    ) -> None:
+        self._add_documents(documents, embeddings)
+
+    def _add_documents(
+        self,
+        documents: Sequence[Document],
+        embedding_vecs: Optional[Embeddings] = None,
+    ) -> None:
         from qdrant_client.http.models import (
             Batch,
             CollectionStatus,
@@ -333,17 +350,17 @@ class QdrantDB(VectorStore):
         # Fix the ids due to qdrant finickiness
         for doc in documents:
             doc.metadata.id = str(self._to_int_or_uuid(doc.metadata.id))
-        colls = self.list_collections(empty=True)
         if len(documents) == 0:
             return
         document_dicts = [doc.model_dump() for doc in documents]
-        embedding_vecs = self.embedding_fn([doc.content for doc in documents])
+        if embedding_vecs is None:
+            embedding_vecs = self.embedding_fn([doc.content for doc in documents])
         sparse_embedding_vecs = self.get_sparse_embeddings(
             [doc.content for doc in documents]
         )
         if self.config.collection_name is None:
             raise ValueError("No collection name set, cannot ingest docs")
-        if self.config.collection_name not in colls:
+        if not self.has_collection(self.config.collection_name, empty=True):
             self.create_collection(self.config.collection_name, replace=True)
         ids = [self._to_int_or_uuid(d.id()) for d in documents]
         # don't insert all at once, batch in chunks of b,
@@ -355,8 +372,8 @@ class QdrantDB(VectorStore):
             }
             if self.config.use_sparse_embeddings:
                 vectors["text-sparse"] = sparse_embedding_vecs[i : i + b]
-            coll_found: bool = False
-            for _ in range(3):
+            coll_found = self._is_collection_ready_cached(self.config.collection_name)
+            for _ in range(0 if coll_found else 3):
                 # poll until collection is ready
                 if (
                     self.client.collection_exists(self.config.collection_name)
@@ -364,6 +381,7 @@ class QdrantDB(VectorStore):
                     == CollectionStatus.GREEN
                 ):
                     coll_found = True
+                    self._mark_collection_ready(self.config.collection_name)
                     break
                 time.sleep(1)
 
@@ -383,9 +401,19 @@ class QdrantDB(VectorStore):
                     payloads=document_dicts[i : i + b],
                 ),
             )
+        self._mark_collection_nonempty(self.config.collection_name)
+
+    @staticmethod
+    def _dense_vector(match: Any) -> Optional[List[float]]:
+        """The dense vector returned with a search match, if any."""
+        vector = match.vector
+        if isinstance(vector, dict):
+            vector = vector.get("")
+        return vector if isinstance(vector, list) else None
 
     def delete_collection(self, collection_name: str) -> None:
         self.client.delete_collection(collection_name=collection_name)
+        self.invalidate_collection_cache(collection_name)
 
     def _to_int_or_uuid(self, id: str) -> int | str:
         try:
@@ -468,6 +496,18 @@ class QdrantDB(VectorStore):
         where: Optional[str] = None,
         neighbors: int = 0,
     ) -> List[Tuple[Document, float]]:
+        return self.similar_texts_with_scores_batch([text], k=k, where=where)[0]
+
+    def similar_texts_with_scores_batch(
+        self,
+        texts: List[str],
+        k: int = 1,
+        where: Optional[str] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Embed all texts in one call, and search for all of them (dense and, if
+        enabled, sparse) in a single `search_batch` request.
+        """
         from qdrant_client.conversions.common_types import ScoredPoint
         from qdrant_client.http.models import (
             Filter,
@@ -476,57 +516,74 @@ class QdrantDB(VectorStore):
             SearchRequest,
         )
 
-        embedding = self.embedding_fn([text])[0]
+        if len(texts) == 0:
+            return []
+        embeddings = self.embedding_fn(texts)
+        sparse_embeddings = self.get_sparse_embeddings(texts)
         # TODO filter may not work yet
         if where is None or where == "":
             filter = Filter()
         else:
             filter = Filter.model_validate(json.loads(where))
-        requests = [
-            SearchRequest(
-                vector=NamedVector(
-                    name="",
-                    vector=embedding,
-                ),
-                limit=k,
-                with_payload=True,
-                filter=filter,
-            )
-        ]
-        if self.config.use_sparse_embeddings:
-            sparse_embedding = self.get_sparse_embeddings([text])[0]
+        requests = []
+        for i, embedding in enumerate(embeddings):
             requests.append(
                 SearchRequest(
-                    vector=NamedSparseVector(
-                        name="text-sparse",
-                        vector=sparse_embedding,
+                    vector=NamedVector(
+                        name="",
+                        vector=embedding,
                     ),
-                    limit=self.config.sparse_limit,
+                    limit=k,
                     with_payload=True,
+                    with_vector=True,
                     filter=filter,
                 )
             )
+            if self.config.use_sparse_embeddings:
+                requests.append(
+                    SearchRequest(
+                        vector=NamedSparseVector(
+                            name="text-sparse",
+                            vector=sparse_embeddings[i],
+                        ),
+                        limit=self.config.sparse_limit,
+                        with_payload=True,
+                        filter=filter,
+                    )
+                )
         if self.config.collection_name is None:
             raise ValueError("No collection name set, cannot search")
         search_result_lists: List[List[ScoredPoint]] = self.client.search_batch(
             collection_name=self.config.collection_name, requests=requests
         )
-
-        search_result = [
-            match for result in search_result_lists for match in result
-        ]  # 2D list -> 1D list
-        scores = [match.score for match in search_result if match is not None]
-        docs = [
-            self.config.document_class(**(match.payload))  # type: ignore
-            for match in search_result
-            if match is not None
-        ]
-        if len(docs) == 0:
-            logger.warning(f"No matches found for {text}")
-            return []
-        doc_score_pairs = list(zip(docs, scores))
-        max_score = max(ds[1] for ds in doc_score_pairs)
-        if settings.debug:
-            logger.info(f"Found {len(doc_score_pairs)} matches, max score: {max_score}")
-        self.show_if_debug(doc_score_pairs)
-        return doc_score_pairs
+        # requests per text: dense, then sparse (if enabled)
+        n_per_text = 2 if self.config.use_sparse_embeddings else 1
+        results: List[List[Tuple[Document, float]]] = []
+        for i, text in enumerate(texts):
+            search_result = [
+                match
+                for result in search_result_lists[i * n_per_text : (i + 1) * n_per_text]
+                for match in result
+            ]  # 2D list -> 1D list
+            scores = [match.score for match in search_result if match is not None]
+            search_result = [match for match in search_result if match is not None]
+            docs = [
+                self.config.document_class(**(match.payload))  # type: ignore
+                for match in search_result
+            ]
+            if len(docs) == 0:
+                logger.warning(f"No matches found for {text}")
+                results.append([])
+                continue
+            self._remember_search_embeddings(
+                docs, [self._dense_vector(match) for match in search_result]
+            )
+            doc_score_pairs = list(zip(docs, scores))
+            max_score = max(ds[1] for ds in doc_score_pairs)
+            if settings.debug:
+                logger.info(
+                    f"Found {len(doc_score_pairs)} matches, max score: {max_score}"
+                )
+            self.show_if_debug(doc_score_pairs)
+            results.append(doc_score_pairs)
+        return results
@@ -85,6 +85,7 @@ class WeaviateDB(VectorStore):
             if len(val) == 0:
                 n_deletes += 1
                 self.client.collections.delete(coll_name)
+        self.invalidate_collection_cache()
         return n_deletes
 
     def list_collections(self, empty: bool = False) -> List[str]:
@@ -120,6 +121,7 @@ class WeaviateDB(VectorStore):
             n_empty_deletes += points_count == 0
             n_non_empty_deletes += points_count > 0
             self.client.collections.delete(name)
+        self.invalidate_collection_cache()
         logger.warning(
             f"""
             Deleted {n_empty_deletes} empty collections and
@@ -130,6 +132,7 @@ class WeaviateDB(VectorStore):
 
     def delete_collection(self, collection_name: str) -> None:
         self.client.collections.delete(name=collection_name)
+        self.invalidate_collection_cache(collection_name)
 
     def create_collection(self, collection_name: str, replace: bool = False) -> None:
         try:
@@ -169,6 +172,7 @@ class WeaviateDB(VectorStore):
             vector_index_config=vector_index_config,
             vectorizer_config=vectorizer_config,
         )
+        self.invalidate_collection_cache(collection_name)
         collection_info = self.client.collections.get(name=collection_name)
         assert len(collection_info) in [0, None]
         if settings.debug:
@@ -179,7 +183,6 @@ class WeaviateDB(VectorStore):
 
     def add_documents(self, documents: Sequence[Document]) -> None:
         super().maybe_add_ids(documents)
-        colls = self.list_collections(empty=True)
         for doc in documents:
             doc.metadata.id = str(self._create_valid_uuid_id(doc.metadata.id))
         if len(documents) == 0:
@@ -189,13 +192,14 @@ class WeaviateDB(VectorStore):
         embedding_vecs = self.embedding_fn([doc.content for doc in documents])
         if self.config.collection_name is None:
             raise ValueError("No collection name set, cannot ingest docs")
-        if self.config.collection_name not in colls:
+        if not self.has_collection(self.config.collection_name, empty=True):
             self.create_collection(self.config.collection_name, replace=True)
         coll_name = self.client.collections.get(self.config.collection_name)
         with coll_name.batch.dynamic() as batch:
             for i, doc_dict in enumerate(document_dicts):
                 id = doc_dict["metadata"].pop("id", None)
                 batch.add_object(properties=doc_dict, uuid=id, vector=embedding_vecs[i])
+        self._mark_collection_nonempty(self.config.collection_name)
 
     def get_all_documents(self, where: str = "") -> List[Document]:
         if self.config.collection_name is None:
@@ -0,0 +1,72 @@
+"""
+Benchmark: BM25 lexical search via `BM25Index` vs the original per-query
+`rank_bm25.BM25Okapi` path used by `find_closest_matches_with_bm25`.
+
+Run e.g.:
+
+python3 -m tests.benchmarks.bench_bm25_index --n_docs=200000 --n_queries=20
+"""
+
+import random
+import time
+
+import fire
+from rank_bm25 import BM25Okapi
+
+from langroid.parsing.bm25_index import BM25Index
+
+
+def make_corpus(
+    n_docs: int, doc_len: int, vocab_size: int, seed: int
+) -> list[list[str]]:
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(vocab_size)]
+    # Zipf-like term distribution, as in natural text
+    weights = [1.0 / (i + 1) for i in range(vocab_size)]
+    return [rng.choices(vocab, weights=weights, k=doc_len) for _ in range(n_docs)]
+
+
+def main(
+    n_docs: int = 50_000,
+    doc_len: int = 150,
+    vocab_size: int = 50_000,
+    n_queries: int = 10,
+    query_len: int = 5,
+    k: int = 10,
+    seed: int = 42,
+) -> None:
+    corpus = make_corpus(n_docs, doc_len, vocab_size, seed)
+    rng = random.Random(seed + 1)
+    queries = [
+        [f"w{rng.randint(0, vocab_size // 10)}" for _ in range(query_len)]
+        for _ in range(n_queries)
+    ]
+
+    start = time.perf_counter()
+    index = BM25Index()
+    index.add(corpus)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index_results = [index.top_k(q, k) for q in queries]
+    index_time = (time.perf_counter() - start) / n_queries
+
+    # original path: build BM25Okapi from scratch and score all docs, per query
+    start = time.perf_counter()
+    okapi_results = []
+    for q in queries:
+        scores = BM25Okapi(corpus).get_scores(q)
+        top = sorted(range(len(scores)), key=lambda i: -scores[i])[:k]
+        okapi_results.append(top)
+    okapi_time = (time.perf_counter() - start) / n_queries
+
+    agree = all([i for i, _ in r] == o for r, o in zip(index_results, okapi_results))
+    print(f"docs={n_docs} doc_len={doc_len} vocab={vocab_size} k={k}")
+    print(f"BM25Index build (one-time): {build_time:.2f}s")
+    print(f"BM25Index per query:        {index_time * 1000:.2f}ms")
+    print(f"BM25Okapi per query:        {okapi_time * 1000:.2f}ms")
+    print(f"speedup: {okapi_time / index_time:.0f}x, same top-k: {agree}")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
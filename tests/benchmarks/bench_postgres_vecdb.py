@@ -0,0 +1,110 @@
+"""
+Benchmark: PostgresDB ingestion with binary COPY + staging-table upsert vs
+multi-row INSERT upserts, and search latency (p50/p99) of per-query searches
+vs batched searches, with a given `hnsw.ef_search`.
+
+Needs a local Postgres with pgvector, e.g.
+
+docker run -d -p 5432:5432 -e POSTGRES_PASSWORD=postgres \
+    -e POSTGRES_DB=langroid pgvector/pgvector:pg17
+
+Run e.g.:
+
+python3 -m tests.benchmarks.bench_postgres_vecdb --n_docs=20000 --n_queries=200
+"""
+
+import hashlib
+import random
+import time
+from typing import List
+
+import fire
+import numpy as np
+
+from langroid.embedding_models.base import EmbeddingModel
+from langroid.mytypes import DocMetaData, Document, EmbeddingFunction, Embeddings
+from langroid.vector_store.postgres import PostgresDB, PostgresDBConfig
+
+
+class RandomEmbeddings(EmbeddingModel):
+    """Deterministic pseudo-random unit vectors, so no embedding API is needed."""
+
+    def __init__(self, dims: int):
+        self.dims = dims
+
+    def embedding_fn(self) -> EmbeddingFunction:
+        def embed(texts: List[str]) -> Embeddings:
+            vectors = []
+            for t in texts:
+                seed = int(hashlib.md5(t.encode()).hexdigest()[:8], 16)
+                v = np.random.default_rng(seed).standard_normal(self.dims)
+                vectors.append((v / np.linalg.norm(v)).tolist())
+            return vectors
+
+        return embed
+
+    @property
+    def embedding_dims(self) -> int:
+        return self.dims
+
+
+def percentile_ms(times: List[float], q: float) -> float:
+    return float(np.percentile(times, q) * 1000)
+
+
+def main(
+    n_docs: int = 10_000,
+    n_queries: int = 100,
+    dims: int = 384,
+    k: int = 10,
+    batch_size: int = 1000,
+    ef_search: int = 100,
+    seed: int = 42,
+) -> None:
+    rng = random.Random(seed)
+    docs = [
+        Document(
+            content=f"doc {i} " + " ".join(str(rng.random()) for _ in range(10)),
+            metadata=DocMetaData(id=str(i), source=rng.choice(["wiki", "web"])),
+        )
+        for i in range(n_docs)
+    ]
+    queries = [f"query {i}" for i in range(n_queries)]
+
+    for use_copy in [False, True]:
+        vecdb = PostgresDB(
+            PostgresDBConfig(
+                collection_name="bench_postgres_vecdb",
+                replace_collection=True,
+                embedding_model=RandomEmbeddings(dims),
+                batch_size=batch_size,
+                use_copy=use_copy,
+                hnsw_ef_search=ef_search,
+            )
+        )
+        docs_copy = [d.model_copy(deep=True) for d in docs]
+        start = time.perf_counter()
+        vecdb.add_documents(docs_copy)
+        elapsed = time.perf_counter() - start
+        method = "COPY + upsert" if use_copy else "INSERT upsert"
+        print(f"ingest ({method}): {n_docs / elapsed:,.0f} rows/s")
+
+    times = []
+    for q in queries:
+        start = time.perf_counter()
+        vecdb.similar_texts_with_scores(q, k=k)
+        times.append(time.perf_counter() - start)
+    print(
+        f"per-query search: p50 {percentile_ms(times, 50):.2f}ms, "
+        f"p99 {percentile_ms(times, 99):.2f}ms"
+    )
+
+    start = time.perf_counter()
+    vecdb.similar_texts_with_scores_batch(queries, k=k)
+    per_query = (time.perf_counter() - start) / n_queries
+    print(f"batched search:   {per_query * 1000:.2f}ms per query")
+    vecdb.delete_collection("bench_postgres_vecdb")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,110 @@
+"""
+Benchmark: single-pass token chunking (`Parser.chunk_tokens`, also via
+`Parser.split_chunk_tokens`, serial and with `chunk_workers`) vs the original
+chunker, which decoded, regex-scanned and re-encoded every chunk, and re-sliced
+the remaining token list after each one.
+
+Run e.g.:
+
+python3 -m tests.benchmarks.bench_token_chunker --n_docs=20 --doc_words=100000
+"""
+
+import re
+import time
+from typing import List
+
+import fire
+
+from langroid.mytypes import Document
+from langroid.parsing.parser import Parser, ParsingConfig, Splitter
+from langroid.parsing.utils import generate_random_text
+
+
+def original_chunk_tokens(parser: Parser, text: str) -> List[str]:
+    """The original `Parser.chunk_tokens`."""
+    if not text or text.isspace():
+        return []
+    config = parser.config
+    tokens = parser.tokenizer.encode(text, disallowed_special=())
+    chunks = []
+    num_chunks = 0
+    while tokens and num_chunks < config.max_chunks:
+        chunk = tokens[: config.chunk_size]
+        chunk_text = parser.tokenizer.decode(chunk)
+        if not chunk_text or chunk_text.isspace():
+            tokens = tokens[len(chunk) :]
+            continue
+        punctuation_matches = [
+            (m.start(), m.group())
+            for m in re.finditer(r"(?:[.!?][\s\n]|\n)", chunk_text)
+        ]
+        last_punctuation = max([pos for pos, _ in punctuation_matches] + [-1])
+        if last_punctuation != -1 and last_punctuation > config.min_chunk_chars:
+            chunk_text = chunk_text[: last_punctuation + 1]
+        chunk_text_to_append = re.sub(r"\n{3,}", "\n\n", chunk_text)
+        if len(chunk_text_to_append) > config.discard_chunk_chars:
+            chunks.append(chunk_text_to_append)
+        tokens = tokens[
+            len(parser.tokenizer.encode(chunk_text, disallowed_special=())) :
+        ]
+        num_chunks += 1
+    return chunks
+
+
+def make_text(n_words: int, seed: int) -> str:
+    # sentences and paragraphs of random words
+    words = generate_random_text(n_words).split()
+    lines = []
+    for i in range(0, len(words), 12):
+        end = ".\n\n" if (i // 12) % 5 == 4 else ". "
+        lines.append(" ".join(words[i : i + 12]) + end)
+    return "".join(lines)
+
+
+def main(
+    n_docs: int = 10,
+    doc_words: int = 50_000,
+    chunk_size: int = 200,
+    workers: int = 4,
+    seed: int = 42,
+) -> None:
+    texts = [make_text(doc_words, seed + i) for i in range(n_docs)]
+    config = ParsingConfig(
+        splitter=Splitter.TOKENS, chunk_size=chunk_size, max_chunks=1_000_000
+    )
+    parser = Parser(config)
+    docs = [Document(content=t, metadata={"id": str(i)}) for i, t in enumerate(texts)]
+
+    start = time.perf_counter()
+    original = [original_chunk_tokens(parser, t) for t in texts]
+    original_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunks = [parser.chunk_tokens(t) for t in texts]
+    chunk_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parser.split_chunk_tokens(docs)
+    split_time = time.perf_counter() - start
+
+    config.chunk_workers = workers
+    start = time.perf_counter()
+    parser.split_chunk_tokens(docs)
+    parallel_time = time.perf_counter() - start
+
+    n_chunks = sum(len(c) for c in chunks)
+    same = sum(c == o for doc, orig in zip(chunks, original) for c, o in zip(doc, orig))
+    print(f"docs={n_docs} words/doc={doc_words} chunk_size={chunk_size}")
+    print(f"original chunk_tokens:      {original_time:.2f}s")
+    print(f"chunk_tokens:               {chunk_time:.2f}s")
+    print(f"split_chunk_tokens:         {split_time:.2f}s")
+    print(f"split_chunk_tokens x{workers}:      {parallel_time:.2f}s")
+    print(
+        f"speedup: {original_time / chunk_time:.1f}x, "
+        f"chunks: {n_chunks} (original: {sum(len(o) for o in original)}), "
+        f"identical: {same}"
+    )
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
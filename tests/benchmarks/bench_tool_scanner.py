@@ -0,0 +1,80 @@
+"""
+Benchmark: scanning long LLM responses for JSON tool candidates with
+`get_json_candidates` (and incrementally with `JsonCandidateScanner`) vs the
+original pyparsing `nested_expr` grammar.
+
+Run e.g.:
+
+python3 -m tests.benchmarks.bench_tool_scanner --n_chars=200000 --repeat=5
+"""
+
+import json
+import random
+import time
+from typing import Callable, List
+
+import fire
+from pyparsing import nested_expr, original_text_for
+
+from langroid.parsing.parse_json import JsonCandidateScanner, get_json_candidates
+
+
+def original_get_json_candidates(s: str) -> List[str]:
+    """The original pyparsing-based `get_json_candidates`."""
+    curly_braces = original_text_for(nested_expr("{", "}"))
+    try:
+        return [r[0] for r in curly_braces.search_string(s)]
+    except Exception:
+        return []
+
+
+def make_response(n_chars: int, with_code: bool, seed: int) -> str:
+    rng = random.Random(seed)
+    words = ["the", "tool", "result", "is", "shown", "below", "it's", "a", "value"]
+    parts: List[str] = []
+    size = 0
+    while size < n_chars:
+        if with_code and rng.random() < 0.1:
+            part = 'def f(x):\n    return {"k": x, "s": "a}b"}\n'
+        else:
+            part = " ".join(rng.choices(words, k=12)) + ".\n"
+        parts.append(part)
+        size += len(part)
+    tool = {"request": "search", "query": "weather in {city}", "limit": 5}
+    return "".join(parts) + json.dumps(tool)
+
+
+def streamed(s: str, delta: int = 20) -> List[str]:
+    scanner = JsonCandidateScanner()
+    found = []
+    for i in range(0, len(s), delta):
+        found += scanner.feed(s[i : i + delta])
+    return found + scanner.finish()
+
+
+def timed(fn: Callable[[str], List[str]], s: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(s)
+    return (time.perf_counter() - start) / repeat
+
+
+def main(n_chars: int = 100_000, repeat: int = 3, seed: int = 42) -> None:
+    for with_code in [False, True]:
+        s = make_response(n_chars, with_code, seed)
+        same = original_get_json_candidates(s) == get_json_candidates(s) == streamed(s)
+        original = timed(original_get_json_candidates, s, repeat)
+        scan = timed(get_json_candidates, s, repeat)
+        stream = timed(streamed, s, repeat)
+        no_tool = s.replace("{", "(").replace("}", ")")
+        fast = timed(get_json_candidates, no_tool, repeat)
+        print(f"response: {len(s)} chars, code blocks: {with_code}")
+        print(f"  pyparsing:            {original * 1000:.1f}ms")
+        print(f"  get_json_candidates:  {scan * 1000:.2f}ms")
+        print(f"  streamed (20 chars):  {stream * 1000:.2f}ms")
+        print(f"  no-tool fast path:    {fast * 1000:.3f}ms")
+        print(f"  speedup: {original / scan:.0f}x, same candidates: {same}")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -5,7 +5,7 @@ from langroid.exceptions import LangroidImportError
 from langroid.language_models.openai_gpt import OpenAIGPTConfig
 
 try:
-    from sqlalchemy import Column, ForeignKey, Integer, String, create_engine
+    from sqlalchemy import Column, ForeignKey, Integer, String, create_engine, text
     from sqlalchemy.ext.declarative import declarative_base
     from sqlalchemy.orm import Session, relationship, sessionmaker
 except ImportError as e:
@@ -15,6 +15,12 @@ from langroid.agent.special.sql.sql_chat_agent import (
     SQLChatAgent,
     SQLChatAgentConfig,
 )
+from langroid.agent.special.sql.utils.tools import (
+    GetTableNamesTool,
+    GetTableSchemaTool,
+    RunQueryTool,
+)
+from langroid.language_models.mock_lm import MockLMConfig
 from langroid.utils.configuration import Settings, set_global
 
 Base = declarative_base()
@@ -300,3 +306,82 @@ def test_sql_schema_tools(
         answer=answer,
         use_schema_tools=True,
     )
+
+
+def test_sql_query_result_limits_and_cache(mock_db_session, mock_context):
+    agent = SQLChatAgent(
+        SQLChatAgentConfig(
+            database_session=mock_db_session,
+            context_descriptions=mock_context,
+            use_helper=False,
+            llm=MockLMConfig(),
+            max_result_rows=1,
+            result_format="csv",
+            query_cache_size=4,
+        )
+    )
+    query = "SELECT name FROM employees ORDER BY id"
+    result = agent.run_query(RunQueryTool(query=query))
+    assert "name\nAlice\n... [result truncated" in result
+    assert "Bob" not in result
+
+    agent.config.max_result_rows = None
+    agent.config.result_format = "rows"
+    agent.config.max_result_chars = 5
+    result = agent.run_query(RunQueryTool(query="SELECT name FROM employees"))
+    assert "('Ali..." in result
+    assert "Bob" not in result
+
+    # read-only queries are cached, keyed by normalized SQL ...
+    agent.config.max_result_chars = None
+    result = agent.run_query(RunQueryTool(query="SELECT name FROM departments"))
+    assert "('Sales',),\n('Marketing',)" in result
+    mock_db_session.execute(text("UPDATE departments SET name = 'Ops' WHERE id = 2"))
+    mock_db_session.commit()
+    result = agent.run_query(RunQueryTool(query="SELECT name\n FROM departments;"))
+    assert "Marketing" in result
+    # ... until some other query is run
+    result = agent.run_query(
+        RunQueryTool(query="UPDATE departments SET name = 'R&D' WHERE id = 1")
+    )
+    assert "Rows affected: 1" in result
+    result = agent.run_query(RunQueryTool(query="SELECT name FROM departments"))
+    assert "('R&D',),\n('Ops',)" in result
+
+
+def test_sql_schema_cache(mock_db_session, tmp_path, monkeypatch):
+    def make_agent(**kwargs) -> SQLChatAgent:
+        return SQLChatAgent(
+            SQLChatAgentConfig(
+                database_session=mock_db_session,
+                use_helper=False,
+                llm=MockLMConfig(),
+                schema_cache=True,
+                schema_cache_path=str(tmp_path),
+                **kwargs,
+            )
+        )
+
+    agent = make_agent()
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    table_names = agent.get_table_names(GetTableNamesTool())
+
+    # started from the snapshot, without reflecting the database
+    with monkeypatch.context() as m:
+        m.setattr(SQLChatAgent, "_init_metadata", lambda self: pytest.fail())
+        cached_agent = make_agent()
+    assert cached_agent.table_metadata == agent.table_metadata
+    assert cached_agent.get_table_names(GetTableNamesTool()) == table_names
+
+    # a schema change invalidates the snapshot
+    mock_db_session.execute(text("CREATE TABLE regions (id INTEGER, name TEXT)"))
+    mock_db_session.commit()
+    assert "regions" in make_agent().table_metadata
+
+    # with schema tools, tables are reflected as their schema is requested
+    agent = make_agent(use_schema_tools=True)
+    assert agent.table_metadata == {}
+    assert "regions" in agent.get_table_names(GetTableNamesTool())
+    schema = agent.get_table_schema(GetTableSchemaTool(tables=["sales"]))
+    assert "amount" in schema
+    assert list(agent.table_metadata) == ["sales"]
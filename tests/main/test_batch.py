@@ -8,7 +8,9 @@ from langroid import ChatDocument
 from langroid.agent.batch import (
     ExceptionHandling,
     _convert_exception_handling,
+    _iter_batch_async,
     _process_batch_async,
+    iter_batch_tasks,
     llm_response_batch,
     run_batch_agent_method,
     run_batch_function,
@@ -230,25 +232,38 @@ def test_task_gen_batch(
     batch_size: Optional[int],
 ):
     set_global(test_settings)
+    # whether all tasks run concurrently (stop_on_first_result overrides sequential)
+    concurrent = (stop_on_first or not sequential) and batch_size != 1
+    hmm_done = asyncio.Event()
 
     def task_gen(i: int) -> Task:
         async def response_fn_async(x):
+            if concurrent and i != 1:
+                # let task 1 finish first: wait for its result rather than
+                # sleeping, since generating and running a task can take
+                # longer than any fixed sleep
+                await hmm_done.wait()
             match i:
                 case 0:
-                    await asyncio.sleep(0.1)
                     return str(x)
                 case 1:
                     return "hmm"
                 case _:
-                    await asyncio.sleep(0.2)
                     return str(2 * int(x))
 
         class _TestChatAgentConfig(ChatAgentConfig):
             vecdb: Optional[VectorStoreConfig] = None
             llm: MockLMConfig = MockLMConfig(response_fn_async=response_fn_async)
 
+        class _TestTask(Task):
+            async def run_async(self, *args, **kwargs):
+                result = await super().run_async(*args, **kwargs)
+                if i == 1:
+                    hmm_done.set()
+                return result
+
         cfg = _TestChatAgentConfig()
-        return Task(
+        return _TestTask(
             ChatAgent(cfg),
             name=f"Test-{i}",
             single_round=True,
@@ -513,3 +528,147 @@ def test_process_batch_async_stop_on_first(stop_on_first_result):
     else:
         assert all(r is not None for r in results)
         assert all("Processed" in r for r in results)
+
+
+def test_process_batch_async_sliding_window():
+    """A slow task holds one slot; the others keep flowing through the rest."""
+    running = 0
+    max_running = 0
+
+    async def mock_task(input: str, i: int) -> str:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.3 if i == 0 else 0.05)
+        running -= 1
+        return f"Processed {input}"
+
+    inputs = [str(i) for i in range(7)]
+    start = time.time()
+    results = asyncio.run(_process_batch_async(inputs, mock_task, max_concurrency=2))
+    elapsed = time.time() - start
+    assert results == [f"Processed {i}" for i in range(7)]
+    assert max_running == 2
+    # waves of 2 would take 0.3 + 3 * 0.05; the window finishes with the slow task
+    assert elapsed < 0.4
+
+
+def test_iter_batch_async_completion_order():
+    async def mock_task(input: str, i: int) -> str:
+        await asyncio.sleep(0.05 * (3 - i))
+        return input
+
+    async def collect():
+        return [
+            pair
+            async for pair in _iter_batch_async(
+                ["a", "b", "c"], mock_task, output_map=str.upper
+            )
+        ]
+
+    assert asyncio.run(collect()) == [(2, "C"), (1, "B"), (0, "A")]
+
+
+def test_iter_batch_async_stops_on_first_finished():
+    """
+    With stop_on_first_result, the task that finished first wins, even if
+    another (lower-index) task finished before the iterator resumed.
+    """
+
+    async def mock_task(input: str, i: int) -> str:
+        if i == 0:
+            await asyncio.sleep(0)  # finishes right after task 1
+        return input
+
+    async def collect():
+        return [
+            pair
+            async for pair in _iter_batch_async(
+                ["a", "b"], mock_task, stop_on_first_result=True
+            )
+        ]
+
+    assert asyncio.run(collect()) == [(1, "b")]
+
+
+def test_iter_batch_tasks(test_settings: Settings):
+    set_global(test_settings)
+    agent = ChatAgent(
+        ChatAgentConfig(
+            name="Adder",
+            llm=MockLMConfig(response_fn=lambda x: f"{DONE} {int(x) + 1}"),
+            vecdb=None,
+        )
+    )
+    task = Task(agent, interactive=False)
+
+    async def collect():
+        return [
+            (i, result.content)
+            async for i, result in iter_batch_tasks(task, [1, 2, 3], max_concurrency=2)
+        ]
+
+    results = asyncio.run(collect())
+    assert sorted(results) == [(0, "2"), (1, "3"), (2, "4")]
+
+
+def test_run_batch_in_running_loop():
+    """The sync batch functions also work when called from async code."""
+
+    async def main():
+        return run_batch_function(lambda x: x * 2, [1, 2, 3], sequential=False)
+
+    assert asyncio.run(main()) == [2, 4, 6]
+
+
+class _CountingAgent(ChatAgent):
+    n_made = 0
+
+    def __init__(self, config: ChatAgentConfig):
+        super().__init__(config)
+        _CountingAgent.n_made += 1
+
+
+@pytest.mark.parametrize("sequential", [True, False])
+def test_batch_reuses_agents(test_settings: Settings, sequential: bool):
+    """When reusing, batch runs build one agent per concurrent item."""
+    set_global(test_settings)
+    cfg = ChatAgentConfig(
+        name="Adder",
+        llm=MockLMConfig(response_fn=lambda x: f"{DONE} {int(x) + 1}"),
+        vecdb=None,
+    )
+    N, batch_size = 6, 2
+    n_workers = 1 if sequential else batch_size
+    agent = _CountingAgent(cfg)
+    task = Task(agent, interactive=False)
+
+    for reuse in [False, True]:
+        _CountingAgent.n_made = 0
+        answers = run_batch_tasks(
+            task,
+            list(range(N)),
+            sequential=sequential,
+            batch_size=batch_size,
+            output_map=lambda x: x.content,
+            reuse_tasks=reuse,
+        )
+        assert answers == [str(i + 1) for i in range(N)]
+        if reuse:
+            # workers are only made when none is free
+            assert 1 <= _CountingAgent.n_made <= n_workers
+        else:
+            assert _CountingAgent.n_made == N
+
+    _CountingAgent.n_made = 0
+    answers = run_batch_agent_method(
+        agent,
+        agent.llm_response_async,
+        list(range(N)),
+        sequential=sequential,
+        batch_size=batch_size,
+        output_map=lambda x: x.content,
+        reuse_agents=True,
+    )
+    assert answers == [f"{DONE} {i + 1}" for i in range(N)]
+    assert 1 <= _CountingAgent.n_made <= n_workers
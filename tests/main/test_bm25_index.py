@@ -0,0 +1,109 @@
+import random
+
+import numpy as np
+import pytest
+from rank_bm25 import BM25Okapi
+
+from langroid.parsing.bm25_index import BM25Index
+
+WORDS = [
+    "tiger",
+    "lion",
+    "cat",
+    "species",
+    "largest",
+    "world",
+    "bengal",
+    "power",
+    "symbol",
+    "document",
+    "legal",
+    "sample",
+]
+
+
+RARE_WORDS = WORDS + [f"rare{i}" for i in range(500)]
+
+
+def _random_corpus(
+    n_docs: int, seed: int = 42, vocab: list[str] = WORDS
+) -> list[list[str]]:
+    rng = random.Random(seed)
+    return [
+        [rng.choice(vocab) for _ in range(rng.randint(1, 30))] for _ in range(n_docs)
+    ]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        ["tiger"],
+        ["tiger", "bengal", "power"],
+        ["cat", "cat", "lion"],  # repeated query terms count repeatedly
+        ["unknown", "lion"],
+        ["unknown"],
+        ["rare3", "rare7", "tiger"],
+    ],
+)
+# with a small vocab most idfs are negative (and floored), unlike with a large one
+@pytest.mark.parametrize("vocab", [WORDS, RARE_WORDS])
+def test_bm25_index_matches_rank_bm25(query, vocab):
+    corpus = _random_corpus(200, vocab=vocab)
+    index = BM25Index()
+    index.add(corpus)
+    expected = BM25Okapi(corpus).get_scores(query)
+
+    scores = index.scores(query)
+    full = np.zeros(len(corpus))
+    for i, s in scores.items():
+        full[i] = s
+    assert np.allclose(full, expected)
+
+    k = 10
+    expected_top = sorted(range(len(corpus)), key=lambda i: -expected[i])[:k]
+    top = index.top_k(query, k)
+    assert [i for i, _ in top] == expected_top
+    assert np.allclose([s for _, s in top], [expected[i] for i in expected_top])
+
+
+def test_bm25_index_incremental_add():
+    corpus = _random_corpus(100)
+    query = ["lion", "world"]
+    incremental = BM25Index()
+    for i in range(0, len(corpus), 7):
+        incremental.add(corpus[i : i + 7])
+        # query between additions, so cached stats must be invalidated
+        incremental.top_k(query, 5)
+    full = BM25Index()
+    full.add(corpus)
+    assert len(incremental) == len(full) == len(corpus)
+    assert incremental.top_k(query, 20) == full.top_k(query, 20)
+
+
+def test_bm25_index_save_load(tmp_path):
+    corpus = _random_corpus(50)
+    ids = [f"id-{i}" for i in range(len(corpus))]
+    index = BM25Index()
+    index.add(corpus, ids=ids)
+    path = str(tmp_path / "coll.bm25.npz")
+    index.save(path)
+
+    loaded = BM25Index.load(path)
+    assert loaded.ids == ids
+    query = ["tiger", "symbol"]
+    assert loaded.top_k(query, 10) == index.top_k(query, 10)
+
+    # loaded index can continue to be updated incrementally
+    more = _random_corpus(10, seed=7)
+    loaded.add(more, ids=[f"more-{i}" for i in range(len(more))])
+    index.add(more, ids=[f"more-{i}" for i in range(len(more))])
+    assert loaded.top_k(query, 10) == index.top_k(query, 10)
+
+
+def test_bm25_index_top_k_pads_with_zero_scores():
+    index = BM25Index()
+    index.add([["tiger"], ["lion"], ["cat"]])
+    assert index.top_k(["lion"], 3)[0][0] == 1
+    assert [i for i, _ in index.top_k(["lion"], 3)[1:]] == [0, 2]
+    assert index.top_k(["lion"], 10)[1:] == [(0, 0.0), (2, 0.0)]
+    assert BM25Index().top_k(["lion"], 3) == []
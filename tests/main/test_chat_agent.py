@@ -337,3 +337,63 @@ def test_llm_response_messages_no_registry_leak():
         f"This suggests ChatDocument objects are being created unnecessarily "
         f"(e.g., in callbacks or _render_llm_response) and not cleaned up."
     )
+
+
+def test_compiled_system_message_and_tool_specs():
+    """
+    The system message and tool specs are memoized across LLM calls, and
+    rebuilt when tools, output format or system message change.
+    """
+    from langroid.agent.tool_message import ToolMessage
+    from langroid.language_models.mock_lm import MockLMConfig
+
+    class SquareTool(ToolMessage):
+        request: str = "square"
+        purpose: str = "To square a <number>"
+        number: int
+
+    class CubeTool(ToolMessage):
+        request: str = "cube"
+        purpose: str = "To cube a <number>"
+        number: int
+
+    agent = ChatAgent(
+        ChatAgentConfig(
+            llm=MockLMConfig(default_response="ok"),
+            use_functions_api=True,
+            use_tools=False,
+            system_message="You are a calculator.",
+        )
+    )
+    agent.enable_message(SquareTool)
+
+    def tool_names():
+        return sorted(t.function.name for t in agent._function_args()[2])
+
+    tools = agent._function_args()[2]
+    assert tool_names() == ["square"]
+    # not rebuilt (and strict-formatted) again
+    assert agent._function_args()[2][0] is tools[0]
+
+    agent.llm_response("2")
+    system_message = agent.message_history[0]
+    agent.llm_response("3")
+    # system message is unchanged, and not replaced
+    assert agent.message_history[0] is system_message
+
+    agent.enable_message(CubeTool)
+    assert tool_names() == ["cube", "square"]
+    agent.disable_message_use(SquareTool)
+    assert tool_names() == ["cube"]
+    # switches to langroid-native tools
+    agent.set_output_format(SquareTool)
+    assert agent._function_args()[2] is None
+    agent.set_output_format(None)
+    assert tool_names() == ["cube"]
+
+    agent.augment_system_message("Be precise.")
+    assert agent._create_system_and_tools_message().content.startswith(
+        "You are a calculator.\n\nBe precise."
+    )
+    agent.llm_response("4")
+    assert agent.message_history[0] is not system_message
@@ -1,5 +1,6 @@
 import os
 import warnings
+from pathlib import Path
 from types import SimpleNamespace
 from typing import List, Optional
 
@@ -24,7 +25,9 @@ from langroid.embedding_models.models import OpenAIEmbeddingsConfig
 from langroid.language_models.mock_lm import MockLMConfig
 from langroid.language_models.openai_gpt import OpenAIGPTConfig
 from langroid.mytypes import DocMetaData, Document, Entity
+from langroid.parsing.bm25_index import BM25Index
 from langroid.parsing.parser import ParsingConfig, Splitter
+from langroid.parsing.repo_loader import RepoLoader
 from langroid.parsing.utils import generate_random_text
 from langroid.prompts.prompts_config import PromptsConfig
 from langroid.utils.configuration import Settings, set_global
@@ -765,6 +768,117 @@ def test_doc_chat_incremental_ingest(
     )
 
 
+@pytest.mark.parametrize("vecdb", ["lancedb", "chroma", "qdrant_local"], indirect=True)
+@pytest.mark.parametrize("window_size, max_chunks", [(1, 100), (2, 100), (4, 5)])
+def test_doc_chat_streaming_ingest(
+    test_settings: Settings,
+    vecdb,
+    window_size: int,
+    max_chunks: int,
+    tmp_path,
+    monkeypatch,
+):
+    """
+    Check that docs from a generator are ingested in windows of chunks,
+    and the bm25 index is saved once, when all windows are in.
+    """
+    set_global(test_settings)
+    saved = []
+    bm25_save = BM25Index.save
+
+    def recording_save(index: BM25Index, path: str) -> None:
+        saved.append(len(index))
+        bm25_save(index, path)
+
+    monkeypatch.setattr(BM25Index, "save", recording_save)
+    agent = DocChatAgent(
+        _MyDocChatAgentConfig(
+            n_similar_chunks=3,
+            n_relevant_chunks=3,
+            ingest_window_size=window_size,
+            bm25_index_dir=str(tmp_path),
+            parsing=ParsingConfig(
+                splitter=Splitter.SIMPLE,
+                max_chunks=max_chunks,
+            ),
+        )
+    )
+    agent.vecdb = vecdb
+    agent.clear()
+
+    sentences = [
+        "Cats are quiet and clean.",
+        "Dogs are loud and messy.",
+        "Pigs cannot fly.",
+        "Giraffes are tall and vegetarian.",
+        "Bats are blind.",
+        "Cows are peaceful.",
+        "Hyenas are dangerous and fast.",
+    ]
+    windows = []
+    add_documents_stream = agent.vecdb.add_documents_stream
+
+    def recording_add_documents_stream(batches, max_in_flight=2):
+        for batch in add_documents_stream(batches, max_in_flight):
+            windows.append(len(batch))
+            yield batch
+
+    agent.vecdb.add_documents_stream = recording_add_documents_stream
+
+    n_chunks = agent.ingest_docs(
+        Document(content=s, metadata=DocMetaData(source="animals")) for s in sentences
+    )
+    n_expected = min(len(sentences), max_chunks)
+    assert n_chunks == n_expected
+    assert sum(windows) == n_expected
+    assert all(n <= window_size for n in windows)
+    assert len(agent.chunked_docs) == n_expected
+    assert len(agent.original_docs) == 0  # not retained when streaming
+    assert len(agent.vecdb.get_all_documents()) == n_expected
+    assert saved == [n_expected]
+
+    results = agent.get_relevant_chunks("What do we know about Pigs?")
+    assert any("fly" in r.content for r in results)
+
+
+@pytest.mark.parametrize("vecdb", ["lancedb", "chroma", "qdrant_local"], indirect=True)
+def test_doc_chat_concurrent_retrieval(test_settings: Settings, vecdb):
+    """
+    Check that batched/concurrent retrieval over a query and its proxies
+    gives the same results as sequential retrieval.
+    """
+    set_global(test_settings)
+    agent = DocChatAgent(_MyDocChatAgentConfig(n_similar_chunks=2))
+    agent.vecdb = vecdb
+    agent.clear()
+    sentences = [
+        "Cats are quiet and clean.",
+        "Dogs are loud and messy.",
+        "Pigs cannot fly.",
+        "Giraffes are tall and vegetarian.",
+        "Bats are blind.",
+        "Cows are peaceful.",
+        "Hyenas are dangerous and fast.",
+    ]
+    agent.ingest_docs(
+        [Document(content=s, metadata=DocMetaData(source="animals")) for s in sentences]
+    )
+    queries = ["Which animals are noisy?", "Dogs bark", "Loud pets"]
+
+    batch_results = agent.vecdb.similar_texts_with_scores_batch(queries, k=2)
+    assert len(batch_results) == len(queries)
+    for q, results in zip(queries, batch_results):
+        single = agent.vecdb.similar_texts_with_scores(q, k=2)
+        assert [d.content for d, _ in results] == [d.content for d, _ in single]
+
+    agent.config.concurrent_retrieval = True
+    concurrent = agent.get_relevant_chunks(queries[0], queries[1:])
+    agent.config.concurrent_retrieval = False
+    sequential = agent.get_relevant_chunks(queries[0], queries[1:])
+    assert len(concurrent) > 0
+    assert [d.content for d in concurrent] == [d.content for d in sequential]
+
+
 @pytest.mark.parametrize("vecdb", ["chroma", "qdrant_local"], indirect=True)
 @pytest.mark.parametrize(
     "splitter", [Splitter.PARA_SENTENCE, Splitter.SIMPLE, Splitter.TOKENS]
@@ -826,6 +940,61 @@ def test_doc_chat_ingest_paths(
     )
 
 
+@pytest.mark.parametrize("vecdb", ["qdrant_local"], indirect=True)
+def test_doc_chat_parallel_ingest_paths(test_settings: Settings, vecdb, tmp_path):
+    """
+    Parallel parsing of paths gives the same docs, in the same order, as serial
+    parsing.
+    """
+    set_global(test_settings)
+    sentences = [
+        "Cats are quiet and clean.",
+        "Dogs are loud and messy.",
+        "Pigs cannot fly.",
+        "Giraffes are tall and vegetarian.",
+        "Bats are blind.",
+    ]
+    folder = tmp_path / "animals"
+    (folder / "more").mkdir(parents=True)
+    for i, s in enumerate(sentences[:-1]):
+        sub = folder / "more" if i % 2 else folder
+        (sub / f"animal{i}.txt").write_text(s)
+    single = tmp_path / "single.txt"
+    single.write_text(sentences[-1])
+    paths = [str(folder), str(single), b"Cows are peaceful."]
+
+    def ingest(parse_workers: int, window_size: int = 0) -> List[Document]:
+        agent = DocChatAgent(
+            _MyDocChatAgentConfig(
+                parse_workers=parse_workers,
+                ingest_window_size=window_size,
+                parsing=ParsingConfig(splitter=Splitter.SIMPLE),
+            )
+        )
+        agent.vecdb = vecdb
+        return agent.ingest_doc_paths(paths)
+
+    def contents(docs: List[Document]) -> List[str]:
+        return [d.content.strip() for d in docs]
+
+    serial_docs = ingest(parse_workers=1)
+    parallel = contents(ingest(parse_workers=3))
+    assert parallel == contents(serial_docs)
+    assert sorted(parallel) == sorted(sentences + ["Cows are peaceful."])
+    assert parallel[-2:] == [sentences[-1], "Cows are peaceful."]
+    # folder files are in the same (walk) order as with serial parsing
+    assert parallel[:-2] == [
+        Path(p).read_text() for p in RepoLoader.get_file_paths(str(folder))
+    ]
+
+    # when streaming, parsed docs aren't retained: only their metadata is returned
+    streamed = ingest(parse_workers=3, window_size=2)
+    assert contents(streamed) == [""] * len(serial_docs)
+    assert [d.metadata.source for d in streamed] == [
+        d.metadata.source for d in serial_docs
+    ]
+
+
 @pytest.mark.xfail(
     condition=lambda: "lancedb" in vecdb,
     reason="LanceDB may fail due to unknown flakiness",
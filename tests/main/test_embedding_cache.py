@@ -0,0 +1,95 @@
+from typing import List
+
+import pytest
+
+from langroid.cachedb.redis_cachedb import RedisCacheConfig
+from langroid.cachedb.sqlite_cachedb import SQLiteCache, SQLiteCacheConfig
+from langroid.embedding_models.base import EmbeddingModel, EmbeddingModelsConfig
+from langroid.embedding_models.embedding_cache import get_cachedb
+from langroid.embedding_models.models import EmbeddingFunctionCallable
+from langroid.mytypes import Embeddings
+
+
+class _CountingEmbeddingsConfig(EmbeddingModelsConfig):
+    model_type: str = "counting"
+    model_name: str = "counting-v1"
+    dims: int = 4
+
+
+class _CountingEmbeddingFn(EmbeddingFunctionCallable):
+    def _embed(self, input: List[str]) -> Embeddings:
+        self.embed_model.calls.append(list(input))
+        return [[float(len(t)), float(sum(map(ord, t))), 0.5, -1.0] for t in input]
+
+
+class _CountingEmbeddings(EmbeddingModel):
+    def __init__(self, config: _CountingEmbeddingsConfig):
+        self.config = config
+        self.calls: List[List[str]] = []
+
+    def embedding_fn(self) -> EmbeddingFunctionCallable:
+        return _CountingEmbeddingFn(self, self.config.batch_size)
+
+    @property
+    def embedding_dims(self) -> int:
+        return self.config.dims
+
+
+@pytest.fixture(params=["sqlite", "fakeredis"])
+def cache_config(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteCacheConfig(storage_path=str(tmp_path / "emb_cache.db"))
+    config = RedisCacheConfig(fake=True)
+    get_cachedb(config).delete_keys_pattern("emb:counting-v1:*")
+    return config
+
+
+def test_embedding_cache_only_embeds_misses(cache_config):
+    model = _CountingEmbeddings(_CountingEmbeddingsConfig(cache_config=cache_config))
+    fn = model.embedding_fn()
+    texts = ["alpha", "beta", "alpha", "gamma"]
+    first = fn(texts)
+    # duplicates within a call are embedded once
+    assert model.calls == [["alpha", "beta", "gamma"]]
+    assert model.embedding_cache.misses == 4
+    assert model.embedding_cache.hits == 0
+
+    second = fn(["gamma", "delta", "beta"])
+    assert model.calls[-1] == ["delta"]
+    assert second[0] == first[3]
+    assert second[2] == first[1]
+    assert model.embedding_cache.hits == 2
+
+    # uncached model gives the same vectors
+    plain = _CountingEmbeddings(_CountingEmbeddingsConfig())
+    assert plain.embedding_cache is None
+    assert plain.embedding_fn()(texts) == first
+
+
+def test_embedding_cache_shared_across_models(cache_config):
+    m1 = _CountingEmbeddings(_CountingEmbeddingsConfig(cache_config=cache_config))
+    m1.embedding_fn()(["one", "two"])
+    # a different model instance (e.g. in another vector store) reuses the cache
+    m2 = _CountingEmbeddings(_CountingEmbeddingsConfig(cache_config=cache_config))
+    m2.embedding_fn()(["two", "one"])
+    assert m2.calls == []
+    # but a model with different dims does not
+    m3 = _CountingEmbeddings(
+        _CountingEmbeddingsConfig(cache_config=cache_config, dims=8)
+    )
+    m3.embedding_fn()(["one"])
+    assert m3.calls == [["one"]]
+
+
+def test_sqlite_cache_lru_eviction(tmp_path):
+    cache = SQLiteCache(
+        SQLiteCacheConfig(storage_path=str(tmp_path / "lru.db"), max_entries=3)
+    )
+    cache.store_many({"a": 1, "b": 2, "c": 3})
+    # touch "a" so "b" becomes least recently used
+    assert cache.retrieve("a") == 1
+    cache.store("d", 4)
+    assert len(cache) == 3
+    assert cache.retrieve_many(["a", "b", "c", "d"]) == [1, None, 3, 4]
+    cache.delete_keys_pattern("[cd]")
+    assert cache.retrieve_many(["c", "d"]) == [None, None]
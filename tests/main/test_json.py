@@ -3,7 +3,11 @@ import json
 import pytest
 
 from langroid.parsing.parse_json import (
+    JsonCandidateScanner,
     extract_top_level_json,
+    get_json_candidates,
+    json_candidate_spans,
+    maybe_tool_candidate,
     parse_imperfect_json,
     top_level_json_field,
 )
@@ -193,3 +197,42 @@ def test_top_level_json_field_never_crashes():
         # Should never crash, just return empty string or found value
         result = top_level_json_field(malformed, "recipient")
         assert isinstance(result, (str, int, float, bool, type(None)))
+
+
+@pytest.mark.parametrize(
+    "s, expected",
+    [
+        ("no tools here", []),
+        ('say {"a": "b}"} and {"c": {"d": 1}}', ['{"a": "b}"}', '{"c": {"d": 1}}']),
+        # braces in single-quoted strings are ignored too
+        ("{'x': '}'}", ["{'x': '}'}"]),
+        # an unclosed brace is skipped, and the scan resumes right after it
+        ('{ oops {"a": 1}', ['{"a": 1}']),
+        # quotes can't span lines, and must be closed to start a string
+        ('{"a\n}', ['{"a\n}']),
+        ("{it's} ok", ["{it's}"]),
+        ("{it's} {'}", ["{it's} {'}"]),
+        ('{"esc \\" }"}', ['{"esc \\" }"}']),
+    ],
+)
+def test_get_json_candidates(s, expected):
+    assert get_json_candidates(s) == expected
+    assert [s[i:j] for i, j in json_candidate_spans(s)] == expected
+    assert maybe_tool_candidate(s) == ("{" in s)
+
+    # incremental scanning of streamed pieces finds the same candidates
+    for size in [1, 3, 7]:
+        scanner = JsonCandidateScanner()
+        found = []
+        for i in range(0, len(s), size):
+            found += scanner.feed(s[i : i + size])
+        assert found + scanner.finish() == expected
+
+
+def test_json_candidate_scanner_streaming():
+    scanner = JsonCandidateScanner()
+    assert scanner.feed('Sure.\n{"request": "search",') == []
+    # candidates are returned once the line they end on is complete
+    assert scanner.feed(' "q": "x}"}') == []
+    assert scanner.feed(" done\nmore") == ['{"request": "search", "q": "x}"}']
+    assert scanner.finish() == []
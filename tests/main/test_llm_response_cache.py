@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import pytest
+
+from langroid.cachedb.base import canonical_key
+from langroid.cachedb.memory_cachedb import MemoryCache, MemoryCacheConfig
+from langroid.cachedb.redis_cachedb import RedisCache, RedisCacheConfig
+from langroid.cachedb.sqlite_cachedb import SQLiteCache, SQLiteCacheConfig
+from langroid.cachedb.tiered_cachedb import TieredCache
+from langroid.language_models.base import Role
+from langroid.language_models.openai_gpt import OpenAIGPT, OpenAIGPTConfig
+from langroid.utils.configuration import Settings, set_global
+
+
+def test_canonical_key_is_order_independent():
+    k1 = canonical_key(
+        "Completion",
+        model="m",
+        messages=[dict(role="user", content="hi", name="x")],
+        max_tokens=10,
+    )
+    k2 = canonical_key(
+        "Completion",
+        max_tokens=10,
+        messages=[dict(name="x", content="hi", role=Role.USER)],
+        model="m",
+    )
+    assert k1 == k2
+    assert k1 != canonical_key("AsyncCompletion", model="m", max_tokens=10)
+    assert k1 != canonical_key("Completion", model="m", max_tokens=11)
+
+
+def test_memory_cache_lru_and_ttl():
+    cache = MemoryCache(MemoryCacheConfig(max_entries=2, ttl=0.2))
+    cache.store("a", {"v": 1})
+    cache.store("b", {"v": 2})
+    assert cache.retrieve("a") == {"v": 1}  # "b" is now least recently used
+    cache.store("c", {"v": 3})
+    assert cache.retrieve("b") is None
+    # retrieved values are copies
+    cache.retrieve("a")["v"] = 100
+    assert cache.retrieve("a") == {"v": 1}
+    time.sleep(0.3)
+    assert cache.retrieve("a") is None
+    assert len(cache) == 1  # only expired "c" left, dropped on next access
+
+
+def test_tiered_cache_stats_sync_and_async(tmp_path):
+    backend = SQLiteCache(SQLiteCacheConfig(storage_path=str(tmp_path / "c.db")))
+    backend.store("shared", "from-backend")
+    cache = TieredCache(backend, MemoryCacheConfig(max_entries=10))
+
+    assert cache.retrieve("shared") == "from-backend"  # memory miss, backend hit
+    assert cache.retrieve("shared") == "from-backend"  # memory hit
+    assert cache.retrieve("missing") is None  # misses in both
+
+    async def run():
+        await cache.astore("k", {"x": 1})
+        assert await cache.aretrieve("k") == {"x": 1}  # memory hit
+        cache.memory.clear()
+        assert await cache.aretrieve("k") == {"x": 1}  # backend hit
+
+    asyncio.run(run())
+    assert backend.retrieve("k") == {"x": 1}
+    stats = cache.stats()
+    assert stats["memory"]["hits"] == 2
+    assert stats["memory"]["misses"] == 3
+    assert stats["backend"]["hits"] == 2
+    assert stats["backend"]["misses"] == 1
+    assert stats["backend"]["hit_rate"] == pytest.approx(2 / 3)
+
+
+@pytest.mark.parametrize("cache_type", ["fakeredis", "sqlite"])
+def test_openai_gpt_tiered_cache(cache_type, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    set_global(Settings(cache_type=cache_type))
+    try:
+        llm = OpenAIGPT(OpenAIGPTConfig(cache_config=RedisCacheConfig(fake=True)))
+        assert isinstance(llm.cache, TieredCache)
+        backend_cls = SQLiteCache if cache_type == "sqlite" else RedisCache
+        assert isinstance(llm.cache.backend, backend_cls)
+        kwargs = dict(model="m", messages=[dict(role="user", content="hello")])
+        key, result = llm._cache_lookup("Completion", **kwargs)
+        assert result is None
+        llm._cache_store(key, {"choices": []})
+
+        async def run():
+            return await llm._acache_lookup("Completion", **kwargs)
+
+        akey, aresult = asyncio.run(run())
+        assert akey == key and aresult == {"choices": []}
+
+        # no in-process tier
+        llm2 = OpenAIGPT(
+            OpenAIGPTConfig(
+                cache_config=RedisCacheConfig(fake=True), memory_cache_config=None
+            )
+        )
+        assert not isinstance(llm2.cache, TieredCache)
+    finally:
+        set_global(Settings())
@@ -37,7 +37,9 @@ from langroid.agent.tools.mcp import (
     get_tool_async,
     get_tools_async,
     mcp_tool,
+    session_pool,
 )
+from langroid.agent.tools.mcp.session_pool import MCPSessionPool, mcp_session_pool
 from langroid.agent.tools.orchestration import DoneTool
 
 
@@ -937,6 +939,86 @@ async def test_persist_connection() -> None:
         assert result2 == "5"  # handle_async returns string for backward compatibility
 
 
+@pytest.mark.asyncio
+async def test_pooled_sessions(monkeypatch) -> None:
+    """Tool calls reuse pooled sessions, reconnecting when one has failed,
+    and the tool list is cached while a session is open."""
+    # pooling is opt-in (LANGROID_MCP_POOL_MAX_SESSIONS)
+    monkeypatch.setattr(session_pool, "_pool", MCPSessionPool(max_sessions=4))
+    pool = mcp_session_pool()
+    server = mcp_server()
+    tools = {t.default_value("request"): t for t in await get_tools_async(server)}
+    AddBeansTool, GetNumBeansTool = tools["add_beans"], tools["get_num_beans"]
+    before = pool.stats()
+
+    results = await asyncio.gather(
+        *[AddBeansTool(x=1).handle_async() for _ in range(6)]
+    )
+    assert sorted(results) == [str(i) for i in range(1, 7)]
+    assert await GetNumBeansTool().handle_async() == "6"
+    opened = pool.stats()["opened"] - before["opened"]
+    assert 0 <= opened <= pool.max_sessions - 1  # session used to list tools
+
+    # tool list is served from the cache
+    await get_tools_async(server)
+    assert pool.stats()["tool_list_hits"] == before["tool_list_hits"] + 1
+
+    # a failed session is replaced
+    key = AddBeansTool._pool_key
+    for session in pool._servers()[key].sessions:
+        await session.client.close()
+    assert await AddBeansTool(x=1).handle_async() == "7"
+
+    await pool.close()
+    assert pool.stats()["open"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pooled_sessions_idle_timeout() -> None:
+    pool = MCPSessionPool(max_sessions=2, idle_timeout=0.1)
+    AddBeansTool = await get_tool_async(mcp_server(), "add_beans")
+    key, config = AddBeansTool._pool_key, AddBeansTool._client_config
+    results = await asyncio.gather(
+        *[pool.call_tool(key, config, "add_beans", dict(x=1)) for _ in range(4)]
+    )
+    assert sorted(text for text, _ in results) == ["1", "2", "3", "4"]
+    assert pool.stats()["opened"] <= 2
+    assert pool.stats()["open"] == pool.stats()["opened"]
+    await asyncio.sleep(0.3)
+    assert pool.stats()["open"] == 0
+    assert pool.stats()["closed_idle"] == pool.stats()["opened"]
+
+
+@pytest.mark.asyncio
+async def test_pooled_call_cancelled() -> None:
+    """A cancelled pooled call releases its session, which is then discarded."""
+    server = FastMCP("SlowServer")
+
+    @server.tool()
+    async def slow() -> str:
+        await asyncio.sleep(10)
+        return "done"
+
+    pool = MCPSessionPool(max_sessions=2)
+    SlowTool = await get_tool_async(server, "slow")
+    key, config = SlowTool._pool_key, SlowTool._client_config
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(pool.call_tool(key, config, "slow", {}), timeout=0.2)
+    assert pool.stats()["opened"] == 1
+    assert pool.stats()["open"] == 0
+
+
+def test_pooled_sessions_closed_with_loop() -> None:
+    """Sessions are closed when the loop they were opened in shuts down."""
+    pool = MCPSessionPool(max_sessions=2)
+    AddBeansTool = asyncio.run(get_tool_async(mcp_server(), "add_beans"))
+    key, config = AddBeansTool._pool_key, AddBeansTool._client_config
+    for _ in range(2):
+        asyncio.run(pool.call_tool(key, config, "add_beans", dict(x=1)))
+        assert pool.stats()["open"] == 0
+    assert pool.stats()["opened"] == 2
+
+
 @pytest.mark.asyncio
 async def test_handle_async_with_images() -> None:
     """Test that response_async returns ChatDocument with file attachments."""
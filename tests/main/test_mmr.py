@@ -0,0 +1,47 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from langroid.utils.algorithms.mmr import mmr_order
+
+
+def _legacy_diversity_order(embs: List[np.ndarray]) -> List[int]:
+    # the original pairwise-loop implementation of diversity reranking
+    indices = list(range(len(embs)))
+
+    def avg_similarity_to_result(i: int, result: List[int]) -> float:
+        return sum(
+            (embs[i] @ embs[j]) / (np.linalg.norm(embs[i]) * np.linalg.norm(embs[j]))
+            for j in result
+        ) / len(result)
+
+    result = [indices.pop(0)]
+    while indices:
+        least_similar_item = min(
+            indices, key=lambda i: avg_similarity_to_result(i, result)
+        )
+        result.append(least_similar_item)
+        indices.remove(least_similar_item)
+    return result
+
+
+@pytest.mark.parametrize("n, d", [(1, 4), (2, 4), (10, 8), (40, 16)])
+def test_mmr_matches_legacy_diversity_order(n: int, d: int):
+    rng = np.random.default_rng(n)
+    embs = rng.normal(size=(n, d))
+    assert mmr_order(embs) == _legacy_diversity_order(list(embs))
+    # relevance is ignored when lambda_ = 0
+    assert mmr_order(embs, relevance=rng.random(n)) == mmr_order(embs)
+
+
+def test_mmr_relevance_tradeoff():
+    # items 0, 1 are near-duplicates; item 2 is different but less relevant
+    embs = np.array([[1.0, 0.0], [0.99, 0.01], [0.0, 1.0]])
+    relevance = np.array([0.9, 0.95, 0.5])
+    # pure relevance
+    assert mmr_order(embs, relevance, lambda_=1.0) == [1, 0, 2]
+    # balanced: the duplicate is pushed below the diverse item
+    assert mmr_order(embs, relevance, lambda_=0.5) == [1, 2, 0]
+    assert mmr_order(embs, relevance, lambda_=0.5, k=2) == [1, 2]
+    assert mmr_order(np.zeros((0, 2))) == []
@@ -159,3 +159,89 @@ def test_agent_chat_document_link():
     assert (
         ObjectRegistry.get(last_msg.chat_document_id) is response_doc
     ), "Lookup from last message should return the response chat document"
+
+
+@pytest.fixture
+def weak_registry():
+    ObjectRegistry.configure(weak=True, max_size=2)
+    yield
+    ObjectRegistry.configure()
+
+
+def test_weak_registry_drops_unreferenced(weak_registry):
+    import gc
+
+    docs = [
+        ChatDocument(content=f"doc {i}", metadata=ChatDocMetaData(sender=Entity.LLM))
+        for i in range(5)
+    ]
+    ids = [d.id() for d in docs]
+    # only the 2 most recent are retained by the registry itself
+    assert ObjectRegistry.stats()["retained"] == 2
+    assert ObjectRegistry.stats()["by_type"]["ChatDocument"] >= 5
+    kept = docs[0]
+    del docs
+    gc.collect()
+    assert ChatDocument.from_id(ids[0]) is kept
+    assert ChatDocument.from_id(ids[1]) is None
+    assert ChatDocument.from_id(ids[2]) is None
+    assert ChatDocument.from_id(ids[4]) is not None
+
+
+def test_weak_registry_keeps_live_chain(weak_registry):
+    import gc
+
+    def make_chain(n):
+        parent = None
+        for i in range(n):
+            doc = ChatDocument(
+                content=f"msg {i}",
+                metadata=ChatDocMetaData(
+                    sender=Entity.LLM,
+                    parent_id="" if parent is None else parent.id(),
+                ),
+            )
+            if parent is not None:
+                parent.metadata.child_id = doc.id()
+            parent = doc
+        return parent
+
+    tail = make_chain(6)
+    # flood the LRU with unrelated docs
+    for i in range(10):
+        ChatDocument(content="noise", metadata=ChatDocMetaData(sender=Entity.USER))
+    gc.collect()
+    contents = []
+    doc = tail
+    while doc is not None:
+        contents.append(doc.content)
+        doc = doc.parent
+    assert contents == [f"msg {i}" for i in reversed(range(6))]
+    assert tail.parent.child is tail
+
+    # copies share, rather than duplicate, the chain
+    copied = ChatDocument.deepcopy(tail.parent)
+    assert copied.parent is None
+
+    tail_id = tail.id()
+    del tail, doc
+    gc.collect()
+    # once the tail is unreferenced (and out of the LRU), it is dropped
+    assert ChatDocument.from_id(tail_id) is None
+
+
+def test_lru_capped_strong_registry():
+    ObjectRegistry.configure(max_size=3)
+    try:
+        objs = [A() for _ in range(4)]
+        for a in objs:
+            register_object(a)
+        assert ObjectRegistry.get(objs[0].id) is None
+        # lookup refreshes recency
+        assert ObjectRegistry.get(objs[1].id) is objs[1]
+        register_object(A())
+        assert ObjectRegistry.get(objs[1].id) is objs[1]
+        assert ObjectRegistry.get(objs[2].id) is None
+        assert ObjectRegistry.stats()["live"] == 3
+    finally:
+        ObjectRegistry.configure()
@@ -178,3 +178,31 @@ vegetables
     assert original_lines == result_lines
     assert len(original_lines) == 6  # Verify all lines are present
     assert all(line.startswith("- ") for line in original_lines if "-" in line)
+
+
+@pytest.mark.parametrize("chunk_workers", [1, 3])
+def test_chunk_tokens_single_pass(chunk_workers: int):
+    cfg = ParsingConfig(
+        splitter=Splitter.TOKENS,
+        chunk_size=100,
+        min_chunk_chars=20,
+        discard_chunk_chars=0,
+        chunk_workers=chunk_workers,
+    )
+    parser = Parser(cfg)
+    # multi-byte chars may be split across tokens
+    sentences = [f"Größe {i} ist schön 🤦🏻‍♂️ ok! Next één." for i in range(30)]
+    texts = ["\n".join(sentences[:k]) for k in (10, 20, 30)]
+
+    for text in texts:
+        chunks = parser.chunk_tokens(text)
+        # chunks partition the text, and are cut at sentence/line ends
+        assert "".join(chunks) == text
+        assert all(c[-1] in ".!?\n" for c in chunks[:-1])
+        assert all(parser.num_tokens(c) <= cfg.chunk_size + 1 for c in chunks)
+
+    docs = [Document(content=t, metadata={"id": str(i)}) for i, t in enumerate(texts)]
+    split_docs = parser.split(docs)
+    assert [d.content for d in split_docs] == [
+        c for t in texts for c in parser.chunk_tokens(t)
+    ]
@@ -1,3 +1,4 @@
+import copy
 import json
 
 import pytest
@@ -381,3 +382,74 @@ def test_drop_turns_accounts_for_buffer():
     # History should have been compressed
     assert hist[0].role == Role.SYSTEM
     assert hist[-1].role == Role.USER
+
+
+def test_chat_num_tokens_incremental(agent):
+    """History token total is maintained incrementally, with per-msg caching."""
+    calls = []
+    num_tokens = agent.parser.num_tokens
+
+    def counting_num_tokens(text):
+        calls.append(text)
+        return num_tokens(text)
+
+    agent.parser.num_tokens = counting_num_tokens
+
+    def expected():
+        return sum(len(m.content) for m in agent.message_history)
+
+    assert agent.chat_num_tokens() == expected()
+    agent.message_history.append(LLMMessage(role=Role.USER, content="hello"))
+    agent.message_history.extend(
+        [
+            LLMMessage(role=Role.ASSISTANT, content="hi there"),
+            LLMMessage(role=Role.USER, content="how are you?"),
+        ]
+    )
+    assert agent.chat_num_tokens() == expected()
+    n_calls = len(calls)
+    # repeated queries do not re-tokenize anything
+    for _ in range(3):
+        assert agent.chat_num_tokens(agent.message_history) == expected()
+    assert len(calls) == n_calls
+
+    # content mutation invalidates only that message's count
+    agent.message_history[1].content = "hello, world"
+    assert agent.chat_num_tokens() == expected()
+    assert calls[n_calls:] == ["hello, world"]
+
+    agent.truncate_message(2, tokens=2)
+    assert agent.chat_num_tokens() == expected()
+    agent.clear_history(-1)
+    assert agent.chat_num_tokens() == expected()
+    agent.message_history.pop(0)
+    del agent.message_history[:1]
+    assert agent.chat_num_tokens() == expected()
+    agent.message_history = [LLMMessage(role=Role.USER, content="fresh")]
+    assert agent.chat_num_tokens() == 5
+    agent.message_history.clear()
+    assert agent.chat_num_tokens() == 0
+
+
+def test_chat_num_tokens_on_copied_history(agent):
+    """Copies of an agent (or of its history) can still count tokens."""
+    agent.message_history.extend(
+        [
+            LLMMessage(role=Role.USER, content="hello"),
+            LLMMessage(role=Role.ASSISTANT, content="hi there"),
+        ]
+    )
+    n_tokens = agent.chat_num_tokens()
+
+    agent_copy = copy.deepcopy(agent)
+    assert agent_copy.chat_num_tokens() == n_tokens
+    agent_copy.message_history.append(LLMMessage(role=Role.USER, content="more"))
+    assert agent_copy.chat_num_tokens() == n_tokens + 4
+    assert agent.chat_num_tokens() == n_tokens
+
+    clone = agent.clone(1)
+    clone.parser = agent.parser
+    clone._message_history = copy.deepcopy(agent.message_history)
+    assert clone.chat_num_tokens() == n_tokens
+    clone._message_history = copy.copy(agent.message_history)
+    assert clone.chat_num_tokens() == n_tokens
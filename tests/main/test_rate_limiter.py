@@ -0,0 +1,217 @@
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+from pydantic import ValidationError
+
+from langroid.language_models.openai_gpt import OpenAIGPT, OpenAIGPTConfig
+from langroid.language_models.rate_limiter import (
+    RateLimitConfig,
+    RateLimiter,
+    get_rate_limiter,
+    rate_limiter_stats,
+    reset_rate_limiters,
+    retry_after_seconds,
+)
+from langroid.language_models.utils import async_retry_with_exponential_backoff
+
+
+def _rate_limit_error(headers: dict) -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://api.example.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers, request=request)
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+def test_retry_after_seconds():
+    assert retry_after_seconds(_rate_limit_error({"retry-after": "2"})) == 2.0
+    assert retry_after_seconds(_rate_limit_error({"retry-after-ms": "250"})) == 0.25
+    assert retry_after_seconds(_rate_limit_error({})) is None
+    assert retry_after_seconds(ValueError("no response")) is None
+
+
+def test_requests_per_minute_bucket():
+    # 600 rpm = 10 per second, with a burst of up to 600
+    limiter = RateLimiter(RateLimitConfig(requests_per_minute=600))
+    limiter._requests = 0.0  # start with an empty bucket
+    start = time.monotonic()
+    for _ in range(3):
+        with limiter.limit():
+            pass
+    assert time.monotonic() - start >= 0.25
+    stats = limiter.stats()
+    assert stats["calls"] == 3 and stats["queued"] == 3
+
+
+def test_aimd_concurrency():
+    limiter = RateLimiter(RateLimitConfig(max_concurrency=8, min_concurrency=2))
+    limiter.on_rate_limited()
+    assert limiter.stats()["concurrency_limit"] == 4
+    limiter.on_rate_limited()
+    limiter.on_rate_limited()
+    assert limiter.stats()["concurrency_limit"] == 2
+    for _ in range(10):
+        with limiter.limit():
+            pass
+    # raised by about one per window of `limit` successes, capped by max
+    assert 4 <= limiter.stats()["concurrency_limit"] <= 8
+    assert limiter.stats()["throttled"] == 3
+
+
+def test_burst_of_rate_limits_cuts_limit_once():
+    limiter = RateLimiter(RateLimitConfig(max_concurrency=32))
+
+    async def call(all_in_flight: asyncio.Event):
+        try:
+            async with limiter.alimit():
+                if limiter.stats()["in_flight"] == 32:
+                    all_in_flight.set()
+                await all_in_flight.wait()
+                raise _rate_limit_error({})
+        except openai.RateLimitError:
+            limiter.on_rate_limited()
+
+    async def burst():
+        all_in_flight = asyncio.Event()
+        await asyncio.gather(*[call(all_in_flight) for _ in range(32)])
+
+    # 32 calls in flight together get a 429: one congestion event, one cut
+    asyncio.run(burst())
+    assert limiter.stats()["throttled"] == 32
+    assert limiter.stats()["concurrency_limit"] == 16
+
+    # a 429 to a call admitted after the cut is a new event
+    with pytest.raises(openai.RateLimitError):
+        with limiter.limit():
+            raise _rate_limit_error({})
+    limiter.on_rate_limited()
+    assert limiter.stats()["concurrency_limit"] == 8
+
+
+def test_shared_limiter_keeps_strictest_limits():
+    reset_rate_limiters()
+    strict = RateLimitConfig(requests_per_minute=60, max_concurrency=8)
+    llm1 = OpenAIGPT(OpenAIGPTConfig(chat_model="gpt-4o", rate_limit=strict))
+    llm2 = OpenAIGPT(OpenAIGPTConfig(chat_model="gpt-4o"))  # no limits
+    llm3 = OpenAIGPT(
+        OpenAIGPTConfig(
+            chat_model="gpt-4o",
+            rate_limit=RateLimitConfig(tokens_per_minute=1000, max_concurrency=16),
+        )
+    )
+    limiter = llm1._rate_limiter("gpt-4o")
+    assert llm2._rate_limiter("gpt-4o") is limiter
+    # a client without limits does not lift those set by another client
+    assert limiter.config.requests_per_minute == 60
+    assert llm3._rate_limiter("gpt-4o") is limiter
+    assert limiter.config.requests_per_minute == 60
+    assert limiter.config.tokens_per_minute == 1000
+    assert limiter.config.max_concurrency == 8
+    llm2._rate_limiter("gpt-4o")
+    assert limiter.config.tokens_per_minute == 1000
+    reset_rate_limiters()
+
+
+def test_min_concurrency_at_least_one():
+    with pytest.raises(ValidationError):
+        RateLimitConfig(min_concurrency=0)
+
+
+def test_stream_holds_slot_until_consumed():
+    reset_rate_limiters()
+    config = RateLimitConfig(max_concurrency=1)
+    llm = OpenAIGPT(OpenAIGPTConfig(chat_model="gpt-4o", rate_limit=config))
+    limiter = llm._rate_limiter("gpt-4o")
+    kwargs = dict(model="gpt-4o", stream=True)
+
+    stream = llm._rate_limited_call(lambda **kwargs: iter("ab"), kwargs)
+    assert next(stream) == "a"
+    assert limiter.stats()["in_flight"] == 1
+    assert list(stream) == ["b"]
+    assert limiter.stats()["in_flight"] == 0
+
+    async def achunks():
+        for chunk in "ab":
+            yield chunk
+
+    async def acall(**kwargs):
+        return achunks()
+
+    async def consume_two_streams():
+        async def consume():
+            stream = await llm._arate_limited_call(acall, kwargs)
+            chunks = []
+            async for chunk in stream:
+                assert limiter.stats()["in_flight"] == 1
+                chunks.append(chunk)
+                await asyncio.sleep(0.01)
+            return chunks
+
+        return await asyncio.gather(consume(), consume())
+
+    # with max_concurrency=1, the second stream waits for the first to finish
+    assert asyncio.run(consume_two_streams()) == [["a", "b"], ["a", "b"]]
+    assert limiter.stats()["in_flight"] == 0
+    assert limiter.stats()["queued"] == 1
+    reset_rate_limiters()
+
+
+def test_async_backoff_honors_retry_after_without_blocking():
+    limiter = RateLimiter()
+    calls = []
+
+    async def flaky():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise _rate_limit_error({"retry-after": "0.5"})
+        return "ok"
+
+    async def ticker(ticks: list):
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.05)
+
+    async def run():
+        ticks: list = []
+        retrying = async_retry_with_exponential_backoff(
+            flaky, initial_delay=0.01, jitter=False, rate_limiter=limiter
+        )
+        result, _ = await asyncio.gather(retrying(), ticker(ticks))
+        return result, ticks
+
+    result, ticks = asyncio.run(run())
+    assert result == "ok"
+    assert calls[1] - calls[0] >= 0.5
+    # the event loop kept running while the call was backing off
+    assert len(ticks) == 5 and ticks[-1] < calls[1]
+    stats = limiter.stats()
+    assert stats["throttled"] == 1 and stats["retried"] == 1
+    assert stats["concurrency_limit"] == 1
+
+
+def test_shared_limiter_per_model_and_base():
+    reset_rate_limiters()
+    config = RateLimitConfig(requests_per_minute=100)
+    llm1 = OpenAIGPT(OpenAIGPTConfig(chat_model="gpt-4o", rate_limit=config))
+    llm2 = OpenAIGPT(OpenAIGPTConfig(chat_model="gpt-4o", rate_limit=config))
+    llm3 = OpenAIGPT(
+        OpenAIGPTConfig(
+            chat_model="gpt-4o", api_base="http://localhost:1234/v1", rate_limit=config
+        )
+    )
+    assert llm1._rate_limiter("gpt-4o") is llm2._rate_limiter("gpt-4o")
+    assert llm1._rate_limiter("gpt-4o") is not llm3._rate_limiter("gpt-4o")
+    assert get_rate_limiter("gpt-4o", None, config) is llm1._rate_limiter("gpt-4o")
+
+    result = llm1._rate_limited_call(lambda **kwargs: "done", dict(model="gpt-4o"))
+    assert result == "done"
+    assert rate_limiter_stats()["gpt-4o"]["calls"] == 1
+    with pytest.raises(ValueError):
+        llm2._rate_limited_call(_raise, dict(model="gpt-4o"))
+    assert rate_limiter_stats()["gpt-4o"]["in_flight"] == 0
+    reset_rate_limiters()
+
+
+def _raise(**kwargs):
+    raise ValueError("API call failed")
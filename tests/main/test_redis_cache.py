@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from langroid.cachedb.redis_cachedb import RedisCache, RedisCacheConfig
@@ -19,6 +21,30 @@ def test_fake_store_and_retrieve(fake_redis_cache):
     assert result == data
 
 
+@pytest.mark.unit
+def test_async_clients_closed_with_loop(fake_redis_cache):
+    closed = []
+
+    async def run(i: int):
+        client = await fake_redis_cache._aclient()
+        client_aclose = client.aclose
+
+        async def aclose(**kwargs):
+            closed.append(client)
+            await client_aclose(**kwargs)
+
+        client.aclose = aclose
+        await fake_redis_cache.astore(f"key{i}", i)
+        return await fake_redis_cache.aretrieve("key0")
+
+    # each asyncio.run uses a new loop, and so a new client,
+    # which is closed when the loop shuts down
+    for i in range(3):
+        assert asyncio.run(run(i)) == 0
+        assert len(closed) == i + 1
+        assert fake_redis_cache._async_clients == {}
+
+
 @pytest.fixture
 def real_redis_cache():
     config = RedisCacheConfig(
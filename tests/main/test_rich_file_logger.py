@@ -88,3 +88,41 @@ def test_write_after_peer_close(tmp_path: Path) -> None:
 
     # Clean up
     logger2.close()
+
+
+def test_log_writer_batches_and_drops(tmp_path: Path) -> None:
+    from langroid.utils.logging import LogWriter
+
+    writer = LogWriter(max_queue=1000, batch_size=100)
+    with open(tmp_path / "out.log", "w") as f:
+        for i in range(500):
+            writer.write(f, f"{i}\n" if i % 2 else (lambda i=i: f"{i}\n"))
+        assert writer.flush(timeout=10)
+    lines = (tmp_path / "out.log").read_text().splitlines()
+    assert lines == [str(i) for i in range(500)]
+    stats = writer.stats()
+    assert stats["written"] == 500 and stats["dropped"] == 0
+    assert stats["batches"] < 500
+
+    # with a full queue, entries are dropped rather than blocking the caller
+    dropping = LogWriter(max_queue=1, overflow="drop")
+    block = threading.Event()
+    with open(tmp_path / "drop.log", "w") as f:
+        dropping.write(f, lambda: block.wait(10) and "first\n")
+        results = [dropping.write(f, "x\n") for _ in range(10)]
+        block.set()
+        assert dropping.flush(timeout=10)
+    assert not all(results)
+    assert dropping.stats()["dropped"] == 10 - sum(results)
+
+
+def test_rich_file_logger_background_writes(tmp_path: Path) -> None:
+    path = tmp_path / "bg.log"
+    log = RichFileLogger(str(path), color=True)
+    for i in range(100):
+        log.log(f"entry-{'first' if i == 0 else i}")
+    log.flush()
+    text = path.read_text()
+    assert "entry-first" in text and text.count("entry-") == 100
+    log.close()
+    assert log.file.closed
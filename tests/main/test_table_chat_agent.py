@@ -5,7 +5,11 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from langroid.agent.special.table_chat_agent import TableChatAgent, TableChatAgentConfig
+from langroid.agent.special.table_chat_agent import (
+    PandasEvalTool,
+    TableChatAgent,
+    TableChatAgentConfig,
+)
 from langroid.agent.task import Task
 from langroid.parsing.table_loader import read_tabular_data
 from langroid.parsing.utils import closest_string
@@ -238,3 +242,38 @@ def test_table_chat_agent_url(test_settings: Settings, fn_api: bool) -> None:
     # directly get the answer
     answer = df[df["cotton"] < 500]["poultry"].mean()
     assert contains_approx_float(result.content, answer)
+
+
+@pytest.mark.parametrize("full_eval", [True, False])
+def test_table_chat_agent_duckdb_engine(mock_data_file, full_eval):
+    pytest.importorskip("duckdb")
+    agent = TableChatAgent(
+        TableChatAgentConfig(
+            data=mock_data_file,
+            engine="duckdb",
+            full_eval=full_eval,
+            summary_sample_rows=50,
+        )
+    )
+    df = pd.read_csv(mock_data_file)
+    df.columns = df.columns.str.strip()
+    assert list(agent.df.columns) == list(df.columns)
+    assert len(agent.df) == 0  # the data stays in the file
+    assert "sample of 50 of the 100 rows" in agent.config.system_message
+
+    expressions = [
+        "df['income'].mean()",
+        "df.groupby('State')['income'].max()",
+        "df.shape",
+        "df.sort_values('age').head(3)",
+        "df['age'].idxmax()",
+    ]
+    if full_eval:
+        expressions += [
+            "df[(df['age'] < 40) & (df['State'] == 'CA')]['income'].mean()",
+            "len(df[df.GenDer.isin(['Male'])])",
+            "df.query(\"age > 30 and State != 'TX'\").head()",
+        ]
+    for expression in expressions:
+        expected = str(eval(expression, {"df": df, "len": len}))
+        assert agent.pandas_eval(PandasEvalTool(expression=expression)) == expected
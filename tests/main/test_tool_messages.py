@@ -621,6 +621,24 @@ def test_agent_infer_tool(
     assert agent.agent_response(no_args_request_specified).content in ["Heads", "Tails"]
 
 
+def test_tool_inference_index_tracks_enabled_tools():
+    agent = ChatAgent(ChatAgentConfig(use_tools=True, use_functions_api=False))
+    agent.enable_message([GaussTool, CoinFlipTool])
+    index = agent._get_tool_inference_index()
+    # reused while the handled tools are unchanged
+    assert agent._get_tool_inference_index() is index
+    assert index.candidates(["xval", "yval"]) == [GaussTool]
+    # only inherited fields, or unknown fields: no candidates
+    assert index.candidates(["purpose"]) == []
+    assert index.candidates(["xval", "zval"]) == []
+    assert agent.agent_response("""{"xval": 1, "yval": 3}""").content == "12"
+
+    agent.disable_message_handling(GaussTool)
+    assert agent._get_tool_inference_index() is not index
+    assert agent._get_tool_inference_index().candidates(["xval", "yval"]) == []
+    assert agent.agent_response("""{"xval": 1, "yval": 3}""") is None
+
+
 @pytest.mark.parametrize("use_tools_api", [True])
 @pytest.mark.parametrize("use_functions_api", [True, False])
 def test_tool_no_llm_response(
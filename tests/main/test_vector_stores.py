@@ -1,4 +1,5 @@
 import json
+from collections import Counter
 from types import SimpleNamespace
 from typing import List
 
@@ -381,6 +382,104 @@ def test_vector_stores_access(vecdb):
     assert vecdb.get_all_documents() == []
 
 
+@pytest.mark.parametrize("vecdb", ["qdrant_local", "lancedb", "chroma"], indirect=True)
+def test_vector_stores_reuse_search_embeddings(vecdb):
+    """Vectors returned with search results are reused, not re-embedded."""
+    docs_scores = vecdb.similar_texts_with_scores(phrases.HELLO, k=3)
+    texts = [d.content for d, _ in docs_scores]
+    embedding_fn = vecdb.embedding_fn
+    embedded = []
+
+    def recording_embedding_fn(inputs: List[str]):
+        embedded.extend(inputs)
+        return embedding_fn(inputs)
+
+    vecdb.embedding_fn = recording_embedding_fn
+    embeddings = vecdb.get_text_embeddings(texts + ["something new"])
+    assert embedded == ["something new"]
+    assert len(embeddings) == len(texts) + 1
+    assert all(len(e) == len(embeddings[-1]) for e in embeddings)
+
+
+@pytest.mark.parametrize("vecdb", ["qdrant_local", "lancedb", "chroma"], indirect=True)
+def test_vector_stores_chunk_contents(vecdb):
+    """Chunk contents are fetched in one call, then served from the cache."""
+    ids = [d.id() for d in stored_docs]
+    get_documents_by_ids = vecdb.get_documents_by_ids
+    calls = []
+
+    def counting_get_documents_by_ids(ids: List[str]) -> List[Document]:
+        calls.append(list(ids))
+        return get_documents_by_ids(ids)
+
+    vecdb.get_documents_by_ids = counting_get_documents_by_ids
+    contents = vecdb.get_chunk_contents(ids[3:0:-1])
+    assert contents == {id: stored_docs[int(id)].content for id in ids[1:4]}
+    assert calls == [ids[3:0:-1]]
+
+    assert vecdb.get_chunk_contents(ids[:3]) == {
+        id: stored_docs[int(id)].content for id in ids[:3]
+    }
+    assert calls[1:] == [ids[:1]]
+
+    # adding documents invalidates the cached contents
+    vecdb.add_documents(stored_docs[:1])
+    vecdb.get_chunk_contents(ids[:2])
+    assert calls[2:] == [ids[:2]]
+
+
+def test_remove_overlaps():
+    windows = [
+        ["a2", "a3", "a4"],
+        ["b0", "b1"],
+        ["a0", "a1", "a2"],
+        ["a3"],  # contained in the first window
+        ["b3", "b4"],
+        ["a4", "a5", "a6"],
+    ]
+    assert VectorStore.remove_overlaps(windows) == [
+        ["a0", "a1", "a2", "a3", "a4", "a5", "a6"],
+        ["b0", "b1"],
+        ["b3", "b4"],
+    ]
+    assert VectorStore.remove_overlaps([]) == []
+
+
+@pytest.mark.parametrize("vecdb", ["qdrant_local", "lancedb", "chroma"], indirect=True)
+def test_vector_stores_collection_cache(vecdb):
+    """Collection checks are served from the cache, which tracks our own changes."""
+    coll_name = vecdb.config.collection_name
+    list_collections = vecdb.list_collections
+    calls = []
+
+    def counting_list_collections(empty: bool = False) -> List[str]:
+        calls.append(empty)
+        return list_collections(empty=empty)
+
+    vecdb.list_collections = counting_list_collections
+    vecdb.invalidate_collection_cache()
+    assert vecdb.has_collection(coll_name)
+    assert vecdb.has_collection(coll_name)
+    assert len(calls) == 1
+
+    vecdb.delete_collection(coll_name)
+    assert not vecdb.has_collection(coll_name)
+    assert len(calls) == 2
+
+    vecdb.add_documents(stored_docs)
+    assert vecdb.has_collection(coll_name)
+    n_calls = len(calls)
+    assert vecdb.has_collection(coll_name)
+    assert len(calls) == n_calls
+
+    vecdb.config.collection_cache_ttl = 0
+    vecdb.invalidate_collection_cache()
+    n_calls = len(calls)
+    vecdb.has_collection(coll_name)
+    vecdb.has_collection(coll_name)
+    assert len(calls) == n_calls + 2
+
+
 @pytest.mark.parametrize(
     "vecdb",
     [
@@ -583,6 +682,25 @@ def test_vector_stores_overlapping_matches(vecdb):
         assert indices == sorted(indices)
 
 
+@pytest.mark.parametrize("vecdb", ["lancedb"], indirect=True)
+def test_lance_arrow_results(vecdb: LanceDB):
+    """Search results as an Arrow table, and documents read in Arrow batches."""
+    table = vecdb.similar_texts_table(phrases.FRANCE, k=3)
+    assert table.num_rows == 3
+    assert "vector" not in table.schema.names
+    docs_scores = vecdb.similar_texts_with_scores(phrases.FRANCE, k=3)
+    assert table.column("content").to_pylist() == [d.content for d, _ in docs_scores]
+    assert table.column("score").to_pylist() == pytest.approx(
+        [s for _, s in docs_scores]
+    )
+
+    batches = list(vecdb.iter_documents(batch_size=3))
+    assert len(batches) >= 3 and all(len(b) <= 3 for b in batches)
+    docs = [d for b in batches for d in b]
+    assert sorted(d.content for d in docs) == sorted(vars(phrases).values())
+    assert [d.content for d in vecdb.get_all_documents()] == [d.content for d in docs]
+
+
 def test_lance_metadata():
     """
     Test that adding documents with extra fields in metadata
@@ -694,3 +812,64 @@ def test_postgres_where_clause(vecdb: PostgresDB):
     assert len(all_docs) == 3
 
     vecdb.delete_collection("test_get_all_documents_where")
+
+
+@pytest.mark.parametrize("use_copy", [True, False])
+@pytest.mark.parametrize("vecdb", ["postgres"], indirect=True)
+def test_postgres_upsert_and_batch_search(vecdb: PostgresDB, use_copy: bool):
+    """Re-ingesting docs replaces them; batched search matches per-query search."""
+    vecdb.config.use_copy = use_copy
+    vecdb.config.hnsw_ef_search = 100
+    vecdb.config.metadata_index = True
+    vecdb.create_collection(collection_name="test_upsert", replace=True)
+    docs = [
+        Document(content=p, metadata=DocMetaData(id=str(i), source="wiki"))
+        for i, p in enumerate(vars(phrases).values())
+    ]
+    vecdb.add_documents(docs)
+    # same ids (already converted to uuids), new content
+    for d in docs[:2]:
+        d.content = d.content.upper()
+    vecdb.add_documents(docs[:2] + docs[:1])
+    all_docs = vecdb.get_all_documents()
+    assert len(all_docs) == len(docs)
+    assert sorted(d.content for d in all_docs) == sorted(d.content for d in docs)
+
+    queries = [phrases.FRANCE, phrases.OVER_40]
+    batch = vecdb.similar_texts_with_scores_batch(queries, k=2)
+    for query, results in zip(queries, batch):
+        single = vecdb.similar_texts_with_scores(query, k=2)
+        assert [d.content for d, _ in results] == [d.content for d, _ in single]
+        assert [s for _, s in results] == pytest.approx([s for _, s in single])
+    results = vecdb.similar_texts_with_scores(
+        phrases.FRANCE, k=3, where=json.dumps({"source": "web"})
+    )
+    assert results == []
+    vecdb.delete_collection("test_upsert")
+
+
+@pytest.mark.parametrize(
+    "vecdb", ["qdrant_local", "lancedb", "chroma", "postgres"], indirect=True
+)
+def test_add_documents_stream_embeds_once(vecdb: VectorStore):
+    """Streamed batches are embedded once, and not again when they are added."""
+    embedded: Counter[str] = Counter()
+    embedding_fn = vecdb.embedding_fn
+
+    def counting_embedding_fn(input: List[str]) -> List[List[float]]:
+        embedded.update(input)
+        return embedding_fn(input)
+
+    vecdb.embedding_fn = counting_embedding_fn
+    # some stores (e.g. chroma) bind the embedding function to the collection
+    vecdb.create_collection(collection_name="test_embed_once", replace=True)
+    # smaller than the streamed batches, so stores that upsert in slices
+    # can't match their slices to the precomputed embeddings by position
+    vecdb.config.batch_size = 2
+    docs = [d.model_copy(deep=True) for d in stored_docs]
+    batches = [docs[i : i + 5] for i in range(0, len(docs), 5)]
+    added = list(vecdb.add_documents_stream(batches))
+    assert sum(len(b) for b in added) == len(docs)
+    assert embedded == Counter(d.content for d in docs)
+    assert len(vecdb.get_all_documents()) == len(docs)
+    vecdb.delete_collection("test_embed_once")